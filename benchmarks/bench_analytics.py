@@ -0,0 +1,59 @@
+"""Benchmark the analytics pipeline over a replay archive.
+
+Archives N games of random inputs, then analyzes them in one process and in
+a process pool, reporting games and simulated frames per second.
+
+Usage:
+    python benchmarks/bench_analytics.py [--games N] [--processes P]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from tetris.analytics import analyze  # noqa: E402
+from tetris.archive import ArchiveWriter  # noqa: E402
+from tetris.constants import Action  # noqa: E402
+from tetris.replay import Replay  # noqa: E402
+
+# Simulation time per recorded update at 60 FPS, in ms
+FRAME_MS = 16
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--games", type=int, default=400, help="games to archive")
+    parser.add_argument("--frames", type=int, default=1800, help="updates per game")
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 1, help="pool size")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    actions = list(Action)
+    with tempfile.TemporaryDirectory() as directory:
+        writer = ArchiveWriter(directory)
+        for index in range(args.games):
+            replay = Replay(index, rng.choice(["Classic", "Speed", "Battle"]))
+            for frame in range(1, args.frames + 1):
+                pressed = [(frame * FRAME_MS - 1, rng.choice(actions))] if rng.random() < 0.2 else []
+                replay.add_frame(frame * FRAME_MS, pressed)
+            writer.append(replay)
+        writer.close()
+
+        frames = args.games * args.frames
+        for processes in sorted({1, args.processes}):
+            start = time.perf_counter()
+            stats = analyze(directory, processes, chunk_size=max(1, args.games // (4 * processes)))
+            elapsed = time.perf_counter() - start
+            print(f"{processes:3d} process(es): {args.games / elapsed:8.0f} games/s, "
+                  f"{frames / elapsed:10.0f} frames/s ({sum(stats.games.values())} games)")
+
+
+if __name__ == "__main__":
+    main()
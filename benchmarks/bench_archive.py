@@ -0,0 +1,101 @@
+"""Benchmark the replay archive against one file per replay.
+
+Writes N replays both to an archive and as loose files, then reports write
+rate, index scan rate (game id, mode, score of every game) and random-access
+decode rate for each.
+
+Usage:
+    python benchmarks/bench_archive.py [--games N]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from tetris.archive import ArchiveWriter, ReplayArchive  # noqa: E402
+from tetris.constants import Action  # noqa: E402
+from tetris.replay import Replay  # noqa: E402
+
+# Simulation time per recorded update at 60 FPS, in ms
+FRAME_MS = 16
+
+
+def make_replays(count, frames):
+    """Return ``count`` replays of random inputs, ``frames`` updates each."""
+    rng = random.Random(0)
+    actions = list(Action)
+    replays = []
+    for index in range(count):
+        replay = Replay(index, rng.choice(["Classic", "Speed", "Battle"]))
+        for frame in range(1, frames + 1):
+            pressed = [(frame * FRAME_MS - 1, rng.choice(actions))] if rng.random() < 0.2 else []
+            replay.add_frame(frame * FRAME_MS, pressed)
+        replay.score = rng.randrange(10000)
+        replays.append(replay)
+    return replays
+
+
+def rate(count, seconds):
+    return f"{count / seconds:10.0f}/s"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--games", type=int, default=20000, help="replays to store")
+    parser.add_argument("--frames", type=int, default=600, help="updates per replay")
+    args = parser.parse_args()
+
+    replays = make_replays(args.games, args.frames)
+    sample = random.Random(1).sample(range(args.games), min(args.games, 2000))
+    with tempfile.TemporaryDirectory() as directory:
+        archive_dir = os.path.join(directory, "archive")
+        loose_dir = os.path.join(directory, "loose")
+        os.makedirs(loose_dir)
+
+        start = time.perf_counter()
+        writer = ArchiveWriter(archive_dir)
+        for replay in replays:
+            writer.append(replay)
+        writer.close(seal=True)
+        archive_write = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for index, replay in enumerate(replays):
+            replay.save(os.path.join(loose_dir, f"{index}.replay"))
+        loose_write = time.perf_counter() - start
+
+        start = time.perf_counter()
+        archive = ReplayArchive(archive_dir)
+        best = max(entry.score for entry in archive)
+        archive_scan = time.perf_counter() - start
+
+        start = time.perf_counter()
+        loose_best = max(Replay.load(os.path.join(loose_dir, f"{index}.replay")).score
+                         for index in range(args.games))
+        loose_scan = time.perf_counter() - start
+        assert best == loose_best
+
+        start = time.perf_counter()
+        for game_id in sample:
+            archive.load(game_id)
+        archive_load = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for game_id in sample:
+            Replay.load(os.path.join(loose_dir, f"{game_id}.replay"))
+        loose_load = time.perf_counter() - start
+
+    print(f"{args.games} games, {len(archive.segments)} segment(s)")
+    print(f"                  archive      loose files")
+    print(f"write:        {rate(args.games, archive_write)}  {rate(args.games, loose_write)}")
+    print(f"scan scores:  {rate(args.games, archive_scan)}  {rate(args.games, loose_scan)}")
+    print(f"random load:  {rate(len(sample), archive_load)}  {rate(len(sample), loose_load)}")
+
+
+if __name__ == "__main__":
+    main()
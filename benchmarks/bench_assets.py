@@ -0,0 +1,130 @@
+"""Benchmark asset loading at startup: one bundle against loose files.
+
+Generates an asset directory of small sounds, images and fonts and its
+bundle, then times, in fresh interpreters, opening the assets and loading
+either all of them (a loader that decodes everything up front) or only the
+few effects the game needs at startup (lazy decoding). With --drop-caches
+(root only) the page cache is emptied before every run, which is closer to
+a cold start from slow storage such as an SD card.
+
+Usage:
+    python benchmarks/bench_assets.py [--sounds N] [--images N] [--runs N] [--drop-caches]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import wave
+
+SRC_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, SRC_PATH)
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import pygame  # noqa: E402
+from tetris.assets import build_bundle  # noqa: E402
+
+# Assets decoded at startup in the lazy runs
+STARTUP = ["sounds/sound000.wav", "sounds/sound001.wav", "sounds/sound002.wav",
+           "sounds/sound003.wav", "sounds/sound004.wav"]
+
+# Run in a fresh interpreter; prints the milliseconds from opening to loaded
+CHILD = """
+import sys, time, pygame
+pygame.mixer.init()
+pygame.font.init()
+from tetris.assets import AssetBundle, AssetDirectory
+kind, path, mode = sys.argv[1:4]
+start = time.perf_counter()
+assets = AssetBundle(path) if kind == "bundle" else AssetDirectory(path)
+names = sorted(assets.names()) if mode == "all" else sys.argv[4:]
+for name in names:
+    if name.endswith(".wav"):
+        assets.sound(name)
+    elif name.endswith(".png"):
+        assets.image(name)
+    else:
+        assets.font(name, 24)
+print((time.perf_counter() - start) * 1000)
+"""
+
+
+def make_assets(root, sounds, images):
+    """Write ``sounds`` short WAV files, ``images`` PNG tiles and a few fonts below ``root``."""
+    for directory in ("sounds", "images", "fonts"):
+        os.makedirs(os.path.join(root, directory))
+    for i in range(sounds):
+        with wave.open(os.path.join(root, "sounds", f"sound{i:03d}.wav"), "wb") as f:
+            f.setnchannels(1)
+            f.setsampwidth(2)
+            f.setframerate(22050)
+            f.writeframes(bytes(range(256)) * 17)  # About 0.1 s
+    tile = pygame.Surface((32, 32))
+    for i in range(images):
+        tile.fill((i % 256, 80, 160))
+        pygame.image.save(tile, os.path.join(root, "images", f"block{i:03d}.png"))
+    with open(os.path.join(os.path.dirname(pygame.__file__), pygame.font.get_default_font()), "rb") as f:
+        font = f.read()
+    for i in range(4):
+        with open(os.path.join(root, "fonts", f"font{i}.ttf"), "wb") as f:
+            f.write(font)
+
+
+def drop_caches():
+    """Empty the page cache; return False if not permitted."""
+    try:
+        os.sync()
+        with open("/proc/sys/vm/drop_caches", "w") as f:
+            f.write("3")
+        return True
+    except OSError:
+        return False
+
+
+def time_load(kind, path, mode, runs, cold):
+    """Return the load times (ms) of ``runs`` fresh interpreters."""
+    env = dict(os.environ, PYTHONPATH=SRC_PATH)
+    samples = []
+    for _ in range(runs):
+        if cold:
+            drop_caches()
+        output = subprocess.run([sys.executable, "-c", CHILD, kind, path, mode] + STARTUP,
+                                env=env, capture_output=True, text=True, check=True).stdout
+        samples.append(float(output.split()[-1]))
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sounds", type=int, default=200, help="sound files")
+    parser.add_argument("--images", type=int, default=200, help="image files")
+    parser.add_argument("--runs", type=int, default=10, help="fresh interpreters per case")
+    parser.add_argument("--drop-caches", action="store_true", help="empty the page cache before each run")
+    args = parser.parse_args()
+
+    cold = args.drop_caches and drop_caches()
+    if args.drop_caches and not cold:
+        print("Can't drop the page cache (needs root); timing with warm caches")
+    with tempfile.TemporaryDirectory() as directory:
+        root = os.path.join(directory, "assets")
+        make_assets(root, args.sounds, args.images)
+        bundle = root + ".bundle"
+        count = build_bundle(root, bundle)
+        print(f"{count} assets, {os.path.getsize(bundle)} bytes, "
+              f"{'cold' if cold else 'warm'} page cache")
+        print(f"{'case':<26}{'median ms':>12}{'min ms':>10}")
+        for label, kind, path, mode in (
+                ("loose files, load all", "loose", root, "all"),
+                ("bundle, load all", "bundle", bundle, "all"),
+                ("loose files, startup set", "loose", root, "startup"),
+                ("bundle, startup set", "bundle", bundle, "startup")):
+            samples = time_load(kind, path, mode, args.runs, cold)
+            print(f"{label:<26}{statistics.median(samples):>12.2f}{min(samples):>10.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,143 @@
+"""Benchmark how per-piece costs scale with board size.
+
+For each board size this times collision checks, locking a piece, clearing a
+line, receiving a garbage row (pushed in and cleared again) and rendering a
+frame (steady state, and right after a lock), reporting microseconds per
+operation. Per-piece work should stay roughly flat as the board grows; the
+board's rows are a circular buffer, so clearing the bottom line and pushing
+garbage grow only with the width. The first render of a board grows with it.
+
+Usage:
+    python benchmarks/bench_board_scaling.py [--repeat N] [--csv FILE] [--plot FILE]
+
+``--plot`` needs matplotlib.
+"""
+
+import argparse
+import csv
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+import pygame  # noqa: E402
+from tetris.constants import SCREEN_DIMENSIONS, SHAPES  # noqa: E402
+from tetris.game import BaseGame  # noqa: E402
+from tetris.tetrimino import Tetrimino  # noqa: E402
+
+# (columns, rows), from the standard board to party-mode sizes
+SIZES = [(10, 20), (40, 80), (100, 400), (200, 1000), (400, 4000)]
+
+COLUMNS = ["collision", "lock", "line_clear", "garbage", "render", "render_after_lock"]
+
+
+class BenchSettings:
+    """Minimal settings for a game without saved state."""
+
+    difficulty = "Normal"
+    controls = {}
+
+
+def per_op(func, repeat):
+    """Return the mean time of ``func()`` in microseconds."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def bench_size(screen, width, height, repeat):
+    """Time each operation on a ``width`` x ``height`` board."""
+    game = BaseGame(screen, BenchSettings(), None, grid_width=width, grid_height=height)
+    square = SHAPES[1]
+    bottom = height - 2
+
+    def place():
+        game.current_piece = Tetrimino(width // 2, bottom, square)
+
+    def collision():
+        game.check_collision(y_offset=1)
+
+    def lock():
+        place()
+        game.lock_piece()
+
+    def line_clear():
+        start = game.grid.row_start(height - 1)
+        game.grid.cells[start:start + width] = b"\x01" * width
+        game.clear_lines([height - 1])
+
+    def garbage():
+        game.add_garbage(1, 0)
+        game.grid.set(0, height - 1, 1)
+        game.clear_lines([height - 1])
+
+    def render_after_lock():
+        game.mark_changed(bottom, height - 1)
+        game.draw()
+
+    place()
+    results = {"collision": per_op(collision, repeat)}
+    results["lock"] = per_op(lock, repeat)
+    results["line_clear"] = per_op(line_clear, repeat)
+    results["garbage"] = per_op(garbage, repeat)
+    game.draw()
+    results["render"] = per_op(game.draw, repeat)
+    results["render_after_lock"] = per_op(render_after_lock, repeat)
+    return results
+
+
+def plot(rows, path):
+    """Plot each column against board cell count (log-log)."""
+    try:
+        import matplotlib
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+    except ImportError:
+        print("matplotlib is not installed; skipping plot")
+        return
+    cells = [width * height for width, height, _ in rows]
+    fig, ax = plt.subplots()
+    for column in COLUMNS:
+        ax.plot(cells, [result[column] for _, _, result in rows], marker="o", label=column)
+    ax.set_xscale("log")
+    ax.set_yscale("log")
+    ax.set_xlabel("board cells")
+    ax.set_ylabel("us per operation")
+    ax.legend()
+    fig.savefig(path)
+    print(f"plot written to {path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=200, help="operations timed per size")
+    parser.add_argument("--csv", help="write results to this CSV file")
+    parser.add_argument("--plot", help="write a log-log plot to this image file")
+    args = parser.parse_args()
+
+    pygame.init()
+    screen = pygame.display.set_mode((SCREEN_DIMENSIONS['WIDTH'], SCREEN_DIMENSIONS['HEIGHT']))
+    rows = [(width, height, bench_size(screen, width, height, args.repeat))
+            for width, height in SIZES]
+    pygame.quit()
+
+    print(f"{'board':>10}  " + "  ".join(f"{column:>17}" for column in COLUMNS))
+    for width, height, result in rows:
+        print(f"{width:>4}x{height:<5}  " + "  ".join(f"{result[column]:>17.1f}" for column in COLUMNS))
+
+    if args.csv:
+        with open(args.csv, "w", newline="") as handle:
+            writer = csv.writer(handle)
+            writer.writerow(["width", "height"] + COLUMNS)
+            for width, height, result in rows:
+                writer.writerow([width, height] + [f"{result[column]:.2f}" for column in COLUMNS])
+    if args.plot:
+        plot(rows, args.plot)
+
+
+if __name__ == "__main__":
+    main()
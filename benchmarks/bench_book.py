@@ -0,0 +1,66 @@
+"""Benchmark opening book lookups against searching.
+
+Generates a book, then times choosing the first placements of many seeded
+games with the book and with the search alone.
+
+Usage:
+    python benchmarks/bench_book.py [--depth D] [--games N]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import types
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from tetris.book import OpeningBook, generate, write_book  # noqa: E402
+from tetris.bot import Bot, apply_placement  # noqa: E402
+from tetris.engine import GameEngine  # noqa: E402
+
+
+def opening_times(bot, games, depth):
+    """Return the seconds spent choosing the first ``depth`` placements of each game."""
+    engine = GameEngine(types.SimpleNamespace(difficulty="Normal"))
+    spent = 0.0
+    for seed in range(games):
+        engine.seed(seed)
+        engine.reset_game()
+        for _ in range(depth):
+            start = time.perf_counter()
+            placement = bot.choose(engine)
+            spent += time.perf_counter() - start
+            apply_placement(engine, *placement)
+    return spent
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--depth", type=int, default=3, help="book depth")
+    parser.add_argument("--games", type=int, default=500, help="games to open")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    records = generate(depth=args.depth)
+    generation = time.perf_counter() - start
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "book.bin")
+        write_book(path, records, 10, 20, args.depth)
+        start = time.perf_counter()
+        book = OpeningBook(path)
+        opened = time.perf_counter() - start
+        booked = Bot(book)
+        with_book = opening_times(booked, args.games, args.depth)
+        book.close()
+    searched = opening_times(Bot(), args.games, args.depth)
+
+    placements = args.games * args.depth
+    print(f"book: {len(records)} positions, generated in {generation:.1f}s, opened in {opened * 1e6:.0f}us")
+    print(f"search:  {searched / placements * 1e6:8.0f} us/placement")
+    print(f"book:    {with_book / placements * 1e6:8.0f} us/placement ({booked.book_hits} hits)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Benchmark reinforcement learning environment throughput.
+
+Reports environment steps (placed pieces) per second for the single-game
+TetrisEnv and for VectorTetrisEnv at several batch sizes, using random
+actions.
+
+Usage:
+    python benchmarks/bench_env.py [--seconds S]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+import numpy as np  # noqa: E402
+from tetris.env import TetrisEnv, VectorTetrisEnv  # noqa: E402
+
+BATCH_SIZES = [1, 64, 1024, 8192]
+
+
+def bench_single(seconds):
+    """Return steps per second of TetrisEnv."""
+    env = TetrisEnv()
+    env.reset(seed=0)
+    actions = np.random.default_rng(0).integers(env.num_actions, size=100_000).tolist()
+    steps = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        for action in actions[:1000]:
+            if env.step(action)[2]:
+                env.reset()
+        steps += 1000
+    return steps / (time.perf_counter() - start)
+
+
+def bench_vector(num_envs, seconds):
+    """Return steps per second of VectorTetrisEnv with ``num_envs`` games."""
+    env = VectorTetrisEnv(num_envs)
+    env.reset(seed=0)
+    rng = np.random.default_rng(0)
+    steps = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        env.step(rng.integers(env.num_actions, size=num_envs))
+        steps += num_envs
+    return steps / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=2.0, help="time spent per configuration")
+    args = parser.parse_args()
+
+    print(f"{'environment':<28}{'steps/s':>14}")
+    print(f"{'TetrisEnv':<28}{bench_single(args.seconds):>14,.0f}")
+    for num_envs in BATCH_SIZES:
+        rate = bench_vector(num_envs, args.seconds)
+        print(f"{f'VectorTetrisEnv({num_envs})':<28}{rate:>14,.0f}")
+
+
+if __name__ == "__main__":
+    main()
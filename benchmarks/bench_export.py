@@ -0,0 +1,60 @@
+"""Benchmark headless replay export.
+
+Records a game with random inputs, then exports it to a raw frame file and
+reports frames per second and the speed relative to real time.
+
+Usage:
+    python benchmarks/bench_export.py [--seconds S] [--fps F]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from tetris.constants import Action  # noqa: E402
+from tetris.export import export  # noqa: E402
+from tetris.replay import Replay  # noqa: E402
+
+# Simulation time per recorded update at 60 FPS, in ms
+FRAME_MS = 16
+
+
+def record(seconds):
+    """Return a replay of random inputs lasting ``seconds``."""
+    rng = random.Random(0)
+    actions = list(Action)
+    replay = Replay(0)
+    for index in range(1, seconds * 1000 // FRAME_MS + 1):
+        end_time = index * FRAME_MS
+        pressed = [(end_time - 1, rng.choice(actions))] if rng.random() < 0.2 else []
+        replay.add_frame(end_time, pressed)
+    return replay
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=int, default=60, help="length of the recorded game")
+    parser.add_argument("--fps", type=int, default=60, help="video frame rate")
+    args = parser.parse_args()
+
+    replay = record(args.seconds)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "bench.raw")
+        start = time.perf_counter()
+        count = export(replay, path, args.fps)
+        elapsed = time.perf_counter() - start
+
+    print(f"{count} frames ({replay.end_time / 1000:.0f}s of play at {args.fps} FPS)")
+    print(f"export:     {count / elapsed:8.0f} frames/s")
+    print(f"real time:  {count / args.fps / elapsed:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Benchmark the reachability planner on boards from bot-played games.
+
+Collects the boards a bot meets in seeded games, then times finding every
+lock position of each board's piece with a fresh planner per board and with
+one planner reusing its memoized open regions.
+
+Usage:
+    python benchmarks/bench_planner.py [--games N] [--pieces P]
+"""
+
+import argparse
+import os
+import sys
+import time
+import types
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from tetris.bot import Bot, occupancy  # noqa: E402
+from tetris.engine import GameEngine  # noqa: E402
+from tetris.planner import Planner  # noqa: E402
+
+
+def collect_boards(games, pieces):
+    """Return ``(cells, width, height, kind)`` for each piece of bot-played games."""
+    engine = GameEngine(types.SimpleNamespace(difficulty="Normal"))
+    bot = Bot()
+    boards = []
+    for seed in range(games):
+        engine.seed(seed)
+        engine.reset_game()
+        for _ in range(pieces):
+            if engine.game_over:
+                break
+            grid = engine.grid
+            boards.append((occupancy(grid), grid.width, grid.height, engine.current_piece.kind))
+            bot.play(engine)
+    return boards
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--games", type=int, default=10, help="games to collect boards from")
+    parser.add_argument("--pieces", type=int, default=50, help="pieces per game")
+    args = parser.parse_args()
+
+    boards = collect_boards(args.games, args.pieces)
+    start = time.perf_counter()
+    for board in boards:
+        Planner().lock_positions(*board)
+    fresh = time.perf_counter() - start
+
+    planner = Planner()
+    locks = 0
+    start = time.perf_counter()
+    for board in boards:
+        locks += len(planner.lock_positions(*board))
+    memoized = time.perf_counter() - start
+
+    print(f"{len(boards)} boards, {locks / len(boards):.1f} lock positions each, "
+          f"{len(planner.regions)} open regions memoized")
+    print(f"fresh planner:    {fresh / len(boards) * 1e3:6.2f} ms/board")
+    print(f"memoized regions: {memoized / len(boards) * 1e3:6.2f} ms/board")
+
+
+if __name__ == "__main__":
+    main()
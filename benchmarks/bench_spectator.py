@@ -0,0 +1,79 @@
+"""Benchmark the spectator wall frame rate.
+
+Runs N headless games with random inputs and gravity, draws them on a
+SpectatorWall every frame and reports the frame rate of rendering alone and
+of simulation plus rendering. The target is 60 FPS with 64 boards.
+
+Usage:
+    python benchmarks/bench_spectator.py [--boards N] [--frames F]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+import pygame  # noqa: E402
+from tetris.constants import Action  # noqa: E402
+from tetris.engine import GameEngine  # noqa: E402
+from tetris.spectator import SpectatorWall  # noqa: E402
+
+# Simulation time per frame at 60 FPS, in ms
+FRAME_MS = 16
+
+
+class BenchSettings:
+    """Minimal settings for a headless game."""
+
+    difficulty = "Hard"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--boards", type=int, default=64, help="games on the wall")
+    parser.add_argument("--frames", type=int, default=600, help="frames to render")
+    parser.add_argument("--size", default="1280x720", help="screen size, WxH")
+    args = parser.parse_args()
+
+    width, height = (int(value) for value in args.size.split("x"))
+    pygame.init()
+    screen = pygame.display.set_mode((width, height))
+    rng = random.Random(0)
+    games = []
+    for index in range(args.boards):
+        game = GameEngine(BenchSettings())
+        game.seed(index)
+        game.reset_game()
+        games.append(game)
+    wall = SpectatorWall(screen.get_rect(), games)
+    actions = list(Action)
+
+    render_time = 0.0
+    redrawn = 0
+    start = time.perf_counter()
+    for _ in range(args.frames):
+        for game in games:
+            if game.game_over:
+                game.reset_game()
+            if rng.random() < 0.3:
+                game.apply_action(rng.choice(actions))
+            game.advance(FRAME_MS)
+        frame_start = time.perf_counter()
+        redrawn += len(wall.draw(screen))
+        render_time += time.perf_counter() - frame_start
+    total = time.perf_counter() - start
+    pygame.quit()
+
+    print(f"{args.boards} boards, block size {wall.block_size}px, {args.frames} frames")
+    print(f"render only:         {args.frames / render_time:8.0f} FPS")
+    print(f"simulate + render:   {args.frames / total:8.0f} FPS")
+    print(f"tiles redrawn/frame: {redrawn / args.frames:8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Benchmark cold-start import time of the tetris package.
+
+Each measurement spawns a fresh interpreter, so the numbers include module
+lookup, bytecode loading and any third-party imports (pygame/SDL) that the
+imported modules pull in.
+
+Usage:
+    python benchmarks/bench_startup.py [--runs N]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+SRC_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+# Import targets, from the lightest (pure logic) to the full game.
+TARGETS = [
+    ("baseline (python -c pass)", "pass"),
+    ("tetris.constants", "import tetris.constants"),
+    ("tetris.settings", "import tetris.settings"),
+    ("tetris.engine", "import tetris.engine"),
+    ("tetris.game", "import tetris.game"),
+    ("tetris.ui", "import tetris.ui"),
+]
+
+
+def time_import(code, runs):
+    """Return wall-clock times (ms) of running ``code`` in fresh interpreters."""
+    env = dict(os.environ, PYTHONPATH=SRC_PATH, PYGAME_HIDE_SUPPORT_PROMPT="1")
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], env=env, check=True)
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def main():
+    """Run the startup benchmark and print a summary table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=20, help="fresh interpreters per target")
+    args = parser.parse_args()
+
+    print(f"{'target':<28}{'median ms':>12}{'min ms':>10}{'pygame':>8}")
+    for label, code in TARGETS:
+        samples = time_import(code, args.runs)
+        probe = subprocess.run(
+            [sys.executable, "-c", f"{code}; import sys; print('pygame' in sys.modules)"],
+            env=dict(os.environ, PYTHONPATH=SRC_PATH, PYGAME_HIDE_SUPPORT_PROMPT="1"),
+            capture_output=True, text=True, check=True)
+        print(f"{label:<28}{statistics.median(samples):>12.1f}{min(samples):>10.1f}"
+              f"{probe.stdout.strip():>8}")
+
+
+if __name__ == '__main__':
+    main()
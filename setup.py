@@ -10,5 +10,9 @@ setup(
     install_requires=[
         "pygame>=2.6.1",
     ],
-    python_requires=">=3.6",
+    extras_require={
+        # Reinforcement learning environments (tetris.env)
+        "rl": ["numpy>=1.22"],
+    },
+    python_requires=">=3.8",
 )
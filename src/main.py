@@ -1,43 +1,81 @@
 """Main entry point for the Tetris game."""
 
+import os
 import pygame
+from tetris.audio import Audio, init_mixer
+from tetris.broadcast import BroadcastRelay, BroadcastPublisher
 from tetris.game import BaseGame, SpeedGame, BattleGame
+from tetris.archive import ArchiveWriter, ARCHIVE_DIR
+from tetris.assets import open_assets
+from tetris.levels import load_level_table
 from tetris.settings import Settings, HighScores
 from tetris.ui import Menu
-from tetris.constants import SCREEN_DIMENSIONS, GameState
+from tetris.pacing import FramePacer
+from tetris.events import EventFilter, coalesce_motion, route
+from tetris.display import Display
+from tetris.storage import data_path
+from tetris.constants import GameState
 
 
 def main():
     """Main game function."""
     print("Initializing game...")
+    init_mixer()
     pygame.init()
-    screen = pygame.display.set_mode((SCREEN_DIMENSIONS['WIDTH'], SCREEN_DIMENSIONS['HEIGHT']), 
-                                   pygame.SHOWN | pygame.HWSURFACE | pygame.DOUBLEBUF)
+    settings = Settings()
+    # One bundle (or the loose asset files), decoded as assets are first used
+    assets = open_assets()
+    # Effects are decoded here, once, so playing them never costs a frame
+    audio = Audio(settings, assets)
+    # Everything draws into display.surface at the logical resolution; the
+    # window can be any size and is filled by one scaled present per frame
+    display = Display(settings.window_size)
+    screen = display.surface
     pygame.display.set_caption("Tetris")
-    print("Display initialized with dimensions:", SCREEN_DIMENSIONS['WIDTH'], "x", SCREEN_DIMENSIONS['HEIGHT'])
+    print("Display initialized with dimensions:", *display.window.get_size())
     
-    settings = Settings()
     high_scores = HighScores()
+    # Speed mode follows the tuned level table when one has been generated
+    SpeedGame.LEVELS = load_level_table()
     menu = Menu(screen, settings, high_scores)
-    clock = pygame.time.Clock()
+    pacer = FramePacer(fps=60)  # 60 FPS while playing, wait for input on static screens
+    event_filter = EventFilter()
+    # Broadcast mode: publish the running game to local viewers
+    broadcast_port = os.environ.get("TETRIS_BROADCAST_PORT")
+    relay = BroadcastRelay(port=int(broadcast_port)) if broadcast_port else None
+    publisher = None
     current_game = None
+    # Finished games are appended to the replay archive
+    try:
+        archive = ArchiveWriter(data_path(ARCHIVE_DIR))
+    except RuntimeError as e:
+        print("Not recording replays:", e)
+        archive = None
+    saved_replay = None
     running = True
+    animating = False
     print("Game components initialized")
 
     while running:
-        clock.tick(60)  # Limit to 60 FPS
-        events = pygame.event.get()
+        # Only queue the event types the current screen handles
+        event_filter.restrict(Menu.EVENT_TYPES if current_game is None else BaseGame.EVENT_TYPES)
+        events = display.map_mouse_events(coalesce_motion(pacer.get_events(idle=not animating)))
         
         for event in events:
             if event.type == pygame.QUIT:
                 running = False
                 print("Quit event received")
+            elif event.type == pygame.VIDEORESIZE:
+                display.resize(event.size)
+                settings.window_size = list(event.size)
+                settings.save_settings()
+                pacer.invalidate()
             elif event.type == pygame.ACTIVEEVENT and event.gain and current_game:
                 pygame.event.set_grab(True)
                 print("Window focus gained")
 
         if current_game is None:
-            new_state = menu.handle_events(events)
+            new_state = menu.handle_events(route(events, Menu.EVENT_TYPES))
             if new_state:
                 print("New state received:", new_state)
                 if new_state == GameState.QUIT:
@@ -52,30 +90,60 @@ def main():
                 if current_game:
                     current_game.current_state = GameState.PLAYING
                     print(f"Created new {new_state} instance")
-            menu.draw()
-            pygame.display.flip()
+                    audio.attach(current_game)
+                    audio.play_music()
+                    if relay:
+                        if publisher:
+                            publisher.detach()
+                        publisher = BroadcastPublisher(current_game, relay)
+            if pacer.should_render((menu.state, current_game), animating=current_game is not None):
+                menu.draw()
+                display.present()
         else:
-            game_state = current_game.handle_input(events)
+            game_state = current_game.handle_input(route(events, BaseGame.EVENT_TYPES))
             
             if game_state == GameState.QUIT:
                 running = False
             elif game_state == GameState.PAUSE:
                 current_game = None
+                audio.detach()
+                audio.stop_music()
                 pygame.event.set_grab(False)
             else:
                 current_game.update()
-                current_game.draw()
-                
-                if current_game.current_state == GameState.GAME_OVER:
-                    print("Game Over reached!")
-                    # Keep the game instance to show the game over screen
-                    pygame.event.set_grab(False)
-                
-                # Only flip the display if the game is initialized
-                if pygame.get_init():
-                    pygame.display.flip()
+                if (archive is not None and current_game.current_state == GameState.GAME_OVER
+                        and current_game.replay is not saved_replay):
+                    # Keep each finished game's replay (once, however long the game over screen shows)
+                    current_game.record_score()
+                    saved_replay = current_game.replay
+                    archive.append(saved_replay)
+                playing = current_game.current_state == GameState.PLAYING
+                if pacer.should_render((current_game, current_game.current_state), animating=playing):
+                    current_game.draw()
+                    
+                    if current_game.current_state == GameState.GAME_OVER:
+                        print("Game Over reached!")
+                        # Keep the game instance to show the game over screen
+                        pygame.event.set_grab(False)
+
+                    display.present()
+
+        if relay:
+            relay.pump()
+        audio.update()
+
+        # Menus, pause and game over are static: wait for input between frames
+        animating = current_game is not None and current_game.current_state == GameState.PLAYING
 
     print("Game shutting down...")
+    settings.flush()
+    audio.close()
+    assets.close()
+    if archive is not None:
+        archive.close()
+    high_scores.close()
+    if relay:
+        relay.close()
     pygame.quit()
 
 if __name__ == '__main__':
@@ -0,0 +1,262 @@
+"""
+Module for computing statistics over archived games.
+
+The pipeline is a chain of generators, so only one game is in memory at a
+time whatever the size of the archive:
+
+    iter_entries  archive index entries in a range of game ids (no decoding)
+    iter_replays  replays decoded lazily from the memory-mapped segments
+    iter_games    one summary per game, re-simulated on the game class of
+                  its mode with listeners collecting locks, clears and the
+                  cause of the top-out
+
+GameStats folds summaries into fixed-size aggregates: per-column placement
+heatmaps per mode and board width, line-clear distributions per mode and
+top-out causes. Aggregates from different chunks of the archive merge, so
+``analyze`` splits the id range into chunks and runs them in a process pool,
+each worker mapping the archive itself.
+
+Usage:
+    python -m tetris.analytics [ARCHIVE_DIR] [--processes N] [--chunk 1000] [--json]
+"""
+
+import collections
+import json
+import logging  # Import logging module for debugging
+import types
+from .archive import ReplayArchive, ARCHIVE_DIR
+from .constants import GameEvent
+
+# Initialize logger
+logger = logging.getLogger(__name__)
+
+# Piece letter by piece-type id
+PIECE_NAMES = " IOSZLJT"
+
+# Top-out causes: the new piece overlapped the stack, a piece locked partly
+# above the board, or incoming garbage pushed blocks off the top
+BLOCK_OUT = "block out"
+LOCK_OUT = "lock out"
+GARBAGE_OUT = "garbage out"
+
+def iter_entries(archive, start=0, stop=None, mode=None):
+    """Yield the archive entries of game ids ``start`` to ``stop`` (exclusive).
+
+    Args:
+        archive (ReplayArchive): Archive to read
+        start (int): First game id
+        stop (int, optional): Game id to stop at. Defaults to the end.
+        mode (str, optional): Only yield games of this mode
+    """
+    stop = len(archive) if stop is None else min(stop, len(archive))
+    for game_id in range(start, stop):
+        entry = archive.entry(game_id)
+        if mode is None or entry.mode == mode:
+            yield entry
+
+def iter_replays(archive, entries):
+    """Yield ``(entry, Replay)``, decoding each replay when it is reached."""
+    for entry in entries:
+        yield entry, archive.load(entry)
+
+class GameRecorder:
+    """Engine listener collecting one game's summary."""
+
+    def __init__(self, width):
+        self.columns = [0] * width
+        self.clears = [0] * 5
+        self.last_event = None
+        self.last_piece = None
+        self.top_out = None
+
+    def __call__(self, event, *args):
+        if event == GameEvent.MOVE:
+            # Tracked so a lock out after the piece fell isn't taken for a block out
+            self.last_event = event
+            return
+        if event == GameEvent.LOCK:
+            piece = args[0]
+            for row in piece.shape:
+                for x, cell in enumerate(row):
+                    if cell:
+                        self.columns[piece.x + x] += 1
+        elif event == GameEvent.CLEAR:
+            self.clears[min(len(args[0]), 4)] += 1
+        elif event == GameEvent.SPAWN:
+            self.last_piece = args[0].kind
+        elif event == GameEvent.GAME_OVER:
+            if self.last_event == GameEvent.SPAWN:
+                cause = BLOCK_OUT
+            elif self.last_event == GameEvent.GARBAGE:
+                cause = GARBAGE_OUT
+            else:
+                cause = LOCK_OUT
+            self.top_out = (cause, PIECE_NAMES[self.last_piece])
+        self.last_event = event
+
+def iter_games(replays):
+    """Re-simulate each replay and yield a summary of the game.
+
+    Yields:
+        dict: mode, width, score, lines, columns (cells placed per column),
+            clears (count of 1- to 4-line clears, index = lines) and top_out
+            ((cause, piece) or None if the game did not top out)
+    """
+    from .export import ensure_headless, game_class
+    ensure_headless()
+    games = {}
+    for entry, replay in replays:
+        key = (replay.mode, replay.width, replay.height, replay.difficulty)
+        game = games.get(key)
+        if game is None:
+            settings = types.SimpleNamespace(difficulty=replay.difficulty, controls={})
+            game = games[key] = game_class(replay.mode)(None, settings, None, replay.width, replay.height)
+        recorder = GameRecorder(replay.width)
+        game.add_listener(recorder)
+        try:
+            for _ in replay.play(game):
+                pass
+        finally:
+            game.remove_listener(recorder)
+        yield {"mode": replay.mode, "width": replay.width, "score": game.score,
+               "lines": game.total_lines, "columns": recorder.columns,
+               "clears": recorder.clears, "top_out": recorder.top_out}
+
+class GameStats:
+    """Mergeable aggregates over many games, independent of the game count."""
+
+    def __init__(self):
+        self.games = collections.Counter()
+        self.scores = collections.Counter()
+        self.best = {}
+        self.lines = collections.Counter()
+        # (mode, width) -> cells placed per column
+        self.placements = {}
+        # mode -> count of 0- to 4-line clears
+        self.clears = {}
+        # (mode, cause, piece) -> games
+        self.top_outs = collections.Counter()
+
+    def add(self, game):
+        """Add one game summary from iter_games."""
+        mode = game["mode"]
+        self.games[mode] += 1
+        self.scores[mode] += game["score"]
+        self.best[mode] = max(self.best.get(mode, 0), game["score"])
+        self.lines[mode] += game["lines"]
+        heatmap = self.placements.setdefault((mode, game["width"]), [0] * game["width"])
+        for column, count in enumerate(game["columns"]):
+            heatmap[column] += count
+        clears = self.clears.setdefault(mode, [0] * 5)
+        for lines, count in enumerate(game["clears"]):
+            clears[lines] += count
+        if game["top_out"] is not None:
+            self.top_outs[(mode,) + game["top_out"]] += 1
+
+    def merge(self, other):
+        """Add another GameStats' aggregates into this one."""
+        self.games.update(other.games)
+        self.scores.update(other.scores)
+        self.lines.update(other.lines)
+        self.top_outs.update(other.top_outs)
+        for mode, best in other.best.items():
+            self.best[mode] = max(self.best.get(mode, 0), best)
+        for key, heatmap in other.placements.items():
+            mine = self.placements.setdefault(key, [0] * len(heatmap))
+            for column, count in enumerate(heatmap):
+                mine[column] += count
+        for mode, clears in other.clears.items():
+            mine = self.clears.setdefault(mode, [0] * 5)
+            for lines, count in enumerate(clears):
+                mine[lines] += count
+        return self
+
+    def to_dict(self):
+        """Return the aggregates as JSON-serializable data."""
+        return {
+            "games": dict(self.games),
+            "mean_score": {mode: self.scores[mode] / count for mode, count in self.games.items()},
+            "best_score": dict(self.best),
+            "lines": dict(self.lines),
+            "placements": {f"{mode} {width}": heatmap for (mode, width), heatmap in self.placements.items()},
+            "clears": {mode: clears[1:] for mode, clears in self.clears.items()},
+            "top_outs": {f"{mode} {cause} {piece}": count
+                         for (mode, cause, piece), count in self.top_outs.items()},
+        }
+
+def analyze_chunk(directory, start, stop, mode=None):
+    """Return the GameStats of game ids ``start`` to ``stop`` of an archive."""
+    archive = ReplayArchive(directory)
+    stats = GameStats()
+    for game in iter_games(iter_replays(archive, iter_entries(archive, start, stop, mode))):
+        stats.add(game)
+    return stats
+
+def _analyze_chunk(args):
+    """Pool entry point for analyze_chunk."""
+    return analyze_chunk(*args)
+
+def chunks(count, size):
+    """Return ``(start, stop)`` id ranges of at most ``size`` games covering ``count``."""
+    return [(start, min(start + size, count)) for start in range(0, count, size)]
+
+def analyze(directory, processes=1, chunk_size=1000, mode=None):
+    """Compute GameStats over a whole archive.
+
+    Args:
+        directory (str): Archive directory
+        processes (int): Worker processes; 1 runs in this process
+        chunk_size (int): Games per unit of work
+        mode (str, optional): Only analyze games of this mode
+
+    Returns:
+        GameStats: Aggregates over every game
+    """
+    work = [(directory, start, stop, mode) for start, stop in chunks(len(ReplayArchive(directory)), chunk_size)]
+    stats = GameStats()
+    if processes <= 1 or len(work) <= 1:
+        for args in work:
+            stats.merge(_analyze_chunk(args))
+        return stats
+    import multiprocessing
+    # Workers initialize SDL, which is not safe to fork
+    with multiprocessing.get_context("spawn").Pool(processes) as pool:
+        for chunk_stats in pool.imap_unordered(_analyze_chunk, work):
+            stats.merge(chunk_stats)
+    return stats
+
+def main(argv=None):
+    """Print statistics over the replay archive."""
+    import argparse
+    import os
+    from .storage import data_path
+
+    parser = argparse.ArgumentParser(description="Statistics over recorded Tetris games.")
+    parser.add_argument("archive", nargs="?", default=data_path(ARCHIVE_DIR), help="archive directory")
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 1, help="worker processes")
+    parser.add_argument("--chunk", type=int, default=1000, help="games per unit of work")
+    parser.add_argument("--mode", help="only analyze one game mode")
+    parser.add_argument("--json", action="store_true", help="print the aggregates as JSON")
+    args = parser.parse_args(argv)
+
+    stats = analyze(args.archive, args.processes, args.chunk, args.mode)
+    if args.json:
+        print(json.dumps(stats.to_dict(), indent=2))
+        return
+    for mode, count in sorted(stats.games.items()):
+        clears = stats.clears.get(mode, [0] * 5)
+        print(f"{mode}: {count} games, mean score {stats.scores[mode] / count:.0f}, "
+              f"best {stats.best[mode]}, {stats.lines[mode]} lines")
+        print(f"  line clears (1-4): {clears[1:]}")
+        for (heat_mode, width), heatmap in sorted(stats.placements.items()):
+            if heat_mode == mode:
+                total = sum(heatmap) or 1
+                print(f"  placements by column ({width} wide): "
+                      + " ".join(f"{100 * count / total:.0f}%" for count in heatmap))
+        causes = [(count, cause, piece) for (top_mode, cause, piece), count in stats.top_outs.items()
+                  if top_mode == mode]
+        for count, cause, piece in sorted(causes, reverse=True):
+            print(f"  top-out {cause} on {piece}: {count}")
+
+if __name__ == "__main__":
+    main()
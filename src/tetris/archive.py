@@ -0,0 +1,395 @@
+"""
+Module for storing many replays in large, indexed segment files.
+
+An archive is a directory of segment files. Each segment holds a header,
+the encoded replays appended one after another as records, and, once the
+segment is full, a footer index and a trailer:
+
+    header   magic b"TARC", version, id of the segment's first game
+    record   kind, payload length, CRC-32 of payload, payload (Replay.to_bytes)
+    ...
+    index    a record of kind INDEX whose payload is one ENTRY per game
+    trailer  index offset, game count, CRC-32 of the index, magic b"TEND"
+
+An ENTRY holds the game's mode when its UTF-8 encoding fits in MODE_SIZE
+bytes; a longer mode is stored as zeros and read from the replay's own
+header instead, so the index keeps fixed-size entries.
+
+Game ids are sequential across the archive; a segment is named after its
+first id, so finding a game is a binary search over file names followed by
+a lookup in that segment's index.
+
+ReplayArchive reads segments through ``mmap``: listing, filtering and random
+access never read a file into memory or open it per replay, and only the
+replays actually decoded are copied out. Sealed segments are immutable.
+The newest segment is still being appended to; readers scan its records,
+stopping at the first incomplete one, and ``refresh`` picks up what the
+writer has added since.
+
+ArchiveWriter is the single appending writer, enforced with an exclusive
+lock on the directory where the platform supports it. It writes each record
+with one call, so concurrent readers see either all of it or a torn tail
+that fails its length or CRC check.
+"""
+
+import bisect
+import collections
+import logging  # Import logging module for debugging
+import mmap
+import os
+import struct
+import zlib
+from .replay import Replay, HEADER as REPLAY_HEADER, _read_text
+
+try:
+    import fcntl
+except ImportError:  # Windows: the single-writer rule is not enforced
+    fcntl = None
+
+# Initialize logger
+logger = logging.getLogger(__name__)
+
+MAGIC = b"TARC"
+END_MAGIC = b"TEND"
+VERSION = 1
+
+# Magic, version, first game id
+SEGMENT_HEADER = struct.Struct(">4sBQ")
+# Kind, payload length, payload CRC-32
+RECORD_HEADER = struct.Struct(">BII")
+# Bytes of the mode in an index entry
+MODE_SIZE = 8
+# Game id, seed, score, end time, payload offset, payload length, mode
+ENTRY = struct.Struct(f">QIIIQI{MODE_SIZE}s")
+# Index offset, game count, index CRC-32, magic
+TRAILER = struct.Struct(">QII4s")
+
+# Record kinds
+REPLAY = 1
+INDEX = 2
+
+# Segments are sealed once appending would make them larger than this
+DEFAULT_SEGMENT_SIZE = 64 * 1024 * 1024
+
+# Directory (under the data directory) the game archives finished games in
+ARCHIVE_DIR = "archive"
+
+SEGMENT_SUFFIX = ".tarc"
+LOCK_FILE = ".lock"
+
+ArchiveEntry = collections.namedtuple(
+    "ArchiveEntry", "game_id seed mode score end_time segment offset length")
+
+def segment_name(first_id):
+    """Return the file name of the segment starting at ``first_id``."""
+    return f"{first_id:012d}{SEGMENT_SUFFIX}"
+
+def _segment_ids(directory):
+    """Return the first game ids of the segments in ``directory``, sorted."""
+    try:
+        names = os.listdir(directory)
+    except FileNotFoundError:
+        return []
+    return sorted(int(name[:-len(SEGMENT_SUFFIX)]) for name in names
+                  if name.endswith(SEGMENT_SUFFIX) and name[:-len(SEGMENT_SUFFIX)].isdigit())
+
+def _entry_fields(data, offset, length):
+    """Read seed, mode, score and end time from an encoded replay's header."""
+    _, version, seed, _, _, score, end_time, _ = REPLAY_HEADER.unpack_from(data, offset)
+    mode, _ = _read_text(data, offset + REPLAY_HEADER.size, version)
+    return seed, mode, score, end_time
+
+def _scan_records(data, offset, end):
+    """Yield ``(payload offset, payload length)`` of complete replay records.
+
+    Stops at the end of the data, at the index record or at a torn record.
+    """
+    while offset + RECORD_HEADER.size <= end:
+        kind, length, crc = RECORD_HEADER.unpack_from(data, offset)
+        start = offset + RECORD_HEADER.size
+        if kind != REPLAY or start + length > end:
+            return
+        if zlib.crc32(data[start:start + length]) != crc:
+            return
+        yield start, length
+        offset = start + length
+
+class Segment:
+    """Read-only view of one segment file."""
+
+    def __init__(self, path, first_id):
+        """Map the segment and read its index, or scan it if still open.
+
+        Args:
+            path (str): Segment file path
+            first_id (int): Id of the segment's first game
+        """
+        self.path = path
+        self.first_id = first_id
+        self.map = None
+        self.size = 0
+        self.sealed = False
+        # Unsealed segments: (seed, mode, score, end time, offset, length) per game
+        self.records = []
+        self.scanned = SEGMENT_HEADER.size
+        self.index = None
+        self.count = 0
+        self.refresh()
+
+    def refresh(self):
+        """Pick up records appended since the last refresh."""
+        if self.sealed:
+            return
+        size = os.path.getsize(self.path)
+        if size < SEGMENT_HEADER.size or size == self.size:
+            return
+        with open(self.path, "rb") as f:
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.size = len(self.map)
+        magic, version, first_id = SEGMENT_HEADER.unpack_from(self.map)
+        if magic != MAGIC or version != VERSION or first_id != self.first_id:
+            raise ValueError(f"{self.path} is not an archive segment")
+        if self._read_trailer():
+            return
+        for start, length in _scan_records(self.map, self.scanned, self.size):
+            self.records.append(_entry_fields(self.map, start, length) + (start, length))
+            self.scanned = start + length
+        self.count = len(self.records)
+
+    def _read_trailer(self):
+        """Load the footer index if the segment is sealed; return True if so."""
+        data = self.map
+        if self.size < SEGMENT_HEADER.size + TRAILER.size:
+            return False
+        index_offset, count, crc, magic = TRAILER.unpack_from(data, self.size - TRAILER.size)
+        if magic != END_MAGIC:
+            return False
+        start = index_offset + RECORD_HEADER.size
+        index = memoryview(data)[start:start + count * ENTRY.size]
+        if zlib.crc32(index) != crc:
+            raise ValueError(f"{self.path} has a corrupt index")
+        self.index = index
+        self.count = count
+        self.records = []
+        self.sealed = True
+        return True
+
+    def entry(self, position):
+        """Return the ArchiveEntry of the segment's ``position``-th game."""
+        if self.index is not None:
+            game_id, seed, score, end_time, offset, length, mode = ENTRY.unpack_from(
+                self.index, position * ENTRY.size)
+            mode = mode.rstrip(b"\0").decode("utf-8")
+            if not mode:
+                # Too long for the index
+                mode = _entry_fields(self.map, offset, length)[1]
+        else:
+            seed, mode, score, end_time, offset, length = self.records[position]
+            game_id = self.first_id + position
+        return ArchiveEntry(game_id, seed, mode, score, end_time, self, offset, length)
+
+    def entries(self):
+        """Yield the segment's entries in id order."""
+        for position in range(self.count):
+            yield self.entry(position)
+
+class ReplayArchive:
+    """Read-only, memory-mapped view of an archive directory."""
+
+    def __init__(self, directory):
+        """Open the archive.
+
+        Args:
+            directory (str): Archive directory
+        """
+        self.directory = directory
+        self.segments = []
+        self.first_ids = []
+        self.refresh()
+
+    def refresh(self):
+        """Pick up games and segments added by the writer since opening."""
+        known = len(self.segments)
+        # Only the newest segments can have grown; sealed ones return at once
+        for segment in self.segments:
+            segment.refresh()
+        for first_id in _segment_ids(self.directory)[known:]:
+            self.segments.append(Segment(os.path.join(self.directory, segment_name(first_id)), first_id))
+            self.first_ids.append(first_id)
+
+    def __len__(self):
+        return sum(segment.count for segment in self.segments)
+
+    def __iter__(self):
+        """Iterate over every game's ArchiveEntry in id order."""
+        for segment in self.segments:
+            yield from segment.entries()
+
+    def entry(self, game_id):
+        """Return the ArchiveEntry of ``game_id``.
+
+        Raises:
+            KeyError: If the archive has no such game
+        """
+        position = bisect.bisect_right(self.first_ids, game_id) - 1
+        if position >= 0:
+            segment = self.segments[position]
+            if game_id - segment.first_id < segment.count:
+                return segment.entry(game_id - segment.first_id)
+        raise KeyError(game_id)
+
+    def read(self, entry):
+        """Return a game's encoded replay as a memoryview of the mapped segment."""
+        return memoryview(entry.segment.map)[entry.offset:entry.offset + entry.length]
+
+    def load(self, entry):
+        """Decode a game's replay.
+
+        Args:
+            entry (ArchiveEntry or int): Entry or game id
+        """
+        if not isinstance(entry, ArchiveEntry):
+            entry = self.entry(entry)
+        with self.read(entry) as data:
+            return Replay.from_bytes(data)
+
+    def replays(self, mode=None):
+        """Yield ``(entry, Replay)`` for every game, optionally of one mode only."""
+        for entry in self:
+            if mode is None or entry.mode == mode:
+                yield entry, self.load(entry)
+
+class ArchiveWriter:
+    """The single appending writer of an archive directory."""
+
+    def __init__(self, directory, segment_size=DEFAULT_SEGMENT_SIZE):
+        """Open the archive for appending, creating it if needed.
+
+        A torn record left by a crash at the end of the newest segment is
+        truncated away.
+
+        Args:
+            directory (str): Archive directory
+            segment_size (int): Size in bytes at which a segment is sealed
+
+        Raises:
+            RuntimeError: If another writer has the archive open
+        """
+        self.directory = directory
+        self.segment_size = segment_size
+        os.makedirs(directory, exist_ok=True)
+        self._lock = open(os.path.join(directory, LOCK_FILE), "a")
+        if fcntl is not None:
+            try:
+                fcntl.flock(self._lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                self._lock.close()
+                raise RuntimeError(f"replay archive {directory} is open in another writer")
+        self.file = None
+        self.index = bytearray()
+        self.count = 0
+        self.first_id = 0
+        self.next_id = 0
+        ids = _segment_ids(directory)
+        if ids:
+            segment = Segment(os.path.join(directory, segment_name(ids[-1])), ids[-1])
+            self.next_id = segment.first_id + segment.count
+            if not segment.sealed:
+                self._resume(segment)
+
+    def _resume(self, segment):
+        """Continue appending to an unsealed segment."""
+        if segment.map is None:
+            # Created but never written: start it again
+            os.remove(segment.path)
+            return
+        for position in range(segment.count):
+            entry = segment.entry(position)
+            self._add_entry(entry.game_id, entry.seed, entry.mode, entry.score,
+                            entry.end_time, entry.offset, entry.length)
+        end = segment.scanned
+        segment.map.close()
+        self.file = open(segment.path, "r+b")
+        if os.path.getsize(segment.path) > end:
+            logger.warning("Truncating torn record at the end of %s", segment.path)
+            self.file.truncate(end)
+        self.file.seek(end)
+        self.first_id = segment.first_id
+
+    def _add_entry(self, game_id, seed, mode, score, end_time, offset, length):
+        """Add a game to the pending footer index."""
+        encoded = mode.encode("utf-8")
+        if len(encoded) > MODE_SIZE:
+            # Readers take it from the replay rather than a truncated copy
+            encoded = b""
+        self.index += ENTRY.pack(game_id, seed, score, end_time, offset, length, encoded)
+        self.count += 1
+
+    def _start_segment(self):
+        """Create a new segment starting at the next game id."""
+        self.first_id = self.next_id
+        self.index = bytearray()
+        self.count = 0
+        self.file = open(os.path.join(self.directory, segment_name(self.first_id)), "xb")
+        self.file.write(SEGMENT_HEADER.pack(MAGIC, VERSION, self.first_id))
+        self.file.flush()
+
+    def append(self, replay):
+        """Append a finished game's replay.
+
+        Args:
+            replay (Replay): Replay to store
+
+        Returns:
+            int: The game's id in the archive
+        """
+        payload = replay.to_bytes()
+        if (self.file is not None and self.count
+                and self.file.tell() + RECORD_HEADER.size + len(payload) > self.segment_size):
+            self.seal()
+        if self.file is None:
+            self._start_segment()
+        offset = self.file.tell() + RECORD_HEADER.size
+        self.file.write(RECORD_HEADER.pack(REPLAY, len(payload), zlib.crc32(payload)) + payload)
+        # Make the record visible to readers; durability is left to sync()
+        self.file.flush()
+        game_id = self.next_id
+        self._add_entry(game_id, replay.seed, replay.mode, replay.score, replay.end_time,
+                        offset, len(payload))
+        self.next_id += 1
+        return game_id
+
+    def sync(self):
+        """Flush appended games to disk."""
+        if self.file is not None:
+            os.fsync(self.file.fileno())
+
+    def seal(self):
+        """Write the current segment's index and trailer, and close it.
+
+        The next append starts a new segment.
+        """
+        if self.file is None:
+            return
+        index_offset = self.file.tell()
+        self.file.write(RECORD_HEADER.pack(INDEX, len(self.index), zlib.crc32(self.index)) + self.index)
+        self.file.write(TRAILER.pack(index_offset, self.count, zlib.crc32(self.index), END_MAGIC))
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.file.close()
+        self.file = None
+
+    def close(self, seal=False):
+        """Close the writer.
+
+        Args:
+            seal (bool): Seal the current segment; otherwise the next writer
+                keeps appending to it
+        """
+        if seal:
+            self.seal()
+        elif self.file is not None:
+            self.sync()
+            self.file.close()
+            self.file = None
+        self._lock.close()
@@ -0,0 +1,367 @@
+"""
+Module for game assets: fonts, images and sounds by name.
+
+Assets are named by their path relative to the asset directory, with
+forward slashes (``sounds/lock.wav``). They are read either from the loose
+files of that directory or from a bundle built from it: one file holding
+every asset, so startup opens one file instead of one per asset.
+
+The bundle is a header, an index, the names and the assets' bytes:
+
+    header  magic b"TAST", version, entry count, names size, data size
+    index   per entry, sorted by UTF-8 name: name offset and length in the
+            names, data offset and size
+    names   the UTF-8 names, one after another
+    data    asset contents, at the offsets of the index
+
+AssetBundle maps the file and reads only the header when opened, so
+opening costs the same whatever the number of assets. An asset is found by
+a binary search over the fixed-size index entries when it is first asked
+for; its bytes are read from the map, and decoded into a pygame object,
+the first time it is used, and the decoded object is cached. open_assets
+prefers the bundle next to the asset directory and falls back to the loose
+files.
+
+Usage:
+    python -m tetris.assets [--source DIR] [--output PATH]
+"""
+
+import abc
+import io
+import logging  # Import logging module for debugging
+import mmap
+import os
+import struct
+import tempfile
+
+# Initialize logger
+logger = logging.getLogger(__name__)
+
+MAGIC = b"TAST"
+VERSION = 2
+
+# Magic, version, entry count, names size, data size in bytes
+HEADER = struct.Struct(">4sBIIQ")
+# Name offset (in the names), name length, data offset (in the file), data size
+ENTRY = struct.Struct(">IHQI")
+
+# Loose asset files and the bundle built from them (next to the tetris package)
+ASSET_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "assets")
+BUNDLE_FILE = ASSET_DIR + ".bundle"
+
+class Assets(abc.ABC):
+    """Named assets with decoded objects cached on first use.
+
+    Subclasses provide the bytes of each asset (``names`` and ``data``, and
+    ``open`` if they can stream); decoding is shared.
+    """
+
+    def __init__(self):
+        # (kind, name, ...) -> decoded pygame object
+        self.cache = {}
+
+    def __contains__(self, name):
+        return name in self.names()
+
+    @abc.abstractmethod
+    def names(self):
+        """Return the set of asset names."""
+
+    @abc.abstractmethod
+    def data(self, name):
+        """Return the bytes of an asset.
+
+        Raises:
+            KeyError: If there is no such asset
+        """
+
+    def open(self, name):
+        """Return a binary file object reading an asset, for streaming."""
+        return io.BytesIO(self.data(name))
+
+    def _decoded(self, key, decode):
+        """Return the cached object for ``key``, decoding it on first use."""
+        value = self.cache.get(key)
+        if value is None:
+            value = self.cache[key] = decode()
+        return value
+
+    def font(self, name, size):
+        """Return the font ``name`` at ``size`` points."""
+        import pygame
+        return self._decoded(("font", name, size), lambda: pygame.font.Font(io.BytesIO(self.data(name)), size))
+
+    def image(self, name):
+        """Return the image ``name``, converted for the display once one is set."""
+        import pygame
+
+        def decode():
+            image = pygame.image.load(io.BytesIO(self.data(name)), name)
+            if pygame.display.get_surface() is not None:
+                image = image.convert_alpha()
+            return image
+        return self._decoded(("image", name), decode)
+
+    def sound(self, name):
+        """Return the decoded sound ``name``."""
+        import pygame
+        return self._decoded(("sound", name), lambda: pygame.mixer.Sound(file=io.BytesIO(self.data(name))))
+
+    def close(self):
+        """Drop the decoded objects."""
+        self.cache.clear()
+
+class AssetDirectory(Assets):
+    """Assets read from loose files."""
+
+    def __init__(self, root=ASSET_DIR):
+        """Use the files below ``root``; a missing directory holds no assets.
+
+        Args:
+            root (str): Asset directory
+        """
+        super().__init__()
+        self.root = root
+
+    def _path(self, name):
+        return os.path.join(self.root, *name.split("/"))
+
+    def __contains__(self, name):
+        return os.path.isfile(self._path(name))
+
+    def names(self):
+        return set(scan(self.root))
+
+    def data(self, name):
+        try:
+            with open(self._path(name), "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            raise KeyError(name) from None
+
+    def open(self, name):
+        try:
+            return open(self._path(name), "rb")
+        except FileNotFoundError:
+            raise KeyError(name) from None
+
+class _MapReader(io.RawIOBase):
+    """Seekable binary reader over a range of a mapped file."""
+
+    def __init__(self, data, start, size):
+        super().__init__()
+        self.mapped = data
+        self.start = start
+        self.size = size
+        self.position = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def readinto(self, buffer):
+        count = max(0, min(len(buffer), self.size - self.position))
+        start = self.start + self.position
+        buffer[:count] = self.mapped[start:start + count]
+        self.position += count
+        return count
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self.position, io.SEEK_END: self.size}[whence]
+        self.position = max(0, base + offset)
+        return self.position
+
+    def tell(self):
+        return self.position
+
+class AssetBundle(Assets):
+    """Assets read from a bundle file through mmap."""
+
+    def __init__(self, path):
+        """Map the bundle and read its index.
+
+        Args:
+            path (str): Bundle file
+
+        Raises:
+            ValueError: If the file is not a valid bundle
+        """
+        super().__init__()
+        self.path = path
+        with open(path, "rb") as f:
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if hasattr(mmap, "MADV_RANDOM"):
+            # Assets are read a few at a time from scattered offsets; don't
+            # read ahead of every page fault
+            self.map.madvise(mmap.MADV_RANDOM)
+        try:
+            magic, version, self.count, names_size, data_size = HEADER.unpack_from(self.map)
+            if magic != MAGIC or version != VERSION:
+                raise ValueError("bad magic or version")
+            self.names_start = HEADER.size + self.count * ENTRY.size
+            self.data_start = self.names_start + names_size
+            if self.data_start + data_size != len(self.map):
+                raise ValueError("size mismatch")
+        except (ValueError, struct.error) as e:
+            self.map.close()
+            raise ValueError(f"{path} is not an asset bundle: {e}") from None
+        # name -> (offset, size) of the assets looked up so far
+        self.index = {}
+        # Searches touch the index and names all over: start reading them in
+        # one request instead of a page at a time
+        self._prefetch(HEADER.size, self.data_start - HEADER.size)
+
+    def _prefetch(self, offset, size):
+        """Ask the kernel to start reading a range of the file, without waiting."""
+        if size > 0 and hasattr(mmap, "MADV_WILLNEED"):
+            start = offset - offset % mmap.PAGESIZE
+            self.map.madvise(mmap.MADV_WILLNEED, start, offset + size - start)
+
+    def _name(self, position):
+        """Return the UTF-8 name of the ``position``-th index entry."""
+        name_offset, name_length, _, _ = ENTRY.unpack_from(self.map, HEADER.size + position * ENTRY.size)
+        start = self.names_start + name_offset
+        return self.map[start:start + name_length]
+
+    def _find(self, name):
+        """Return ``(offset, size)`` of an asset, or None if there is none."""
+        found = self.index.get(name)
+        if found is not None:
+            return found
+        key = name.encode("utf-8")
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if self._name(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+        if low == self.count or self._name(low) != key:
+            return None
+        _, _, offset, size = ENTRY.unpack_from(self.map, HEADER.size + low * ENTRY.size)
+        if offset < self.data_start or offset + size > len(self.map):
+            raise ValueError(f"{self.path}: {name} is truncated")
+        found = self.index[name] = (offset, size)
+        return found
+
+    def _entry(self, name):
+        """Return ``(offset, size)`` of an asset; raise KeyError if there is none."""
+        found = self._find(name)
+        if found is None:
+            raise KeyError(name)
+        return found
+
+    def __contains__(self, name):
+        return self._find(name) is not None
+
+    def names(self):
+        return {self._name(position).decode("utf-8") for position in range(self.count)}
+
+    def data(self, name):
+        offset, size = self._entry(name)
+        # One read for the whole asset rather than a fault per page
+        self._prefetch(offset, size)
+        return self.map[offset:offset + size]
+
+    def open(self, name):
+        # Streams (music) read from the map as they play
+        offset, size = self._entry(name)
+        return io.BufferedReader(_MapReader(self.map, offset, size))
+
+    def close(self):
+        """Drop the decoded objects and unmap the file."""
+        super().close()
+        self.map.close()
+
+def scan(root):
+    """Return the sorted asset names of the files below ``root``."""
+    names = []
+    for directory, subdirectories, files in os.walk(root):
+        subdirectories.sort()
+        relative = os.path.relpath(directory, root)
+        for file_name in files:
+            if file_name.startswith("."):
+                continue
+            path = file_name if relative == "." else os.path.join(relative, file_name)
+            names.append(path.replace(os.sep, "/"))
+    return sorted(names)
+
+def build_bundle(source, path):
+    """Pack every file below ``source`` into a bundle at ``path`` atomically.
+
+    Args:
+        source (str): Asset directory
+        path (str): Bundle file to write
+
+    Returns:
+        int: Number of assets packed
+    """
+    # Sorted by encoded name, the order AssetBundle searches in
+    names = sorted(scan(source), key=lambda name: name.encode("utf-8"))
+    encoded = [name.encode("utf-8") for name in names]
+    sizes = [os.path.getsize(os.path.join(source, *name.split("/"))) for name in names]
+    names_size = sum(len(name) for name in encoded)
+    offset = HEADER.size + len(names) * ENTRY.size + names_size
+
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=".bundle")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(HEADER.pack(MAGIC, VERSION, len(names), names_size, sum(sizes)))
+            name_offset = 0
+            for name, size in zip(encoded, sizes):
+                f.write(ENTRY.pack(name_offset, len(name), offset, size))
+                name_offset += len(name)
+                offset += size
+            f.write(b"".join(encoded))
+            for name, size in zip(names, sizes):
+                with open(os.path.join(source, *name.split("/")), "rb") as asset:
+                    data = asset.read()
+                if len(data) != size:
+                    raise OSError(f"{name} changed while building the bundle")
+                f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+    return len(names)
+
+def open_assets(root=ASSET_DIR, bundle=None):
+    """Return the assets of ``root``: its bundle if built, else the loose files.
+
+    Args:
+        root (str): Asset directory
+        bundle (str, optional): Bundle file. Defaults to ``root + ".bundle"``.
+    """
+    bundle = bundle or root + ".bundle"
+    if os.path.exists(bundle):
+        try:
+            return AssetBundle(bundle)
+        except (OSError, ValueError) as e:
+            logger.warning("Ignoring asset bundle: %s", e)
+    return AssetDirectory(root)
+
+def main(argv=None):
+    """Build the asset bundle from the command line."""
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Pack the Tetris assets into one bundle file.")
+    parser.add_argument("--source", default=ASSET_DIR, help="asset directory")
+    parser.add_argument("--output", default=None, help="bundle file (default: SOURCE.bundle)")
+    args = parser.parse_args(argv)
+
+    output = args.output or os.path.normpath(args.source) + ".bundle"
+    start = time.perf_counter()
+    count = build_bundle(args.source, output)
+    print(f"Packed {count} assets into {output} in {time.perf_counter() - start:.2f}s "
+          f"({os.path.getsize(output)} bytes)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,245 @@
+"""
+Module for sound effects and music.
+
+Effects are decoded once, when Audio is created, into a cache of
+pygame.mixer.Sound objects, and each effect plays on a mixer channel
+reserved for it. A trigger only hands an already decoded buffer to SDL's
+mixer thread and returns, so it never waits on the disk or the decoder, and
+a repeated effect (auto-repeated moves) restarts on its own channel instead
+of piling up. Music streams from disk through pygame.mixer.music.
+
+Volumes come from the settings: effects read ``sfx_volume`` on every
+trigger, and ``update`` applies ``music_volume`` once per frame when it
+changed, so both follow the settings live.
+
+Effects come from the game assets (``sounds/<name>.wav`` or ``.ogg``, see
+tetris.assets) when present; missing ones are synthesized as short tones.
+Music plays from the MUSIC asset if there is one. Without an audio device
+Audio does nothing.
+"""
+
+import array
+import logging  # Import logging module for debugging
+import math
+import pygame
+from .assets import open_assets
+from .constants import GameEvent
+
+# Initialize logger
+logger = logging.getLogger(__name__)
+
+# Asset names of the effects (with one of the extensions) and the music
+SOUND_PREFIX = "sounds/"
+SOUND_EXTENSIONS = (".wav", ".ogg")
+MUSIC = "music/theme.ogg"
+
+# Mixer setup: 44.1 kHz, signed 16-bit stereo, and a short buffer so an
+# effect starts within about 12 ms of its trigger
+FREQUENCY = 44100
+SAMPLE_SIZE = -16
+CHANNELS = 2
+BUFFER_SAMPLES = 512
+
+# Built-in effects: (frequencies in Hz played in sequence, ms per note)
+EFFECTS = {
+    "move": ((880,), 25),
+    "rotate": ((1320,), 35),
+    "lock": ((220,), 60),
+    "clear": ((523, 659, 784, 1047), 50),
+    "game_over": ((392, 330, 262, 196), 150),
+}
+
+# array typecode and peak amplitude per mixer sample size
+_SAMPLE_FORMATS = {
+    8: ('B', 127),
+    -8: ('b', 127),
+    16: ('H', 32767),
+    -16: ('h', 32767),
+    32: ('f', 1.0),
+}
+
+def init_mixer():
+    """Request the low-latency mixer setup; call before pygame.init()."""
+    pygame.mixer.pre_init(FREQUENCY, SAMPLE_SIZE, CHANNELS, BUFFER_SAMPLES)
+
+def synthesize(frequencies, note_ms, mixer_format):
+    """Return the raw samples of a tone sequence in the mixer's format.
+
+    Args:
+        frequencies (tuple): Note frequencies in Hz, played in sequence
+        note_ms (int): Length of each note in ms
+        mixer_format (tuple): (frequency, size, channels) from pygame.mixer.get_init()
+
+    Returns:
+        array: Interleaved samples, or None if the sample size is unsupported
+    """
+    rate, size, channels = mixer_format
+    if size not in _SAMPLE_FORMATS:
+        return None
+    typecode, peak = _SAMPLE_FORMATS[size]
+    # Unsigned formats are centred on the peak
+    centre = peak if typecode in 'BH' else 0
+    samples = array.array(typecode)
+    length = rate * note_ms // 1000
+    for frequency in frequencies:
+        step = 2 * math.pi * frequency / rate
+        for i in range(length):
+            # Sine with a linear fade-out to avoid clicks
+            value = 0.3 * math.sin(step * i) * (1 - i / length)
+            sample = centre + value * peak
+            samples.extend([sample if typecode == 'f' else int(sample)] * channels)
+    return samples
+
+class Audio:
+    """Sound effects and music for a game."""
+
+    def __init__(self, settings, assets=None, music=MUSIC):
+        """Open the mixer and decode every effect.
+
+        Args:
+            settings (Settings): Source of ``music_volume`` and ``sfx_volume``
+            assets (Assets, optional): Effect files overriding the built-in
+                tones, and the music. Defaults to open_assets(), which close
+                also closes; assets passed in stay open.
+            music (str): Asset name of the music streamed while a game is played
+        """
+        self.settings = settings
+        # Close the assets only if they were opened here
+        self._owns_assets = assets is None
+        self.assets = open_assets() if assets is None else assets
+        self.music = music
+        self.sounds = {}
+        self.channels = {}
+        self.game = None
+        # Last piece position seen, to tell moves and rotations from gravity
+        self._piece = None
+        self._music_volume = None
+        try:
+            if not pygame.mixer.get_init():
+                pygame.mixer.init(FREQUENCY, SAMPLE_SIZE, CHANNELS, BUFFER_SAMPLES)
+        except pygame.error as e:
+            logger.warning("Audio disabled: %s", e)
+            self.enabled = False
+            return
+        self.enabled = True
+        mixer_format = pygame.mixer.get_init()
+        # Reserve one channel per effect; other sounds can't take them
+        if pygame.mixer.get_num_channels() < len(EFFECTS):
+            pygame.mixer.set_num_channels(len(EFFECTS))
+        pygame.mixer.set_reserved(len(EFFECTS))
+        for index, (name, (frequencies, note_ms)) in enumerate(EFFECTS.items()):
+            sound = self._load(name)
+            if sound is None:
+                samples = synthesize(frequencies, note_ms, mixer_format)
+                if samples is None:
+                    continue
+                sound = pygame.mixer.Sound(buffer=samples)
+            self.sounds[name] = sound
+            self.channels[name] = pygame.mixer.Channel(index)
+
+    def _load(self, name):
+        """Return the decoded effect asset for ``name``, or None if there is none."""
+        for extension in SOUND_EXTENSIONS:
+            asset = SOUND_PREFIX + name + extension
+            if asset in self.assets:
+                try:
+                    return self.assets.sound(asset)
+                except pygame.error as e:
+                    logger.warning("Can't load sound %s: %s", asset, e)
+        return None
+
+    def play(self, name):
+        """Start an effect at the current effects volume and return immediately.
+
+        Args:
+            name (str): Effect name (see EFFECTS)
+        """
+        sound = self.sounds.get(name)
+        if sound is None:
+            return
+        channel = self.channels[name]
+        channel.set_volume(self.settings.sfx_volume)
+        channel.play(sound)
+
+    def attach(self, game):
+        """Play the effects of ``game``'s events until detached.
+
+        Args:
+            game (GameEngine): Game to play sounds for
+        """
+        self.detach()
+        if not self.enabled:
+            return
+        self.game = game
+        self._piece = None
+        game.add_listener(self.on_event)
+
+    def detach(self):
+        """Stop playing the attached game's effects."""
+        if self.game is not None:
+            self.game.remove_listener(self.on_event)
+            self.game = None
+
+    def on_event(self, event, *args):
+        """Play the effect of a game event."""
+        if event == GameEvent.MOVE:
+            piece = args[0]
+            last = self._piece
+            self._piece = (piece, piece.x, piece.shape)
+            # Gravity and soft drops only change y and stay silent
+            if last is None or last[0] is not piece:
+                return
+            if last[2] is not piece.shape:
+                self.play("rotate")
+            elif last[1] != piece.x:
+                self.play("move")
+        elif event == GameEvent.SPAWN:
+            piece = args[0]
+            self._piece = (piece, piece.x, piece.shape)
+        elif event == GameEvent.LOCK:
+            self.play("lock")
+        elif event == GameEvent.CLEAR:
+            self.play("clear")
+        elif event == GameEvent.GAME_OVER:
+            self.play("game_over")
+            self.stop_music()
+        elif event == GameEvent.RESET:
+            # Restarted after a game over
+            self.play_music()
+
+    def play_music(self):
+        """Stream the music in a loop, if there is any."""
+        if not self.enabled or self.music not in self.assets:
+            return
+        try:
+            # The stream reads the asset as it plays (see Assets.open)
+            pygame.mixer.music.load(self.assets.open(self.music), self.music)
+        except pygame.error as e:
+            logger.warning("Can't load music %s: %s", self.music, e)
+            return
+        self._music_volume = None
+        self.update()
+        pygame.mixer.music.play(loops=-1)
+
+    def stop_music(self, fade_ms=500):
+        """Fade the music out without waiting for the fade."""
+        if self.enabled:
+            pygame.mixer.music.fadeout(fade_ms)
+
+    def update(self):
+        """Apply a changed music volume; call once per frame."""
+        if self.enabled and self.settings.music_volume != self._music_volume:
+            self._music_volume = self.settings.music_volume
+            pygame.mixer.music.set_volume(self._music_volume)
+
+    def close(self):
+        """Detach, stop all sound and close the assets Audio opened itself."""
+        self.detach()
+        if self.enabled:
+            pygame.mixer.music.stop()
+            # Release the music stream before its assets are closed
+            pygame.mixer.music.unload()
+            pygame.mixer.stop()
+        if self._owns_assets:
+            self.assets.close()
+            self._owns_assets = False
@@ -0,0 +1,283 @@
+"""
+Module for the playfield (board) storage.
+
+The board keeps one byte per cell holding the piece-type id of the block in
+it (0 for empty) in a single bytearray, rather than a list of lists of RGB
+tuples. A standard 10x20 board is about 200 bytes of cell data, which keeps
+large numbers of boards (AI search, batch simulation) cheap.
+
+The rows form a circular buffer: ``offset`` is the row of ``cells`` holding
+row 0 (the top) of the board, and row ``y`` starts at ``row_start(y)``.
+Pushing garbage rows in from the bottom moves the offset and overwrites the
+rows leaving at the top, and clearing lines moves whichever side of the
+cleared rows is shorter, so both cost the rows changed rather than the
+height of the board. Code that needs the rows in order reads ``linear()``.
+"""
+
+from .constants import PALETTE, COLOR_IDS
+
+class BoardRow:
+    """View of one board row exposing cells as colors (None when empty).
+
+    This keeps ``grid[y][x]`` usable by code that works with colors; the
+    game rules themselves read ``Board.cells`` directly.
+    """
+
+    __slots__ = ("board", "start")
+
+    def __init__(self, board, y):
+        """Initialize the view.
+
+        Args:
+            board (Board): Board the row belongs to
+            y (int): Row index
+        """
+        self.board = board
+        self.start = board.row_start(y)
+
+    def __len__(self):
+        return self.board.width
+
+    def __getitem__(self, x):
+        if not 0 <= x < self.board.width:
+            raise IndexError("board column out of range")
+        return PALETTE[self.board.cells[self.start + x]]
+
+    def __setitem__(self, x, value):
+        if not 0 <= x < self.board.width:
+            raise IndexError("board column out of range")
+        self.board.cells[self.start + x] = _cell_id(value)
+
+    def __iter__(self):
+        cells = self.board.cells
+        for i in range(self.start, self.start + self.board.width):
+            yield PALETTE[cells[i]]
+
+def _cell_id(value):
+    """Convert None, a piece-type id or a color into a cell id."""
+    if value is None:
+        return 0
+    if isinstance(value, int):
+        return value
+    return COLOR_IDS[tuple(value)]
+
+class Board:
+    """Playfield storing a one-byte piece-type id per cell."""
+
+    __slots__ = ("width", "height", "cells", "offset")
+
+    def __init__(self, width, height):
+        """Initialize an empty board.
+
+        Args:
+            width (int): Number of columns
+            height (int): Number of rows
+        """
+        self.width = width
+        self.height = height
+        self.cells = bytearray(width * height)
+        # Row of ``cells`` holding the top row of the board
+        self.offset = 0
+
+    def __len__(self):
+        return self.height
+
+    def __getitem__(self, y):
+        if not 0 <= y < self.height:
+            raise IndexError("board row out of range")
+        return BoardRow(self, y)
+
+    def __iter__(self):
+        for y in range(self.height):
+            yield BoardRow(self, y)
+
+    def row_start(self, y):
+        """Return the index in ``cells`` of the first cell of row ``y``."""
+        y += self.offset
+        if y >= self.height:
+            y -= self.height
+        return y * self.width
+
+    def get(self, x, y):
+        """Return the piece-type id at (x, y); 0 if empty."""
+        return self.cells[self.row_start(y) + x]
+
+    def set(self, x, y, kind):
+        """Store piece-type id ``kind`` at (x, y)."""
+        self.cells[self.row_start(y) + x] = kind
+
+    def linear(self, top=0, stop=None):
+        """Return rows ``top`` to ``stop`` (exclusive) as row-major bytes.
+
+        Args:
+            top (int): First row
+            stop (int, optional): Row to stop at. Defaults to the height.
+        """
+        if stop is None:
+            stop = self.height
+        if stop <= top:
+            return b""
+        cells = self.cells
+        size = len(cells)
+        start = (self.offset + top) * self.width
+        end = (self.offset + stop) * self.width
+        if end <= size:
+            return bytes(cells[start:end])
+        if start >= size:
+            return bytes(cells[start - size:end - size])
+        return bytes(cells[start:] + cells[:end - size])
+
+    def load(self, cells):
+        """Replace the contents with row-major bytes such as linear() returns."""
+        self.cells[:] = cells
+        self.offset = 0
+
+    def column(self, x):
+        """Return column ``x`` top to bottom as bytes of piece-type ids."""
+        column = self.cells[x::self.width]
+        return bytes(column[self.offset:] + column[:self.offset])
+
+    def first_filled(self, x, top, stop):
+        """Return the first row from ``top`` to ``stop - 1`` filled in column ``x``.
+
+        The column is read as at most two strided slices (either side of the
+        row storage's wrap), so the search runs in C rather than per cell.
+
+        Args:
+            x (int): Column index
+            top (int): First row to look at
+            stop (int): Row after the last one to look at
+
+        Returns:
+            int: Row of the first filled cell, or ``stop`` if there is none
+        """
+        if stop <= top:
+            return stop
+        width = self.width
+        cells = self.cells
+        start = top + self.offset
+        if start >= self.height:
+            start -= self.height
+        count = stop - top
+        first = min(count, self.height - start)
+        segments = [cells[start * width + x:(start + first - 1) * width + x + 1:width]]
+        if count > first:
+            segments.append(cells[x:(count - first - 1) * width + x + 1:width])
+        row = top
+        for segment in segments:
+            empty = len(segment) - len(segment.lstrip(b"\x00"))
+            if empty < len(segment):
+                return row + empty
+            row += len(segment)
+        return stop
+
+    def clear(self):
+        """Empty every cell."""
+        self.cells[:] = bytes(len(self.cells))
+        self.offset = 0
+
+    def copy(self):
+        """Return an independent copy of the board."""
+        board = Board.__new__(Board)
+        board.width = self.width
+        board.height = self.height
+        board.cells = bytearray(self.cells)
+        board.offset = self.offset
+        return board
+
+    def row_is_full(self, y):
+        """Return True if every cell of row ``y`` is filled."""
+        start = self.row_start(y)
+        return self.cells.find(0, start, start + self.width) == -1
+
+    def row_is_empty(self, y):
+        """Return True if no cell of row ``y`` is filled."""
+        start = self.row_start(y)
+        return not any(self.cells[start:start + self.width])
+
+    def _move_row(self, source, target):
+        """Copy row ``source`` over row ``target``."""
+        width = self.width
+        start = self.row_start(source)
+        end = self.row_start(target)
+        self.cells[end:end + width] = self.cells[start:start + width]
+
+    def _empty_rows(self, top, stop):
+        """Empty rows ``top`` to ``stop`` (exclusive)."""
+        empty = bytes(self.width)
+        for y in range(top, stop):
+            start = self.row_start(y)
+            self.cells[start:start + self.width] = empty
+
+    def clear_rows(self, rows):
+        """Remove those of ``rows`` that are full, shifting the rows above down.
+
+        Only the given rows are tested, so clearing after a lock costs the
+        height of the piece rather than the height of the board. Either the
+        rows above the cleared rows move down, or the rows below them move up
+        and the offset turns the board so the rows above end up lower; the
+        side with fewer rows is moved.
+
+        Args:
+            rows (iterable): Candidate row indices
+
+        Returns:
+            int: Number of rows removed
+        """
+        full = sorted(y for y in set(rows) if 0 <= y < self.height and self.row_is_full(y))
+        if not full:
+            return 0
+        count = len(full)
+        removed = set(full)
+        if full[-1] <= self.height - full[0]:
+            # Move the rows above down, from the bottom up
+            target = full[-1]
+            for y in range(full[-1] - 1, -1, -1):
+                if y not in removed:
+                    self._move_row(y, target)
+                    target -= 1
+        else:
+            # Move the rows below up, then turn the board down by ``count``
+            target = full[0]
+            for y in range(full[0] + 1, self.height):
+                if y not in removed:
+                    self._move_row(y, target)
+                    target += 1
+            self.offset = (self.offset - count) % self.height
+        self._empty_rows(0, count)
+        return count
+
+    def clear_full_rows(self):
+        """Remove every full row, shifting the rows above them down.
+
+        Returns:
+            int: Number of rows removed
+        """
+        return self.clear_rows(range(self.height))
+
+    def push_rows(self, rows):
+        """Insert rows at the bottom, pushing the rest of the board up.
+
+        As many rows leave at the top as enter at the bottom; only their
+        storage is rewritten.
+
+        Args:
+            rows (list): Row contents, ``width`` bytes of piece-type ids each
+
+        Returns:
+            bool: True if a block was pushed off the top of the board
+        """
+        count = len(rows)
+        if not count:
+            return False
+        if count > self.height:
+            raise ValueError("cannot push more rows than the board has")
+        overflow = any(not self.row_is_empty(y) for y in range(count))
+        self.offset = (self.offset + count) % self.height
+        width = self.width
+        for y, row in enumerate(rows, self.height - count):
+            if len(row) != width:
+                raise ValueError("pushed rows must be one board width long")
+            start = self.row_start(y)
+            self.cells[start:start + width] = row
+        return overflow
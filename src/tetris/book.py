@@ -0,0 +1,201 @@
+"""
+Module for the opening book: precomputed placements for the first pieces.
+
+Every game starts from the empty board, so the first few positions repeat
+from game to game. The book maps (board hash, current piece, preview piece)
+to the placement the bot's search would choose, for every position reachable
+from the empty board by following the book for ``depth`` pieces.
+
+The file is a header followed by fixed-size records sorted by key:
+
+    header  magic b"TBOK", version, board width, board height, depth, count
+    record  board hash (8 bytes), piece id, preview id, rotation, x
+
+OpeningBook maps the file on first lookup and binary-searches the records
+in place, so loading costs nothing until the book is used and lookups never
+read the whole table.
+
+Usage:
+    python -m tetris.book [--depth 3] [--output PATH]
+"""
+
+import hashlib
+import logging  # Import logging module for debugging
+import mmap
+import os
+import struct
+import tempfile
+from .bot import best_placement, place, WEIGHTS
+from .constants import SCREEN_DIMENSIONS
+
+# Initialize logger
+logger = logging.getLogger(__name__)
+
+MAGIC = b"TBOK"
+VERSION = 1
+
+# Magic, version, width, height, depth, record count
+HEADER = struct.Struct(">4sBHHBI")
+# Board hash, piece id, preview id, rotation, x
+RECORD = struct.Struct(">QBBBH")
+# Records are sorted by their first KEY_SIZE bytes
+KEY_SIZE = 10
+KEY = struct.Struct(">QBB")
+
+# Default book file name (in the data directory)
+BOOK_FILE = "opening_book.bin"
+
+# Pieces of the book, by piece-type id
+PIECES = range(1, 8)
+
+def board_hash(cells):
+    """Return a stable 64-bit hash of occupancy bytes."""
+    return int.from_bytes(hashlib.blake2b(cells, digest_size=8).digest(), "big")
+
+def generate(width=None, height=None, depth=3, weights=WEIGHTS):
+    """Compute the book's records.
+
+    Positions are expanded breadth first: each position (board, piece) is
+    looked up with every possible preview, and the board after the chosen
+    placement becomes a position with the preview as its piece.
+
+    Args:
+        width (int, optional): Board columns. Defaults to SCREEN_DIMENSIONS.
+        height (int, optional): Board rows. Defaults to SCREEN_DIMENSIONS.
+        depth (int): Pieces covered from the empty board
+        weights (tuple): Evaluation weights of the search
+
+    Returns:
+        list: Sorted ``(hash, piece, preview, rotation, x)`` tuples
+    """
+    width = width or SCREEN_DIMENSIONS['GRID_WIDTH']
+    height = height or SCREEN_DIMENSIONS['GRID_HEIGHT']
+    records = {}
+    positions = {(bytes(width * height), piece) for piece in PIECES}
+    for ply in range(depth):
+        following = set()
+        for cells, piece in positions:
+            key = board_hash(cells)
+            for preview in PIECES:
+                if (key, piece, preview) in records:
+                    continue
+                placement = best_placement(cells, width, height, piece, preview, weights)
+                if placement is None:
+                    continue
+                records[(key, piece, preview)] = placement
+                after, _ = place(cells, width, height, piece, *placement)
+                following.add((after, preview))
+        logger.info("Book ply %d: %d positions, %d records", ply + 1, len(positions), len(records))
+        positions = following
+    return sorted(key + placement for key, placement in records.items())
+
+def write_book(path, records, width, height, depth):
+    """Write records from generate to ``path`` atomically."""
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=".bin")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(HEADER.pack(MAGIC, VERSION, width, height, depth, len(records)))
+            for record in records:
+                f.write(RECORD.pack(*record))
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+class OpeningBook:
+    """Read-only opening book, mapped lazily from its file."""
+
+    def __init__(self, path):
+        """Remember the book's path; nothing is read until the first lookup.
+
+        Args:
+            path (str): Book file
+        """
+        self.path = path
+        self.map = None
+        self.width = self.height = self.depth = self.count = None
+
+    def _open(self):
+        """Map the file and read its header."""
+        with open(self.path, "rb") as f:
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.width, self.height, self.depth, self.count = HEADER.unpack_from(self.map)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{self.path} is not an opening book")
+        if len(self.map) < HEADER.size + self.count * RECORD.size:
+            raise ValueError(f"{self.path} is truncated")
+
+    def __len__(self):
+        if self.map is None:
+            self._open()
+        return self.count
+
+    def lookup(self, cells, width, height, piece, preview):
+        """Return the book's ``(rotation, x)`` for a position, or None.
+
+        Args:
+            cells (bytes): Occupancy bytes of the board (see bot.occupancy)
+            width (int): Board columns
+            height (int): Board rows
+            piece (int): Piece-type id to place
+            preview (int): Piece-type id of the next piece
+        """
+        if self.map is None:
+            self._open()
+        if (width, height) != (self.width, self.height):
+            return None
+        key = KEY.pack(board_hash(cells), piece, preview)
+        data = self.map
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            start = HEADER.size + middle * RECORD.size
+            if data[start:start + KEY_SIZE] < key:
+                low = middle + 1
+            else:
+                high = middle
+        start = HEADER.size + low * RECORD.size
+        if low < self.count and data[start:start + KEY_SIZE] == key:
+            _, _, _, rotation, x = RECORD.unpack_from(data, start)
+            return rotation, x
+        return None
+
+    def close(self):
+        """Unmap the file."""
+        if self.map is not None:
+            self.map.close()
+            self.map = None
+
+def load_book(path=None):
+    """Return the OpeningBook at ``path`` (default: the data directory), or None if missing."""
+    if path is None:
+        from .storage import data_path
+        path = data_path(BOOK_FILE)
+    return OpeningBook(path) if os.path.exists(path) else None
+
+def main(argv=None):
+    """Generate the opening book from the command line."""
+    import argparse
+    import time
+    from .storage import data_path
+
+    parser = argparse.ArgumentParser(description="Generate the Tetris opening book.")
+    parser.add_argument("--depth", type=int, default=3, help="pieces covered from the empty board")
+    parser.add_argument("--width", type=int, default=SCREEN_DIMENSIONS['GRID_WIDTH'], help="board columns")
+    parser.add_argument("--height", type=int, default=SCREEN_DIMENSIONS['GRID_HEIGHT'], help="board rows")
+    parser.add_argument("--output", default=data_path(BOOK_FILE), help="book file")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    records = generate(args.width, args.height, args.depth)
+    write_book(args.output, records, args.width, args.height, args.depth)
+    print(f"Wrote {len(records)} positions to {args.output} in {time.perf_counter() - start:.1f}s "
+          f"({os.path.getsize(args.output)} bytes)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,235 @@
+"""
+Module for a heuristic bot that chooses where to place pieces.
+
+A placement is ``(rotation, x)``: the spawned piece rotated ``rotation``
+times clockwise with its left edge at column ``x``, hard-dropped straight
+down (the same placements as TetrisEnv's actions). The bot tries every
+distinct placement of the current piece and scores the resulting board with
+a weighted sum of aggregate height, holes, bumpiness and lines cleared.
+With the preview piece it also tries the preview's placements on the best
+few boards (a beam) and keeps the first placement of the best pair.
+
+Boards are searched as occupancy bytes (one 0/1 byte per cell, row-major),
+so trying a placement is a few byte-string operations. When an opening book
+is given and knows the position, its placement is used without searching.
+"""
+
+import logging  # Import logging module for debugging
+from .constants import SHAPES
+from .tetrimino import rotate_shape
+
+# Initialize logger
+logger = logging.getLogger(__name__)
+
+# Evaluation weights: aggregate height, lines cleared, holes, bumpiness
+WEIGHTS = (-0.510066, 0.760666, -0.35663, -0.184483)
+
+# Boards after the current piece that the preview piece is tried on
+BEAM_WIDTH = 8
+
+# Translation table mapping every piece-type id to 1 (filled)
+_FILLED = bytes([0] + [1] * 255)
+
+def occupancy(board):
+    """Return the board as row-major 0/1 bytes."""
+    return board.linear().translate(_FILLED)
+
+def _piece_rotations():
+    """Return, per piece-type id, the distinct rotations of the piece.
+
+    Each rotation is ``(rotation, width, height, cells, bottoms)`` where
+    ``cells`` are the (dx, dy) offsets of its blocks and ``bottoms`` the
+    lowest dy of each of its columns.
+    """
+    rotations = [None]
+    for info in SHAPES:
+        shapes = []
+        seen = set()
+        shape = info['shape']
+        for rotation in range(4):
+            key = tuple(map(tuple, shape))
+            if key not in seen:
+                seen.add(key)
+                cells = [(dx, dy) for dy, row in enumerate(shape) for dx, cell in enumerate(row) if cell]
+                bottoms = [max(dy for dx, dy in cells if dx == column) for column in range(len(shape[0]))]
+                shapes.append((rotation, len(shape[0]), len(shape), cells, bottoms))
+            shape = rotate_shape(shape)
+        rotations.append(shapes)
+    return rotations
+
+# Distinct rotations by piece-type id
+ROTATIONS = _piece_rotations()
+
+def column_tops(cells, width, height):
+    """Return the row of the highest block of each column (``height`` if empty)."""
+    tops = []
+    for x in range(width):
+        top = cells[x::width].find(1)
+        tops.append(height if top < 0 else top)
+    return tops
+
+def _drop(cells, width, tops, piece, x):
+    """Drop one rotation of a piece at column ``x``; see place."""
+    _, _, piece_height, piece_cells, bottoms = piece
+    y = min(tops[x + dx] - 1 - bottom for dx, bottom in enumerate(bottoms))
+    if y < 0:
+        return None
+    board = bytearray(cells)
+    for dx, dy in piece_cells:
+        board[(y + dy) * width + x + dx] = 1
+    full = [row for row in range(y, y + piece_height) if board.find(0, row * width, (row + 1) * width) == -1]
+    if full:
+        for row in reversed(full):
+            del board[row * width:(row + 1) * width]
+        board[:0] = bytes(width * len(full))
+    return bytes(board), len(full)
+
+def place(cells, width, height, kind, rotation, x, tops=None):
+    """Drop a piece straight down and clear full rows.
+
+    Args:
+        cells (bytes): Occupancy bytes
+        width (int): Board columns
+        height (int): Board rows
+        kind (int): Piece-type id
+        rotation (int): Clockwise rotations from the spawn orientation
+        x (int): Column of the piece's left edge
+        tops (list, optional): column_tops of ``cells``, if already known
+
+    Returns:
+        tuple: (new occupancy bytes, lines cleared), or None if the piece
+        does not fit on the board
+    """
+    for piece in ROTATIONS[kind]:
+        if piece[0] == rotation % 4:
+            break
+    else:
+        raise ValueError(f"rotation {rotation} repeats another rotation of piece {kind}")
+    if not 0 <= x <= width - piece[1]:
+        return None
+    if tops is None:
+        tops = column_tops(cells, width, height)
+    return _drop(cells, width, tops, piece, x)
+
+def evaluate(cells, width, height, lines, weights=WEIGHTS):
+    """Score a board; higher is better.
+
+    Args:
+        cells (bytes): Occupancy bytes
+        width (int): Board columns
+        height (int): Board rows
+        lines (int): Lines cleared on the way to this board
+        weights (tuple): Weights of aggregate height, lines, holes, bumpiness
+    """
+    aggregate = holes = bumpiness = 0
+    previous = None
+    for x in range(width):
+        column = cells[x::width]
+        top = column.find(1)
+        if top < 0:
+            column_height = 0
+        else:
+            column_height = height - top
+            holes += column.count(0, top)
+        aggregate += column_height
+        if previous is not None:
+            bumpiness += abs(column_height - previous)
+        previous = column_height
+    height_weight, lines_weight, holes_weight, bumpiness_weight = weights
+    return (height_weight * aggregate + lines_weight * lines
+            + holes_weight * holes + bumpiness_weight * bumpiness)
+
+def placements(cells, width, height, kind):
+    """Yield ``(rotation, x, new cells, lines cleared)`` for every placement that fits."""
+    tops = column_tops(cells, width, height)
+    for piece in ROTATIONS[kind]:
+        for x in range(width - piece[1] + 1):
+            result = _drop(cells, width, tops, piece, x)
+            if result is not None:
+                yield piece[0], x, result[0], result[1]
+
+def best_placement(cells, width, height, kind, preview=None, weights=WEIGHTS, beam=BEAM_WIDTH):
+    """Return the best ``(rotation, x)`` for a piece, or None if none fits.
+
+    Args:
+        cells (bytes): Occupancy bytes
+        width (int): Board columns
+        height (int): Board rows
+        kind (int): Piece-type id to place
+        preview (int, optional): Piece-type id of the next piece
+        weights (tuple): Evaluation weights (see evaluate)
+        beam (int): Boards the preview piece is tried on
+    """
+    scored = [(evaluate(after, width, height, lines, weights), rotation, x, after, lines)
+              for rotation, x, after, lines in placements(cells, width, height, kind)]
+    if not scored:
+        return None
+    # Ties go to the lowest rotation, then the leftmost column
+    scored.sort(key=lambda item: (-item[0], item[1], item[2]))
+    if preview is None:
+        return scored[0][1], scored[0][2]
+    best = None
+    for score, rotation, x, after, lines in scored[:beam]:
+        value = max((evaluate(final, width, height, lines + more, weights)
+                     for _, _, final, more in placements(after, width, height, preview)),
+                    default=score - 1000)
+        if best is None or value > best[0]:
+            best = (value, rotation, x)
+    return best[1], best[2]
+
+def apply_placement(engine, rotation, x):
+    """Rotate, move and hard-drop the engine's current piece."""
+    piece = engine.current_piece
+    shape = piece.shape
+    for _ in range(rotation):
+        shape = rotate_shape(shape)
+    piece.shape = shape
+    piece.x = min(x, engine.grid.width - len(shape[0]))
+    if engine.check_collision():
+        engine.end_game()
+    else:
+        engine.hard_drop()
+
+class Bot:
+    """Plays a GameEngine one piece at a time."""
+
+    def __init__(self, book=None, weights=WEIGHTS, lookahead=True):
+        """Initialize the bot.
+
+        Args:
+            book (OpeningBook, optional): Book consulted before searching
+            weights (tuple): Evaluation weights (see evaluate)
+            lookahead (bool): Use the preview piece in the search
+        """
+        self.book = book
+        self.weights = weights
+        self.lookahead = lookahead
+        self.book_hits = 0
+        self.searches = 0
+
+    def choose(self, engine):
+        """Return the ``(rotation, x)`` for the engine's current piece, or None."""
+        grid = engine.grid
+        kind = engine.current_piece.kind
+        preview = engine.next_shape['id'] if self.lookahead and engine.next_shape else None
+        cells = occupancy(grid)
+        if self.book is not None and preview is not None:
+            placement = self.book.lookup(cells, grid.width, grid.height, kind, preview)
+            if placement is not None:
+                self.book_hits += 1
+                return placement
+        self.searches += 1
+        return best_placement(cells, grid.width, grid.height, kind, preview, self.weights)
+
+    def play(self, engine):
+        """Place the engine's current piece; end the game if nothing fits.
+
+        Returns:
+            tuple: The placement used, or None
+        """
+        placement = self.choose(engine)
+        if placement is None:
+            engine.end_game()
+        else:
+            apply_placement(engine, *placement)
+        return placement
@@ -0,0 +1,447 @@
+"""
+Module for broadcasting a running game to many viewers.
+
+A BroadcastPublisher listens to a game's events (see GameEngine.add_listener)
+and encodes each one once into a compact binary frame. A BroadcastRelay fans
+the frames out to any number of TCP subscribers from a single shared log:
+each subscriber only holds a read position into it, so the cost of an event
+does not depend on the number of viewers. The relay never blocks; pump() is
+called once per frame from the game loop, sends whatever each socket will
+take, and drops subscribers that fall more than ``max_lag`` bytes behind.
+New subscribers first receive a keyframe (full board snapshot), then deltas.
+
+BroadcastViewer is the receiving end: it mirrors the game (grid, piece,
+score) from the stream, so it can be drawn on a SpectatorWall.
+
+Frames are ``type (B), payload length (I)`` followed by the payload, all
+big-endian. Shapes are sent as a 4x4 bit mask plus their row/column counts.
+
+Run ``python -m tetris.broadcast PORT --viewers N`` to watch a broadcast on
+a spectator wall.
+"""
+
+import logging  # Import logging module for debugging
+import socket
+import struct
+from .board import Board
+from .constants import GARBAGE_ID, GameEvent
+
+# Initialize logger
+logger = logging.getLogger(__name__)
+
+# Frame types
+RESET, SPAWN, MOVE, LOCK, CLEAR, GAME_OVER, KEYFRAME, GARBAGE = range(1, 9)
+
+HEADER = struct.Struct(">BI")
+# Piece placement: x, y, shape dims (rows << 4 | columns), shape mask
+PLACEMENT = struct.Struct(">hhBH")
+SIZE = struct.Struct(">HH")
+SCORE = struct.Struct(">I")
+# Garbage rows: count, empty column
+GARBAGE_ROWS = struct.Struct(">HH")
+KIND = struct.Struct(">B")
+# Keyframe: width, height, score, game over, piece kind (0 for none)
+KEYFRAME_HEAD = struct.Struct(">HHIBB")
+
+# Default bytes a subscriber may fall behind before it is dropped
+DEFAULT_MAX_LAG = 64 * 1024
+
+# Encoded shapes, keyed by id(); the shape is kept alive alongside its code
+_SHAPE_CODES = {}
+# Decoded shapes by code, shared so equal pieces share one shape list
+_SHAPES_BY_CODE = {}
+
+def encode_shape(shape):
+    """Return ``(dims, mask)`` for a shape of at most 4x4 cells."""
+    cached = _SHAPE_CODES.get(id(shape))
+    if cached is not None and cached[0] is shape:
+        return cached[1]
+    mask = 0
+    for y, row in enumerate(shape):
+        for x, cell in enumerate(row):
+            if cell:
+                mask |= 1 << (y * 4 + x)
+    code = (len(shape) << 4 | len(shape[0]), mask)
+    _SHAPE_CODES[id(shape)] = (shape, code)
+    return code
+
+def decode_shape(dims, mask):
+    """Return the shape matrix for an encoded shape."""
+    shape = _SHAPES_BY_CODE.get((dims, mask))
+    if shape is None:
+        rows, columns = dims >> 4, dims & 0xF
+        shape = [[1 if mask >> (y * 4 + x) & 1 else 0 for x in range(columns)] for y in range(rows)]
+        _SHAPES_BY_CODE[(dims, mask)] = shape
+    return shape
+
+def frame(kind, payload=b""):
+    """Return a complete frame of type ``kind``."""
+    return HEADER.pack(kind, len(payload)) + payload
+
+def encode_placement(piece):
+    """Return the placement payload for ``piece``."""
+    return PLACEMENT.pack(piece.x, piece.y, *encode_shape(piece.shape))
+
+def encode_event(game, event, *args):
+    """Encode a game event as a frame.
+
+    Args:
+        game: Game that produced the event
+        event (GameEvent): Event type
+        *args: Event arguments as passed to listeners
+
+    Returns:
+        bytes: The frame
+    """
+    if event is GameEvent.MOVE:
+        return frame(MOVE, encode_placement(args[0]))
+    if event is GameEvent.SPAWN:
+        piece = args[0]
+        return frame(SPAWN, KIND.pack(piece.kind) + encode_placement(piece) + SCORE.pack(game.score))
+    if event is GameEvent.LOCK:
+        piece = args[0]
+        return frame(LOCK, KIND.pack(piece.kind) + encode_placement(piece))
+    if event is GameEvent.CLEAR:
+        return frame(CLEAR, struct.pack(f">{len(args[0])}H", *args[0]))
+    if event is GameEvent.GARBAGE:
+        return frame(GARBAGE, GARBAGE_ROWS.pack(*args))
+    if event is GameEvent.RESET:
+        return frame(RESET, SIZE.pack(game.grid.width, game.grid.height))
+    if event is GameEvent.GAME_OVER:
+        return frame(GAME_OVER, SCORE.pack(game.score))
+    raise ValueError(f"unknown game event {event!r}")
+
+def encode_keyframe(game):
+    """Encode a full snapshot of ``game`` as a keyframe."""
+    grid = game.grid
+    piece = game.current_piece
+    head = KEYFRAME_HEAD.pack(grid.width, grid.height, game.score, bool(game.game_over),
+                              piece.kind if piece else 0)
+    placement = encode_placement(piece) if piece else PLACEMENT.pack(0, 0, 0, 0)
+    return frame(KEYFRAME, head + placement + grid.linear())
+
+def iter_frames(buffer):
+    """Split complete frames off the front of ``buffer``.
+
+    Consumed bytes are removed from ``buffer``; an incomplete trailing frame
+    is left in it.
+
+    Args:
+        buffer (bytearray): Received bytes
+
+    Yields:
+        tuple: (frame type, payload bytes)
+    """
+    offset = 0
+    end = len(buffer)
+    try:
+        while end - offset >= HEADER.size:
+            kind, length = HEADER.unpack_from(buffer, offset)
+            start = offset + HEADER.size
+            if end - start < length:
+                break
+            yield kind, bytes(buffer[start:start + length])
+            offset = start + length
+    finally:
+        del buffer[:offset]
+
+class BroadcastPublisher:
+    """Publishes a game's events to a relay."""
+
+    def __init__(self, game, relay):
+        """Attach to ``game`` and publish to ``relay``.
+
+        Args:
+            game (GameEngine): Game to broadcast
+            relay (BroadcastRelay): Relay to publish to
+        """
+        self.game = game
+        self.relay = relay
+        relay.keyframe = self.keyframe
+        game.add_listener(self.on_event)
+        # Viewers already connected switch to the new game
+        relay.publish(self.keyframe())
+
+    def on_event(self, event, *args):
+        """Encode a game event once and hand it to the relay."""
+        self.relay.publish(encode_event(self.game, event, *args))
+
+    def keyframe(self):
+        """Return a keyframe of the current game state."""
+        return encode_keyframe(self.game)
+
+    def detach(self):
+        """Stop publishing the game's events."""
+        self.game.remove_listener(self.on_event)
+        if self.relay.keyframe == self.keyframe:
+            self.relay.keyframe = None
+
+class Subscriber:
+    """One connected viewer of a relay."""
+
+    __slots__ = ("sock", "address", "position", "pending")
+
+    def __init__(self, sock, address, position, pending):
+        self.sock = sock
+        self.address = address
+        # Absolute offset in the relay log of the next byte to send
+        self.position = position
+        # Bytes to send before the shared log (the join keyframe)
+        self.pending = pending
+
+class BroadcastRelay:
+    """Non-blocking TCP fan-out of broadcast frames."""
+
+    def __init__(self, host="127.0.0.1", port=0, max_lag=DEFAULT_MAX_LAG):
+        """Start listening.
+
+        Args:
+            host (str): Address to listen on; loopback by default
+            port (int): Port to listen on; 0 picks a free port
+            max_lag (int): Bytes a subscriber may fall behind before it is dropped
+        """
+        self.max_lag = max_lag
+        self.server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.server.bind((host, port))
+        self.server.listen()
+        self.server.setblocking(False)
+        self.address = self.server.getsockname()
+        self.subscribers = []
+        # Callable returning a keyframe for new subscribers
+        self.keyframe = None
+        # Frames not yet sent to every subscriber; log[0] is at offset base
+        self.log = bytearray()
+        self.base = 0
+        self.dropped = 0
+        logger.info("Broadcast relay listening on %s:%d", *self.address)
+
+    @property
+    def end(self):
+        """int: Absolute offset just past the last published byte."""
+        return self.base + len(self.log)
+
+    def publish(self, data):
+        """Queue an encoded frame for every subscriber.
+
+        Args:
+            data (bytes): Encoded frame(s)
+        """
+        if not self.subscribers:
+            return
+        self.log += data
+        end = self.end
+        for subscriber in [s for s in self.subscribers if end - s.position > self.max_lag]:
+            self.drop(subscriber, "fell behind")
+
+    def accept(self):
+        """Accept pending connections."""
+        while True:
+            try:
+                sock, address = self.server.accept()
+            except (BlockingIOError, InterruptedError):
+                return
+            sock.setblocking(False)
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            keyframe = self.keyframe() if self.keyframe else b""
+            self.subscribers.append(Subscriber(sock, address, self.end, bytearray(keyframe)))
+            logger.info("Broadcast viewer connected from %s:%d", *address)
+
+    def drop(self, subscriber, reason):
+        """Disconnect a subscriber."""
+        self.subscribers.remove(subscriber)
+        self.dropped += 1
+        subscriber.sock.close()
+        logger.info("Dropped broadcast viewer %s:%d (%s)", *subscriber.address, reason)
+
+    def pump(self):
+        """Accept new viewers and send as much as every socket will take.
+
+        Never blocks; call it once per frame.
+        """
+        self.accept()
+        for subscriber in list(self.subscribers):
+            try:
+                if subscriber.pending:
+                    sent = subscriber.sock.send(subscriber.pending)
+                    del subscriber.pending[:sent]
+                    if subscriber.pending:
+                        continue
+                if subscriber.position < self.end:
+                    with memoryview(self.log) as view:
+                        sent = subscriber.sock.send(view[subscriber.position - self.base:])
+                    subscriber.position += sent
+            except (BlockingIOError, InterruptedError):
+                continue
+            except OSError as e:
+                self.drop(subscriber, e)
+
+        # Forget what every subscriber has been sent
+        low = min((s.position for s in self.subscribers), default=self.end)
+        if low > self.base:
+            del self.log[:low - self.base]
+            self.base = low
+
+    def close(self):
+        """Disconnect every viewer and stop listening."""
+        for subscriber in self.subscribers:
+            subscriber.sock.close()
+        self.subscribers = []
+        self.server.close()
+
+class ViewerPiece:
+    """Falling piece as seen by a viewer."""
+
+    __slots__ = ("x", "y", "shape", "kind")
+
+    def __init__(self, kind, x, y, shape):
+        self.kind = kind
+        self.x = x
+        self.y = y
+        self.shape = shape
+
+class BroadcastViewer:
+    """Client mirroring a broadcast game.
+
+    Exposes ``grid``, ``current_piece``, ``score`` and ``game_over`` like a
+    game, so it can be shown on a SpectatorWall.
+    """
+
+    def __init__(self, address, timeout=5.0):
+        """Connect to a relay.
+
+        Args:
+            address (tuple): (host, port) of the relay
+            timeout (float): Connection timeout in seconds
+        """
+        self.sock = socket.create_connection(address, timeout=timeout)
+        self.sock.setblocking(False)
+        self.buffer = bytearray()
+        self.grid = Board(1, 1)
+        self.current_piece = None
+        self.score = 0
+        self.game_over = False
+        self.connected = True
+        self.frames = 0
+
+    def poll(self):
+        """Read and apply everything received so far without blocking.
+
+        Returns:
+            int: Number of frames applied
+        """
+        while self.connected:
+            try:
+                data = self.sock.recv(65536)
+            except (BlockingIOError, InterruptedError):
+                break
+            except OSError:
+                data = b""
+            if not data:
+                self.connected = False
+                break
+            self.buffer += data
+        count = 0
+        for kind, payload in iter_frames(self.buffer):
+            self.apply(kind, payload)
+            count += 1
+        self.frames += count
+        return count
+
+    def _piece(self, kind, payload, offset):
+        """Decode a placement at ``offset`` into a ViewerPiece."""
+        x, y, dims, mask = PLACEMENT.unpack_from(payload, offset)
+        return ViewerPiece(kind, x, y, decode_shape(dims, mask))
+
+    def apply(self, kind, payload):
+        """Apply one frame to the mirrored game."""
+        if kind == MOVE:
+            piece = self.current_piece
+            if piece is not None:
+                piece.x, piece.y, dims, mask = PLACEMENT.unpack(payload)
+                piece.shape = decode_shape(dims, mask)
+        elif kind == SPAWN:
+            self.current_piece = self._piece(payload[0], payload, KIND.size)
+            (self.score,) = SCORE.unpack_from(payload, KIND.size + PLACEMENT.size)
+        elif kind == LOCK:
+            piece = self._piece(payload[0], payload, KIND.size)
+            grid = self.grid
+            for y, row in enumerate(piece.shape):
+                for x, cell in enumerate(row):
+                    if cell and 0 <= piece.y + y < grid.height and 0 <= piece.x + x < grid.width:
+                        grid.set(piece.x + x, piece.y + y, piece.kind)
+            self.current_piece = None
+        elif kind == CLEAR:
+            self.grid.clear_rows(struct.unpack(f">{len(payload) // 2}H", payload))
+        elif kind == GARBAGE:
+            count, hole = GARBAGE_ROWS.unpack(payload)
+            row = bytearray([GARBAGE_ID]) * self.grid.width
+            row[hole] = 0
+            self.grid.push_rows([bytes(row)] * count)
+        elif kind == RESET:
+            self.grid = Board(*SIZE.unpack(payload))
+            self.current_piece = None
+            self.score = 0
+            self.game_over = False
+        elif kind == GAME_OVER:
+            (self.score,) = SCORE.unpack(payload)
+            self.game_over = True
+        elif kind == KEYFRAME:
+            width, height, score, game_over, piece_kind = KEYFRAME_HEAD.unpack_from(payload)
+            offset = KEYFRAME_HEAD.size
+            self.current_piece = self._piece(piece_kind, payload, offset) if piece_kind else None
+            offset += PLACEMENT.size
+            self.grid = Board(width, height)
+            self.grid.load(payload[offset:offset + width * height])
+            self.score = score
+            self.game_over = bool(game_over)
+        else:
+            logger.warning("Ignoring unknown broadcast frame type %d", kind)
+
+    def close(self):
+        """Disconnect from the relay."""
+        self.sock.close()
+        self.connected = False
+
+def main(argv=None):
+    """Watch a broadcast on a spectator wall."""
+    import argparse
+    import time
+    import pygame
+    from .spectator import SpectatorWall
+
+    parser = argparse.ArgumentParser(description="Watch a broadcast Tetris game.")
+    parser.add_argument("port", type=int, help="relay port")
+    parser.add_argument("--host", default="127.0.0.1", help="relay host")
+    parser.add_argument("--viewers", type=int, default=1, help="number of viewers to connect")
+    args = parser.parse_args(argv)
+
+    pygame.init()
+    screen = pygame.display.set_mode((800, 600))
+    pygame.display.set_caption("Tetris broadcast")
+    viewers = [BroadcastViewer((args.host, args.port)) for _ in range(args.viewers)]
+    # Wait for the keyframes so the wall is laid out for the real board size
+    deadline = time.monotonic() + 5
+    while not all(viewer.frames for viewer in viewers) and time.monotonic() < deadline:
+        for viewer in viewers:
+            viewer.poll()
+        time.sleep(0.01)
+    wall = SpectatorWall(screen.get_rect(), viewers,
+                         [f"Viewer {index + 1}" for index in range(len(viewers))])
+    clock = pygame.time.Clock()
+    running = True
+    while running and any(viewer.connected for viewer in viewers):
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+        for viewer in viewers:
+            viewer.poll()
+        wall.draw(screen)
+        pygame.display.flip()
+        clock.tick(60)
+    for viewer in viewers:
+        viewer.close()
+    pygame.quit()
+
+if __name__ == "__main__":
+    main()
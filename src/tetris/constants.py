@@ -1,7 +1,6 @@
 """Constants used throughout the Tetris game."""
 
 import enum
-import pygame
 
 # Screen dimensions
 SCREEN_DIMENSIONS = {
@@ -44,37 +43,95 @@ class GameState(enum.Enum):
     PLAYING = 10  # Active gameplay
     GAME_OVER = 11  # Game over state
 
-# Tetrimino shapes and their colors
+# Player actions, named as in Settings.controls
+class Action(enum.Enum):
+    """Enum for player actions that keys can be bound to."""
+    MOVE_LEFT = "MOVE_LEFT"
+    MOVE_RIGHT = "MOVE_RIGHT"
+    ROTATE = "ROTATE"
+    SOFT_DROP = "SOFT_DROP"
+    HARD_DROP = "HARD_DROP"
+
+# Events the engine reports to its listeners
+class GameEvent(enum.Enum):
+    """Enum for game events published by GameEngine.notify."""
+    RESET = "RESET"  # New board: listener(event)
+    SPAWN = "SPAWN"  # New piece: listener(event, piece)
+    MOVE = "MOVE"  # Piece moved or rotated: listener(event, piece)
+    LOCK = "LOCK"  # Piece written to the board: listener(event, piece)
+    CLEAR = "CLEAR"  # Full rows removed: listener(event, rows)
+    GARBAGE = "GARBAGE"  # Rows pushed in from the bottom: listener(event, count, hole)
+    GAME_OVER = "GAME_OVER"  # Game ended: listener(event)
+
+# Auto-repeat timing in milliseconds of simulation time: delayed auto-shift
+# (delay before a held key starts repeating) and auto-repeat rate (interval
+# between repeats)
+DEFAULT_DAS = 170
+DEFAULT_ARR = 50
+
+# Tetrimino shapes and their colors. 'id' is the one-byte piece-type id
+# stored in board cells (0 means empty).
 SHAPES = [
-    {'shape': [[1, 1, 1, 1]], 'color': COLORS["CYAN"]},    # I
-    {'shape': [[1, 1], [1, 1]], 'color': COLORS["YELLOW"]},  # O
-    {'shape': [[0, 1, 1], [1, 1, 0]], 'color': COLORS["GREEN"]},  # S
-    {'shape': [[1, 1, 0], [0, 1, 1]], 'color': COLORS["RED"]},    # Z
-    {'shape': [[1, 1, 1], [0, 0, 1]], 'color': COLORS["BLUE"]},   # L
-    {'shape': [[1, 1, 1], [1, 0, 0]], 'color': COLORS["ORANGE"]}, # J
-    {'shape': [[1, 1, 1], [0, 1, 0]], 'color': COLORS["PURPLE"]}  # T
+    {'id': 1, 'shape': [[1, 1, 1, 1]], 'color': COLORS["CYAN"]},    # I
+    {'id': 2, 'shape': [[1, 1], [1, 1]], 'color': COLORS["YELLOW"]},  # O
+    {'id': 3, 'shape': [[0, 1, 1], [1, 1, 0]], 'color': COLORS["GREEN"]},  # S
+    {'id': 4, 'shape': [[1, 1, 0], [0, 1, 1]], 'color': COLORS["RED"]},    # Z
+    {'id': 5, 'shape': [[1, 1, 1], [0, 0, 1]], 'color': COLORS["BLUE"]},   # L
+    {'id': 6, 'shape': [[1, 1, 1], [1, 0, 0]], 'color': COLORS["ORANGE"]}, # J
+    {'id': 7, 'shape': [[1, 1, 1], [0, 1, 0]], 'color': COLORS["PURPLE"]}  # T
 ]
 
-# Default settings
-DEFAULT_SETTINGS = {
-    "FALL_SPEED": 500,
-    "MUSIC_VOLUME": 0.7,
-    "SFX_VOLUME": 1.0,
-    "DEFAULT_SFX_VOLUME": 1.0,
-    "DIFFICULTY": "Normal",
-    "DEFAULT_DIFFICULTY": "Normal",
-    "CONTROLS": {
-        "MOVE_LEFT": pygame.K_LEFT,
-        "MOVE_RIGHT": pygame.K_RIGHT,
-        "ROTATE": pygame.K_UP,
-        "SOFT_DROP": pygame.K_DOWN,
-        "HARD_DROP": pygame.K_SPACE
-    },
-    "DEFAULT_CONTROLS": {
-        "MOVE_LEFT": pygame.K_LEFT,
-        "MOVE_RIGHT": pygame.K_RIGHT,
-        "ROTATE": pygame.K_UP,
-        "SOFT_DROP": pygame.K_DOWN,
-        "HARD_DROP": pygame.K_SPACE
-    }
+# Cell id of garbage rows sent in Battle mode
+GARBAGE_ID = len(SHAPES) + 1
+
+# Cell color by piece-type id, looked up only when rendering
+PALETTE = [None] + [shape['color'] for shape in SHAPES] + [COLORS["GRAY"]]
+
+# Piece-type id by color
+COLOR_IDS = {color: kind for kind, color in enumerate(PALETTE) if color is not None}
+
+# Default control bindings. Keys are stored as pygame attribute names and
+# resolved to key codes on first use, so this module (and everything that only
+# needs the game rules or settings) can be imported without loading pygame.
+DEFAULT_CONTROL_KEYS = {
+    "MOVE_LEFT": "K_LEFT",
+    "MOVE_RIGHT": "K_RIGHT",
+    "ROTATE": "K_UP",
+    "SOFT_DROP": "K_DOWN",
+    "HARD_DROP": "K_SPACE"
 }
+
+def resolve_controls(key_names=None):
+    """Resolve pygame key attribute names to key codes.
+
+    Args:
+        key_names (dict, optional): Mapping of action to pygame key name.
+            Defaults to DEFAULT_CONTROL_KEYS.
+
+    Returns:
+        dict: Mapping of action to pygame key code
+    """
+    import pygame
+    if key_names is None:
+        key_names = DEFAULT_CONTROL_KEYS
+    return {action: getattr(pygame, name) for action, name in key_names.items()}
+
+def __getattr__(name):
+    """Build the pygame-dependent DEFAULT_SETTINGS on first access."""
+    if name == "DEFAULT_SETTINGS":
+        controls = resolve_controls()
+        value = {
+            "FALL_SPEED": 500,
+            "MUSIC_VOLUME": 0.7,
+            "SFX_VOLUME": 1.0,
+            "DEFAULT_SFX_VOLUME": 1.0,
+            "DIFFICULTY": "Normal",
+            "DEFAULT_DIFFICULTY": "Normal",
+            "DAS": DEFAULT_DAS,
+            "ARR": DEFAULT_ARR,
+            "CONTROLS": controls,
+            "DEFAULT_CONTROLS": controls.copy()
+        }
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
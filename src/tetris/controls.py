@@ -0,0 +1,125 @@
+"""
+Module mapping keys to player actions.
+
+InputHandler turns key presses and releases into timestamped actions using a
+dispatch table built once from Settings.controls. Held movement keys repeat
+with delayed auto-shift (DAS) and auto-repeat rate (ARR) measured on the
+simulation clock, so repeats land at exact simulation times however long a
+rendered frame takes. Pressing the opposite direction takes over the
+repeat; releasing it hands the repeat back to the first direction if that
+key is still held. This module does not depend on pygame; callers pass
+key codes and simulation timestamps in milliseconds.
+"""
+
+from .constants import Action, DEFAULT_DAS, DEFAULT_ARR
+
+# Actions that auto-repeat while their key is held
+REPEATABLE_ACTIONS = (Action.MOVE_LEFT, Action.MOVE_RIGHT, Action.SOFT_DROP)
+
+# Horizontal moves cancel each other's auto-repeat
+_OPPOSITE = {
+    Action.MOVE_LEFT: Action.MOVE_RIGHT,
+    Action.MOVE_RIGHT: Action.MOVE_LEFT
+}
+
+class InputHandler:
+    """Class converting key events into a queue of timestamped actions."""
+
+    def __init__(self, controls, das=DEFAULT_DAS, arr=DEFAULT_ARR):
+        """Initialize the input handler.
+
+        Args:
+            controls (dict): Mapping of action name to key code
+            das (int): Delay in ms before a held key starts repeating
+            arr (int): Interval in ms between repeats (at least 1)
+        """
+        self.das = das
+        self.arr = max(1, arr)
+        self.dispatch = {}
+        self.set_controls(controls)
+        self.queue = []
+        self.held = {}  # Action -> simulation time of its next repeat
+        self.pressed = set()  # Repeatable actions whose key is down
+
+    def set_controls(self, controls):
+        """Rebuild the key-to-action dispatch table.
+
+        Args:
+            controls (dict): Mapping of action name to key code
+        """
+        self.dispatch = {key: Action(name) for name, key in controls.items()
+                         if name in Action.__members__}
+
+    def reset(self):
+        """Forget held keys and queued actions."""
+        self.queue = []
+        self.held = {}
+        self.pressed = set()
+
+    def key_down(self, key, now):
+        """Handle a key press.
+
+        Args:
+            key (int): Key code
+            now (int): Simulation time in ms
+
+        Returns:
+            bool: True if the key is bound to an action
+        """
+        action = self.dispatch.get(key)
+        if action is None:
+            return False
+        self.queue.append((now, action))
+        if action in REPEATABLE_ACTIONS:
+            # Repeats of the other direction due before the press still happen
+            self.update(now)
+            self.held.pop(_OPPOSITE.get(action), None)
+            self.held[action] = now + self.das
+            self.pressed.add(action)
+        return True
+
+    def key_up(self, key, now):
+        """Handle a key release.
+
+        Args:
+            key (int): Key code
+            now (int): Simulation time in ms
+
+        Returns:
+            bool: True if the key is bound to an action
+        """
+        action = self.dispatch.get(key)
+        if action is None:
+            return False
+        self.pressed.discard(action)
+        if action in self.held:
+            self.update(now)
+            del self.held[action]
+            opposite = _OPPOSITE.get(action)
+            if opposite in self.pressed:
+                # The first direction is still held: it repeats again after DAS
+                self.held[opposite] = now + self.das
+        return True
+
+    def update(self, now):
+        """Queue every auto-repeat due up to simulation time ``now``.
+
+        Args:
+            now (int): Simulation time in ms
+        """
+        for action, next_time in self.held.items():
+            while next_time <= now:
+                self.queue.append((next_time, action))
+                next_time += self.arr
+            self.held[action] = next_time
+
+    def drain(self):
+        """Return queued actions in timestamp order and clear the queue.
+
+        Returns:
+            list: (timestamp, Action) tuples
+        """
+        queue = self.queue
+        self.queue = []
+        queue.sort(key=lambda item: item[0])
+        return queue
@@ -0,0 +1,100 @@
+"""
+Module for presenting the game at any window resolution.
+
+Everything is drawn at a fixed logical resolution (SCREEN_DIMENSIONS) into an
+off-screen surface. Once per frame Display scales that surface into the
+window with a single transform (a plain blit at 1:1) and flips, so drawing
+cost does not depend on the window size. The scaling policy (destination
+rectangle, letterbox offsets, scaling function) is computed once per window
+size and cached.
+"""
+
+import pygame
+from .constants import SCREEN_DIMENSIONS, COLORS
+
+class Display:
+    """Class owning the window and the logical render surface."""
+
+    def __init__(self, window_size=None, logical_size=None, smooth=False,
+                 flags=pygame.RESIZABLE | pygame.DOUBLEBUF):
+        """Create the window.
+
+        Args:
+            window_size (tuple, optional): Window size. Defaults to the logical size.
+            logical_size (tuple, optional): Resolution everything is drawn at.
+                Defaults to SCREEN_DIMENSIONS.
+            smooth (bool): Use smooth (bilinear) scaling for non-integer
+                factors instead of nearest-neighbour
+            flags (int): pygame display flags
+        """
+        self.logical_size = tuple(logical_size or (SCREEN_DIMENSIONS['WIDTH'], SCREEN_DIMENSIONS['HEIGHT']))
+        self.smooth = smooth
+        self.flags = flags
+        self.window = None
+        self.surface = None
+        self.resize(window_size or self.logical_size)
+
+    def resize(self, window_size):
+        """Resize the window and recompute the scaling policy.
+
+        Args:
+            window_size (tuple): New window size in pixels
+        """
+        self.window = pygame.display.set_mode(tuple(window_size), self.flags)
+        if self.surface is None:
+            # Created once so menus and games can keep a reference to it
+            self.surface = pygame.Surface(self.logical_size).convert()
+        window_w, window_h = self.window.get_size()
+        logical_w, logical_h = self.logical_size
+
+        # Largest uniform scale that fits, preferring whole-number factors so
+        # pixels stay crisp
+        scale = min(window_w / logical_w, window_h / logical_h)
+        if scale >= 1 and int(scale) / scale > 0.9:
+            scale = int(scale)
+        dest_w, dest_h = max(1, int(logical_w * scale)), max(1, int(logical_h * scale))
+        self.scale = scale
+        self.dest_rect = pygame.Rect((window_w - dest_w) // 2, (window_h - dest_h) // 2, dest_w, dest_h)
+        self.window.fill(COLORS["BLACK"])
+        if scale == 1:
+            # Same size: a plain blit, no scaling
+            self._scale_fn = None
+        elif self.smooth and scale != int(scale):
+            self._scale_fn = pygame.transform.smoothscale
+        else:
+            self._scale_fn = pygame.transform.scale
+        # Scale straight into the window region
+        self._dest = self.window.subsurface(self.dest_rect)
+
+    def present(self):
+        """Scale the logical surface into the window and flip."""
+        if self._scale_fn is None:
+            self._dest.blit(self.surface, (0, 0))
+        else:
+            self._scale_fn(self.surface, self.dest_rect.size, self._dest)
+        pygame.display.flip()
+
+    def to_logical(self, pos):
+        """Convert a window position into logical coordinates.
+
+        Args:
+            pos (tuple): Position in window pixels
+        """
+        return (int((pos[0] - self.dest_rect.x) / self.scale),
+                int((pos[1] - self.dest_rect.y) / self.scale))
+
+    def map_mouse_events(self, events):
+        """Return ``events`` with mouse positions in logical coordinates.
+
+        Args:
+            events (list): pygame events
+        """
+        if self.dest_rect.topleft == (0, 0) and self.scale == 1:
+            return events
+        mapped = []
+        for event in events:
+            if event.type in (pygame.MOUSEMOTION, pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP):
+                attributes = dict(event.__dict__, pos=self.to_logical(event.pos))
+                event = pygame.event.Event(event.type, attributes)
+            mapped.append(event)
+        return mapped
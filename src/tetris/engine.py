@@ -0,0 +1,441 @@
+"""
+Core rules engine for the Tetris game.
+
+This module contains the GameEngine class, which implements piece spawning,
+collision detection, locking and line clearing without depending on pygame.
+It can be imported and driven by headless tools (simulators, bots, tests)
+without paying the pygame/SDL import cost.
+"""
+
+import math
+import random
+import logging
+from .constants import (
+    SCREEN_DIMENSIONS,
+    SHAPES, GARBAGE_ID,
+    Action, GameEvent, GameState
+)
+from .board import Board
+from .features import FeatureTracker
+from .tetrimino import Tetrimino
+
+# Initialize logger
+logger = logging.getLogger(__name__)
+
+class GameEngine:
+    """Pure game rules shared by every game mode."""
+
+    # Cache fall speeds for different difficulty levels
+    FALL_SPEEDS = {
+        "Easy": SCREEN_DIMENSIONS['BLOCK_SIZE'] * 6,
+        "Normal": SCREEN_DIMENSIONS['BLOCK_SIZE'] * 5,
+        "Hard": SCREEN_DIMENSIONS['BLOCK_SIZE'] * 4
+    }
+
+    # Gravity is counted in cells per tick of the 60 FPS game loop; instant
+    # gravity drops a piece straight to the floor, however tall the board
+    TICK_MS = 1000 / 60
+    INSTANT_GRAVITY = math.inf
+
+    def __init__(self, settings, grid_width=None, grid_height=None):
+        """Initialize the engine.
+
+        Args:
+            settings: Object exposing a ``difficulty`` attribute
+            grid_width (int, optional): Board columns. Defaults to SCREEN_DIMENSIONS.
+            grid_height (int, optional): Board rows. Defaults to SCREEN_DIMENSIONS.
+        """
+        self.settings = settings
+        self.grid_width = grid_width or SCREEN_DIMENSIONS['GRID_WIDTH']
+        self.grid_height = grid_height or SCREEN_DIMENSIONS['GRID_HEIGHT']
+        # Piece generator; seed it for reproducible games
+        self.rng = random.Random()
+        # Callables notified of GameEvents (see add_listener)
+        self.listeners = []
+        self.current_state = GameState.PLAYING
+        # Dispatch table from action to handler
+        self.action_handlers = {
+            Action.MOVE_LEFT: self.move_left,
+            Action.MOVE_RIGHT: self.move_right,
+            Action.ROTATE: self.rotate,
+            Action.SOFT_DROP: self.soft_drop,
+            Action.HARD_DROP: self.hard_drop
+        }
+        self.reset_game()
+
+    @property
+    def gravity(self):
+        """Gravity in cells per tick (fractional below one row per tick)."""
+        return self.TICK_MS / self.fall_speed if self.fall_speed else self.INSTANT_GRAVITY
+
+    @gravity.setter
+    def gravity(self, cells):
+        """Set the fall speed from a gravity in cells per tick.
+
+        Raises:
+            ValueError: If ``cells`` is not positive
+        """
+        if not cells > 0:
+            raise ValueError(f"gravity must be positive, not {cells!r}")
+        # Instant gravity is a fall speed of 0 ms per row
+        self.fall_speed = self.TICK_MS / cells
+
+    def seed(self, seed=None):
+        """Seed the piece generator.
+
+        Args:
+            seed (int, optional): Seed value; None reseeds from system entropy
+        """
+        self.rng.seed(seed)
+
+    def reset_game(self, seed=None):
+        """Reset the game state.
+
+        Args:
+            seed (int, optional): Seed for the new game's piece sequence
+        """
+        if seed is not None:
+            self.seed(seed)
+        self.grid = Board(self.grid_width, self.grid_height)
+        self.features = FeatureTracker(self.grid)
+        # Rows (top, bottom) whose cells changed since a renderer last looked
+        self.changed_rows = (0, self.grid_height - 1)
+        self.current_piece = None
+        # Shape of the piece after the current one (the preview)
+        self.next_shape = None
+        self.sim_time = 0
+        self.fall_time = 0
+        self.fall_speed = self.FALL_SPEEDS.get(self.settings.difficulty, self.FALL_SPEEDS["Normal"])
+        self.game_over = False
+        self.score = 0
+        self.total_lines = 0
+        self.current_state = GameState.PLAYING
+        if self.listeners:
+            self.notify(GameEvent.RESET)
+        self.spawn_new_piece()
+
+    def add_listener(self, listener):
+        """Register a callable to be notified of game events.
+
+        Listeners run synchronously inside the engine, so they should only
+        record or queue the event.
+
+        Args:
+            listener (callable): Called as ``listener(event, *args)`` with a
+                GameEvent and its arguments
+        """
+        self.listeners.append(listener)
+
+    def remove_listener(self, listener):
+        """Unregister a listener added with add_listener."""
+        self.listeners.remove(listener)
+
+    def notify(self, event, *args):
+        """Notify every listener of ``event``."""
+        for listener in self.listeners:
+            listener(event, *args)
+
+    def end_game(self):
+        """Mark the game as over."""
+        self.current_state = GameState.GAME_OVER
+        if self.game_over:
+            return
+        self.game_over = True
+        if self.listeners:
+            self.notify(GameEvent.GAME_OVER)
+
+    def spawn_new_piece(self):
+        """Create and spawn a new tetrimino."""
+        if self.game_over:
+            self.current_state = GameState.GAME_OVER
+            return
+
+        # Take the previewed shape and draw the next one; the piece sequence
+        # of a seed is the same as drawing at spawn
+        shape_info = self.next_shape or self.rng.choice(SHAPES)
+        self.next_shape = self.rng.choice(SHAPES)
+        
+        # Calculate starting position
+        start_x = self.grid.width // 2 - len(shape_info['shape'][0]) // 2
+        start_y = 0
+        
+        # Create the new piece
+        self.current_piece = Tetrimino(start_x, start_y, shape_info)
+        if self.listeners:
+            self.notify(GameEvent.SPAWN, self.current_piece)
+        
+        # Check if the new piece can be placed
+        if self.check_collision():
+            self.end_game()
+
+    def check_collision(self, x_offset=0, y_offset=0, shape=None):
+        """Check if the current piece collides with anything."""
+        if not self.current_piece:
+            return False
+
+        # Use provided shape or current piece's shape
+        piece_shape = shape if shape is not None else self.current_piece.shape
+
+        # Check each cell of the piece
+        grid = self.grid
+        cells = grid.cells
+        width = grid.width
+        height = grid.height
+        base_x = self.current_piece.x + x_offset
+        base_y = self.current_piece.y + y_offset
+        for y, row in enumerate(piece_shape):
+            abs_y = base_y + y
+            # Start of the row in the board's circular row storage
+            start = abs_y + grid.offset
+            if start >= height:
+                start -= height
+            start *= width
+            for x, cell in enumerate(row):
+                if cell:
+                    abs_x = base_x + x
+
+                    # Check for collisions with walls or existing blocks
+                    if (abs_x < 0 or abs_x >= width or abs_y >= height or
+                        (abs_y >= 0 and cells[start + abs_x])):
+                        return True  # Collision detected
+        return False  # No collision detected
+
+    def drop_distance(self, limit=None):
+        """Return how many rows the current piece can fall before landing.
+
+        Only the lowest block of each piece column can hit something first,
+        so only the board columns below those blocks are searched, down to
+        the nearest filled cell or the floor, instead of testing the whole
+        piece one row at a time.
+
+        Args:
+            limit (int, optional): Stop looking after this many rows
+
+        Returns:
+            int: Rows the piece can move down, at most ``limit``
+        """
+        piece = self.current_piece
+        if not piece:
+            return 0
+        grid = self.grid
+        shape = piece.shape
+        distance = grid.height if limit is None else limit
+        for x in range(len(shape[0])):
+            bottom = len(shape) - 1
+            while bottom >= 0 and not shape[bottom][x]:
+                bottom -= 1
+            if bottom < 0:
+                continue
+            below = piece.y + bottom + 1
+            stop = min(grid.height, below + distance)
+            distance = min(distance, grid.first_filled(piece.x + x, max(below, 0), stop) - below)
+        return distance
+
+    def lock_piece(self):
+        """Lock the current piece in place."""
+        if not self.current_piece:
+            return
+        
+        grid = self.grid
+        piece = self.current_piece
+        columns = set()
+        for y, row in enumerate(piece.shape):
+            for x, cell in enumerate(row):
+                if cell:
+                    abs_y = piece.y + y
+                    abs_x = piece.x + x
+                    
+                    # Check if piece is within grid bounds
+                    if 0 <= abs_y < grid.height and 0 <= abs_x < grid.width:
+                        grid.set(abs_x, abs_y, piece.kind)
+                        columns.add(abs_x)
+                    else:
+                        self.end_game()
+                        return
+
+        # Only the rows the piece covers can have become full
+        top = max(piece.y, 0)
+        bottom = min(piece.y + len(piece.shape), grid.height) - 1
+        self.mark_changed(top, bottom)
+        self.features.update_cells(columns, range(top, bottom + 1))
+        if self.listeners:
+            self.notify(GameEvent.LOCK, piece)
+
+        # Clear any completed lines and update score
+        lines_cleared = self.clear_lines(range(top, bottom + 1))
+        if lines_cleared > 0:
+            self.total_lines += lines_cleared
+            self.score += lines_cleared * 100
+
+        # Spawn a new piece
+        self.spawn_new_piece()
+        
+        # Check if the new piece can be placed
+        if self.check_collision():
+            self.end_game()
+
+    def clear_lines(self, rows=None):
+        """Clear completed lines.
+
+        Args:
+            rows (iterable, optional): Rows to check, e.g. those covered by the
+                piece just locked. Defaults to every row.
+
+        Returns:
+            int: Number of lines cleared
+        """
+        grid = self.grid
+        if rows is None:
+            rows = range(grid.height)
+        full = [y for y in sorted(set(rows)) if 0 <= y < grid.height and grid.row_is_full(y)]
+        if not full:
+            return 0
+        self.features.remove_rows(full)
+        cleared = grid.clear_rows(full)
+        # Everything above the lowest cleared row has shifted
+        self.mark_changed(0, full[-1])
+        if self.listeners:
+            self.notify(GameEvent.CLEAR, full)
+        return cleared
+
+    def add_garbage(self, count, hole):
+        """Push garbage rows in from the bottom of the board.
+
+        Each row is filled except for column ``hole``. The stack moves up by
+        ``count`` rows, and so does the current piece if it now overlaps it;
+        the game ends if blocks are pushed off the top.
+
+        Args:
+            count (int): Rows to add
+            hole (int): Empty column of the rows
+        """
+        grid = self.grid
+        count = min(count, grid.height)
+        if count <= 0:
+            return
+        row = bytearray([GARBAGE_ID]) * grid.width
+        row[hole] = 0
+        overflow = grid.push_rows([bytes(row)] * count)
+        self.features.push_rows(count)
+        self.mark_changed(0, grid.height - 1)
+        if self.listeners:
+            self.notify(GameEvent.GARBAGE, count, hole)
+        piece = self.current_piece
+        if piece is not None:
+            lifted = 0
+            while lifted < count and self.check_collision():
+                piece.move(0, -1)
+                lifted += 1
+        if overflow:
+            self.end_game()
+
+    def mark_changed(self, top, bottom):
+        """Record that board rows ``top``..``bottom`` changed.
+
+        Args:
+            top (int): First changed row
+            bottom (int): Last changed row
+        """
+        if self.changed_rows:
+            top = min(top, self.changed_rows[0])
+            bottom = max(bottom, self.changed_rows[1])
+        self.changed_rows = (top, bottom)
+
+    def move_left(self):
+        """Move the current piece one column left if possible."""
+        if not self.check_collision(x_offset=-1):
+            self.current_piece.move(-1, 0)
+            if self.listeners:
+                self.notify(GameEvent.MOVE, self.current_piece)
+
+    def move_right(self):
+        """Move the current piece one column right if possible."""
+        if not self.check_collision(x_offset=1):
+            self.current_piece.move(1, 0)
+            if self.listeners:
+                self.notify(GameEvent.MOVE, self.current_piece)
+
+    def soft_drop(self):
+        """Move the current piece one row down if possible."""
+        if not self.check_collision(y_offset=1):
+            self.current_piece.move(0, 1)
+            if self.listeners:
+                self.notify(GameEvent.MOVE, self.current_piece)
+
+    def rotate(self):
+        """Rotate the current piece, reverting if it would collide."""
+        # Store current shape
+        current_shape = self.current_piece.shape
+        # Rotate the piece
+        self.current_piece.rotate()
+        # If rotation causes collision, revert back
+        if self.check_collision():
+            self.current_piece.shape = current_shape
+        elif self.listeners:
+            self.notify(GameEvent.MOVE, self.current_piece)
+
+    def hard_drop(self):
+        """Drop the current piece to the bottom and lock it."""
+        self.current_piece.move(0, self.drop_distance())
+        self.lock_piece()
+
+    def apply_action(self, action):
+        """Apply a player action to the current piece.
+
+        Args:
+            action (Action): Action to apply
+        """
+        if self.game_over or not self.current_piece:
+            return
+        self.action_handlers[action]()
+
+    def advance(self, dt):
+        """Advance the simulation clock, applying gravity.
+
+        Args:
+            dt (float): Elapsed simulation time in ms
+        """
+        self.sim_time += dt
+        if self.current_state != GameState.PLAYING or self.game_over:
+            return
+
+        # Gravity is owed one row per fall_speed ms elapsed, including the
+        # time left over from earlier steps, so fast speeds move several
+        # rows per step instead of stalling at one per frame
+        self.fall_time += dt
+        if not self.fall_speed:
+            # Instant gravity: more rows than any drop, so the piece lands and locks
+            rows = self.grid_height + 1
+            self.fall_time = 0
+        elif self.fall_time < self.fall_speed:
+            return
+        else:
+            rows = int(self.fall_time // self.fall_speed)
+            self.fall_time -= rows * self.fall_speed
+        distance = self.drop_distance(rows)
+        if distance:
+            self.current_piece.move(0, distance)
+            if self.listeners:
+                self.notify(GameEvent.MOVE, self.current_piece)
+        if distance < rows:
+            # The piece landed with gravity to spare: lock it and spawn a new one
+            self.lock_piece()
+
+    def run_until(self, end_time, actions=()):
+        """Advance the simulation to ``end_time``, applying actions in order.
+
+        Gravity runs up to each action's timestamp before the action is
+        applied, so inputs take effect at their exact simulation time.
+
+        Args:
+            end_time (int): Simulation time in ms to advance to
+            actions (iterable): (timestamp, Action) tuples sorted by time
+        """
+        for timestamp, action in actions:
+            if self.game_over:
+                return
+            if timestamp > self.sim_time:
+                self.advance(timestamp - self.sim_time)
+            self.apply_action(action)
+        if end_time > self.sim_time:
+            self.advance(end_time - self.sim_time)
@@ -0,0 +1,306 @@
+"""
+Reinforcement learning environments over the game rules.
+
+The environments follow the Gymnasium API (``reset(seed)`` returns
+``(obs, info)``, ``step(action)`` returns ``(obs, reward, terminated,
+truncated, info)``) without depending on Gymnasium or pygame. Each step
+places one piece: ``action = rotation * width + x`` rotates the spawned
+piece ``rotation`` times clockwise, moves its left edge to column ``x``
+(clamped so the piece stays on the board) and hard-drops it.
+
+TetrisEnv wraps a GameEngine, so it plays by exactly the rules of the game.
+VectorTetrisEnv runs many games in one set of NumPy arrays, stepping all of
+them with array operations instead of one Python object per game; it is the
+one to use for training throughput.
+
+Requires NumPy (``pip install tetris[rl]``).
+"""
+
+import logging  # Import logging module for debugging
+import types
+
+import numpy as np
+
+from .constants import SHAPES, SCREEN_DIMENSIONS
+from .engine import GameEngine
+from .tetrimino import rotate_shape
+
+# Initialize logger
+logger = logging.getLogger(__name__)
+
+# Rotations tried per piece
+ROTATIONS = 4
+
+# Reward for clearing 0, 1, 2, 3 or 4 lines with one piece
+LINE_REWARDS = (0.0, 1.0, 3.0, 5.0, 8.0)
+
+def _shape_rotations(shape):
+    """Return the ``ROTATIONS`` clockwise rotations of ``shape``."""
+    rotations = [shape]
+    for _ in range(ROTATIONS - 1):
+        rotations.append(rotate_shape(rotations[-1]))
+    return rotations
+
+def _line_reward(lines, line_rewards):
+    """Return the reward for clearing ``lines`` lines."""
+    return line_rewards[min(lines, len(line_rewards) - 1)]
+
+class TetrisEnv:
+    """Single-game environment wrapping GameEngine.
+
+    Observations are ``{"board": uint8 array (height, width), "piece": int}``
+    where board cells hold piece-type ids (0 empty) and ``piece`` is the id of
+    the piece to place. The board array is a view of the engine's board
+    while its circular row storage starts at the top row, and a rolled copy
+    once clears or garbage have turned it, so it may or may not change as
+    the game goes on: copy it to keep it, and don't write to it.
+    """
+
+    def __init__(self, width=None, height=None, max_steps=None, line_rewards=LINE_REWARDS):
+        """Initialize the environment.
+
+        Args:
+            width (int, optional): Board columns. Defaults to SCREEN_DIMENSIONS.
+            height (int, optional): Board rows. Defaults to SCREEN_DIMENSIONS.
+            max_steps (int, optional): Truncate episodes after this many pieces
+            line_rewards (tuple): Reward per number of lines cleared at once
+        """
+        self.width = width or SCREEN_DIMENSIONS['GRID_WIDTH']
+        self.height = height or SCREEN_DIMENSIONS['GRID_HEIGHT']
+        self.num_actions = ROTATIONS * self.width
+        self.max_steps = max_steps
+        self.line_rewards = line_rewards
+        self.engine = GameEngine(types.SimpleNamespace(difficulty="Normal"), self.width, self.height)
+        self.steps = 0
+        self._board = None
+
+    def _observation(self):
+        """Return the current observation."""
+        board = self._board
+        offset = self.engine.grid.offset
+        if offset:
+            # Put the board's circular row storage in top-to-bottom order
+            board = np.roll(board, -offset, axis=0)
+        return {"board": board, "piece": self.engine.current_piece.kind}
+
+    def _info(self):
+        """Return the info dict."""
+        return {"score": self.engine.score, "lines": self.engine.total_lines, "steps": self.steps}
+
+    def reset(self, seed=None, options=None):
+        """Start a new episode.
+
+        Args:
+            seed (int, optional): Seed for the piece sequence
+            options (dict, optional): Unused; accepted for API compatibility
+
+        Returns:
+            tuple: (observation, info)
+        """
+        if seed is not None:
+            self.engine.seed(seed)
+        self.engine.reset_game()
+        self.steps = 0
+        self._board = np.frombuffer(self.engine.grid.cells, dtype=np.uint8).reshape(self.height, self.width)
+        return self._observation(), self._info()
+
+    def step(self, action):
+        """Place the current piece.
+
+        Args:
+            action (int): ``rotation * width + x``
+
+        Returns:
+            tuple: (observation, reward, terminated, truncated, info)
+        """
+        engine = self.engine
+        rotation, x = divmod(int(action), self.width)
+        piece = engine.current_piece
+        shape = _shape_rotations(piece.shape)[rotation % ROTATIONS]
+        piece.shape = shape
+        piece.x = min(x, self.width - len(shape[0]))
+        lines_before = engine.total_lines
+        if engine.check_collision():
+            # The placement is blocked at the top: the stack has topped out
+            engine.end_game()
+        else:
+            engine.hard_drop()
+        self.steps += 1
+
+        reward = _line_reward(engine.total_lines - lines_before, self.line_rewards)
+        terminated = engine.game_over
+        truncated = not terminated and self.max_steps is not None and self.steps >= self.max_steps
+        return self._observation(), reward, terminated, truncated, self._info()
+
+class VectorTetrisEnv:
+    """Many games stepped together with NumPy array operations.
+
+    All boards live in one ``(num_envs, height, width)`` uint8 array and each
+    step places one piece in every game at once. Games that end are reset in
+    the same step (their final score and lines are reported in ``info``), so
+    the returned observation is always playable.
+
+    Observations are ``{"board": (num_envs, height, width) uint8,
+    "piece": (num_envs,) uint8}``; both are the live state arrays.
+    """
+
+    def __init__(self, num_envs, width=None, height=None, max_steps=None, line_rewards=LINE_REWARDS):
+        """Initialize the environments.
+
+        Args:
+            num_envs (int): Number of games
+            width (int, optional): Board columns. Defaults to SCREEN_DIMENSIONS.
+            height (int, optional): Board rows. Defaults to SCREEN_DIMENSIONS.
+            max_steps (int, optional): Truncate episodes after this many pieces
+            line_rewards (tuple): Reward per number of lines cleared at once
+        """
+        self.num_envs = num_envs
+        self.width = width = width or SCREEN_DIMENSIONS['GRID_WIDTH']
+        self.height = height = height or SCREEN_DIMENSIONS['GRID_HEIGHT']
+        self.num_actions = ROTATIONS * width
+        self.max_steps = max_steps
+        self.line_rewards = np.asarray(line_rewards, dtype=np.float32)
+        self.rng = np.random.default_rng()
+
+        self.boards = np.zeros((num_envs, height, width), dtype=np.uint8)
+        self.pieces = np.zeros(num_envs, dtype=np.uint8)
+        # Row index of the highest block per column (height when empty)
+        self.tops = np.full((num_envs, width), height, dtype=np.int32)
+        self.scores = np.zeros(num_envs, dtype=np.int64)
+        self.lines = np.zeros(num_envs, dtype=np.int64)
+        self.steps = np.zeros(num_envs, dtype=np.int64)
+        self._build_tables()
+
+    def _build_tables(self):
+        """Precompute cell offsets for every (piece, rotation, x) placement."""
+        width = self.width
+        kinds = len(SHAPES) + 1
+        # Cell (row, column) offsets of each of the 4 blocks, per placement
+        self._cell_dy = np.zeros((kinds, self.num_actions, 4), dtype=np.int32)
+        self._cell_x = np.zeros((kinds, self.num_actions, 4), dtype=np.int32)
+        # Lowest and highest block row per board column (-1 where the
+        # piece has no block in that column)
+        self._bottom = np.full((kinds, self.num_actions, width), -1, dtype=np.int16)
+        self._top = np.full((kinds, self.num_actions, width), -1, dtype=np.int16)
+        self._height = np.zeros((kinds, self.num_actions), dtype=np.int32)
+        self._spawn_x = np.zeros(kinds, dtype=np.int32)
+        for info in SHAPES:
+            kind = info['id']
+            rotations = _shape_rotations(info['shape'])
+            self._spawn_x[kind] = width // 2 - len(info['shape'][0]) // 2
+            for action in range(self.num_actions):
+                rotation, x = divmod(action, width)
+                shape = rotations[rotation]
+                x = min(x, width - len(shape[0]))
+                blocks = [(dy, x + dx) for dy, row in enumerate(shape)
+                          for dx, cell in enumerate(row) if cell]
+                for index, (dy, column) in enumerate(blocks):
+                    self._cell_dy[kind, action, index] = dy
+                    self._cell_x[kind, action, index] = column
+                    self._bottom[kind, action, column] = max(self._bottom[kind, action, column], dy)
+                    if self._top[kind, action, column] < 0:
+                        self._top[kind, action, column] = dy
+                self._height[kind, action] = len(shape)
+
+    def _spawn(self, envs):
+        """Draw new pieces for ``envs``; return a mask of those that are blocked."""
+        kinds = self.rng.integers(1, len(SHAPES) + 1, size=len(envs), dtype=np.uint8)
+        self.pieces[envs] = kinds
+        # The spawn placement is rotation 0 at the spawn column
+        actions = self._spawn_x[kinds]
+        dy = self._cell_dy[kinds, actions]
+        columns = self._cell_x[kinds, actions]
+        return (self.boards[envs[:, None], dy, columns] != 0).any(axis=1)
+
+    def _reset_envs(self, envs):
+        """Clear the games in ``envs`` and spawn their first pieces."""
+        self.boards[envs] = 0
+        self.tops[envs] = self.height
+        self.scores[envs] = 0
+        self.lines[envs] = 0
+        self.steps[envs] = 0
+        self._spawn(envs)
+
+    def observation(self):
+        """Return the current observation."""
+        return {"board": self.boards, "piece": self.pieces}
+
+    def reset(self, seed=None, options=None):
+        """Reset every game.
+
+        Args:
+            seed (int, optional): Seed for the piece sequences
+            options (dict, optional): Unused; accepted for API compatibility
+
+        Returns:
+            tuple: (observation, info)
+        """
+        if seed is not None:
+            self.rng = np.random.default_rng(seed)
+        self._reset_envs(np.arange(self.num_envs))
+        return self.observation(), {}
+
+    def step(self, actions):
+        """Place the current piece in every game.
+
+        Args:
+            actions (array-like): One ``rotation * width + x`` action per game
+
+        Returns:
+            tuple: (observation, rewards, terminated, truncated, info)
+        """
+        envs = np.arange(self.num_envs)
+        kinds = self.pieces
+        actions = np.asarray(actions, dtype=np.int64) % self.num_actions
+        bottom = self._bottom[kinds, actions]
+        covered = bottom >= 0
+
+        # Hard drop: the piece stops one row above the highest block under it
+        landing = np.where(covered, self.tops - 1 - bottom, self.height).min(axis=1)
+        topped_out = landing < 0
+        placed = ~topped_out
+        landing = np.maximum(landing, 0)
+
+        rows = landing[:, None] + self._cell_dy[kinds, actions]
+        columns = self._cell_x[kinds, actions]
+        self.boards[envs[placed, None], rows[placed], columns[placed]] = kinds[placed, None]
+        new_tops = landing[:, None] + self._top[kinds, actions]
+        self.tops = np.where(covered & placed[:, None], np.minimum(self.tops, new_tops), self.tops)
+
+        # Line clears: only the rows under the piece can have filled up
+        piece_rows = landing[:, None] + np.arange(4)
+        in_board = (piece_rows < self.height) & (np.arange(4) < self._height[kinds, actions][:, None])
+        full = (self.boards[envs[:, None], np.minimum(piece_rows, self.height - 1)] != 0).all(axis=2)
+        full &= in_board & placed[:, None]
+        cleared = full.sum(axis=1)
+        for env in np.flatnonzero(cleared):
+            self._clear_rows(env, piece_rows[env][full[env]])
+
+        self.lines += cleared
+        self.scores += cleared * 100
+        self.steps += 1
+        rewards = self.line_rewards[np.minimum(cleared, len(self.line_rewards) - 1)]
+
+        blocked = self._spawn(envs)
+        terminated = topped_out | blocked
+        if self.max_steps is not None:
+            truncated = ~terminated & (self.steps >= self.max_steps)
+        else:
+            truncated = np.zeros(self.num_envs, dtype=bool)
+
+        info = {"score": self.scores.copy(), "lines": self.lines.copy()}
+        done = np.flatnonzero(terminated | truncated)
+        if len(done):
+            self._reset_envs(done)
+        return self.observation(), rewards, terminated, truncated, info
+
+    def _clear_rows(self, env, rows):
+        """Remove full ``rows`` from game ``env`` and recompute its column tops."""
+        board = self.boards[env]
+        keep = np.ones(self.height, dtype=bool)
+        keep[rows] = False
+        count = len(rows)
+        board[count:] = board[keep]
+        board[:count] = 0
+        filled = board != 0
+        self.tops[env] = np.where(filled.any(axis=0), filled.argmax(axis=0), self.height)
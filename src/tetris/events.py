@@ -0,0 +1,75 @@
+"""
+Module for pre-processing pygame events before dispatch.
+
+The main loop restricts the SDL event queue to the event types the current
+screen handles, collapses runs of MOUSEMOTION events into the latest
+position and hands each handler only the event types it is interested in.
+"""
+
+import pygame
+
+# Event types every screen needs: quitting, focus changes, window exposure
+# (which forces a redraw) and window resizing
+BASE_EVENT_TYPES = frozenset((
+    pygame.QUIT,
+    pygame.ACTIVEEVENT,
+    pygame.WINDOWFOCUSGAINED,
+    pygame.WINDOWEXPOSED,
+    pygame.VIDEOEXPOSE,
+    pygame.VIDEORESIZE,
+))
+
+def restrict_queue(event_types):
+    """Allow only ``event_types`` (plus BASE_EVENT_TYPES) into the SDL queue.
+
+    Args:
+        event_types (iterable): pygame event types to allow
+    """
+    pygame.event.set_blocked(None)
+    pygame.event.set_allowed(list(BASE_EVENT_TYPES.union(event_types)))
+
+def coalesce_motion(events):
+    """Collapse consecutive MOUSEMOTION events into the latest one.
+
+    Other events keep their order relative to the motion, so a click is
+    still seen after the motion that preceded it.
+
+    Args:
+        events (list): pygame events
+
+    Returns:
+        list: Events with motion runs collapsed
+    """
+    result = []
+    for event in events:
+        if event.type == pygame.MOUSEMOTION and result and result[-1].type == pygame.MOUSEMOTION:
+            result[-1] = event
+        else:
+            result.append(event)
+    return result
+
+def route(events, event_types):
+    """Return the events whose type is in ``event_types``.
+
+    Args:
+        events (list): pygame events
+        event_types (collection): Types the handler is interested in
+    """
+    return [event for event in events if event.type in event_types]
+
+class EventFilter:
+    """Class tracking which event types the SDL queue currently accepts."""
+
+    def __init__(self):
+        """Initialize with no restriction applied."""
+        self.event_types = None
+
+    def restrict(self, event_types):
+        """Restrict the queue to ``event_types`` if not already restricted to them.
+
+        Args:
+            event_types (frozenset): pygame event types to allow
+        """
+        if event_types != self.event_types:
+            restrict_queue(event_types)
+            self.event_types = event_types
@@ -0,0 +1,276 @@
+"""
+Module for exporting replays as video frames, headless and offline.
+
+ReplayRenderer plays a replay back on the game class of its mode and draws
+each video frame with the game's own ``draw`` onto an off-screen surface,
+using SDL's dummy video driver so no window is opened. Nothing waits on a
+clock: frames are produced as fast as the CPU allows.
+
+Frames go to one of two sinks, both fed straight from the surface's pixel
+buffer without intermediate Python copies:
+    RawFrameFile: A preallocated memory-mapped file with a small header
+        followed by fixed-size frames, for random access by other tools.
+    EncoderPipe: The stdin of a local encoder (ffmpeg by default).
+
+Usage:
+    python -m tetris.export REPLAY OUTPUT [--fps 60] [--tail 2]
+    python -m tetris.export ARCHIVE_DIR OUTPUT --game ID
+
+OUTPUT ending in ``.raw`` is written as a RawFrameFile; anything else is
+encoded by ffmpeg.
+"""
+
+import logging  # Import logging module for debugging
+import mmap
+import os
+import shutil
+import struct
+import subprocess
+import sys
+import types
+from .constants import SCREEN_DIMENSIONS, COLORS
+
+# Initialize logger
+logger = logging.getLogger(__name__)
+
+# Raw frame file header: magic, version, width, height, pitch, frame count,
+# fps, pixel format (byte order of one pixel, e.g. b"BGRX")
+RAW_MAGIC = b"TRAW"
+RAW_HEADER = struct.Struct(">4sBHHIIH4s")
+# Frames start at this offset so they stay aligned
+RAW_DATA_OFFSET = 64
+
+def ensure_headless():
+    """Initialize pygame's display and fonts, without a window if none is open."""
+    import pygame
+    if not pygame.display.get_init():
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        # Leave SIGINT and SIGTERM to Python so tools and workers can be stopped
+        os.environ.setdefault("SDL_NO_SIGNAL_HANDLERS", "1")
+        pygame.display.init()
+    if not pygame.font.get_init():
+        pygame.font.init()
+
+def pixel_format(surface):
+    """Return the in-memory byte order of a 32-bit surface's pixels, e.g. "BGRX"."""
+    names = dict(zip(surface.get_masks(), "RGBA"))
+    order = []
+    for index in range(4):
+        shift = 8 * index if sys.byteorder == "little" else 8 * (3 - index)
+        order.append(names.get(0xFF << shift, "X"))
+    return "".join(order)
+
+def game_class(mode):
+    """Return the game class that plays ``mode``."""
+    from .game import BaseGame, SpeedGame, BattleGame
+    for cls in (BaseGame, SpeedGame, BattleGame):
+        if cls.MODE == mode:
+            return cls
+    raise ValueError(f"unknown game mode {mode!r}")
+
+class ReplayRenderer:
+    """Draws a replay's frames on an off-screen surface."""
+
+    def __init__(self, replay, size=None):
+        """Set up a game for the replay's mode.
+
+        Args:
+            replay (Replay): Replay to render
+            size (tuple, optional): Frame size. Defaults to the logical screen size.
+        """
+        import pygame
+        ensure_headless()
+        self.replay = replay
+        self.size = tuple(size or (SCREEN_DIMENSIONS['WIDTH'], SCREEN_DIMENSIONS['HEIGHT']))
+        self.surface = pygame.Surface(self.size, 0, 32)
+        self.surface.fill(COLORS["BLACK"])
+        settings = types.SimpleNamespace(difficulty=replay.difficulty, controls={})
+        self.game = game_class(replay.mode)(self.surface, settings, None, replay.width, replay.height)
+        pygame.event.set_grab(False)
+
+    def frame_count(self, fps, tail=0.0):
+        """Return how many frames ``frames(fps, tail)`` yields."""
+        return self.replay.end_time * fps // 1000 + 1 + round(tail * fps)
+
+    def frames(self, fps=60, tail=0.0):
+        """Yield the surface once per video frame, drawn with the game state.
+
+        The state shown for a frame is the one at the end of the first
+        recorded update reaching the frame's time.
+
+        Args:
+            fps (int): Video frame rate
+            tail (float): Seconds to hold the final frame
+
+        Yields:
+            pygame.Surface: The (reused) frame surface
+        """
+        game = self.game
+        sample = 0
+        for end_time in self.replay.play(game):
+            if sample * 1000 > end_time * fps:
+                continue
+            game.draw()
+            while sample * 1000 <= end_time * fps:
+                yield self.surface
+                sample += 1
+        if sample == 0:
+            game.draw()
+            yield self.surface
+        game.draw()
+        for _ in range(round(tail * fps)):
+            yield self.surface
+
+class RawFrameFile:
+    """Preallocated memory-mapped file of fixed-size raw frames."""
+
+    def __init__(self, path, size, frame_count, fps, pixel_format="BGRX"):
+        """Create the file.
+
+        Args:
+            path (str): Output path
+            size (tuple): Frame width and height
+            frame_count (int): Number of frames the file holds
+            fps (int): Frame rate stored in the header
+            pixel_format (str): Byte order of one pixel
+        """
+        self.width, self.height = size
+        self.pitch = self.width * 4
+        self.frame_size = self.pitch * self.height
+        self.frame_count = frame_count
+        self.written = 0
+        with open(path, "wb") as f:
+            f.write(RAW_HEADER.pack(RAW_MAGIC, 1, self.width, self.height, self.pitch,
+                                    frame_count, fps, pixel_format.encode("ascii")))
+            f.truncate(RAW_DATA_OFFSET + self.frame_size * frame_count)
+        self.file = open(path, "r+b")
+        self.map = mmap.mmap(self.file.fileno(), 0)
+
+    def write_frame(self, surface):
+        """Copy a frame from the surface's pixel buffer into the next slot."""
+        if self.written >= self.frame_count:
+            raise ValueError("raw frame file is full")
+        start = RAW_DATA_OFFSET + self.written * self.frame_size
+        self.map[start:start + self.frame_size] = surface.get_buffer()
+        self.written += 1
+
+    def close(self):
+        """Flush and close the file."""
+        self.map.flush()
+        self.map.close()
+        self.file.close()
+
+def read_raw_frame(path, index):
+    """Return one frame of a RawFrameFile as a memoryview of a read-only map.
+
+    Returns:
+        tuple: (header dict, memoryview of the frame's pixels)
+    """
+    with open(path, "rb") as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    magic, _, width, height, pitch, frame_count, fps, fmt = RAW_HEADER.unpack_from(mapped)
+    if magic != RAW_MAGIC:
+        raise ValueError("not a raw frame file")
+    if not 0 <= index < frame_count:
+        raise IndexError("frame index out of range")
+    start = RAW_DATA_OFFSET + index * pitch * height
+    header = {"width": width, "height": height, "pitch": pitch, "frames": frame_count,
+              "fps": fps, "format": fmt.decode("ascii")}
+    return header, memoryview(mapped)[start:start + pitch * height]
+
+class EncoderPipe:
+    """Streams raw frames into an encoder process's stdin."""
+
+    def __init__(self, path, size, fps, pixel_format="BGRX", command=None):
+        """Start the encoder.
+
+        Args:
+            path (str): Output video path
+            size (tuple): Frame width and height
+            fps (int): Frame rate
+            pixel_format (str): Byte order of one pixel
+            command (list, optional): Encoder command reading raw frames on
+                stdin. Defaults to ffmpeg writing ``path``.
+
+        Raises:
+            RuntimeError: If no command is given and ffmpeg is not installed
+        """
+        if command is None:
+            if shutil.which("ffmpeg") is None:
+                raise RuntimeError("ffmpeg not found; write a .raw file instead")
+            width, height = size
+            command = ["ffmpeg", "-loglevel", "error", "-y",
+                       "-f", "rawvideo", "-pix_fmt", pixel_format.lower().replace("x", "0"),
+                       "-s", f"{width}x{height}", "-r", str(fps), "-i", "-",
+                       "-pix_fmt", "yuv420p", path]
+        self.process = subprocess.Popen(command, stdin=subprocess.PIPE)
+
+    def write_frame(self, surface):
+        """Send a frame straight from the surface's pixel buffer."""
+        self.process.stdin.write(surface.get_buffer())
+
+    def close(self):
+        """Finish the stream and wait for the encoder.
+
+        Raises:
+            RuntimeError: If the encoder failed
+        """
+        self.process.stdin.close()
+        if self.process.wait() != 0:
+            raise RuntimeError(f"encoder exited with status {self.process.returncode}")
+
+def export(replay, path, fps=60, tail=0.0, command=None):
+    """Render every frame of ``replay`` to ``path``.
+
+    Args:
+        replay (Replay): Replay to export
+        path (str): ``.raw`` for a RawFrameFile, otherwise a video file
+        fps (int): Video frame rate
+        tail (float): Seconds to hold the final frame
+        command (list, optional): Encoder command (see EncoderPipe)
+
+    Returns:
+        int: Number of frames written
+    """
+    renderer = ReplayRenderer(replay)
+    fmt = pixel_format(renderer.surface)
+    if path.endswith(".raw") and command is None:
+        sink = RawFrameFile(path, renderer.size, renderer.frame_count(fps, tail), fps, fmt)
+    else:
+        sink = EncoderPipe(path, renderer.size, fps, fmt, command)
+    count = 0
+    try:
+        for surface in renderer.frames(fps, tail):
+            sink.write_frame(surface)
+            count += 1
+    finally:
+        sink.close()
+    return count
+
+def main(argv=None):
+    """Export a replay file from the command line."""
+    import argparse
+    import time
+    from .replay import Replay
+
+    parser = argparse.ArgumentParser(description="Export a Tetris replay as video frames.")
+    parser.add_argument("replay", help="replay file, or archive directory with --game")
+    parser.add_argument("output", help="output .raw frame file or video file (needs ffmpeg)")
+    parser.add_argument("--fps", type=int, default=60, help="video frame rate")
+    parser.add_argument("--tail", type=float, default=2.0, help="seconds to hold the final frame")
+    parser.add_argument("--game", type=int, help="game id in the archive")
+    args = parser.parse_args(argv)
+
+    if args.game is not None:
+        from .archive import ReplayArchive
+        replay = ReplayArchive(args.replay).load(args.game)
+    else:
+        replay = Replay.load(args.replay)
+    start = time.perf_counter()
+    count = export(replay, args.output, args.fps, args.tail)
+    elapsed = time.perf_counter() - start
+    print(f"Wrote {count} frames to {args.output} in {elapsed:.2f}s "
+          f"({count / elapsed:.0f} frames/s, {count / args.fps / elapsed:.1f}x real time)")
+
+if __name__ == "__main__":
+    main()
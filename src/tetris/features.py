@@ -0,0 +1,286 @@
+"""
+Module for incrementally maintained board features.
+
+FeatureTracker keeps the board features used by AI heuristics and analytics
+(aggregate height, holes, bumpiness, wells, row and column transitions) up to
+date as the engine locks pieces and clears lines, touching only the columns
+and rows that changed instead of rescanning the board.
+
+Definitions:
+    heights: Rows from the floor to the highest block, per column.
+    holes: Empty cells below the highest block of their column.
+    bumpiness: Sum of height differences between neighbouring columns.
+    wells: Sum over columns of how far the column sits below both of its
+        neighbours (a wall counts as infinitely tall).
+    row transitions: Changes between empty and filled along each row, with
+        the walls counting as filled.
+    column transitions: Changes between empty and filled down each column,
+        from the empty space above the board to the filled floor.
+"""
+
+import logging  # Import logging module for debugging
+from array import array
+
+# Initialize logger
+logger = logging.getLogger(__name__)
+
+# Names of the entries of FeatureTracker.values, in order
+FEATURES = (
+    "aggregate_height",
+    "max_height",
+    "holes",
+    "bumpiness",
+    "wells",
+    "row_transitions",
+    "column_transitions",
+)
+AGGREGATE_HEIGHT, MAX_HEIGHT, HOLES, BUMPINESS, WELLS, ROW_TRANSITIONS, COLUMN_TRANSITIONS = range(len(FEATURES))
+
+# Translation table mapping every piece-type id to 1 (filled)
+_FILLED = bytes([0] + [1] * 255)
+
+def _transitions(sequence):
+    """Count changes between 0 and 1 in a 0/1 byte string."""
+    return sequence.count(b"\x00\x01") + sequence.count(b"\x01\x00")
+
+class FeatureTracker:
+    """Board features kept current by the engine.
+
+    ``values`` is an ``array('i')`` indexed by the constants in this module
+    (see FEATURES) and ``heights`` holds the per-column heights; both are
+    updated in place, so evaluators can hold on to them.
+    """
+
+    def __init__(self, board):
+        """Initialize the tracker from the current contents of ``board``.
+
+        Args:
+            board (Board): Board to track
+        """
+        self.board = board
+        self.values = array('i', [0] * len(FEATURES))
+        self.rebuild()
+
+    def rebuild(self):
+        """Recompute every feature from scratch.
+
+        Call this after changing the board other than through the engine.
+        """
+        board = self.board
+        self.heights = array('i', [0] * board.width)
+        self.column_holes = [0] * board.width
+        self.column_transitions = [0] * board.width
+        self.well_depths = [0] * board.width
+        self.row_transitions = [self._row_transitions(y) for y in range(board.height)]
+        for x in range(board.width):
+            self._store_column(x, self._column(x))
+        for x in range(board.width):
+            self.well_depths[x] = self._well_depth(x)
+
+        values = self.values
+        values[AGGREGATE_HEIGHT] = sum(self.heights)
+        values[MAX_HEIGHT] = max(self.heights)
+        values[HOLES] = sum(self.column_holes)
+        values[BUMPINESS] = sum(abs(self.heights[x] - self.heights[x + 1]) for x in range(board.width - 1))
+        values[WELLS] = sum(self.well_depths)
+        values[ROW_TRANSITIONS] = sum(self.row_transitions)
+        values[COLUMN_TRANSITIONS] = sum(self.column_transitions)
+
+    def as_dict(self):
+        """Return the features as a name-to-value dict."""
+        return dict(zip(FEATURES, self.values))
+
+    def _row_transitions(self, y):
+        """Return the row transitions of row ``y``."""
+        return _transitions(b"\x01" + self._row_bits(y) + b"\x01")
+
+    def _row_bits(self, y):
+        """Return row ``y`` as 0/1 bytes."""
+        start = self.board.row_start(y)
+        return self.board.cells[start:start + self.board.width].translate(_FILLED)
+
+    def _column(self, x):
+        """Return column ``x`` top to bottom as 0/1 bytes."""
+        return self.board.column(x).translate(_FILLED)
+
+    def _store_column(self, x, column):
+        """Store the height, holes and transitions of column ``x``.
+
+        Args:
+            x (int): Column index
+            column (bytes): Column contents top to bottom as 0/1 bytes
+        """
+        top = column.find(1)
+        if top < 0:
+            height = holes = 0
+        else:
+            height = len(column) - top
+            holes = column.count(0, top)
+        transitions = _transitions(b"\x00" + column + b"\x01")
+        self._set_column(x, height, holes, transitions)
+
+    def _set_column(self, x, height, holes, transitions):
+        """Store new per-column values and adjust the totals."""
+        values = self.values
+        values[AGGREGATE_HEIGHT] += height - self.heights[x]
+        values[HOLES] += holes - self.column_holes[x]
+        values[COLUMN_TRANSITIONS] += transitions - self.column_transitions[x]
+        self.heights[x] = height
+        self.column_holes[x] = holes
+        self.column_transitions[x] = transitions
+
+    def _update_wells(self, columns):
+        """Recompute the well depths of ``columns`` and their neighbours."""
+        values = self.values
+        for x in {x + dx for x in columns for dx in (-1, 0, 1)}:
+            if 0 <= x < len(self.heights):
+                depth = self._well_depth(x)
+                values[WELLS] += depth - self.well_depths[x]
+                self.well_depths[x] = depth
+
+    def _well_depth(self, x):
+        """Return the well depth of column ``x`` from the current heights."""
+        heights = self.heights
+        neighbours = []
+        if x > 0:
+            neighbours.append(heights[x - 1])
+        if x < len(heights) - 1:
+            neighbours.append(heights[x + 1])
+        if not neighbours:
+            return 0
+        return max(0, min(neighbours) - heights[x])
+
+    def _bumpiness_around(self, columns):
+        """Return the bumpiness contributed by neighbour pairs touching ``columns``."""
+        heights = self.heights
+        pairs = {x + dx for x in columns for dx in (-1, 0)}
+        return sum(abs(heights[x] - heights[x + 1]) for x in pairs if 0 <= x < len(heights) - 1)
+
+    def update_cells(self, columns, rows):
+        """Update the features after cells in ``columns`` x ``rows`` were filled.
+
+        Args:
+            columns (iterable): Columns that changed
+            rows (iterable): Rows that changed
+        """
+        values = self.values
+        columns = set(columns)
+        width = self.board.width
+
+        bumpiness_before = self._bumpiness_around(columns)
+        for x in columns:
+            self._store_column(x, self._column(x))
+        values[BUMPINESS] += self._bumpiness_around(columns) - bumpiness_before
+        values[MAX_HEIGHT] = max(self.heights)
+        self._update_wells(columns)
+
+        for y in rows:
+            transitions = self._row_transitions(y)
+            values[ROW_TRANSITIONS] += transitions - self.row_transitions[y]
+            self.row_transitions[y] = transitions
+
+    def remove_rows(self, rows):
+        """Update the features for full ``rows`` about to be cleared.
+
+        Must be called before the board removes them. A column whose highest
+        block is in a removed row is rescanned as it will be after the clear.
+        Every other column loses exactly ``len(rows)`` of height and keeps
+        its holes, so bumpiness and wells between such columns do not change;
+        only their column transitions across the removed rows need the
+        neighbouring cells.
+
+        Args:
+            rows (list): Full rows that will be removed
+        """
+        if not rows:
+            return
+        board = self.board
+        width = board.width
+        height = board.height
+        cells = board.cells
+        values = self.values
+        rows = sorted(rows)
+        removed = set(rows)
+        count = len(rows)
+
+        rescan = [x for x in range(width) if height - self.heights[x] in removed]
+        bumpiness_before = self._bumpiness_around(rescan)
+        shifted = [x for x in range(width) if height - self.heights[x] not in removed]
+
+        # Group the rows into runs of adjacent rows
+        runs = []
+        for y in rows:
+            if runs and runs[-1][1] == y - 1:
+                runs[-1][1] = y
+            else:
+                runs.append([y, y])
+        # A run of filled cells between two empty cells loses both of its
+        # transitions; any other neighbours keep the count unchanged. The
+        # space above the board is empty and the floor is filled.
+        for top, bottom in runs:
+            if bottom == height - 1:
+                continue
+            above = board.row_start(top - 1) if top else 0
+            below = board.row_start(bottom + 1)
+            for x in shifted:
+                if (top == 0 or not cells[above + x]) and not cells[below + x]:
+                    self.column_transitions[x] -= 2
+                    values[COLUMN_TRANSITIONS] -= 2
+        for x in shifted:
+            self.heights[x] -= count
+        values[AGGREGATE_HEIGHT] -= count * len(shifted)
+
+        for x in rescan:
+            column = self._column(x)
+            kept = b"".join(column[start + 1:end] for start, end in zip([-1] + rows, rows + [height]))
+            self._store_column(x, bytes(count) + kept)
+        if rescan:
+            values[BUMPINESS] += self._bumpiness_around(rescan) - bumpiness_before
+            self._update_wells(rescan)
+        values[MAX_HEIGHT] = max(self.heights)
+
+        for y in reversed(rows):
+            values[ROW_TRANSITIONS] -= self.row_transitions.pop(y)
+        # Rows entering at the top are empty: two transitions at the walls
+        self.row_transitions[:0] = [2] * count
+        values[ROW_TRANSITIONS] += 2 * count
+
+    def push_rows(self, count):
+        """Update the features after ``count`` rows were pushed in at the bottom.
+
+        Columns with blocks rise by ``count`` and gain the holes of the new
+        rows; only the cells of the new rows and the row above them are read.
+        If the push overflowed the top, everything is rebuilt instead.
+
+        Args:
+            count (int): Rows added
+        """
+        board = self.board
+        height = board.height
+        if count >= height or max(self.heights) + count > height:
+            self.rebuild()
+            return
+        values = self.values
+        old_transitions = sum(self.row_transitions[:count])
+        del self.row_transitions[:count]
+        new_rows = [self._row_bits(y) for y in range(height - count, height)]
+        self.row_transitions.extend(_transitions(b"\x01" + row + b"\x01") for row in new_rows)
+        values[ROW_TRANSITIONS] += sum(self.row_transitions[-count:]) - old_transitions
+
+        above = self._row_bits(height - count - 1)
+        for x in range(board.width):
+            new = bytes(row[x] for row in new_rows)
+            if self.heights[x]:
+                column_height = self.heights[x] + count
+                holes = self.column_holes[x] + new.count(0)
+            else:
+                top = new.find(1)
+                column_height = 0 if top < 0 else count - top
+                holes = 0 if top < 0 else new.count(0, top)
+            # The old column ended on the floor; it now ends on the new rows
+            transitions = (self.column_transitions[x] - (above[x] != 1)
+                           + (above[x] != new[0]) + _transitions(new + b"\x01"))
+            self._set_column(x, column_height, holes, transitions)
+        values[MAX_HEIGHT] = max(self.heights)
+        values[BUMPINESS] = sum(abs(self.heights[x] - self.heights[x + 1]) for x in range(board.width - 1))
+        self._update_wells(range(board.width))
@@ -2,189 +2,139 @@
 Main game module containing game logic for a Tetris game.
 
 This module includes the BaseGame class, which serves as the foundation for all game modes,
-inclusive of SpeedGame and BattleGame. The game logic handles piece movement, collision detection,
-line clearing, and game state management.
+inclusive of SpeedGame and BattleGame. BaseGame adds timing, input handling and rendering on top
+of the pygame-free rules in GameEngine (piece movement, collision detection, line clearing).
 """
 
-import random  # Import the random module to generate random pieces
 import pygame  # Import Pygame for graphics and game mechanics
 import logging  # Import logging module for debugging
-import unittest  # Import unittest module for testing
+import random  # Import random for replay seeds
 from .constants import (  # Import constants used in the game
     SCREEN_DIMENSIONS,
-    SHAPES,
-    COLORS, GameState
+    COLORS, PALETTE, GameState,
+    DEFAULT_DAS, DEFAULT_ARR
 )
-from .tetrimino import Tetrimino  # Import the Tetrimino class for game pieces
+from .controls import InputHandler  # Import the key-to-action input layer
+from .engine import GameEngine  # Import the pygame-free rules engine
+from .levels import LevelCurve  # Import the level-table speed curve
+from .replay import Replay  # Import replay recording
+from .ui import get_font  # Import the shared font cache
 
 # Initialize logger
 logger = logging.getLogger(__name__)
 
-class MockSettings:
-    """Mock settings class for testing purposes."""
-    def __init__(self, difficulty="Easy"):
-        self.difficulty = difficulty
-
-class BaseGame:
+class BaseGame(GameEngine):
     """Base class for all game modes."""
+
+    # Mode name used for high scores
+    MODE = "Classic"
+
+    # Event types handle_input reacts to
+    EVENT_TYPES = frozenset((pygame.QUIT, pygame.KEYDOWN, pygame.KEYUP))
     
-    # Cache fall speeds for different difficulty levels
-    FALL_SPEEDS = {
-        "Easy": SCREEN_DIMENSIONS['BLOCK_SIZE'] * 6,
-        "Normal": SCREEN_DIMENSIONS['BLOCK_SIZE'] * 5,
-        "Hard": SCREEN_DIMENSIONS['BLOCK_SIZE'] * 4
-    }
-    
-    def __init__(self, screen, settings, high_scores):
-        """Initialize the game."""
+    def __init__(self, screen, settings, high_scores, grid_width=None, grid_height=None):
+        """Initialize the game.
+
+        Args:
+            screen (pygame.Surface): Logical screen surface to draw on
+            settings (Settings): Game settings
+            high_scores (HighScores): High score table, or None
+            grid_width (int, optional): Board columns. Defaults to SCREEN_DIMENSIONS.
+            grid_height (int, optional): Board rows. Defaults to SCREEN_DIMENSIONS.
+        """
         self.screen = screen
-        self.settings = settings
         self.high_scores = high_scores
         pygame.display.set_caption("Tetris")
         self.clock = pygame.time.Clock()
-        self.current_state = GameState.PLAYING
         self.running = True
-        self.reset_game()
+        self.input = InputHandler(settings.controls,
+                                  getattr(settings, "das", DEFAULT_DAS),
+                                  getattr(settings, "arr", DEFAULT_ARR))
+        super().__init__(settings, grid_width, grid_height)
+        self.layout_board()
         pygame.event.set_grab(True)
 
-    def reset_game(self):
-        """Reset the game state."""
-        grid_width = SCREEN_DIMENSIONS['GRID_WIDTH']
-        grid_height = SCREEN_DIMENSIONS['GRID_HEIGHT']
-        self.grid = [[None for _ in range(grid_width)] for _ in range(grid_height)]
-        self.current_piece = None
-        self.fall_time = 0
-        self.fall_speed = self.FALL_SPEEDS.get(self.settings.difficulty, self.FALL_SPEEDS["Normal"])
-        self.game_over = False
-        self.score = 0
-        self.current_state = GameState.PLAYING
-        self.spawn_new_piece()
-
-    def spawn_new_piece(self):
-        """Create and spawn a new tetrimino."""
-        if self.game_over:
-            self.current_state = GameState.GAME_OVER
+    def layout_board(self):
+        """Fit the board into the logical screen.
+
+        Blocks shrink below BLOCK_SIZE when the board does not fit, down to a
+        single pixel, and the board is centered.
+        """
+        width = SCREEN_DIMENSIONS['WIDTH']
+        height = SCREEN_DIMENSIONS['HEIGHT']
+        self.block_size = max(1, min(SCREEN_DIMENSIONS['BLOCK_SIZE'],
+                                     width // self.grid_width,
+                                     height // self.grid_height))
+        self.grid_offset_x = (width - self.grid_width * self.block_size) // 2
+        self.grid_offset_y = max(0, (height - self.grid_height * self.block_size) // 2)
+        # Cached grid lines and board (lines plus locked blocks)
+        self._grid_surface = None
+        self._board_surface = None
+
+    def reset_game(self, seed=None):
+        """Reset the game state and start recording a replay.
+
+        Args:
+            seed (int, optional): Seed for the piece sequence; random if omitted
+        """
+        self.score_recorded = False
+        self.score_text = None
+        self.input.reset()
+        if seed is None:
+            seed = random.getrandbits(32)
+        self.replay = Replay(seed, self.MODE, self.grid_width, self.grid_height, self.settings.difficulty,
+                             getattr(self, "LEVELS", None))
+        super().reset_game(seed)
+        # Time spent before the restart (the game over screen) isn't game
+        # time; without this the first update would owe it all to gravity
+        self.clock.tick()
+        # Real time (pygame ticks) of sim_time, for stamping input events
+        self._frame_ticks = pygame.time.get_ticks()
+
+    def record_score(self):
+        """Submit the final score to the high scores once per game.
+
+        Submission is queued to a background writer, so this never blocks
+        the game loop on disk.
+        """
+        if self.score_recorded:
             return
-
-        # Get a random shape
-        shape_info = random.choice(SHAPES)
-        
-        # Calculate starting position
-        start_x = SCREEN_DIMENSIONS['GRID_WIDTH'] // 2 - len(shape_info['shape'][0]) // 2
-        start_y = 0
-        
-        # Create the new piece
-        self.current_piece = Tetrimino(start_x, start_y, shape_info)
-        
-        # Check if the new piece can be placed
-        if self.check_collision():
-            self.game_over = True
-            self.current_state = GameState.GAME_OVER
-
-    def check_collision(self, x_offset=0, y_offset=0, shape=None):
-        """Check if the current piece collides with anything."""
-        if not self.current_piece:
-            return False
-
-        # Use provided shape or current piece's shape
-        piece_shape = shape if shape is not None else self.current_piece.shape
-
-        # Check each cell of the piece
-        for y, row in enumerate(piece_shape):
-            for x, cell in enumerate(row):
-                if cell:
-                    abs_x = self.current_piece.x + x + x_offset
-                    abs_y = self.current_piece.y + y + y_offset
-
-                    # Check for collisions with walls or existing blocks
-                    if (abs_x < 0 or abs_x >= SCREEN_DIMENSIONS['GRID_WIDTH'] or 
-                        abs_y >= SCREEN_DIMENSIONS['GRID_HEIGHT'] or 
-                        (abs_y >= 0 and self.grid[abs_y][abs_x] is not None)):
-                        return True  # Collision detected
-        return False  # No collision detected
-
-    def lock_piece(self):
-        """Lock the current piece in place."""
-        if not self.current_piece:
+        self.score_recorded = True
+        self.replay.score = self.score
+        if self.high_scores is None:
             return
-        
-        for y, row in enumerate(self.current_piece.shape):
-            for x, cell in enumerate(row):
-                if cell:
-                    abs_y = self.current_piece.y + y
-                    abs_x = self.current_piece.x + x
-                    
-                    # Check if piece is within grid bounds
-                    if 0 <= abs_y < SCREEN_DIMENSIONS['GRID_HEIGHT'] and 0 <= abs_x < SCREEN_DIMENSIONS['GRID_WIDTH']:
-                        self.grid[abs_y][abs_x] = self.current_piece.color
-                    else:
-                        self.game_over = True
-                        self.current_state = GameState.GAME_OVER
-                        return
-
-        # Clear any completed lines and update score
-        lines_cleared = self.clear_lines()
-        if lines_cleared > 0:
-            self.score += lines_cleared * 100
-
-        # Spawn a new piece
-        self.spawn_new_piece()
-        
-        # Check if the new piece can be placed
-        if self.check_collision():
-            self.game_over = True
-            self.current_state = GameState.GAME_OVER
-
-    def clear_lines(self):
-        """Clear completed lines."""
-        lines_cleared = 0
-        y = SCREEN_DIMENSIONS['GRID_HEIGHT'] - 1
-        
-        while y >= 0:
-            if all(cell is not None for cell in self.grid[y]):
-                lines_cleared += 1
-                # Move all lines above this one down
-                for move_y in range(y, 0, -1):
-                    self.grid[move_y] = self.grid[move_y - 1][:]
-                # Clear the top line
-                self.grid[0] = [None] * SCREEN_DIMENSIONS['GRID_WIDTH']
-            else:
-                y -= 1
-
-        return lines_cleared
+        if self.score > 0:
+            self.high_scores.submit_score(self.score, self.MODE)
 
     def update(self):
         """Update game state."""
         if self.current_state == GameState.GAME_OVER:
+            self.record_score()
             return
 
         if not self.current_piece:
             self.spawn_new_piece()
             if self.check_collision():
-                self.game_over = True
-                self.current_state = GameState.GAME_OVER
+                self.end_game()
                 return
 
         if self.current_state == GameState.PLAYING and not self.game_over:
-            # Update fall time
-            self.fall_time += self.clock.get_rawtime()
-            self.clock.tick()
-
-            # Move piece down if enough time has passed
-            if self.fall_time >= self.fall_speed:
-                self.fall_time = 0
-                
-                # Check if piece can move down
-                if not self.check_collision(y_offset=1):
-                    self.current_piece.move(0, 1)
-                else:
-                    # Lock the piece and spawn a new one
-                    self.lock_piece()
-                    if self.game_over:
-                        self.current_state = GameState.GAME_OVER
+            # Advance the simulation clock by the real time elapsed, applying
+            # queued and auto-repeated input at their simulation timestamps
+            end_time = self.sim_time + self.clock.tick()
+            self._frame_ticks = pygame.time.get_ticks()
+            self.input.update(end_time)
+            # An event stamped a little past the clock's tick belongs to this frame
+            actions = [(min(timestamp, end_time), action) for timestamp, action in self.input.drain()]
+            self.replay.add_frame(end_time, actions)
+            self.run_until(end_time, actions)
 
     def handle_input(self, events):
-        """Handle player input."""
+        """Handle player input.
+
+        Bound keys are forwarded to the input handler, which queues actions
+        for the next update; menu keys are handled here.
+        """
         for event in events:
             if event.type == pygame.QUIT:
                 self.running = False
@@ -203,32 +153,25 @@ class BaseGame:
                     
                 if event.key == pygame.K_ESCAPE:
                     return GameState.PAUSE
-                    
-                if event.key == pygame.K_LEFT:
-                    if not self.check_collision(x_offset=-1):
-                        self.current_piece.move(-1, 0)
-                elif event.key == pygame.K_RIGHT:
-                    if not self.check_collision(x_offset=1):
-                        self.current_piece.move(1, 0)
-                elif event.key == pygame.K_DOWN:
-                    if not self.check_collision(y_offset=1):
-                        self.current_piece.move(0, 1)
-                elif event.key == pygame.K_UP:
-                    # Store current shape
-                    current_shape = self.current_piece.shape
-                    # Rotate the piece
-                    self.current_piece.rotate()
-                    # If rotation causes collision, revert back
-                    if self.check_collision():
-                        self.current_piece.shape = current_shape
-                elif event.key == pygame.K_SPACE:
-                    # Hard drop
-                    while not self.check_collision(y_offset=1):
-                        self.current_piece.move(0, 1)
-                    self.lock_piece()
+
+                self.input.key_down(event.key, self.event_time(event))
+            elif event.type == pygame.KEYUP:
+                self.input.key_up(event.key, self.event_time(event))
         
         return None
 
+    def event_time(self, event):
+        """Return the simulation time of an input event.
+
+        The event's real time (its timestamp where pygame provides one,
+        otherwise now) is mapped onto the simulation clock from the last
+        update, so DAS starts and releases keep their place within a frame.
+        """
+        ticks = getattr(event, "timestamp", None)
+        if ticks is None:
+            ticks = pygame.time.get_ticks()
+        return self.sim_time + max(0, ticks - self._frame_ticks)
+
     def draw(self):
         """Draw the game state."""
         self.clear_screen()
@@ -240,81 +183,118 @@ class BaseGame:
             self.draw_score()
         elif self.current_state == GameState.GAME_OVER:
             self.render_game_over()
-        
-        if pygame.get_init():
-            pygame.display.flip()
 
     def clear_screen(self):
         """Clear the screen with black color."""
         self.screen.fill(COLORS["BLACK"])
 
+    def _grid_background(self):
+        """Return the cached surface holding the empty grid and its lines."""
+        if self._grid_surface is None:
+            block_size = self.block_size
+            pixel_width = self.grid_width * block_size
+            pixel_height = self.grid_height * block_size
+            surface = pygame.Surface((pixel_width + 1, pixel_height + 1))
+            surface.fill(COLORS["BLACK"])
+            # Lines would cover the whole board when blocks are tiny
+            if block_size >= 4:
+                for x in range(self.grid_width + 1):
+                    pygame.draw.line(surface, COLORS["GRAY"],
+                                     (x * block_size, 0), (x * block_size, pixel_height))
+                for y in range(self.grid_height + 1):
+                    pygame.draw.line(surface, COLORS["GRAY"],
+                                     (0, y * block_size), (pixel_width, y * block_size))
+            self._grid_surface = surface
+        return self._grid_surface
+
     def draw_grid(self):
         """Draw the grid border and lines."""
         # Draw grid border
         border_rect = pygame.Rect(
-            SCREEN_DIMENSIONS['GRID_OFFSET_X'] - 2,
-            SCREEN_DIMENSIONS['GRID_OFFSET_Y'] - 2,
-            SCREEN_DIMENSIONS['GRID_WIDTH'] * SCREEN_DIMENSIONS['BLOCK_SIZE'] + 4,
-            SCREEN_DIMENSIONS['GRID_HEIGHT'] * SCREEN_DIMENSIONS['BLOCK_SIZE'] + 4
+            self.grid_offset_x - 2,
+            self.grid_offset_y - 2,
+            self.grid_width * self.block_size + 4,
+            self.grid_height * self.block_size + 4
         )
         pygame.draw.rect(self.screen, COLORS["WHITE"], border_rect, 2)
-        
+
         # Draw grid lines
-        for x in range(SCREEN_DIMENSIONS['GRID_WIDTH'] + 1):
-            pygame.draw.line(
-                self.screen,
-                COLORS["GRAY"],
-                (SCREEN_DIMENSIONS['GRID_OFFSET_X'] + x * SCREEN_DIMENSIONS['BLOCK_SIZE'], SCREEN_DIMENSIONS['GRID_OFFSET_Y']),
-                (SCREEN_DIMENSIONS['GRID_OFFSET_X'] + x * SCREEN_DIMENSIONS['BLOCK_SIZE'], 
-                 SCREEN_DIMENSIONS['GRID_OFFSET_Y'] + SCREEN_DIMENSIONS['GRID_HEIGHT'] * SCREEN_DIMENSIONS['BLOCK_SIZE'])
-            )
-        for y in range(SCREEN_DIMENSIONS['GRID_HEIGHT'] + 1):
-            pygame.draw.line(
-                self.screen,
-                COLORS["GRAY"],
-                (SCREEN_DIMENSIONS['GRID_OFFSET_X'], SCREEN_DIMENSIONS['GRID_OFFSET_Y'] + y * SCREEN_DIMENSIONS['BLOCK_SIZE']),
-                (SCREEN_DIMENSIONS['GRID_OFFSET_X'] + SCREEN_DIMENSIONS['GRID_WIDTH'] * SCREEN_DIMENSIONS['BLOCK_SIZE'],
-                 SCREEN_DIMENSIONS['GRID_OFFSET_Y'] + y * SCREEN_DIMENSIONS['BLOCK_SIZE'])
-            )
+        self.screen.blit(self._grid_background(), (self.grid_offset_x, self.grid_offset_y))
+
+    def redraw_rows(self, top, bottom):
+        """Redraw board rows ``top``..``bottom`` on the cached board surface.
+
+        Args:
+            top (int): First row to redraw
+            bottom (int): Last row to redraw
+        """
+        surface = self._board_surface
+        background = self._grid_background()
+        width = self.grid.width
+        block_size = self.block_size
+        inner = block_size - 1 if block_size > 2 else block_size
+        row_width = width * block_size
+
+        # Leading empty rows of the range are restored in one blit
+        first = top
+        segment = self.grid.linear(top, bottom + 1)
+        stack_top = top + (len(segment) - len(segment.lstrip(b"\0"))) // width
+        if top < stack_top:
+            empty_bottom = min(bottom, stack_top - 1)
+            area = pygame.Rect(0, top * block_size, row_width, (empty_bottom - top + 1) * block_size)
+            surface.blit(background, area, area)
+            top = empty_bottom + 1
+
+        for y in range(top, bottom + 1):
+            area = pygame.Rect(0, y * block_size, row_width, block_size)
+            surface.blit(background, area, area)
+            start = (y - first) * width
+            for x, kind in enumerate(segment[start:start + width]):
+                if kind:
+                    surface.fill(PALETTE[kind], (x * block_size, y * block_size, inner, inner))
 
     def draw_filled_blocks(self):
-        """Draw filled blocks on the grid."""
-        for y in range(SCREEN_DIMENSIONS['GRID_HEIGHT']):
-            for x in range(SCREEN_DIMENSIONS['GRID_WIDTH']):
-                if self.grid[y][x]:
-                    pygame.draw.rect(
-                        self.screen,
-                        self.grid[y][x],
-                        (SCREEN_DIMENSIONS['GRID_OFFSET_X'] + x * SCREEN_DIMENSIONS['BLOCK_SIZE'],
-                         SCREEN_DIMENSIONS['GRID_OFFSET_Y'] + y * SCREEN_DIMENSIONS['BLOCK_SIZE'],
-                         SCREEN_DIMENSIONS['BLOCK_SIZE'] - 1,
-                         SCREEN_DIMENSIONS['BLOCK_SIZE'] - 1)
-                    )
+        """Draw filled blocks on the grid.
+
+        Locked blocks live on a cached surface; only the rows the engine
+        reports as changed are redrawn, so a frame costs one blit whatever
+        the board size.
+        """
+        if self._board_surface is None:
+            self._board_surface = self._grid_background().copy()
+            self.changed_rows = (0, self.grid.height - 1)
+        if self.changed_rows:
+            self.redraw_rows(*self.changed_rows)
+            self.changed_rows = None
+        self.screen.blit(self._board_surface, (self.grid_offset_x, self.grid_offset_y))
 
     def draw_current_piece(self):
         """Draw the current piece on the grid."""
         if self.current_piece:
+            block_size = self.block_size
+            inner = block_size - 1 if block_size > 2 else block_size
             for y, row in enumerate(self.current_piece.shape):
                 for x, cell in enumerate(row):
                     if cell:
                         pygame.draw.rect(
                             self.screen,
                             self.current_piece.color,
-                            (SCREEN_DIMENSIONS['GRID_OFFSET_X'] + (self.current_piece.x + x) * SCREEN_DIMENSIONS['BLOCK_SIZE'],
-                             SCREEN_DIMENSIONS['GRID_OFFSET_Y'] + (self.current_piece.y + y) * SCREEN_DIMENSIONS['BLOCK_SIZE'],
-                             SCREEN_DIMENSIONS['BLOCK_SIZE'] - 1,
-                             SCREEN_DIMENSIONS['BLOCK_SIZE'] - 1)
+                            (self.grid_offset_x + (self.current_piece.x + x) * block_size,
+                             self.grid_offset_y + (self.current_piece.y + y) * block_size,
+                             inner,
+                             inner)
                         )
 
     def draw_score(self):
         """Draw the current score on the screen."""
-        font = pygame.font.Font(None, 36)
-        score_text = font.render(f"Score: {self.score}", True, COLORS["WHITE"])
-        self.screen.blit(score_text, (10, 10))
+        # Render the text only when the score changes
+        if self.score_text is None or self.score_text[0] != self.score:
+            self.score_text = (self.score, get_font(36).render(f"Score: {self.score}", True, COLORS["WHITE"]))
+        self.screen.blit(self.score_text[1], (10, 10))
 
     def render_game_over(self):
         """Render the game over screen."""
-        font = pygame.font.Font(None, 48)
+        font = get_font(48)
         game_over_text = font.render("GAME OVER", True, COLORS["RED"])
         score_text = font.render(f"Final Score: {self.score}", True, COLORS["WHITE"])
         restart_text = font.render("Press ENTER to restart", True, COLORS["WHITE"])
@@ -326,35 +306,19 @@ class BaseGame:
         self.screen.blit(game_over_text, game_over_rect)
         self.screen.blit(score_text, score_rect)
         self.screen.blit(restart_text, restart_rect)
-        
-        if pygame.get_init():
-            pygame.display.flip()
 
     def render_main_menu(self):
         """Render the main menu screen."""
         # Code to display the main menu goes here
         pass
 
-class SpeedGame(BaseGame):
-    """Class for the Speed Game mode."""
-    def __init__(self, screen, settings, high_scores):
-        super().__init__(screen, settings, high_scores)
-        self.speed_factor = 1.0
-        self.lines_cleared = 0
-        self.min_fall_speed = 50  # Minimum fall speed (fastest)
-
-    def clear_lines(self):
-        """Clear completed lines and update speed."""
-        lines_cleared = super().clear_lines()
-        if lines_cleared > 0:
-            self.lines_cleared += lines_cleared
-            # Increase speed by 10% for each line cleared
-            self.speed_factor *= (0.9 ** lines_cleared)
-            # Calculate new fall speed
-            new_fall_speed = int(self.FALL_SPEEDS[self.settings.difficulty] * self.speed_factor)
-            # Ensure fall speed doesn't go below minimum
-            self.fall_speed = max(self.min_fall_speed, new_fall_speed)
-        return lines_cleared
+class SpeedGame(LevelCurve, BaseGame):
+    """Class for the Speed Game mode.
+
+    The fall speed follows LEVELS (see LevelCurve); main loads the tuned
+    table at startup.
+    """
+    MODE = "Speed"
 
     def update(self):
         """Update the game state for the Speed Game mode."""
@@ -366,21 +330,78 @@ class SpeedGame(BaseGame):
 
 class BattleGame(BaseGame):
     """Class for the Battle Game mode."""
-    def __init__(self, screen, settings, high_scores):
-        super().__init__(screen, settings, high_scores)
+    MODE = "Battle"
+
+    # Garbage rows sent for clearing 0 to 4 lines at once
+    GARBAGE_LINES = (0, 0, 1, 2, 4)
+
+    def __init__(self, screen, settings, high_scores, grid_width=None, grid_height=None):
+        # Game receiving this game's garbage (see connect)
+        self.opponent = None
+        # Picks the empty column of incoming garbage
+        self.garbage_rng = random.Random()
+        super().__init__(screen, settings, high_scores, grid_width, grid_height)
+
+    def reset_game(self, seed=None):
+        """Reset the game state, including the opponent's."""
         self.opponent_score = 0
         self.opponent_lines_cleared = 0
         self.opponent_level = 1
+        # Garbage rows received and not yet added to the board
+        self.pending_garbage = 0
+        self.garbage_sent = 0
+        super().reset_game(seed)
+        # Seeded from the replay's seed, which BaseGame picks when none is given
+        self.garbage_rng.seed(self.replay.seed)
+
+    def connect(self, opponent):
+        """Make this game and ``opponent`` send their garbage to each other."""
+        self.opponent = opponent
+        opponent.opponent = self
+
+    def receive_garbage(self, rows):
+        """Queue garbage rows; they are added when a piece locks without clearing."""
+        self.pending_garbage += rows
+        # The opponent's clears aren't in this game's inputs
+        self.replay.add_garbage(self.sim_time, rows)
+
+    def lock_piece(self):
+        """Lock the current piece, then add the waiting garbage if it cleared nothing.
 
-    def clear_lines(self):
-        """Clear completed lines and update opponent score."""
-        lines_cleared = super().clear_lines()
+        The garbage goes in after the next piece has spawned, so only that
+        piece is lifted; the locked one is already part of the stack. All
+        the rows have the same empty column.
+        """
+        if self.current_piece is None:
+            return
+        lines = self.total_lines
+        super().lock_piece()
+        if self.total_lines == lines and self.pending_garbage and not self.game_over:
+            count, self.pending_garbage = self.pending_garbage, 0
+            self.add_garbage(count, self.garbage_rng.randrange(self.grid.width))
+
+    def clear_lines(self, rows=None):
+        """Clear completed lines, update opponent score and exchange garbage.
+
+        Clearing sends garbage (see GARBAGE_LINES), which first cancels
+        garbage waiting to be added to this board (see lock_piece).
+        """
+        lines_cleared = super().clear_lines(rows)
         if lines_cleared > 0:
             # Update opponent score based on lines cleared
             self.opponent_lines_cleared += lines_cleared
             self.opponent_score += lines_cleared * 100 * self.opponent_level
             # Level up opponent every 10 lines
             self.opponent_level = (self.opponent_lines_cleared // 10) + 1
+
+            attack = self.GARBAGE_LINES[min(lines_cleared, 4)]
+            cancelled = min(attack, self.pending_garbage)
+            self.pending_garbage -= cancelled
+            attack -= cancelled
+            if attack:
+                self.garbage_sent += attack
+                if self.opponent is not None:
+                    self.opponent.receive_garbage(attack)
         return lines_cleared
 
     def update(self):
@@ -391,37 +412,6 @@ class BattleGame(BaseGame):
         """Draw the game elements on the screen for the Battle Game mode."""
         super().draw()
         # Draw opponent score
-        font = pygame.font.Font(None, 36)
+        font = get_font(36)
         score_text = font.render(f"Opponent: {self.opponent_score}", True, COLORS["WHITE"])
         self.screen.blit(score_text, (10, 10))
-        if pygame.get_init():
-            pygame.display.flip()
-
-class TestBaseGame(unittest.TestCase):
-    def test_spawn_new_piece(self):
-        game = BaseGame(None, MockSettings(), None)
-        game.reset_game()
-        self.assertIsNotNone(game.current_piece)
-
-    def test_check_collision(self):
-        game = BaseGame(None, MockSettings(), None)
-        game.reset_game()
-        game.current_piece = Tetrimino(0, 0, {'shape': [[1, 1], [1, 1]], 'color': COLORS["YELLOW"]})
-        self.assertTrue(game.check_collision())
-
-    def test_lock_piece(self):
-        game = BaseGame(None, MockSettings(), None)
-        game.reset_game()
-        game.current_piece = Tetrimino(0, 0, {'shape': [[1, 1], [1, 1]], 'color': COLORS["YELLOW"]})
-        game.lock_piece()
-        self.assertIsNotNone(game.grid[0][0])
-
-    def test_clear_lines(self):
-        game = BaseGame(None, MockSettings(), None)
-        game.reset_game()
-        game.grid = [[1 for _ in range(10)] for _ in range(10)]
-        lines_cleared = game.clear_lines()
-        self.assertEqual(lines_cleared, 10)
-
-if __name__ == '__main__':
-    unittest.main()
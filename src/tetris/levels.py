@@ -0,0 +1,152 @@
+"""
+Module for the level table: Speed mode's fall speed by lines cleared.
+
+The table maps each difficulty to a list of fall speeds (milliseconds per
+row), one per level, where the level is the lines cleared divided by
+``lines_per_level``; past the end of the list the last speed holds. The
+default table is the hand-tuned curve (10% faster per line, never faster
+than 50 ms per row); ``python -m tetris.tuner`` fits a table to simulated
+games and writes it to the data directory, where the game loads it at
+startup.
+"""
+
+import json
+import logging  # Import logging module for debugging
+import os
+from .engine import GameEngine
+
+# Initialize logger
+logger = logging.getLogger(__name__)
+
+# Default level table file name (in the data directory)
+LEVEL_TABLE_FILE = "level_table.json"
+VERSION = 1
+
+# Hand-tuned curve: speed factor per level and fastest fall speed (ms per row)
+DEFAULT_DECAY = 0.9
+MIN_FALL_SPEED = 50
+
+# Levels generated for a curve that never reaches its floor
+MAX_LEVELS = 1000
+
+def curve_speeds(base, decay, floor):
+    """Return the fall speed of each level until the floor is reached.
+
+    Args:
+        base (int): Fall speed of level 0 (ms per row)
+        decay (float): Speed factor per level, below 1 to speed up
+        floor (int): Fastest fall speed
+
+    Returns:
+        list: ``max(floor, int(base * decay ** level))`` for each level
+    """
+    speeds = []
+    for level in range(MAX_LEVELS):
+        speed = max(floor, int(base * decay ** level))
+        speeds.append(speed)
+        if speed == floor or decay >= 1:
+            break
+    return speeds
+
+class LevelTable:
+    """Fall speeds by difficulty and level."""
+
+    def __init__(self, fall_speeds, lines_per_level=1, metadata=None):
+        """Initialize the table.
+
+        Args:
+            fall_speeds (dict): Difficulty -> list of fall speeds by level
+            lines_per_level (int): Lines cleared per level
+            metadata (dict, optional): How the table was made, kept in the file
+        """
+        self.fall_speeds = {difficulty: list(speeds) for difficulty, speeds in fall_speeds.items()}
+        self.lines_per_level = lines_per_level
+        self.metadata = metadata or {}
+
+    def fall_speed(self, difficulty, lines):
+        """Return the fall speed after ``lines`` cleared lines.
+
+        Args:
+            difficulty (str): Difficulty name; unknown names use Normal
+            lines (int): Lines cleared so far
+        """
+        speeds = self.fall_speeds.get(difficulty) or self.fall_speeds["Normal"]
+        return speeds[min(lines // self.lines_per_level, len(speeds) - 1)]
+
+    def to_dict(self):
+        """Return the table as JSON-serializable data."""
+        return {"version": VERSION, "lines_per_level": self.lines_per_level,
+                "fall_speeds": self.fall_speeds, "metadata": self.metadata}
+
+    @classmethod
+    def from_dict(cls, data):
+        """Build a table from to_dict's data.
+
+        Raises:
+            ValueError: If the data is not a valid level table
+        """
+        if not isinstance(data, dict) or data.get("version") != VERSION:
+            raise ValueError("unsupported level table version")
+        fall_speeds = data.get("fall_speeds")
+        lines_per_level = data.get("lines_per_level", 1)
+        if (not isinstance(fall_speeds, dict) or "Normal" not in fall_speeds
+                or not isinstance(lines_per_level, int) or lines_per_level < 1):
+            raise ValueError("level table needs Normal fall speeds and a positive lines_per_level")
+        for difficulty, speeds in fall_speeds.items():
+            # Fractional speeds express gravity above a row per millisecond
+            if not speeds or not all(isinstance(speed, (int, float)) and speed > 0 for speed in speeds):
+                raise ValueError(f"bad fall speeds for {difficulty!r}")
+        return cls(fall_speeds, lines_per_level, data.get("metadata"))
+
+def default_table():
+    """Return the table of the hand-tuned curve."""
+    return LevelTable({difficulty: curve_speeds(base, DEFAULT_DECAY, MIN_FALL_SPEED)
+                       for difficulty, base in GameEngine.FALL_SPEEDS.items()})
+
+class LevelCurve:
+    """Engine mixin: the fall speed follows a level table as lines are cleared.
+
+    Put it before the engine class in the bases. ``LEVELS`` is the table;
+    assign a class or instance attribute to use another one.
+    """
+
+    LEVELS = default_table()
+
+    def reset_game(self, seed=None):
+        """Reset the game at the table's first fall speed."""
+        self.speed_factor = 1.0
+        self.lines_cleared = 0
+        super().reset_game(seed)
+        self.fall_speed = self.LEVELS.fall_speed(self.settings.difficulty, 0)
+
+    def clear_lines(self, rows=None):
+        """Clear completed lines and update the fall speed from the table."""
+        lines_cleared = super().clear_lines(rows)
+        if lines_cleared > 0:
+            self.lines_cleared += lines_cleared
+            base = self.LEVELS.fall_speed(self.settings.difficulty, 0)
+            self.fall_speed = self.LEVELS.fall_speed(self.settings.difficulty, self.lines_cleared)
+            self.speed_factor = self.fall_speed / base
+        return lines_cleared
+
+def load_level_table(path=None):
+    """Return the level table at ``path`` (default: the data directory).
+
+    A missing or invalid file gives the default table.
+    """
+    if path is None:
+        from .storage import data_path
+        path = data_path(LEVEL_TABLE_FILE)
+    if not os.path.exists(path):
+        return default_table()
+    try:
+        with open(path) as f:
+            return LevelTable.from_dict(json.load(f))
+    except (OSError, ValueError) as e:
+        logger.warning("Ignoring level table %s: %s", path, e)
+        return default_table()
+
+def save_level_table(table, path=None):
+    """Write ``table`` to ``path`` (default: the data directory) atomically."""
+    from .storage import atomic_write_json, data_path
+    atomic_write_json(path or data_path(LEVEL_TABLE_FILE), table.to_dict())
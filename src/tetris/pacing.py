@@ -0,0 +1,69 @@
+"""
+Module for frame pacing of the main loop.
+
+During gameplay the loop ticks at a fixed frame rate. On static screens
+(menus, pause, game over) FramePacer instead blocks in pygame.event.wait()
+until input arrives or a timeout passes, and frames are rendered only when
+input arrived or the visible state changed, so an idle kiosk sleeps instead
+of redrawing 60 times a second.
+"""
+
+import pygame
+
+class FramePacer:
+    """Class deciding when the main loop waits and when it renders."""
+
+    def __init__(self, fps=60, idle_timeout=1000, adaptive=True):
+        """Initialize the pacer.
+
+        Args:
+            fps (int): Frame rate while animating
+            idle_timeout (int): Longest wait in ms for input while idle
+            adaptive (bool): False to tick and render every frame regardless
+        """
+        self.fps = fps
+        self.idle_timeout = idle_timeout
+        self.adaptive = adaptive
+        self.clock = pygame.time.Clock()
+        self.dirty = True
+        self.last_view = None
+
+    def invalidate(self):
+        """Force the next frame to render."""
+        self.dirty = True
+
+    def get_events(self, idle):
+        """Wait for the next frame and return its events.
+
+        Args:
+            idle (bool): True if nothing on screen animates
+
+        Returns:
+            list: Pending pygame events
+        """
+        if self.adaptive and idle and not self.dirty:
+            event = pygame.event.wait(self.idle_timeout)
+            events = [] if event.type == pygame.NOEVENT else [event]
+            events.extend(pygame.event.get())
+            # Restart the frame timer so the wait isn't counted as a long frame
+            self.clock.tick()
+        else:
+            self.clock.tick(self.fps)
+            events = pygame.event.get()
+        if events:
+            self.dirty = True
+        return events
+
+    def should_render(self, view, animating):
+        """Return True if the frame needs to be drawn.
+
+        Args:
+            view: Hashable description of what is on screen; a change
+                forces a render
+            animating (bool): True if the screen changes every frame
+        """
+        if not self.adaptive or animating or self.dirty or view != self.last_view:
+            self.last_view = view
+            self.dirty = False
+            return True
+        return False
@@ -0,0 +1,240 @@
+"""
+Module for finding the key presses that bring a piece to a lock position.
+
+The planner searches the states ``(x, y, r)`` of a piece, ``r`` being the
+number of clockwise rotations from the spawn orientation modulo the piece's
+rotation period, under the engine's own rules: MOVE_LEFT, MOVE_RIGHT and
+SOFT_DROP shift the piece by one cell, ROTATE turns the shape about its
+top-left corner without kicks, and each is refused if the result collides.
+HARD_DROP drops the piece as far as it goes and locks it. Every press counts
+as one keystroke; gravity is assumed slower than the inputs.
+
+A breadth-first search from the spawn state gives the fewest presses to
+every reachable state, so the lock positions include tucks (moving under an
+overhang after a soft drop) and spins that a straight hard drop can't reach.
+
+The search is split at the highest block on the board. Above it only the
+walls matter, so distances there depend on the piece, the board width and
+how many rows are clear, and are memoized per such region and reused for
+every board with the same clearance. Only the states among the stack are
+searched per board, starting from the memoized region's states.
+"""
+
+import collections
+import logging  # Import logging module for debugging
+from .constants import SHAPES, Action
+from .tetrimino import rotate_shape
+
+# Initialize logger
+logger = logging.getLogger(__name__)
+
+# Rows or columns spanned by the largest piece
+MAX_PIECE_SIZE = 4
+
+# Moves searched, in tie-break order: (action, dx, dy, rotations)
+MOVES = (
+    (Action.ROTATE, 0, 0, 1),
+    (Action.MOVE_LEFT, -1, 0, 0),
+    (Action.MOVE_RIGHT, 1, 0, 0),
+    (Action.SOFT_DROP, 0, 1, 0),
+)
+
+def _piece_cycles():
+    """Return, per piece-type id, its shapes in rotation order.
+
+    Each entry is ``(width, height, cells)`` with ``cells`` the (dx, dy)
+    offsets of the blocks; the list is as long as the rotation period.
+    """
+    cycles = [None]
+    for info in SHAPES:
+        shapes = []
+        shape = info['shape']
+        while not shapes or shape != info['shape']:
+            cells = [(dx, dy) for dy, row in enumerate(shape) for dx, cell in enumerate(row) if cell]
+            shapes.append((len(shape[0]), len(shape), cells))
+            shape = rotate_shape(shape)
+        cycles.append(shapes)
+    return cycles
+
+# Shapes in rotation order by piece-type id
+CYCLES = _piece_cycles()
+
+def spawn_state(kind, width):
+    """Return the state the engine spawns a piece in."""
+    return (width // 2 - CYCLES[kind][0][0] // 2, 0, 0)
+
+def _fits(cells, width, height, shape, x, y):
+    """Return True if a shape at (x, y) is inside the board and on empty cells."""
+    shape_width, shape_height, offsets = shape
+    if x < 0 or y < 0 or x + shape_width > width or y + shape_height > height:
+        return False
+    if cells is None:
+        return True
+    for dx, dy in offsets:
+        if cells[(y + dy) * width + x + dx]:
+            return False
+    return True
+
+class Planner:
+    """Finds minimal key sequences to every lock position of a piece."""
+
+    def __init__(self):
+        # (kind, width, clear rows) -> (distances, parents) of the open region
+        self.regions = {}
+
+    def _region(self, kind, width, clear):
+        """Return the memoized search of the rows above the stack.
+
+        States whose piece lies entirely within the top ``clear`` rows can't
+        touch a block, so their distances only depend on the walls.
+        """
+        key = (kind, width, clear)
+        region = self.regions.get(key)
+        if region is None:
+            distances, parents = self._search(None, width, clear, kind)
+            # Only states within a piece's height of the stack have moves
+            # leaving the region (a soft drop from the region's floor, or a
+            # rotation into a taller shape); the search among the stack
+            # starts there
+            boundary = {state: distance for state, distance in distances.items()
+                        if state[1] + MAX_PIECE_SIZE >= clear}
+            region = self.regions[key] = (distances, parents, boundary)
+        return region
+
+    def _search(self, cells, width, height, kind, seeds=None):
+        """Breadth-first search from the spawn state or from seeded states.
+
+        Args:
+            cells (bytes): Occupancy bytes, or None for an empty board
+            width (int): Board columns
+            height (int): Board rows searched
+            kind (int): Piece-type id
+            seeds (dict, optional): Known state distances to continue from;
+                without them the search starts at the spawn state
+
+        Returns:
+            tuple: (distances, parents) where parents map a state to
+            ``(previous state, action)``
+        """
+        shapes = CYCLES[kind]
+        period = len(shapes)
+        distances = dict(seeds or {})
+        parents = {}
+        if not seeds:
+            start = spawn_state(kind, width)
+            if not _fits(cells, width, height, shapes[0], start[0], start[1]):
+                return distances, parents
+            distances[start] = 0
+        # Seeds have different distances, so expand level by level
+        levels = {}
+        for state, distance in distances.items():
+            levels.setdefault(distance, []).append(state)
+        distance = 0
+        while levels:
+            frontier = levels.pop(distance, [])
+            distance += 1
+            for state in frontier:
+                x, y, r = state
+                for action, dx, dy, turns in MOVES:
+                    following = (x + dx, y + dy, (r + turns) % period)
+                    if following in distances:
+                        continue
+                    if not _fits(cells, width, height, shapes[following[2]], following[0], following[1]):
+                        continue
+                    distances[following] = distance
+                    parents[following] = (state, action)
+                    levels.setdefault(distance, []).append(following)
+        return distances, parents
+
+    def reachable(self, cells, width, height, kind):
+        """Return the fewest presses to every reachable state.
+
+        Args:
+            cells (bytes): Occupancy bytes (see bot.occupancy)
+            width (int): Board columns
+            height (int): Board rows
+            kind (int): Piece-type id
+
+        Returns:
+            tuple: (distances, parents) mappings; see path
+        """
+        top = cells.find(1)
+        clear = height if top < 0 else top // width
+        region_distances, region_parents, boundary = self._region(kind, width, clear)
+        if clear == height:
+            return region_distances, region_parents
+        distances, parents = self._search(cells, width, height, kind, boundary)
+        merged = dict(region_distances)
+        merged.update(distances)
+        return merged, collections.ChainMap(parents, region_parents)
+
+    def lock_positions(self, cells, width, height, kind):
+        """Return the minimal key sequence to every lock position.
+
+        Args:
+            cells (bytes): Occupancy bytes
+            width (int): Board columns
+            height (int): Board rows
+            kind (int): Piece-type id
+
+        Returns:
+            dict: ``(x, y, r)`` of each lock position -> list of Actions,
+            ending with HARD_DROP
+        """
+        distances, parents = self.reachable(cells, width, height, kind)
+        positions = {}
+        for r, shape in enumerate(CYCLES[kind]):
+            for x in range(width - shape[0] + 1):
+                # A hard drop from any state above a lock position in the
+                # same column and rotation lands on it; take the nearest
+                nearest = None
+                for y in range(height - shape[1] + 1):
+                    state = (x, y, r)
+                    if state not in distances:
+                        nearest = None
+                        continue
+                    if nearest is None or distances[state] < distances[nearest]:
+                        nearest = state
+                    # A reachable state that can move down reaches the
+                    # state below by a soft drop
+                    if (x, y + 1, r) not in distances:
+                        positions[state] = path(parents, nearest) + [Action.HARD_DROP]
+        return positions
+
+    def placement_path(self, cells, width, height, kind, rotation, x):
+        """Return the key sequence for a bot placement, or None if unreachable.
+
+        Args:
+            cells (bytes): Occupancy bytes
+            width (int): Board columns
+            height (int): Board rows
+            kind (int): Piece-type id
+            rotation (int): Clockwise rotations from the spawn orientation
+            x (int): Column of the piece's left edge
+
+        Returns:
+            list: Actions ending with HARD_DROP, or None if the straight drop
+            can't be reached by key presses
+        """
+        shapes = CYCLES[kind]
+        r = rotation % len(shapes)
+        y = 0
+        if not _fits(cells, width, height, shapes[r], x, y):
+            return None
+        while _fits(cells, width, height, shapes[r], x, y + 1):
+            y += 1
+        return self.lock_positions(cells, width, height, kind).get((x, y, r))
+
+def path(parents, state):
+    """Return the actions leading from the start of a search to ``state``."""
+    actions = []
+    while state in parents:
+        state, action = parents[state]
+        actions.append(action)
+    actions.reverse()
+    return actions
+
+def play_path(engine, actions):
+    """Apply a key sequence from the planner to an engine's current piece."""
+    for action in actions:
+        engine.apply_action(action)
@@ -0,0 +1,280 @@
+"""
+Module for recording and replaying games.
+
+A game is fully determined by its piece seed, mode, board size, difficulty
+and the inputs applied at each update. Replay stores those, with each
+update ("frame") encoded as the simulation time it advanced to plus the
+timestamped actions applied during it. Frames are encoded into a compact
+byte string as they are recorded, so a long game costs a few bytes per
+frame.
+
+Playing a replay back calls ``run_until`` with the recorded frames, which
+reproduces the game exactly, including gravity. Speed games also record the
+level table they were played with, so a replay keeps its speed curve after
+the table is retuned. Battle games record the garbage rows received from
+the opponent with the time they arrived, since they aren't determined by
+the game's own inputs.
+"""
+
+import collections
+import json
+import logging  # Import logging module for debugging
+import os
+import struct
+import time
+from .constants import Action, SCREEN_DIMENSIONS
+from .levels import LevelTable, default_table
+from .storage import data_path
+
+# Initialize logger
+logger = logging.getLogger(__name__)
+
+MAGIC = b"TRPL"
+# Version 1 stored action counts and text lengths in one byte; version 2
+# stores them as varints; version 3 adds the level table; version 4 adds
+# garbage records. All are read.
+VERSION = 4
+READ_VERSIONS = (1, 2, 3, 4)
+
+# Magic, version, seed, width, height, score, end time, frame count
+HEADER = struct.Struct(">4sBIHHIII")
+
+# Action codes in the encoded frames
+ACTIONS = list(Action)
+ACTION_CODES = {action: code for code, action in enumerate(ACTIONS)}
+
+# Code of a garbage record among the actions of a frame; the row count follows
+GARBAGE_CODE = 0xFF
+
+# Garbage rows received from the opponent, in place of an Action
+Garbage = collections.namedtuple("Garbage", "rows")
+
+# Directory (under the data directory) that finished games are saved to
+REPLAY_DIR = "replays"
+
+def _write_varint(buffer, value):
+    """Append an unsigned LEB128 integer to ``buffer``."""
+    while value >= 0x80:
+        buffer.append(value & 0x7F | 0x80)
+        value >>= 7
+    buffer.append(value)
+
+def _read_varint(data, offset):
+    """Read an unsigned LEB128 integer; return ``(value, new offset)``."""
+    value = shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
+
+def _read_count(data, offset, version):
+    """Read a count written by a replay of ``version``; return ``(count, new offset)``."""
+    if version == 1:
+        return data[offset], offset + 1
+    return _read_varint(data, offset)
+
+def _write_text(buffer, text, version=VERSION):
+    """Append a length-prefixed UTF-8 string in the encoding of ``version``."""
+    encoded = text.encode("utf-8")
+    if version == 1:
+        buffer.append(len(encoded))
+    else:
+        _write_varint(buffer, len(encoded))
+    buffer += encoded
+
+def _read_text(data, offset, version=VERSION):
+    """Read a length-prefixed UTF-8 string; return ``(text, new offset)``."""
+    length, offset = _read_count(data, offset, version)
+    return bytes(data[offset:offset + length]).decode("utf-8"), offset + length
+
+class Replay:
+    """Recorded inputs of one game."""
+
+    def __init__(self, seed, mode="Classic", width=None, height=None, difficulty="Normal", levels=None):
+        """Start an empty recording.
+
+        Args:
+            seed (int): Seed of the game's piece generator
+            mode (str): Game mode name (BaseGame.MODE)
+            width (int, optional): Board columns. Defaults to SCREEN_DIMENSIONS.
+            height (int, optional): Board rows. Defaults to SCREEN_DIMENSIONS.
+            difficulty (str): Difficulty the game was played at
+            levels (LevelTable, optional): Level table of a Speed game
+        """
+        self.seed = seed
+        self.mode = mode
+        self.width = width or SCREEN_DIMENSIONS['GRID_WIDTH']
+        self.height = height or SCREEN_DIMENSIONS['GRID_HEIGHT']
+        self.difficulty = difficulty
+        self.levels = levels
+        self.score = 0
+        self.end_time = 0
+        self.frame_count = 0
+        self.data = bytearray()
+        # Encoding of ``data``; replays loaded from older files keep theirs
+        self.version = VERSION
+        # (timestamp, Garbage) received since the last frame
+        self._garbage = []
+
+    def add_garbage(self, timestamp, rows):
+        """Record garbage rows received; they are stored with the next frame.
+
+        Args:
+            timestamp (int): Simulation time in ms the rows arrived at
+            rows (int): Rows received
+        """
+        self._garbage.append((timestamp, Garbage(rows)))
+
+    def add_frame(self, end_time, actions=()):
+        """Record one update.
+
+        Args:
+            end_time (int): Simulation time in ms the update advanced to
+            actions (list): (timestamp, Action) tuples applied during it
+        """
+        data = self.data
+        start = self.end_time
+        if self._garbage:
+            # Received between updates, so before any of this frame's input
+            actions = self._garbage + list(actions)
+            self._garbage = []
+        _write_varint(data, end_time - start)
+        _write_varint(data, len(actions))
+        for timestamp, action in actions:
+            _write_varint(data, timestamp - start)
+            if isinstance(action, Garbage):
+                data.append(GARBAGE_CODE)
+                _write_varint(data, action.rows)
+            else:
+                data.append(ACTION_CODES[action])
+        self.end_time = end_time
+        self.frame_count += 1
+
+    def frames(self):
+        """Yield the recorded updates.
+
+        Yields:
+            tuple: (end time, list of (timestamp, Action or Garbage))
+        """
+        data = self.data
+        version = self.version
+        offset = 0
+        start = 0
+        for _ in range(self.frame_count):
+            delta, offset = _read_varint(data, offset)
+            count, offset = _read_count(data, offset, version)
+            actions = []
+            for _ in range(count):
+                timestamp, offset = _read_varint(data, offset)
+                code = data[offset]
+                offset += 1
+                if code == GARBAGE_CODE and version >= 4:
+                    rows, offset = _read_varint(data, offset)
+                    actions.append((start + timestamp, Garbage(rows)))
+                else:
+                    actions.append((start + timestamp, ACTIONS[code]))
+            start += delta
+            yield start, actions
+
+    def play(self, game, until=None):
+        """Replay the recorded updates on ``game``.
+
+        Args:
+            game (GameEngine): Game of the recorded mode and board size
+            until (int, optional): Stop after the first frame reaching this time
+
+        Yields:
+            int: Simulation time after each frame
+        """
+        if hasattr(game, "LEVELS"):
+            # Replays from before tables were recorded used the default one
+            game.LEVELS = self.levels or default_table()
+        game.reset_game(self.seed)
+        for end_time, actions in self.frames():
+            start = 0
+            for index, (timestamp, action) in enumerate(actions):
+                if isinstance(action, Garbage):
+                    game.run_until(timestamp, actions[start:index])
+                    game.receive_garbage(action.rows)
+                    start = index + 1
+            game.run_until(end_time, actions[start:])
+            yield end_time
+            if until is not None and end_time >= until:
+                return
+
+    def to_bytes(self):
+        """Return the replay encoded as bytes."""
+        out = bytearray(HEADER.pack(MAGIC, self.version, self.seed, self.width, self.height,
+                                    self.score, self.end_time, self.frame_count))
+        _write_text(out, self.mode, self.version)
+        _write_text(out, self.difficulty, self.version)
+        if self.version >= 3:
+            levels = ""
+            if self.levels is not None:
+                # The speeds are enough to replay; the tuning metadata isn't kept
+                table = self.levels.to_dict()
+                del table["metadata"]
+                levels = json.dumps(table, separators=(",", ":"))
+            _write_text(out, levels, self.version)
+        out += self.data
+        return bytes(out)
+
+    @classmethod
+    def from_bytes(cls, data):
+        """Decode a replay produced by to_bytes.
+
+        Args:
+            data (bytes-like): Encoded replay; may be a memoryview or mmap slice
+
+        Raises:
+            ValueError: If the data is not a replay
+        """
+        if len(data) < HEADER.size:
+            raise ValueError("truncated replay")
+        magic, version, seed, width, height, score, end_time, frame_count = HEADER.unpack_from(data)
+        if magic != MAGIC or version not in READ_VERSIONS:
+            raise ValueError("not a replay")
+        mode, offset = _read_text(data, HEADER.size, version)
+        difficulty, offset = _read_text(data, offset, version)
+        levels = None
+        if version >= 3:
+            text, offset = _read_text(data, offset, version)
+            if text:
+                try:
+                    levels = LevelTable.from_dict(json.loads(text))
+                except ValueError as e:
+                    raise ValueError(f"bad level table: {e}") from None
+        replay = cls(seed, mode, width, height, difficulty, levels)
+        replay.version = version
+        replay.score = score
+        replay.end_time = end_time
+        replay.frame_count = frame_count
+        replay.data = bytearray(data[offset:])
+        return replay
+
+    def save(self, path):
+        """Write the replay to ``path``."""
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path):
+        """Read a replay written by save."""
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read())
+
+def save_replay(replay):
+    """Save a finished game's replay to the data directory.
+
+    Returns:
+        str: Path of the saved file
+    """
+    directory = data_path(REPLAY_DIR)
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"{time.strftime('%Y%m%d-%H%M%S')}-{replay.seed:08x}.replay")
+    replay.save(path)
+    logger.info("Saved replay to %s", path)
+    return path
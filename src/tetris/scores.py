@@ -0,0 +1,289 @@
+"""
+Module containing storage backends for high scores.
+
+HighScores (in settings.py) is a facade over one of these backends:
+
+- JsonScoreBackend keeps the classic behaviour: a short, sorted list of the
+  best scores rewritten to ``highscores.json``.
+- SqliteScoreBackend keeps every submitted score in an indexed SQLite table,
+  giving O(log n) inserts and top-K queries per mode and per mode and day,
+  for deployments with large per-mode, per-day leaderboards. A range of
+  several days still sorts the scores of those days.
+
+Score entries are dicts with ``score``, ``mode`` and ``date`` (YYYY-MM-DD).
+ScoreWriter persists entries on a background thread so the game loop never
+waits on disk.
+"""
+
+import json
+import logging
+import queue
+import threading
+from .storage import atomic_write_json
+
+# Initialize logger
+logger = logging.getLogger(__name__)
+
+
+def _in_range(entry, date_from, date_to):
+    """Return True if the entry's date lies in the inclusive range."""
+    if date_from is not None and entry["date"] < date_from:
+        return False
+    if date_to is not None and entry["date"] > date_to:
+        return False
+    return True
+
+
+class JsonScoreBackend:
+    """Backend keeping the best ``max_scores`` entries in a JSON file."""
+
+    def __init__(self, path, max_scores=10):
+        """Initialize the backend.
+
+        Args:
+            path (str): JSON file path
+            max_scores (int): Number of entries kept
+        """
+        self.path = path
+        self.max_scores = max_scores
+        self._lock = threading.Lock()
+        self.entries = self._read()
+
+    def _read(self):
+        """Read entries from disk, returning an empty list if unavailable."""
+        try:
+            with open(self.path, "r") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return []
+        except ValueError as e:
+            logger.warning("Ignoring unreadable high score file %s: %s", self.path, e)
+            return []
+
+    def add_many(self, entries):
+        """Add entries and persist the updated list.
+
+        Args:
+            entries (list): Score entries to add
+        """
+        with self._lock:
+            self.entries.extend(entries)
+            self.entries.sort(key=lambda x: x["score"], reverse=True)
+            del self.entries[self.max_scores:]
+            self._write()
+
+    def add(self, entry):
+        """Add a single score entry."""
+        self.add_many([entry])
+
+    def top(self, mode=None, limit=None, date_from=None, date_to=None):
+        """Return the best entries, optionally filtered by mode and date range.
+
+        Args:
+            mode (str, optional): Game mode to filter by
+            limit (int, optional): Maximum number of entries
+            date_from (str, optional): First date included (YYYY-MM-DD)
+            date_to (str, optional): Last date included (YYYY-MM-DD)
+
+        Returns:
+            list: Entries sorted by descending score
+        """
+        with self._lock:
+            result = [entry for entry in self.entries
+                      if (mode is None or entry["mode"] == mode)
+                      and _in_range(entry, date_from, date_to)]
+        return result[:limit] if limit is not None else result
+
+    def save(self):
+        """Write the entries to disk."""
+        with self._lock:
+            self._write()
+
+    def _write(self):
+        """Write the entries to disk; the caller holds the lock."""
+        atomic_write_json(self.path, self.entries)
+
+    def close(self):
+        """Release resources (nothing to do for JSON files)."""
+
+
+class SqliteScoreBackend:
+    """Backend storing every score in an indexed SQLite table."""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS scores (
+            id INTEGER PRIMARY KEY,
+            score INTEGER NOT NULL,
+            mode TEXT NOT NULL,
+            date TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS scores_by_score ON scores (score DESC);
+        CREATE INDEX IF NOT EXISTS scores_by_mode ON scores (mode, score DESC);
+        CREATE INDEX IF NOT EXISTS scores_by_mode_date ON scores (mode, date, score DESC);
+    """
+
+    def __init__(self, path):
+        """Initialize the backend.
+
+        Args:
+            path (str): SQLite database path (``":memory:"`` for tests)
+        """
+        # Imported here so the default JSON backend doesn't pay for sqlite3 at startup
+        import sqlite3
+        self.path = path
+        self._lock = threading.Lock()
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(self.SCHEMA)
+
+    def add_many(self, entries):
+        """Insert entries in a single transaction.
+
+        Args:
+            entries (list): Score entries to add
+        """
+        rows = [(entry["score"], entry["mode"], entry["date"]) for entry in entries]
+        with self._lock, self.connection:
+            self.connection.executemany(
+                "INSERT INTO scores (score, mode, date) VALUES (?, ?, ?)", rows)
+
+    def add(self, entry):
+        """Add a single score entry."""
+        self.add_many([entry])
+
+    def top(self, mode=None, limit=None, date_from=None, date_to=None):
+        """Return the best entries, optionally filtered by mode and date range.
+
+        A mode alone, or a mode and a single day (``date_from == date_to``),
+        reads the first ``limit`` rows of an index already in score order.
+        A range of several days spans several runs of that index, so SQLite
+        sorts every score in the range before applying the limit.
+
+        Args:
+            mode (str, optional): Game mode to filter by
+            limit (int, optional): Maximum number of entries
+            date_from (str, optional): First date included (YYYY-MM-DD)
+            date_to (str, optional): Last date included (YYYY-MM-DD)
+
+        Returns:
+            list: Entries sorted by descending score
+        """
+        query, params = self._top_query(mode, limit, date_from, date_to)
+        with self._lock:
+            rows = self.connection.execute(query, params).fetchall()
+        return [{"score": score, "mode": mode, "date": date} for score, mode, date in rows]
+
+    def _top_query(self, mode, limit, date_from, date_to):
+        """Return the SQL and parameters of a top() query."""
+        clauses = []
+        params = []
+        if mode is not None:
+            clauses.append("mode = ?")
+            params.append(mode)
+        if date_from is not None and date_from == date_to:
+            # Equality keeps (mode, date, score DESC) in score order
+            clauses.append("date = ?")
+            params.append(date_from)
+            date_from = date_to = None
+        if date_from is not None:
+            clauses.append("date >= ?")
+            params.append(date_from)
+        if date_to is not None:
+            clauses.append("date <= ?")
+            params.append(date_to)
+        query = "SELECT score, mode, date FROM scores"
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        query += " ORDER BY score DESC, id ASC"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+        return query, params
+
+    def save(self):
+        """Nothing to do: every insert is committed."""
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self.connection.close()
+
+
+class ScoreWriter:
+    """Background thread that writes score entries to a backend in batches.
+
+    ``submit`` only enqueues and never blocks; the worker drains everything
+    queued so far and hands it to ``backend.add_many`` in one call.
+    """
+
+    _STOP = object()
+
+    def __init__(self, backend, batch_size=256):
+        """Initialize and start the writer thread.
+
+        Args:
+            backend: Score backend with an ``add_many`` method
+            batch_size (int): Maximum entries written per batch
+        """
+        self.backend = backend
+        self.batch_size = batch_size
+        self._queue = queue.Queue()
+        self._pending = 0
+        self._idle = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="ScoreWriter", daemon=True)
+        self._thread.start()
+
+    def submit(self, entry):
+        """Queue a score entry for writing.
+
+        Args:
+            entry (dict): Score entry
+        """
+        with self._idle:
+            self._pending += 1
+        self._queue.put(entry)
+
+    def flush(self, timeout=None):
+        """Wait until every submitted entry has been written.
+
+        Args:
+            timeout (float, optional): Maximum seconds to wait
+
+        Returns:
+            bool: True if the queue was fully written
+        """
+        with self._idle:
+            return self._idle.wait_for(lambda: self._pending == 0, timeout)
+
+    def close(self, timeout=None):
+        """Write remaining entries and stop the thread.
+
+        Args:
+            timeout (float, optional): Maximum seconds to wait
+        """
+        if self._thread.is_alive():
+            self._queue.put(self._STOP)
+            self._thread.join(timeout)
+
+    def _run(self):
+        """Worker loop: batch queued entries and write them."""
+        stopping = False
+        while not stopping:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if self._STOP in batch:
+                stopping = True
+                batch = [entry for entry in batch if entry is not self._STOP]
+            if batch:
+                try:
+                    self.backend.add_many(batch)
+                except Exception:
+                    logger.exception("Failed to write %d high score(s)", len(batch))
+            with self._idle:
+                self._pending -= len(batch)
+                self._idle.notify_all()
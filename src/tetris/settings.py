@@ -2,53 +2,85 @@
 Module for managing game settings and high scores.
 """
 
-import json
 from datetime import datetime
-from .constants import (
-    DEFAULT_SETTINGS
-)
+from . import constants
+from .scores import JsonScoreBackend, ScoreWriter
+from .storage import SettingsStore, data_path
 
 class Settings:
     """Class for managing game settings."""
     
-    def __init__(self):
-        """Initialize settings with default values."""
-        self.music_volume = DEFAULT_SETTINGS["MUSIC_VOLUME"]
-        self.sfx_volume = DEFAULT_SETTINGS["SFX_VOLUME"]
-        self.difficulty = DEFAULT_SETTINGS["DIFFICULTY"]
-        self.controls = DEFAULT_SETTINGS["CONTROLS"].copy()
+    def __init__(self, path=None):
+        """Initialize settings with default values.
+
+        Args:
+            path (str, optional): Settings file. Defaults to settings.json in
+                the data directory.
+        """
+        self.store = SettingsStore.for_path(path or data_path("settings.json"))
+        self.music_volume = constants.DEFAULT_SETTINGS["MUSIC_VOLUME"]
+        self.sfx_volume = constants.DEFAULT_SETTINGS["SFX_VOLUME"]
+        self.difficulty = constants.DEFAULT_SETTINGS["DIFFICULTY"]
+        self.das = constants.DEFAULT_SETTINGS["DAS"]
+        self.arr = constants.DEFAULT_SETTINGS["ARR"]
+        self.window_size = None  # None means the logical screen size
+        self.controls = constants.DEFAULT_SETTINGS["CONTROLS"].copy()
         self.load_settings()
 
     def save_settings(self):
-        """Save current settings to a JSON file."""
+        """Save current settings.
+
+        The write is debounced and atomic; unchanged settings are not written.
+        """
         settings_dict = {
             "music_volume": self.music_volume,
             "sfx_volume": self.sfx_volume,
             "difficulty": self.difficulty,
+            "das": self.das,
+            "arr": self.arr,
+            "window_size": self.window_size,
             "controls": {k: v for k, v in self.controls.items()}
         }
-        with open("settings.json", "w") as f:
-            json.dump(settings_dict, f)
+        self.store.save(settings_dict)
+
+    def flush(self):
+        """Write any pending settings changes to disk immediately."""
+        self.store.flush()
 
     def load_settings(self):
-        """Load settings from JSON file."""
-        try:
-            with open("settings.json", "r") as f:
-                settings_dict = json.load(f)
-                self.music_volume = settings_dict.get("music_volume", self.music_volume)
-                self.sfx_volume = settings_dict.get("sfx_volume", self.sfx_volume)
-                self.difficulty = settings_dict.get("difficulty", self.difficulty)
-                self.controls.update(settings_dict.get("controls", {}))
-        except FileNotFoundError:
-            self.save_settings()
+        """Load settings from the settings store, keeping defaults if none are saved."""
+        settings_dict = self.store.load()
+        if settings_dict is None:
+            return
+        self.music_volume = settings_dict.get("music_volume", self.music_volume)
+        self.sfx_volume = settings_dict.get("sfx_volume", self.sfx_volume)
+        self.difficulty = settings_dict.get("difficulty", self.difficulty)
+        self.das = settings_dict.get("das", self.das)
+        self.arr = settings_dict.get("arr", self.arr)
+        self.window_size = settings_dict.get("window_size", self.window_size)
+        self.controls.update(settings_dict.get("controls", {}))
 
 class HighScores:
-    """Class for managing high scores."""
+    """Class for managing high scores.
+
+    Storage is delegated to a backend from tetris.scores; ``scores`` always
+    holds the overall top ``max_scores`` entries for display.
+    """
     
-    def __init__(self):
-        """Initialize high scores list."""
+    def __init__(self, backend=None, max_scores=10):
+        """Initialize high scores list.
+
+        Args:
+            backend (optional): Score backend. Defaults to a JsonScoreBackend
+                on highscores.json in the data directory.
+            max_scores (int): Number of entries in ``scores``
+        """
         self.scores = []
-        self.max_scores = 10
+        self.max_scores = max_scores
+        if backend is None:
+            backend = JsonScoreBackend(data_path("highscores.json"), max_scores)
+        self.backend = backend
+        self.writer = None
         self.load_scores()
 
     def add_score(self, score, mode):
@@ -59,33 +91,70 @@ class HighScores:
             mode (str): The game mode in which the score was achieved
         """
         date = datetime.now().strftime("%Y-%m-%d")
-        self.scores.append({"score": score, "date": date, "mode": mode})
-        self.scores.sort(key=lambda x: x["score"], reverse=True)
-        self.scores = self.scores[:self.max_scores]
-        self.save_scores()
+        self.backend.add({"score": score, "date": date, "mode": mode})
+        self.load_scores()
+
+    def submit_score(self, score, mode):
+        """Record a score without blocking on disk.
+
+        The entry shows up in ``scores`` immediately and is written by a
+        background ScoreWriter.
+
+        Args:
+            score (int): The score to add
+            mode (str): The game mode in which the score was achieved
+        """
+        date = datetime.now().strftime("%Y-%m-%d")
+        entry = {"score": score, "date": date, "mode": mode}
+        scores = self.scores + [entry]
+        scores.sort(key=lambda x: x["score"], reverse=True)
+        self.scores = scores[:self.max_scores]
+        if self.writer is None:
+            self.writer = ScoreWriter(self.backend)
+        self.writer.submit(entry)
+
+    def flush(self, timeout=None):
+        """Wait for submitted scores to be written.
+
+        Args:
+            timeout (float, optional): Maximum seconds to wait
+
+        Returns:
+            bool: True if every submitted score was written
+        """
+        if self.writer is None:
+            return True
+        return self.writer.flush(timeout)
 
     def save_scores(self):
-        """Save high scores to a JSON file."""
-        with open("highscores.json", "w") as f:
-            json.dump(self.scores, f)
+        """Persist high scores through the backend."""
+        self.backend.save()
 
     def load_scores(self):
-        """Load high scores from JSON file."""
-        try:
-            with open("highscores.json", "r") as f:
-                self.scores = json.load(f)
-        except FileNotFoundError:
-            self.save_scores()
-
-    def get_high_scores(self, mode=None):
-        """Get high scores, optionally filtered by mode.
+        """Refresh the cached top scores from the backend."""
+        self.scores = self.backend.top(limit=self.max_scores)
+
+    def get_high_scores(self, mode=None, limit=None, date_from=None, date_to=None):
+        """Get high scores, optionally filtered by mode and date range.
         
         Args:
             mode (str, optional): Game mode to filter by. Defaults to None.
+            limit (int, optional): Maximum number of entries. Defaults to max_scores.
+            date_from (str, optional): First date included (YYYY-MM-DD)
+            date_to (str, optional): Last date included (YYYY-MM-DD)
         
         Returns:
             list: List of high scores
         """
-        if mode is None:
+        if mode is None and limit is None and date_from is None and date_to is None:
             return self.scores
-        return [score for score in self.scores if score["mode"] == mode]
+        if limit is None:
+            limit = self.max_scores
+        return self.backend.top(mode, limit, date_from, date_to)
+
+    def close(self):
+        """Write pending scores and release the backend."""
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+        self.backend.close()
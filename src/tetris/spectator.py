@@ -0,0 +1,282 @@
+"""
+Module for the multi-board spectator wall.
+
+SpectatorWall lays out many games (live or replayed; anything exposing
+``grid``, ``current_piece``, ``score`` and ``game_over`` like GameEngine) in
+a grid of tiles at a reduced block size. Each tile keeps a surface of its
+locked cells and redraws only the cells that changed since the last frame;
+tiles whose board, piece and score are unchanged are not touched at all.
+Block sprites and fonts are shared by every tile.
+"""
+
+import math
+import logging  # Import logging module for debugging
+import pygame
+from .constants import COLORS, PALETTE
+from .ui import get_font
+
+# Initialize logger
+logger = logging.getLogger(__name__)
+
+# Tile colors
+BOARD_BACKGROUND = (20, 20, 20)
+TILE_BORDER = (60, 60, 60)
+
+# Space around each board inside its tile, in pixels
+TILE_PADDING = 2
+
+# Shared block sprites by (size, piece-type id), dropped when pygame quits
+_SPRITES = {}
+
+def block_sprite(size, kind):
+    """Return the shared sprite for a block of piece type ``kind``.
+
+    Args:
+        size (int): Block size in pixels
+        kind (int): Piece-type id (0 for an empty cell)
+    """
+    key = (size, kind)
+    sprite = _SPRITES.get(key)
+    if sprite is None:
+        if not _SPRITES:
+            pygame.register_quit(_SPRITES.clear)
+        sprite = pygame.Surface((size, size))
+        if kind:
+            color = PALETTE[kind]
+            sprite.fill(tuple(channel // 2 for channel in color))
+            # Leave a dark edge when there is room for one
+            inner = size - 1 if size > 2 else size
+            sprite.fill(color, (0, 0, inner, inner))
+        else:
+            sprite.fill(BOARD_BACKGROUND)
+        _SPRITES[key] = sprite
+    return sprite
+
+def grid_shape(count, tile_aspect, width, height):
+    """Choose columns and rows for ``count`` tiles filling ``width`` x ``height``.
+
+    Args:
+        count (int): Number of tiles
+        tile_aspect (float): Preferred tile width divided by height
+        width (int): Available width in pixels
+        height (int): Available height in pixels
+
+    Returns:
+        tuple: (columns, rows)
+    """
+    best = (1, count)
+    best_scale = -1
+    for columns in range(1, count + 1):
+        rows = math.ceil(count / columns)
+        scale = min(width / columns / tile_aspect, height / rows)
+        if scale > best_scale:
+            best, best_scale = (columns, rows), scale
+    return best
+
+class SpectatorTile:
+    """One game on the wall with its cached board surface."""
+
+    def __init__(self, game, title, rect, block_size, font):
+        """Initialize the tile.
+
+        Args:
+            game: Game to show
+            title (str): Name shown above the board
+            rect (pygame.Rect): Tile area on the wall surface
+            block_size (int): Block size in pixels
+            font (pygame.font.Font): Shared font for the title line
+        """
+        self.game = game
+        self.title = title
+        self.rect = rect
+        self.block_size = block_size
+        self.font = font
+        self.label_height = font.get_linesize()
+        self.grid = None
+        self.snapshot = None
+        self.board_surface = None
+        self.piece_key = None
+        self.label_key = None
+        self.label = None
+        self.board_pos = None
+
+    def _reset_board(self):
+        """Start over for a new (or resized) board."""
+        grid = self.game.grid
+        self.grid = grid
+        size = self.block_size
+        self.board_surface = pygame.Surface((grid.width * size, grid.height * size))
+        self.board_surface.fill(BOARD_BACKGROUND)
+        self.snapshot = bytes(len(grid.cells))
+        free_height = self.rect.height - self.label_height - 2 * TILE_PADDING
+        self.board_pos = (
+            self.rect.x + (self.rect.width - grid.width * size) // 2,
+            self.rect.y + self.label_height + TILE_PADDING + max(0, (free_height - grid.height * size) // 2)
+        )
+
+    def _update_cells(self):
+        """Redraw the cells that differ from the snapshot.
+
+        Returns:
+            bool: True if anything changed
+        """
+        cells = self.game.grid.linear()
+        snapshot = self.snapshot
+        if cells == snapshot:
+            return False
+        width = self.grid.width
+        size = self.block_size
+        surface = self.board_surface
+        for y in range(self.grid.height):
+            start = y * width
+            end = start + width
+            if cells[start:end] == snapshot[start:end]:
+                continue
+            for x in range(width):
+                kind = cells[start + x]
+                if kind != snapshot[start + x]:
+                    surface.blit(block_sprite(size, kind), (x * size, y * size))
+        self.snapshot = cells
+        return True
+
+    def _piece_key(self):
+        """Return a value that changes whenever the visible piece does."""
+        piece = self.game.current_piece
+        if piece is None or self.game.game_over:
+            return None
+        return (piece.x, piece.y, id(piece.shape), piece.kind)
+
+    def update(self, wall):
+        """Bring the tile up to date on the wall surface.
+
+        Args:
+            wall (pygame.Surface): Surface the tiles are composited on
+
+        Returns:
+            bool: True if the tile was redrawn
+        """
+        game = self.game
+        changed = False
+        if game.grid is not self.grid:
+            self._reset_board()
+            changed = True
+        changed = self._update_cells() or changed
+
+        piece_key = self._piece_key()
+        if piece_key != self.piece_key:
+            self.piece_key = piece_key
+            changed = True
+
+        label_key = (game.score, game.game_over)
+        if label_key != self.label_key:
+            self.label_key = label_key
+            color = COLORS["RED"] if game.game_over else COLORS["WHITE"]
+            self.label = self.font.render(f"{self.title}  {game.score}", True, color)
+            changed = True
+
+        if changed:
+            self.draw(wall)
+        return changed
+
+    def draw(self, wall):
+        """Composite the tile onto the wall surface."""
+        wall.fill(COLORS["BLACK"], self.rect)
+        pygame.draw.rect(wall, TILE_BORDER, self.rect, 1)
+        wall.blit(self.label, (self.rect.x + TILE_PADDING, self.rect.y + TILE_PADDING))
+        wall.blit(self.board_surface, self.board_pos)
+
+        piece = self.game.current_piece
+        if self.piece_key is not None:
+            size = self.block_size
+            sprite = block_sprite(size, piece.kind)
+            left, top = self.board_pos
+            for y, row in enumerate(piece.shape):
+                if piece.y + y < 0:
+                    continue
+                for x, cell in enumerate(row):
+                    if cell:
+                        wall.blit(sprite, (left + (piece.x + x) * size, top + (piece.y + y) * size))
+
+class SpectatorWall:
+    """Grid of many small game boards on one surface."""
+
+    def __init__(self, rect, games=(), titles=None):
+        """Initialize the wall.
+
+        Args:
+            rect (pygame.Rect): Area of the screen the wall covers
+            games (iterable): Games to show
+            titles (list, optional): Title per game. Defaults to "Game N".
+        """
+        self.rect = pygame.Rect(rect)
+        self.surface = pygame.Surface(self.rect.size)
+        self.games = []
+        self.titles = []
+        self.tiles = []
+        self.block_size = 0
+        for index, game in enumerate(games):
+            self.add(game, titles[index] if titles else None)
+
+    def add(self, game, title=None):
+        """Add a game to the wall.
+
+        Args:
+            game: Game to show
+            title (str, optional): Name shown above the board
+        """
+        self.games.append(game)
+        self.titles.append(title or f"Game {len(self.games)}")
+        self.tiles = []
+
+    def remove(self, game):
+        """Remove a game from the wall."""
+        index = self.games.index(game)
+        del self.games[index]
+        del self.titles[index]
+        self.tiles = []
+
+    def layout(self):
+        """Size and place a tile for every game."""
+        self.surface.fill(COLORS["BLACK"])
+        self.tiles = []
+        if not self.games:
+            return
+        board_width = max(game.grid.width for game in self.games)
+        board_height = max(game.grid.height for game in self.games)
+        width, height = self.rect.size
+
+        # Pick the grid with the largest blocks, then the font to match
+        font = get_font(max(12, min(24, height // 40)))
+        label_height = font.get_linesize()
+        columns, rows = grid_shape(len(self.games), board_width / (board_height + 2), width, height)
+        tile_width = width // columns
+        tile_height = height // rows
+        self.block_size = max(1, min((tile_width - 2 * TILE_PADDING) // board_width,
+                                     (tile_height - label_height - 2 * TILE_PADDING) // board_height))
+        for index, (game, title) in enumerate(zip(self.games, self.titles)):
+            row, column = divmod(index, columns)
+            rect = pygame.Rect(column * tile_width, row * tile_height, tile_width, tile_height)
+            self.tiles.append(SpectatorTile(game, title, rect, self.block_size, font))
+        logger.debug("Spectator wall: %d games in %dx%d tiles, block size %d",
+                     len(self.games), columns, rows, self.block_size)
+
+    def update(self):
+        """Redraw changed tiles on the wall surface.
+
+        Returns:
+            list: Screen rects of the tiles that were redrawn
+        """
+        if not self.tiles and self.games:
+            self.layout()
+        surface = self.surface
+        return [tile.rect.move(self.rect.topleft) for tile in self.tiles if tile.update(surface)]
+
+    def draw(self, screen):
+        """Update the wall and draw it on ``screen``.
+
+        Returns:
+            list: Screen rects of the tiles that were redrawn
+        """
+        dirty = self.update()
+        screen.blit(self.surface, self.rect)
+        return dirty
@@ -0,0 +1,227 @@
+"""
+Module for locating and persisting the game's data files.
+
+Data files (settings, high scores) live in a stable directory instead of the
+current working directory, and are written atomically: content goes to a
+temporary file in the same directory which is then renamed over the target,
+so a crash mid-write never leaves a truncated file behind.
+"""
+
+import atexit
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+
+# Initialize logger
+logger = logging.getLogger(__name__)
+
+# Environment variable overriding the data directory
+DATA_DIR_ENV = "TETRIS_DATA_DIR"
+
+# Name of the game's directory inside the per-user data directory
+APP_NAME = "tetris"
+
+# Quiet time (seconds) after the last settings change before it is written
+SAVE_DELAY = 0.5
+
+
+def data_dir():
+    """Return the directory holding the game's data files.
+
+    Uses ``$TETRIS_DATA_DIR`` when set, otherwise the per-user data directory
+    of the platform: ``%APPDATA%\\tetris`` on Windows,
+    ``~/Library/Application Support/tetris`` on macOS and
+    ``$XDG_DATA_HOME/tetris`` (``~/.local/share/tetris``) elsewhere. The
+    directory may not exist yet; writers create it.
+    """
+    path = os.environ.get(DATA_DIR_ENV)
+    if path:
+        return path
+    if sys.platform == "win32":
+        base = os.environ.get("APPDATA") or os.path.join(os.path.expanduser("~"), "AppData", "Roaming")
+    elif sys.platform == "darwin":
+        base = os.path.join(os.path.expanduser("~"), "Library", "Application Support")
+    else:
+        base = os.environ.get("XDG_DATA_HOME") or os.path.join(os.path.expanduser("~"), ".local", "share")
+    return os.path.join(base, APP_NAME)
+
+
+def data_path(filename):
+    """Return the absolute path of a data file.
+
+    Args:
+        filename (str): Name of the file inside the data directory
+    """
+    return os.path.join(data_dir(), filename)
+
+
+def atomic_write_json(path, data):
+    """Write ``data`` as JSON to ``path`` atomically.
+
+    Args:
+        path (str): Destination file
+        data: JSON-serializable object
+    """
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=".json")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+class SettingsStore:
+    """Cached, debounced JSON store for a single settings file.
+
+    One store exists per file path. Loaded content is kept in memory, saving
+    identical content is a no-op, and changed content is written by a
+    background timer once ``delay`` seconds pass without another change, so
+    that a burst of changes (dragging a volume slider) results in a single
+    write of the final value.
+    """
+
+    _instances = {}
+    _instances_lock = threading.Lock()
+
+    @classmethod
+    def for_path(cls, path):
+        """Return the shared store for ``path``, creating it if needed."""
+        path = os.path.abspath(path)
+        with cls._instances_lock:
+            store = cls._instances.get(path)
+            if store is None:
+                store = cls._instances[path] = cls(path)
+            return store
+
+    def __init__(self, path, delay=SAVE_DELAY):
+        """Initialize the store.
+
+        Args:
+            path (str): Settings file path
+            delay (float): Seconds without changes to wait before writing
+        """
+        self.path = path
+        self.delay = delay
+        # Guards the state below; never held while writing the file, so a
+        # save from the game loop doesn't wait for a write to reach the disk
+        self._lock = threading.Lock()
+        # Serializes writes, so an older snapshot never replaces a newer one
+        self._write_lock = threading.Lock()
+        self._data = None
+        self._loaded = False
+        self._dirty = False
+        self._timer = None
+        # Bumped on every change; a timer only writes if no change followed it
+        self._generation = 0
+
+    def load(self):
+        """Return a copy of the stored settings, or None if there are none."""
+        with self._lock:
+            if not self._loaded:
+                self._data = self._read()
+                self._loaded = True
+            return json.loads(json.dumps(self._data)) if self._data is not None else None
+
+    def save(self, data):
+        """Schedule ``data`` to be written, restarting the delay.
+
+        Args:
+            data (dict): JSON-serializable settings
+
+        Returns:
+            bool: False if the content was unchanged and nothing was scheduled
+        """
+        with self._lock:
+            if self._loaded and data == self._data:
+                return False
+            self._data = json.loads(json.dumps(data))
+            self._loaded = True
+            self._dirty = True
+            if self._timer is not None:
+                self._timer.cancel()
+            self._generation += 1
+            self._timer = threading.Timer(self.delay, self._expire, args=(self._generation,))
+            self._timer.daemon = True
+            self._timer.start()
+            return True
+
+    def _expire(self, generation):
+        """Timer callback: write unless a later save restarted the delay."""
+        try:
+            self._write(generation)
+        except OSError as e:
+            # Still dirty: the next save or flush tries again
+            logger.warning("Can't save settings to %s: %s", self.path, e)
+
+    def flush(self):
+        """Write pending changes to disk immediately.
+
+        Raises:
+            OSError: If the file can't be written; the changes stay pending
+        """
+        self._write()
+
+    def _write(self, generation=None):
+        """Write pending changes.
+
+        Only taking a snapshot of the data holds the lock; the file is
+        written after releasing it.
+
+        Args:
+            generation (int, optional): Write only if no save followed the
+                one that started this timer
+        """
+        with self._write_lock:
+            with self._lock:
+                # A cancelled timer may already be running
+                if generation is not None and generation != self._generation:
+                    return
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+                if not self._dirty:
+                    return
+                # save replaces _data rather than changing it, so the
+                # snapshot can be written without the lock
+                data = self._data
+                self._dirty = False
+            try:
+                atomic_write_json(self.path, data)
+            except OSError:
+                with self._lock:
+                    self._dirty = True
+                raise
+
+    def _read(self):
+        """Read the settings file, returning None if missing or corrupt."""
+        try:
+            with open(self.path, "r") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (ValueError, OSError) as e:
+            logger.warning("Ignoring unreadable settings file %s: %s", self.path, e)
+            return None
+
+    @classmethod
+    def flush_all(cls):
+        """Flush every store with pending changes."""
+        with cls._instances_lock:
+            stores = list(cls._instances.values())
+        for store in stores:
+            store.flush()
+
+
+atexit.register(SettingsStore.flush_all)
@@ -1,7 +1,38 @@
 """Module for Tetrimino (Tetris piece) handling."""
 
+import logging
+from .constants import PALETTE, COLOR_IDS
+
+# Initialize logger
+logger = logging.getLogger(__name__)
+
+# Rotated shapes shared by every piece, keyed by the shape they rotate from
+_ROTATIONS = {}
+
+def rotate_shape(shape):
+    """Return ``shape`` rotated clockwise.
+
+    Results are cached and shared between pieces, so they must not be
+    mutated in place.
+
+    Args:
+        shape (list): Shape matrix (list of rows)
+    """
+    key = tuple(map(tuple, shape))
+    rotated = _ROTATIONS.get(key)
+    if rotated is None:
+        rotated = _ROTATIONS[key] = [list(row) for row in zip(*shape[::-1])]
+    return rotated
+
 class Tetrimino:
-    """Class representing a Tetris piece (Tetrimino)."""
+    """Class representing a Tetris piece (Tetrimino).
+
+    Pieces use ``__slots__`` and store only their position, a reference to a
+    shared shape matrix and a one-byte piece-type id; the color is looked up
+    from the palette.
+    """
+
+    __slots__ = ("x", "y", "shape", "kind")
     
     def __init__(self, x, y, shape_info):
         """Initialize a new Tetrimino.
@@ -9,13 +40,19 @@ class Tetrimino:
         Args:
             x (int): Initial x position
             y (int): Initial y position
-            shape_info (dict): Dictionary containing 'shape' and 'color'
+            shape_info (dict): Dictionary containing 'shape' and 'color', and
+                optionally the piece-type 'id'
         """
         self.x = x
         self.y = y
         self.shape = shape_info['shape']
-        self.color = shape_info['color']
-        print(f"Created new Tetrimino at ({x}, {y}) with shape: {self.shape}")
+        self.kind = shape_info.get('id') or COLOR_IDS[tuple(shape_info['color'])]
+        logger.debug("Created new Tetrimino at (%d, %d) with shape: %s", x, y, self.shape)
+
+    @property
+    def color(self):
+        """tuple: RGB color of the piece."""
+        return PALETTE[self.kind]
 
     def move(self, dx, dy):
         """Move the piece by the given delta.
@@ -26,10 +63,7 @@ class Tetrimino:
         """
         self.x += dx
         self.y += dy
-        print(f"Moved Tetrimino to ({self.x}, {self.y})")
 
     def rotate(self):
         """Rotate the piece clockwise."""
-        self.shape = list(zip(*self.shape[::-1]))
-        self.shape = [list(row) for row in self.shape]
-        print("Rotated Tetrimino")
+        self.shape = rotate_shape(self.shape)
@@ -0,0 +1,285 @@
+"""
+Module for fitting Speed mode's difficulty curve to simulated games.
+
+The player is modelled by the bot (see bot.py) pressing keys at a fixed rate:
+each piece's placement is turned into key presses by the planner and the
+presses are spaced ``1000 / inputs_per_second`` ms apart while gravity runs
+frame by frame, so a curve that is too fast makes the bot misplace pieces
+and top out, as it would a player.
+
+A candidate curve is ``max(floor, base * decay ** level)`` ms per row, with
+the base speed of each difficulty kept (GameEngine.FALL_SPEEDS). Every
+candidate plays the same seeded games in a process pool, and the candidate
+whose survival time and lines-per-minute percentiles come closest to the
+targets (smallest squared log error) becomes the difficulty's row of the
+level table, which is written to the data directory and loaded by the game
+at startup.
+
+Usage:
+    python -m tetris.tuner [--games 32] [--processes N] [--target Normal:survival:50:150]
+"""
+
+import collections
+import logging  # Import logging module for debugging
+import math
+import types
+from .bot import Bot, occupancy
+from .constants import Action
+from .engine import GameEngine
+from .levels import LevelCurve, LevelTable, curve_speeds, save_level_table
+from .planner import Planner
+
+# Initialize logger
+logger = logging.getLogger(__name__)
+
+# Simulation step, as the game loop at 60 frames per second
+FRAME_MS = 16
+
+# Key presses per second of the simulated player
+DEFAULT_INPUTS_PER_SECOND = 10
+
+# Games still going after this many seconds count as surviving this long
+DEFAULT_MAX_TIME = 600
+
+# Candidate speed factors per level and fastest fall speeds (ms per row)
+DECAYS = (0.8, 0.85, 0.9, 0.93, 0.96)
+FLOORS = (30, 50, 80, 120)
+
+# Measured per game: seconds survived, lines cleared per minute
+METRICS = ("survival", "lpm")
+
+# Difficulty -> [(metric, percentile, target value)]
+DEFAULT_TARGETS = {
+    "Easy": [("survival", 50, 240.0), ("survival", 90, 480.0)],
+    "Normal": [("survival", 50, 150.0), ("survival", 90, 300.0)],
+    "Hard": [("survival", 50, 90.0), ("survival", 90, 180.0)],
+}
+
+# One game's result
+GameResult = collections.namedtuple("GameResult", "survival lpm topped_out")
+
+class CurveEngine(LevelCurve, GameEngine):
+    """GameEngine that speeds up by a level table, as SpeedGame does."""
+
+    def __init__(self, settings, table, grid_width=None, grid_height=None):
+        """Initialize the engine.
+
+        Args:
+            settings: Object exposing a ``difficulty`` attribute
+            table (LevelTable): Fall speeds by lines cleared
+            grid_width (int, optional): Board columns
+            grid_height (int, optional): Board rows
+        """
+        self.LEVELS = table
+        super().__init__(settings, grid_width, grid_height)
+
+def play_game(table, difficulty, seed, inputs_per_second=DEFAULT_INPUTS_PER_SECOND,
+              max_time=DEFAULT_MAX_TIME, width=None, height=None):
+    """Play one game with the simulated player.
+
+    Args:
+        table (LevelTable): Curve under test
+        difficulty (str): Difficulty of the game
+        seed (int): Piece sequence seed
+        inputs_per_second (float): Key presses per second
+        max_time (float): Seconds after which the game is stopped
+        width (int, optional): Board columns
+        height (int, optional): Board rows
+
+    Returns:
+        GameResult: Seconds survived, lines per minute and whether it topped out
+    """
+    engine = CurveEngine(types.SimpleNamespace(difficulty=difficulty), table, width, height)
+    engine.reset_game(seed)
+    grid = engine.grid
+    bot = Bot(lookahead=False)
+    planner = Planner()
+    interval = 1000 / inputs_per_second
+    end_time = max_time * 1000
+    piece = None
+    presses = collections.deque()
+    next_press = 0.0
+    while not engine.game_over and engine.sim_time < end_time:
+        if engine.current_piece is not piece:
+            piece = engine.current_piece
+            placement = bot.choose(engine)
+            path = None
+            if placement is not None:
+                path = planner.placement_path(occupancy(grid), grid.width, grid.height, piece.kind, *placement)
+            presses = collections.deque(path or [Action.HARD_DROP])
+            next_press = engine.sim_time + interval
+        frame_end = engine.sim_time + FRAME_MS
+        actions = []
+        while presses and next_press <= frame_end:
+            actions.append((int(next_press), presses.popleft()))
+            next_press += interval
+        engine.run_until(frame_end, actions)
+    survival = min(engine.sim_time, end_time) / 1000
+    return GameResult(survival, engine.total_lines * 60 / survival if survival else 0.0, engine.game_over)
+
+def percentile(values, p):
+    """Return the ``p``-th percentile of ``values`` (nearest rank)."""
+    ordered = sorted(values)
+    rank = max(1, math.ceil(p / 100 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+def candidate_table(difficulty, decay, floor, lines_per_level=1):
+    """Return a one-difficulty level table for a candidate curve."""
+    base = GameEngine.FALL_SPEEDS.get(difficulty, GameEngine.FALL_SPEEDS["Normal"])
+    speeds = curve_speeds(base, decay, floor)
+    return LevelTable({difficulty: speeds, "Normal": speeds}, lines_per_level)
+
+def _play(args):
+    """Pool entry point: play one game of one candidate."""
+    difficulty, decay, floor, lines_per_level, seed, inputs_per_second, max_time = args
+    table = candidate_table(difficulty, decay, floor, lines_per_level)
+    return (difficulty, decay, floor), play_game(table, difficulty, seed, inputs_per_second, max_time)
+
+def simulate(difficulties, games, processes=1, decays=DECAYS, floors=FLOORS, lines_per_level=1,
+             inputs_per_second=DEFAULT_INPUTS_PER_SECOND, max_time=DEFAULT_MAX_TIME):
+    """Play ``games`` seeded games for every candidate curve.
+
+    Every candidate plays the same seeds, so differences between candidates
+    come from the curve rather than the pieces.
+
+    Returns:
+        dict: ``(difficulty, decay, floor)`` -> list of GameResult
+    """
+    work = [(difficulty, decay, floor, lines_per_level, seed, inputs_per_second, max_time)
+            for difficulty in difficulties for decay in decays for floor in floors
+            for seed in range(games)]
+    results = collections.defaultdict(list)
+    if processes <= 1 or len(work) <= 1:
+        for args in work:
+            key, result = _play(args)
+            results[key].append(result)
+        return dict(results)
+    import multiprocessing
+    # Spawned like analytics' workers, so the pool works whatever the
+    # parent process has initialized
+    with multiprocessing.get_context("spawn").Pool(processes) as pool:
+        for key, result in pool.imap_unordered(_play, work, chunksize=4):
+            results[key].append(result)
+    return dict(results)
+
+def measure(results, metric, p):
+    """Return a percentile of one metric over GameResults."""
+    return percentile([getattr(result, metric) for result in results], p)
+
+def error(results, targets):
+    """Return the squared log error of results against ``(metric, percentile, value)`` targets."""
+    total = 0.0
+    for metric, p, value in targets:
+        measured = max(measure(results, metric, p), 1e-3)
+        total += math.log(measured / value) ** 2
+    return total
+
+def fit(results, targets):
+    """Choose the best candidate curve of each difficulty.
+
+    Args:
+        results (dict): simulate's results
+        targets (dict): Difficulty -> [(metric, percentile, value)]
+
+    Returns:
+        dict: Difficulty -> (decay, floor, error)
+    """
+    best = {}
+    for (difficulty, decay, floor), games in sorted(results.items()):
+        score = error(games, targets[difficulty])
+        if difficulty not in best or score < best[difficulty][2]:
+            best[difficulty] = (decay, floor, score)
+    return best
+
+def tune(targets=None, games=32, processes=1, decays=DECAYS, floors=FLOORS, lines_per_level=1,
+         inputs_per_second=DEFAULT_INPUTS_PER_SECOND, max_time=DEFAULT_MAX_TIME):
+    """Simulate every candidate and return the fitted level table.
+
+    Args:
+        targets (dict, optional): Difficulty -> [(metric, percentile, value)].
+            Defaults to DEFAULT_TARGETS.
+        games (int): Games per candidate curve
+        processes (int): Worker processes; 1 runs in this process
+        decays (tuple): Candidate speed factors per level
+        floors (tuple): Candidate fastest fall speeds
+        lines_per_level (int): Lines cleared per level
+        inputs_per_second (float): Key presses per second of the simulated player
+        max_time (float): Seconds after which a game is stopped
+
+    Returns:
+        LevelTable: One fitted curve per difficulty, with the fit in its metadata
+    """
+    targets = targets or DEFAULT_TARGETS
+    results = simulate(list(targets), games, processes, decays, floors, lines_per_level,
+                       inputs_per_second, max_time)
+    best = fit(results, targets)
+    fall_speeds = {}
+    fitted = {}
+    for difficulty, (decay, floor, score) in best.items():
+        fall_speeds[difficulty] = candidate_table(difficulty, decay, floor).fall_speeds[difficulty]
+        chosen = results[(difficulty, decay, floor)]
+        fitted[difficulty] = {
+            "decay": decay, "floor": floor, "error": round(score, 4),
+            "targets": [[metric, p, value, round(measure(chosen, metric, p), 2)]
+                        for metric, p, value in targets[difficulty]],
+        }
+    metadata = {"games": games, "inputs_per_second": inputs_per_second, "max_time": max_time,
+                "curves": fitted}
+    return LevelTable(fall_speeds, lines_per_level, metadata)
+
+def parse_target(text):
+    """Parse ``DIFFICULTY:METRIC:PERCENTILE:VALUE`` into (difficulty, target)."""
+    try:
+        difficulty, metric, p, value = text.split(":")
+        target = (metric, float(p), float(value))
+    except ValueError:
+        raise ValueError(f"target {text!r} is not DIFFICULTY:METRIC:PERCENTILE:VALUE") from None
+    if metric not in METRICS:
+        raise ValueError(f"unknown metric {metric!r}; expected one of {', '.join(METRICS)}")
+    return difficulty, target
+
+def main(argv=None):
+    """Fit the level table from the command line and save it."""
+    import argparse
+    import os
+    import time
+    from .levels import LEVEL_TABLE_FILE
+    from .storage import data_path
+
+    parser = argparse.ArgumentParser(description="Fit Speed mode's difficulty curve to simulated games.")
+    parser.add_argument("--games", type=int, default=32, help="games per candidate curve")
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 1, help="worker processes")
+    parser.add_argument("--target", action="append", default=[],
+                        help="DIFFICULTY:METRIC:PERCENTILE:VALUE, metric survival (s) or lpm; "
+                             "replaces the default targets of that difficulty")
+    parser.add_argument("--inputs-per-second", type=float, default=DEFAULT_INPUTS_PER_SECOND,
+                        help="key presses per second of the simulated player")
+    parser.add_argument("--max-time", type=float, default=DEFAULT_MAX_TIME, help="seconds per game at most")
+    parser.add_argument("--lines-per-level", type=int, default=1, help="lines cleared per level")
+    parser.add_argument("--output", default=data_path(LEVEL_TABLE_FILE), help="level table file")
+    args = parser.parse_args(argv)
+
+    targets = dict(DEFAULT_TARGETS)
+    custom = collections.defaultdict(list)
+    for text in args.target:
+        try:
+            difficulty, target = parse_target(text)
+        except ValueError as e:
+            parser.error(str(e))
+        custom[difficulty].append(target)
+    targets.update(custom)
+
+    start = time.perf_counter()
+    table = tune(targets, args.games, args.processes, lines_per_level=args.lines_per_level,
+                 inputs_per_second=args.inputs_per_second, max_time=args.max_time)
+    save_level_table(table, args.output)
+    candidates = len(DECAYS) * len(FLOORS) * len(targets)
+    print(f"Played {candidates * args.games} games in {time.perf_counter() - start:.1f}s")
+    for difficulty, curve in table.metadata["curves"].items():
+        print(f"{difficulty}: decay {curve['decay']}, floor {curve['floor']} ms/row, error {curve['error']}")
+        for metric, p, value, measured in curve["targets"]:
+            print(f"  {metric} p{p:g}: {measured} (target {value:g})")
+    print(f"Wrote {args.output}")
+
+if __name__ == "__main__":
+    main()
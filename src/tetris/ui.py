@@ -1,5 +1,10 @@
 """
 Module containing UI elements for the game.
+
+Widgets are retained: each one renders its text surfaces once and again only
+when its text or hover state changes. Menu screens are composited into
+cached WidgetLayer surfaces, so redrawing an unchanged screen is a single
+blit with no font, text or surface allocations.
 """
 
 import pygame
@@ -9,26 +14,112 @@ from .constants import COLORS, GameState
 # Initialize logger
 logger = logging.getLogger(__name__)
 
+# Shared default fonts by point size, dropped when pygame quits
+_FONTS = {}
+
+def get_font(size):
+    """Return the shared default font of the given size.
+
+    Args:
+        size (int): Font size in points
+    """
+    font = _FONTS.get(size)
+    if font is None:
+        if not _FONTS:
+            # pygame forgets quit callbacks once they have run, so register
+            # again whenever the cache starts filling up
+            pygame.register_quit(_FONTS.clear)
+        font = _FONTS[size] = pygame.font.Font(None, size)
+    return font
+
+class Label:
+    """Class representing a line of text centered on a point."""
+
+    def __init__(self, text, center, size=36, color=COLORS["WHITE"]):
+        """Initialize a new label.
+
+        Args:
+            text (str): Text to display
+            center (tuple): Center position of the text
+            size (int): Font size
+            color (tuple): Text color
+        """
+        self.center = center
+        self.color = color
+        self.font = get_font(size)
+        self.text = None
+        self.changed = True
+        self.set_text(text)
+
+    def set_text(self, text):
+        """Change the text, re-rendering only if it differs.
+
+        Returns:
+            bool: True if the text changed
+        """
+        if text == self.text:
+            return False
+        self.text = text
+        self._surface = self.font.render(text, True, self.color)
+        self._rect = self._surface.get_rect(center=self.center)
+        self.changed = True
+        return True
+
+    def draw(self, screen):
+        """Draw the label on the screen."""
+        screen.blit(self._surface, self._rect)
+
 class Button:
     """Class representing a clickable button."""
+
+    # Event types a button reacts to
+    EVENT_TYPES = frozenset((pygame.MOUSEMOTION, pygame.MOUSEBUTTONDOWN))
     
     def __init__(self, x, y, width, height, text, color=COLORS["WHITE"], hover_color=COLORS["BLUE"]):
         """Initialize a new button."""
         self.rect = pygame.Rect(x, y, width, height)
-        self.text = text
+        self.text = None
         self.color = color
         self.hover_color = hover_color
-        self.is_hovered = False
-        self.font = pygame.font.Font(None, 36)
-        # Cache text surfaces
-        self._normal_text = self.font.render(text, True, color)
-        self._hover_text = self.font.render(text, True, hover_color)
+        self._is_hovered = False
+        self.changed = True
+        self.font = get_font(36)
+        self.set_text(text)
+
+    @property
+    def is_hovered(self):
+        """bool: Whether the mouse is over the button."""
+        return self._is_hovered
+
+    @is_hovered.setter
+    def is_hovered(self, value):
+        if value != self._is_hovered:
+            self._is_hovered = value
+            self.changed = True
+
+    def set_text(self, text):
+        """Change the label, re-rendering only if it differs.
+
+        Returns:
+            bool: True if the text changed
+        """
+        if text == self.text:
+            return False
+        self.text = text
+        # Cache text surfaces and their positions
+        self._normal_text = self.font.render(text, True, self.color)
+        self._hover_text = self.font.render(text, True, self.hover_color)
+        self._normal_rect = self._normal_text.get_rect(center=self.rect.center)
+        self._hover_rect = self._hover_text.get_rect(center=self.rect.center)
+        self.changed = True
+        return True
 
     def draw(self, screen):
         """Draw the button on the screen."""
-        text_surface = self._hover_text if self.is_hovered else self._normal_text
-        text_rect = text_surface.get_rect(center=self.rect.center)
-        screen.blit(text_surface, text_rect)
+        if self._is_hovered:
+            screen.blit(self._hover_text, self._hover_rect)
+        else:
+            screen.blit(self._normal_text, self._normal_rect)
 
     def handle_event(self, event):
         """Handle mouse events for the button."""
@@ -38,8 +129,66 @@ class Button:
             return self.is_hovered
         return False
 
+class WidgetLayer:
+    """Cached composite of a group of widgets.
+
+    The layer is re-rendered only when a widget reports a change (or the
+    layer is invalidated); otherwise drawing it is a single blit.
+    """
+
+    def __init__(self, size, widgets, background=COLORS["BLACK"]):
+        """Initialize a new layer.
+
+        Args:
+            size (tuple): Layer size in pixels
+            widgets (list): Widgets with ``draw`` and a ``changed`` flag
+            background (tuple): Fill color; an RGBA color makes the layer
+                translucent
+        """
+        self.size = size
+        self.widgets = list(widgets)
+        self.background = background
+        self.surface = None
+        self.valid = False
+
+    def set_widgets(self, widgets):
+        """Replace the layer's widgets."""
+        self.widgets = list(widgets)
+        self.valid = False
+
+    def invalidate(self):
+        """Force the next draw to re-render the layer."""
+        self.valid = False
+
+    def render(self):
+        """Composite the widgets into the cached surface."""
+        if self.surface is None:
+            if len(self.background) == 4:
+                self.surface = pygame.Surface(self.size, pygame.SRCALPHA)
+            else:
+                self.surface = pygame.Surface(self.size)
+        self.surface.fill(self.background)
+        for widget in self.widgets:
+            widget.draw(self.surface)
+            widget.changed = False
+        self.valid = True
+
+    def draw(self, screen, pos=(0, 0)):
+        """Draw the layer, re-rendering it first if anything changed."""
+        if self.valid:
+            for widget in self.widgets:
+                if widget.changed:
+                    self.valid = False
+                    break
+        if not self.valid:
+            self.render()
+        screen.blit(self.surface, pos)
+
 class Menu:
     """Class managing game menus."""
+
+    # Event types the menus react to
+    EVENT_TYPES = frozenset((pygame.QUIT, pygame.KEYDOWN)) | Button.EVENT_TYPES
     
     def __init__(self, screen, settings, high_scores):
         """Initialize the menu system."""
@@ -50,10 +199,12 @@ class Menu:
         self.previous_state = None
         self.selected_setting = None
         # Cache fonts
-        self.title_font = pygame.font.Font(None, 74)
-        self.text_font = pygame.font.Font(None, 36)
-        self.cached_title = self.title_font.render("TETRIS", True, COLORS["WHITE"])
+        self.title_font = get_font(74)
+        self.text_font = get_font(36)
+        self.title = Label("TETRIS", (self.screen.get_width() // 2, 80), 74)
+        self.cached_title = self.title._surface
         self.create_buttons()
+        self.create_layers()
 
     def create_buttons(self):
         """Create all menu buttons."""
@@ -81,91 +232,83 @@ class Menu:
 
         # Settings Buttons
         self.settings_buttons = [
-            Button(center_x, start_y, button_width, button_height, 
-                  f"Music: {int(self.settings.music_volume * 100)}%"),
-            Button(center_x, start_y + spacing, button_width, button_height, 
-                  f"SFX: {int(self.settings.sfx_volume * 100)}%"),
-            Button(center_x, start_y + spacing * 2, button_width, button_height, 
-                  f"Difficulty: {self.settings.difficulty}"),
+            Button(center_x, start_y, button_width, button_height, ""),
+            Button(center_x, start_y + spacing, button_width, button_height, ""),
+            Button(center_x, start_y + spacing * 2, button_width, button_height, ""),
             Button(center_x, start_y + spacing * 3, button_width, button_height, "Back")
         ]
+        self.refresh_settings_labels()
 
         # Back button for high scores
         self.back_button = Button(center_x, self.screen.get_height() - 100,
                                 button_width, button_height, "Back")
 
+        # Game over buttons
+        game_over_x = self.screen.get_width() // 2 - 100
+        game_over_y = self.screen.get_height() // 2
+        self.restart_button = Button(game_over_x, game_over_y + spacing, button_width, button_height, "Restart")
+        self.quit_button = Button(game_over_x, game_over_y + spacing * 2, button_width, button_height, "Quit")
+
+    def create_layers(self):
+        """Create the cached layers each screen is composited from."""
+        size = self.screen.get_size()
+        self.title_layer = WidgetLayer(size, [self.title])
+        self.high_score_header = Label("HIGH SCORES", (self.screen.get_width() // 2, self.screen.get_height() // 4))
+        self.high_score_labels = []
+        self._high_scores_shown = None
+        self.layers = {
+            GameState.MAIN_MENU: WidgetLayer(size, [self.title] + self.main_menu_buttons),
+            GameState.MODE_SELECTION: WidgetLayer(size, [self.title] + self.mode_buttons),
+            GameState.SETTINGS: WidgetLayer(size, [self.title] + self.settings_buttons),
+            GameState.HIGH_SCORES: WidgetLayer(size, [self.title, self.high_score_header, self.back_button])
+        }
+        game_over_title = Label("GAME OVER", (self.screen.get_width() // 2, self.screen.get_height() // 3), 74)
+        # Semi-transparent black overlay with the title and buttons on top
+        self.game_over_layer = WidgetLayer(size, [game_over_title, self.restart_button, self.quit_button],
+                                           background=(0, 0, 0, 128))
+
+    def refresh_settings_labels(self):
+        """Update the settings button labels from the current settings."""
+        self.settings_buttons[0].set_text(f"Music: {int(self.settings.music_volume * 100)}%")
+        self.settings_buttons[1].set_text(f"SFX: {int(self.settings.sfx_volume * 100)}%")
+        self.settings_buttons[2].set_text(f"Difficulty: {self.settings.difficulty}")
+
     def draw(self):
         """Draw the current menu screen."""
-        self.screen.fill(COLORS["BLACK"])
-        
-        # Draw title
-        title_rect = self.cached_title.get_rect(center=(self.screen.get_width() // 2, 80))
-        self.screen.blit(self.cached_title, title_rect)
-
-        # Draw buttons based on current state
-        if self.state == GameState.MAIN_MENU:
-            for button in self.main_menu_buttons:
-                button.draw(self.screen)
-        elif self.state == GameState.MODE_SELECTION:
-            for button in self.mode_buttons:
-                button.draw(self.screen)
-        elif self.state == GameState.SETTINGS:
-            for button in self.settings_buttons:
-                button.draw(self.screen)
+        if self.state == GameState.SETTINGS:
+            self.refresh_settings_labels()
         elif self.state == GameState.HIGH_SCORES:
-            self.draw_high_scores()
-            self.back_button.draw(self.screen)
+            self.refresh_high_scores()
+        self.layers.get(self.state, self.title_layer).draw(self.screen)
 
-        pygame.display.flip()
+    def refresh_high_scores(self):
+        """Rebuild the high score labels if the scores list changed."""
+        scores = self.high_scores.scores
+        if scores is self._high_scores_shown:
+            return
+        self._high_scores_shown = scores
+        y = self.screen.get_height() // 4 + 50
+        self.high_score_labels = []
+        for score in scores:
+            score_text = f"{score['score']:,} - {score['mode']} - {score['date']}"
+            self.high_score_labels.append(Label(score_text, (self.screen.get_width() // 2, y)))
+            y += 40
+        self.layers[GameState.HIGH_SCORES].set_widgets(
+            [self.title, self.high_score_header] + self.high_score_labels + [self.back_button])
 
     def draw_high_scores(self):
         """Draw the high scores screen."""
-        font = pygame.font.Font(None, 36)
-        y = self.screen.get_height() // 4
-        
-        # Draw header
-        header = font.render("HIGH SCORES", True, COLORS["WHITE"])
-        header_rect = header.get_rect(center=(self.screen.get_width() // 2, y))
-        self.screen.blit(header, header_rect)
-        
-        y += 50
-        for score in self.high_scores.scores:
-            score_text = f"{score['score']:,} - {score['mode']} - {score['date']}"
-            text = font.render(score_text, True, COLORS["WHITE"])
-            text_rect = text.get_rect(center=(self.screen.get_width() // 2, y))
-            self.screen.blit(text, text_rect)
-            y += 40
+        self.refresh_high_scores()
+        self.high_score_header.draw(self.screen)
+        for label in self.high_score_labels:
+            label.draw(self.screen)
 
     def draw_game_over(self, current_game, last_game_snapshot):
         """Draw the GAME OVER screen over the last snapshot of the game."""
         # Draw the last game snapshot
         self.screen.blit(last_game_snapshot, (0, 0))
-        
-        # Create a semi-transparent overlay
-        overlay = pygame.Surface(self.screen.get_size())
-        overlay.fill((0, 0, 0))  # Fill with black
-        overlay.set_alpha(128)  # Set transparency level (0-255)
-        self.screen.blit(overlay, (0, 0))  # Draw the overlay
-        
-        # Draw GAME OVER text
-        game_over_text = "GAME OVER"
-        font = pygame.font.Font(None, 74)
-        text_surface = font.render(game_over_text, True, COLORS["WHITE"])
-        text_rect = text_surface.get_rect(center=(self.screen.get_width() // 2, self.screen.get_height() // 3))
-        self.screen.blit(text_surface, text_rect)
-        
-        # Draw restart and quit buttons
-        center_x = self.screen.get_width() // 2 - 100
-        start_y = self.screen.get_height() // 2
-        spacing = 70
-        button_width = 200
-        button_height = 50
-        self.restart_button = Button(center_x, start_y + spacing, button_width, button_height, "Restart")
-        self.quit_button = Button(center_x, start_y + spacing * 2, button_width, button_height, "Quit")
-        self.restart_button.draw(self.screen)
-        self.quit_button.draw(self.screen)
-        
-        pygame.display.flip()
+        # Draw the cached overlay with the title and buttons
+        self.game_over_layer.draw(self.screen)
 
     def handle_back(self):
         """Handle back button navigation."""
@@ -195,6 +338,10 @@ class Menu:
                 if event.key == pygame.K_ESCAPE and self.state != GameState.MAIN_MENU:
                     return self.handle_back()
 
+            # Only mouse events reach the buttons
+            if event.type not in Button.EVENT_TYPES:
+                continue
+
             if self.state == GameState.MAIN_MENU:
                 for i, button in enumerate(self.main_menu_buttons):
                     if button.handle_event(event):
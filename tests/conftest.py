@@ -2,7 +2,11 @@
 
 import os
 import sys
+import tempfile
 
 # Add src directory to Python path
 src_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src'))
 sys.path.insert(0, src_path)
+
+# Keep settings and high scores written by tests out of the source tree
+os.environ.setdefault("TETRIS_DATA_DIR", tempfile.mkdtemp(prefix="tetris-test-data-"))
@@ -0,0 +1,132 @@
+"""Tests for the analytics pipeline over archived games."""
+
+import random
+import shutil
+import tempfile
+import types
+import unittest
+from tetris.analytics import (
+    GameRecorder, GameStats, analyze, analyze_chunk, chunks, iter_entries, iter_games, iter_replays,
+    BLOCK_OUT, GARBAGE_OUT, LOCK_OUT
+)
+from tetris.archive import ArchiveWriter, ReplayArchive
+from tetris.constants import Action
+from tetris.engine import GameEngine
+from tetris.replay import Replay
+
+MODES = ["Classic", "Speed", "Battle"]
+
+def random_replay(index, frames=400):
+    """Return a replay of random inputs."""
+    rng = random.Random(index)
+    actions = list(Action)
+    replay = Replay(index, MODES[index % 3])
+    for frame in range(1, frames + 1):
+        pressed = [(frame * 16 - 1, rng.choice(actions))] if rng.random() < 0.3 else []
+        replay.add_frame(frame * 16, pressed)
+    return replay
+
+def drop_replay(seed, drops):
+    """Return a replay that hard drops every piece where it spawns."""
+    replay = Replay(seed)
+    for frame in range(1, drops + 1):
+        replay.add_frame(frame * 16, [(frame * 16 - 1, Action.HARD_DROP)])
+    return replay
+
+class TestAnalytics(unittest.TestCase):
+    """Test cases for the analytics pipeline."""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp(prefix="tetris-analytics-")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def archive(self, replays):
+        writer = ArchiveWriter(self.directory, segment_size=4096)
+        for replay in replays:
+            writer.append(replay)
+        writer.close()
+        return ReplayArchive(self.directory)
+
+    def test_single_drop(self):
+        archive = self.archive([drop_replay(1, 1)])
+        games = list(iter_games(iter_replays(archive, iter_entries(archive))))
+        self.assertEqual(len(games), 1)
+        self.assertEqual(sum(games[0]["columns"]), 4)
+        self.assertIsNone(games[0]["top_out"])
+
+    def test_stacking_tops_out(self):
+        archive = self.archive([drop_replay(2, 40)])
+        stats = analyze_chunk(self.directory, 0, 1)
+        (mode, cause, piece), = stats.top_outs
+        self.assertEqual((mode, cause), ("Classic", BLOCK_OUT))
+        self.assertIn(piece, "IOSZLJT")
+        self.assertEqual(stats.games["Classic"], 1)
+        self.assertEqual(sum(stats.clears["Classic"]), 0)
+
+    def recorded_engine(self):
+        """Return a new game and a recorder listening from its first piece."""
+        engine = GameEngine(types.SimpleNamespace(difficulty="Normal"), 10, 20)
+        recorder = GameRecorder(10)
+        engine.add_listener(recorder)
+        engine.reset_game(3)
+        return engine, recorder
+
+    def test_top_out_causes(self):
+        """Test that block outs, lock outs and garbage overflows are told apart."""
+        # Block out: the next piece spawns into the stack
+        engine, recorder = self.recorded_engine()
+        for y in range(4):
+            for x in range(1, 10):
+                engine.grid.set(x, y, 1)
+        engine.features.rebuild()
+        engine.lock_piece()
+        self.assertEqual(recorder.top_out[0], BLOCK_OUT)
+
+        # Lock out: a piece that moved comes to rest partly above the board
+        engine, recorder = self.recorded_engine()
+        engine.apply_action(Action.MOVE_RIGHT)
+        piece = engine.current_piece
+        piece.move(0, -1)
+        for x in range(1, 10):
+            engine.grid.set(x, piece.y + len(piece.shape), 1)
+        engine.features.rebuild()
+        engine.advance(5000)
+        self.assertEqual(recorder.top_out[0], LOCK_OUT)
+
+        # Garbage out: incoming rows push the stack off the top
+        engine, recorder = self.recorded_engine()
+        engine.add_garbage(engine.grid.height, 0)
+        self.assertIsNone(recorder.top_out)
+        engine.add_garbage(1, 0)
+        self.assertEqual(recorder.top_out[0], GARBAGE_OUT)
+
+    def test_aggregates_consistent(self):
+        archive = self.archive([random_replay(index) for index in range(12)])
+        stats = analyze(self.directory)
+        self.assertEqual(sum(stats.games.values()), 12)
+        for mode in MODES:
+            self.assertEqual(stats.games[mode], 4)
+            clears = stats.clears[mode]
+            self.assertEqual(sum(lines * count for lines, count in enumerate(clears)), stats.lines[mode])
+            self.assertEqual(sum(stats.placements[(mode, 10)]) % 4, 0)
+        self.assertEqual(len(list(iter_entries(archive, mode="Speed"))), 4)
+
+    def test_chunks_and_processes_agree(self):
+        self.archive([random_replay(index, frames=200) for index in range(10)])
+        whole = analyze(self.directory, chunk_size=100).to_dict()
+        self.assertEqual(analyze(self.directory, chunk_size=3).to_dict(), whole)
+        self.assertEqual(analyze(self.directory, processes=2, chunk_size=3).to_dict(), whole)
+
+    def test_chunks(self):
+        self.assertEqual(chunks(7, 3), [(0, 3), (3, 6), (6, 7)])
+        self.assertEqual(chunks(0, 3), [])
+
+    def test_merge_empty(self):
+        self.archive([random_replay(0)])
+        stats = analyze(self.directory)
+        self.assertEqual(GameStats().merge(stats).to_dict(), stats.to_dict())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,139 @@
+"""Tests for the indexed replay archive."""
+
+import os
+import shutil
+import tempfile
+import unittest
+import zlib
+from tetris.archive import (
+    ArchiveWriter, ReplayArchive, RECORD_HEADER, TRAILER, END_MAGIC, segment_name
+)
+from tetris.constants import Action
+from tetris.replay import Replay
+
+MODES = ["Classic", "Speed", "Battle"]
+
+def make_replay(index):
+    """Return a small replay with fields derived from ``index``."""
+    replay = Replay(index * 7919, MODES[index % 3])
+    for frame in range(1, 20 + index % 5):
+        actions = [(frame * 16 - 3, Action.MOVE_LEFT)] if frame % 4 == 0 else []
+        replay.add_frame(frame * 16, actions)
+    replay.score = index * 100
+    return replay
+
+class TestArchive(unittest.TestCase):
+    """Test cases for ArchiveWriter and ReplayArchive."""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp(prefix="tetris-archive-")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def fill(self, count, segment_size=2048, seal=True):
+        writer = ArchiveWriter(self.directory, segment_size)
+        ids = [writer.append(make_replay(index)) for index in range(count)]
+        writer.close(seal=seal)
+        return ids
+
+    def assert_archived(self, archive, count):
+        self.assertEqual(len(archive), count)
+        for index, entry in enumerate(archive):
+            expected = make_replay(index)
+            self.assertEqual((entry.game_id, entry.seed, entry.mode, entry.score, entry.end_time),
+                             (index, expected.seed, expected.mode, expected.score, expected.end_time))
+            self.assertEqual(bytes(archive.read(entry)), expected.to_bytes())
+
+    def test_ids_are_sequential(self):
+        self.assertEqual(self.fill(50), list(range(50)))
+
+    def test_segments_sealed_with_index(self):
+        self.fill(50)
+        names = sorted(os.listdir(self.directory))
+        segments = [name for name in names if name.endswith(".tarc")]
+        self.assertGreater(len(segments), 1)
+        for name in segments:
+            with open(os.path.join(self.directory, name), "rb") as f:
+                f.seek(-TRAILER.size, os.SEEK_END)
+                self.assertEqual(TRAILER.unpack(f.read())[3], END_MAGIC)
+            self.assertLessEqual(os.path.getsize(os.path.join(self.directory, name)), 2048 + TRAILER.size
+                                 + RECORD_HEADER.size + 40 * 20)
+        self.assert_archived(ReplayArchive(self.directory), 50)
+
+    def test_random_access(self):
+        self.fill(50)
+        archive = ReplayArchive(self.directory)
+        for game_id in (0, 17, 49, 23):
+            replay = archive.load(game_id)
+            self.assertEqual(replay.to_bytes(), make_replay(game_id).to_bytes())
+        with self.assertRaises(KeyError):
+            archive.entry(50)
+
+    def test_filter_by_mode(self):
+        self.fill(30)
+        speed = [entry.game_id for entry, _ in ReplayArchive(self.directory).replays("Speed")]
+        self.assertEqual(speed, list(range(1, 30, 3)))
+
+    def test_long_mode_round_trip(self):
+        """Test that modes too long for the index, or for a one-byte length, survive."""
+        modes = ["Marathon", "Ultra Sprint", "Ü" * 5, "Custom-" + "x" * 150]
+        writer = ArchiveWriter(self.directory, 2048)
+        for seed, mode in enumerate(modes):
+            writer.append(Replay(seed, mode))
+        # Read from the scanned records, then from the sealed index
+        for sealed in (False, True):
+            if sealed:
+                writer.close(seal=True)
+            archive = ReplayArchive(self.directory)
+            self.assertEqual(archive.segments[0].sealed, sealed)
+            self.assertEqual([entry.mode for entry in archive], modes)
+            self.assertEqual([entry.seed for entry, _ in archive.replays(modes[3])], [3])
+
+    def test_reader_follows_writer(self):
+        """Test that a reader sees games appended while it is open."""
+        writer = ArchiveWriter(self.directory, 2048)
+        archive = ReplayArchive(self.directory)
+        self.assertEqual(len(archive), 0)
+        for index in range(40):
+            writer.append(make_replay(index))
+            if index % 7 == 0:
+                archive.refresh()
+                self.assertEqual(len(archive), index + 1)
+        archive.refresh()
+        self.assert_archived(archive, 40)
+        writer.close()
+        self.assert_archived(ReplayArchive(self.directory), 40)
+
+    def test_writer_resumes_unsealed_segment(self):
+        self.fill(5, seal=False)
+        writer = ArchiveWriter(self.directory, 2048)
+        self.assertEqual(writer.append(make_replay(5)), 5)
+        writer.close(seal=True)
+        self.assert_archived(ReplayArchive(self.directory), 6)
+
+    def test_torn_record_ignored_and_truncated(self):
+        self.fill(3, segment_size=1 << 20, seal=False)
+        path = os.path.join(self.directory, segment_name(0))
+        size = os.path.getsize(path)
+        payload = make_replay(3).to_bytes()
+        with open(path, "ab") as f:
+            f.write(RECORD_HEADER.pack(1, len(payload), zlib.crc32(payload)) + payload[:-5])
+        self.assert_archived(ReplayArchive(self.directory), 3)
+        writer = ArchiveWriter(self.directory)
+        self.assertEqual(os.path.getsize(path), size)
+        writer.append(make_replay(3))
+        writer.close()
+        self.assert_archived(ReplayArchive(self.directory), 4)
+
+    def test_single_writer(self):
+        writer = ArchiveWriter(self.directory)
+        try:
+            with self.assertRaises(RuntimeError):
+                ArchiveWriter(self.directory)
+        finally:
+            writer.close()
+        ArchiveWriter(self.directory).close()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,151 @@
+"""Tests for the asset store and bundle."""
+
+import os
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import tempfile
+import unittest
+import wave
+import pygame
+from tetris.assets import (
+    HEADER, AssetBundle, AssetDirectory, Assets, build_bundle, main, open_assets, scan
+)
+
+class TestAssets(unittest.TestCase):
+    """Test cases for loose and bundled assets."""
+
+    @classmethod
+    def setUpClass(cls):
+        pygame.init()
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.root = os.path.join(self.directory.name, "assets")
+        self.bundle_path = self.root + ".bundle"
+        for name, data in (("a.txt", b"alpha"), ("sub/b.bin", bytes(range(256)) * 40),
+                           ("sub/deeper/c", b""), (".hidden", b"skip")):
+            path = os.path.join(self.root, *name.split("/"))
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "wb") as f:
+                f.write(data)
+        # A small image, font and sound
+        surface = pygame.Surface((3, 2))
+        surface.fill((10, 20, 30))
+        pygame.image.save(surface, os.path.join(self.root, "block.bmp"))
+        font = pygame.font.get_default_font()
+        with open(os.path.join(os.path.dirname(pygame.__file__), font), "rb") as f:
+            with open(os.path.join(self.root, "font.ttf"), "wb") as out:
+                out.write(f.read())
+        with wave.open(os.path.join(self.root, "beep.wav"), "wb") as f:
+            f.setnchannels(1)
+            f.setsampwidth(2)
+            f.setframerate(22050)
+            f.writeframes(bytes(2 * 11025))
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_scan(self):
+        self.assertEqual(scan(self.root), ["a.txt", "beep.wav", "block.bmp", "font.ttf",
+                                           "sub/b.bin", "sub/deeper/c"])
+
+    def test_bundle_matches_loose_files(self):
+        self.assertEqual(build_bundle(self.root, self.bundle_path), 6)
+        loose = AssetDirectory(self.root)
+        bundle = AssetBundle(self.bundle_path)
+        self.assertEqual(bundle.names(), loose.names())
+        for name in loose.names():
+            self.assertEqual(bundle.data(name), loose.data(name))
+            with bundle.open(name) as f:
+                self.assertEqual(f.read(), loose.data(name))
+        self.assertIn("sub/b.bin", bundle)
+        self.assertNotIn("missing", bundle)
+        self.assertNotIn("missing", loose)
+        with self.assertRaises(KeyError):
+            bundle.data("missing")
+        with self.assertRaises(KeyError):
+            loose.data("missing")
+        bundle.close()
+
+    def test_bundle_looks_up_lazily(self):
+        """Test that opening reads no index entries and lookups search the sorted names."""
+        names = [f"n/{index:03d}" for index in range(0, 300, 3)] + ["é", "Z", "a.txt"]
+        for name in names:
+            path = os.path.join(self.root, *name.split("/"))
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "wb") as f:
+                f.write(name.encode("utf-8"))
+        build_bundle(self.root, self.bundle_path)
+        bundle = AssetBundle(self.bundle_path)
+        self.assertEqual(bundle.index, {})
+        for name in names:
+            self.assertEqual(bundle.data(name), name.encode("utf-8"))
+        self.assertEqual(len(bundle.index), len(names))
+        for name in ("n/001", "n/300", "", "zz", "0"):
+            self.assertNotIn(name, bundle)
+        self.assertEqual(bundle.names(), AssetDirectory(self.root).names())
+        bundle.close()
+
+    def test_stream_seeks(self):
+        build_bundle(self.root, self.bundle_path)
+        bundle = AssetBundle(self.bundle_path)
+        with bundle.open("sub/b.bin") as f:
+            f.seek(300)
+            self.assertEqual(f.read(3), bytes([44, 45, 46]))
+            f.seek(-2, os.SEEK_END)
+            self.assertEqual(f.read(), bytes([254, 255]))
+        bundle.close()
+
+    def test_decoded_lazily_and_cached(self):
+        build_bundle(self.root, self.bundle_path)
+        for assets in (AssetDirectory(self.root), AssetBundle(self.bundle_path)):
+            self.assertEqual(assets.cache, {})
+            image = assets.image("block.bmp")
+            self.assertEqual(image.get_size(), (3, 2))
+            self.assertEqual(tuple(image.get_at((0, 0)))[:3], (10, 20, 30))
+            self.assertIs(assets.image("block.bmp"), image)
+            font = assets.font("font.ttf", 20)
+            self.assertIs(assets.font("font.ttf", 20), font)
+            self.assertIsNot(assets.font("font.ttf", 30), font)
+            self.assertGreater(font.size("Tetris")[0], 0)
+            self.assertAlmostEqual(assets.sound("beep.wav").get_length(), 0.5, places=2)
+            self.assertEqual(len(assets.cache), 4)
+            assets.close()
+
+    def test_open_assets_prefers_valid_bundle(self):
+        self.assertIsInstance(open_assets(self.root), AssetDirectory)
+        main(["--source", self.root])
+        assets = open_assets(self.root)
+        self.assertIsInstance(assets, AssetBundle)
+        assets.close()
+        # A damaged bundle falls back to the loose files
+        with open(self.bundle_path, "r+b") as f:
+            f.write(b"XXXX")
+        with self.assertLogs("tetris.assets", "WARNING"):
+            self.assertIsInstance(open_assets(self.root), AssetDirectory)
+
+    def test_assets_is_abstract(self):
+        """Test that a store must provide names and data."""
+        with self.assertRaises(TypeError):
+            Assets()
+
+        class Partial(Assets):
+            def names(self):
+                return set()
+        with self.assertRaises(TypeError):
+            Partial()
+
+    def test_truncated_bundle(self):
+        build_bundle(self.root, self.bundle_path)
+        size = os.path.getsize(self.bundle_path)
+        with open(self.bundle_path, "r+b") as f:
+            f.truncate(size - 1)
+        with self.assertRaises(ValueError):
+            AssetBundle(self.bundle_path)
+        with open(self.bundle_path, "r+b") as f:
+            f.truncate(HEADER.size + 3)
+        with self.assertRaises(ValueError):
+            AssetBundle(self.bundle_path)
+
+if __name__ == '__main__':
+    unittest.main()
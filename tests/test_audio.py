@@ -0,0 +1,134 @@
+"""Tests for sound effects and music."""
+
+import os
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import tempfile
+import types
+import unittest
+import wave
+from unittest import mock
+import pygame
+from tetris.assets import AssetBundle, AssetDirectory, build_bundle
+from tetris.audio import EFFECTS, Audio, synthesize
+from tetris.constants import Action
+from tetris.engine import GameEngine
+
+def write_wav(path, seconds, rate=22050):
+    """Write a silent mono 16-bit WAV file."""
+    with wave.open(path, "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(rate)
+        f.writeframes(bytes(2 * int(rate * seconds)))
+
+class TestAudio(unittest.TestCase):
+    """Test cases for Audio with the dummy audio driver."""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.settings = types.SimpleNamespace(music_volume=0.5, sfx_volume=0.25)
+        self.assets = AssetDirectory(self.directory.name)
+        os.makedirs(os.path.join(self.directory.name, "sounds"))
+        os.makedirs(os.path.join(self.directory.name, "music"))
+        self.music_file = os.path.join(self.directory.name, "music", "theme.wav")
+        self.audio = Audio(self.settings, self.assets, "music/theme.wav")
+        self.assertTrue(self.audio.enabled)
+
+    def tearDown(self):
+        self.audio.close()
+        self.assets.close()
+        pygame.mixer.quit()
+        self.directory.cleanup()
+
+    def test_effects_decoded_on_reserved_channels(self):
+        self.assertEqual(set(self.audio.sounds), set(EFFECTS))
+        channels = list(self.audio.channels.values())
+        self.assertEqual(len({id(channel) for channel in channels}), len(EFFECTS))
+        # Reserved channels are never handed out for other sounds
+        free = pygame.mixer.find_channel()
+        self.assertNotIn(free, channels)
+
+    def test_synthesized_length(self):
+        samples = synthesize((440, 880), 50, (44100, -16, 2))
+        self.assertEqual(len(samples), 2 * 2 * 2205)
+        self.assertIsNone(synthesize((440,), 50, (44100, 24, 2)))
+
+    def test_effects_follow_volume_live(self):
+        self.audio.play("lock")
+        channel = self.audio.channels["lock"]
+        self.assertTrue(channel.get_busy())
+        self.assertAlmostEqual(channel.get_volume(), 0.25, places=2)
+        self.settings.sfx_volume = 0.75
+        self.audio.play("lock")
+        self.assertAlmostEqual(channel.get_volume(), 0.75, places=2)
+        # Unknown effects are ignored
+        self.audio.play("explosion")
+
+    def test_sound_files_override_tones(self):
+        self.audio.close()
+        write_wav(os.path.join(self.directory.name, "sounds", "clear.wav"), 0.5)
+        self.audio = Audio(self.settings, self.assets, "music/theme.wav")
+        self.assertAlmostEqual(self.audio.sounds["clear"].get_length(), 0.5, places=2)
+        self.assertLess(self.audio.sounds["move"].get_length(), 0.1)
+
+    def test_music_streams_with_live_volume(self):
+        self.audio.play_music()  # No music file: nothing happens
+        self.assertFalse(pygame.mixer.music.get_busy())
+        write_wav(self.music_file, 2.0)
+        self.audio.play_music()
+        self.assertTrue(pygame.mixer.music.get_busy())
+        self.assertAlmostEqual(pygame.mixer.music.get_volume(), 0.5, places=1)
+        self.settings.music_volume = 0.1
+        self.audio.update()
+        self.assertAlmostEqual(pygame.mixer.music.get_volume(), 0.1, places=1)
+
+    def test_music_streams_from_bundle(self):
+        write_wav(self.music_file, 2.0)
+        write_wav(os.path.join(self.directory.name, "sounds", "lock.wav"), 0.5)
+        path = os.path.join(self.directory.name, "assets.bundle")
+        build_bundle(self.directory.name, path)
+        self.audio.close()
+        bundle = AssetBundle(path)
+        self.audio = Audio(self.settings, bundle, "music/theme.wav")
+        self.assertAlmostEqual(self.audio.sounds["lock"].get_length(), 0.5, places=2)
+        self.audio.play_music()
+        self.assertTrue(pygame.mixer.music.get_busy())
+        self.audio.close()
+        bundle.close()
+
+    def test_closes_only_assets_it_opened(self):
+        write_wav(os.path.join(self.directory.name, "sounds", "lock.wav"), 0.5)
+        path = os.path.join(self.directory.name, "assets.bundle")
+        build_bundle(self.directory.name, path)
+        self.audio.close()
+        # Passed in: still open after close
+        self.assertIn("sounds/lock.wav", self.assets)
+        bundle = AssetBundle(path)
+        with mock.patch("tetris.audio.open_assets", return_value=bundle):
+            self.audio = Audio(self.settings)
+        self.assertIs(self.audio.assets, bundle)
+        self.audio.close()
+        self.assertTrue(bundle.map.closed)
+
+    def test_game_events(self):
+        """Test that moves, rotations and locks trigger effects but gravity doesn't."""
+        played = []
+        self.audio.play = played.append
+        game = GameEngine(types.SimpleNamespace(difficulty="Normal"))
+        game.reset_game(0)
+        self.audio.attach(game)
+        game.spawn_new_piece()
+        game.advance(game.fall_speed)
+        game.apply_action(Action.SOFT_DROP)
+        self.assertEqual(played, [])
+        game.apply_action(Action.MOVE_RIGHT)
+        game.apply_action(Action.ROTATE)
+        game.apply_action(Action.HARD_DROP)
+        self.assertEqual(played[:3], ["move", "rotate", "lock"])
+        self.audio.detach()
+        game.apply_action(Action.HARD_DROP)
+        self.assertEqual(len(played), 3)
+
+if __name__ == '__main__':
+    unittest.main()
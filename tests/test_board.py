@@ -0,0 +1,135 @@
+"""Tests for board storage and compact pieces."""
+
+import sys
+import unittest
+from tetris.board import Board
+from tetris.constants import COLORS, SHAPES, PALETTE
+from tetris.tetrimino import Tetrimino
+
+class TestBoard(unittest.TestCase):
+    """Test cases for the Board class."""
+
+    def setUp(self):
+        """Set up test cases."""
+        self.board = Board(10, 20)
+
+    def test_compact_storage(self):
+        """Test that cells are stored one byte each."""
+        self.assertIsInstance(self.board.cells, bytearray)
+        self.assertEqual(len(self.board.cells), 200)
+        self.assertLess(sys.getsizeof(self.board.cells), 300)
+        self.assertFalse(hasattr(self.board, "__dict__"))
+
+    def test_row_view_uses_colors(self):
+        """Test that grid[y][x] reads and writes colors."""
+        self.assertIsNone(self.board[3][4])
+        self.board[3][4] = COLORS["BLUE"]
+        self.assertEqual(self.board[3][4], COLORS["BLUE"])
+        self.assertEqual(PALETTE[self.board.get(4, 3)], COLORS["BLUE"])
+        self.board[3][4] = None
+        self.assertEqual(self.board.get(4, 3), 0)
+
+    def test_clear_full_rows(self):
+        """Test that full rows are removed and rows above shift down."""
+        for x in range(10):
+            self.board.set(x, 19, 1)
+            self.board.set(x, 17, 2)
+        self.board.set(0, 18, 3)
+        self.board.set(5, 16, 4)
+        self.assertEqual(self.board.clear_full_rows(), 2)
+        self.assertEqual(self.board.get(0, 19), 3)
+        self.assertEqual(self.board.get(5, 18), 4)
+        self.assertEqual(sum(1 for kind in self.board.cells if kind), 2)
+
+    def test_clear_rows_checks_only_given_rows(self):
+        """Test that clear_rows ignores full rows it was not asked about."""
+        for x in range(10):
+            self.board.set(x, 19, 1)
+            self.board.set(x, 15, 2)
+            self.board.set(x, 13, 3)
+        self.board.set(2, 14, 4)
+        self.board.set(7, 12, 5)
+        self.assertEqual(self.board.clear_rows([13, 14, 15]), 2)
+        # Row 19 was full but not a candidate
+        self.assertTrue(self.board.row_is_full(19))
+        self.assertEqual(self.board.get(2, 15), 4)
+        self.assertEqual(self.board.get(7, 14), 5)
+        self.assertEqual(self.board.clear_rows([0, 1]), 0)
+
+    def test_clear_bottom_row_turns_offset(self):
+        """Test that clearing near the floor moves the rows below, not above."""
+        for x in range(10):
+            self.board.set(x, 19, 1)
+        self.board.set(3, 10, 2)
+        self.board.set(4, 18, 3)
+        self.assertEqual(self.board.clear_rows([19]), 1)
+        self.assertNotEqual(self.board.offset, 0)
+        self.assertEqual(self.board.get(3, 11), 2)
+        self.assertEqual(self.board.get(4, 19), 3)
+        self.assertFalse(any(self.board.linear(0, 1)))
+        self.assertEqual(sum(1 for kind in self.board.linear() if kind), 2)
+
+    def test_push_rows(self):
+        """Test that pushed rows enter at the bottom and the stack moves up."""
+        self.board.set(2, 19, 4)
+        garbage = bytes([8] * 9 + [0])
+        self.assertFalse(self.board.push_rows([garbage, garbage]))
+        self.assertEqual(self.board.get(2, 17), 4)
+        self.assertEqual(self.board.linear(18), garbage * 2)
+        self.assertEqual(self.board.column(9), bytes(20))
+        self.assertEqual(list(self.board[19]), [PALETTE[8]] * 9 + [None])
+        # Blocks pushed off the top are reported
+        self.board.set(0, 1, 1)
+        self.assertTrue(self.board.push_rows([garbage, garbage]))
+
+    def test_load_linear_round_trip(self):
+        self.board.set(1, 0, 5)
+        self.board.push_rows([bytes(range(10))])
+        copy = Board(10, 20)
+        copy.load(self.board.linear())
+        self.assertEqual(copy.offset, 0)
+        self.assertEqual(copy.linear(), self.board.linear())
+        self.assertEqual(self.board.copy().linear(), self.board.linear())
+
+    def test_first_filled(self):
+        """Test the column search on both sides of the row storage's wrap."""
+        self.board.push_rows([bytes(10)] * 7)
+        for y in (3, 12, 16):
+            self.board.set(4, y, 1)
+        for top, stop in ((0, 20), (4, 20), (13, 20), (17, 20), (0, 3), (5, 5), (19, 20)):
+            column = self.board.column(4)[top:stop]
+            expected = top + column.index(1) if any(column) else stop
+            self.assertEqual(self.board.first_filled(4, top, stop), expected, (top, stop))
+        self.assertEqual(self.board.first_filled(5, 0, 20), 20)
+
+    def test_copy_is_independent(self):
+        """Test that copies don't share cells."""
+        copy = self.board.copy()
+        copy.set(0, 0, 1)
+        self.assertEqual(self.board.get(0, 0), 0)
+
+class TestCompactTetrimino(unittest.TestCase):
+    """Test cases for the slotted Tetrimino."""
+
+    def test_slots(self):
+        """Test that pieces carry no per-instance dict."""
+        piece = Tetrimino(0, 0, SHAPES[6])
+        self.assertFalse(hasattr(piece, "__dict__"))
+        self.assertEqual(piece.kind, SHAPES[6]['id'])
+        self.assertEqual(piece.color, SHAPES[6]['color'])
+
+    def test_kind_from_color(self):
+        """Test that pieces built from a color get the matching id."""
+        piece = Tetrimino(0, 0, {'shape': [[1, 1], [1, 1]], 'color': COLORS["YELLOW"]})
+        self.assertEqual(piece.kind, SHAPES[1]['id'])
+
+    def test_rotations_are_shared(self):
+        """Test that pieces share rotated shapes instead of copying them."""
+        first = Tetrimino(0, 0, SHAPES[6])
+        second = Tetrimino(0, 0, SHAPES[6])
+        first.rotate()
+        second.rotate()
+        self.assertIs(first.shape, second.shape)
+
+if __name__ == '__main__':
+    unittest.main()
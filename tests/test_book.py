@@ -0,0 +1,72 @@
+"""Tests for the opening book."""
+
+import os
+import shutil
+import tempfile
+import types
+import unittest
+from tetris.book import (
+    OpeningBook, board_hash, generate, load_book, write_book, HEADER, RECORD
+)
+from tetris.bot import Bot, apply_placement, best_placement
+from tetris.engine import GameEngine
+
+class TestOpeningBook(unittest.TestCase):
+    """Test cases for OpeningBook."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.mkdtemp(prefix="tetris-book-")
+        cls.path = os.path.join(cls.directory, "book.bin")
+        cls.records = generate(depth=2)
+        write_book(cls.path, cls.records, 10, 20, 2)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.directory)
+
+    def test_file_layout(self):
+        self.assertEqual(os.path.getsize(self.path), HEADER.size + len(self.records) * RECORD.size)
+        # 7 pieces x 7 previews on the empty board, then 7 previews per reached position
+        self.assertEqual(len([r for r in self.records if r[0] == board_hash(bytes(200))]), 49)
+        self.assertEqual(len(OpeningBook(self.path)), len(self.records))
+
+    def test_lazy_open(self):
+        book = OpeningBook(self.path)
+        self.assertIsNone(book.map)
+        book.lookup(bytes(200), 10, 20, 1, 2)
+        self.assertIsNotNone(book.map)
+        book.close()
+
+    def test_lookup_matches_search(self):
+        book = OpeningBook(self.path)
+        for piece in range(1, 8):
+            for preview in range(1, 8):
+                self.assertEqual(book.lookup(bytes(200), 10, 20, piece, preview),
+                                 best_placement(bytes(200), 10, 20, piece, preview))
+
+    def test_unknown_positions(self):
+        book = OpeningBook(self.path)
+        self.assertIsNone(book.lookup(b"\x01" + bytes(199), 10, 20, 1, 1))
+        self.assertIsNone(book.lookup(bytes(220), 11, 20, 1, 1))
+
+    def test_bot_uses_book(self):
+        book = OpeningBook(self.path)
+        for seed in range(5):
+            engine = GameEngine(types.SimpleNamespace(difficulty="Normal"))
+            engine.seed(seed)
+            engine.reset_game()
+            with_book, plain = Bot(book), Bot()
+            for _ in range(4):
+                placement = with_book.choose(engine)
+                self.assertEqual(placement, plain.choose(engine))
+                apply_placement(engine, *placement)
+            # The first two pieces are in a depth-2 book
+            self.assertEqual(with_book.book_hits, 2)
+            self.assertEqual(with_book.searches, 2)
+
+    def test_load_book_missing(self):
+        self.assertIsNone(load_book(os.path.join(self.directory, "missing.bin")))
+
+if __name__ == '__main__':
+    unittest.main()
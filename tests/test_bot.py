@@ -0,0 +1,88 @@
+"""Tests for the heuristic bot."""
+
+import types
+import unittest
+from tetris.bot import (
+    Bot, ROTATIONS, best_placement, column_tops, evaluate, occupancy, place, placements
+)
+from tetris.engine import GameEngine
+
+def make_engine(seed=0, width=None, height=None):
+    engine = GameEngine(types.SimpleNamespace(difficulty="Normal"), width, height)
+    engine.seed(seed)
+    engine.reset_game()
+    return engine
+
+class TestBot(unittest.TestCase):
+    """Test cases for placement search and the Bot."""
+
+    def test_distinct_rotations(self):
+        self.assertEqual([len(rotations) for rotations in ROTATIONS[1:]], [2, 1, 2, 2, 4, 4, 4])
+
+    def test_place_matches_engine(self):
+        """Test that the searched board is the board the engine ends up with."""
+        for seed in range(3):
+            engine = make_engine(seed)
+            bot = Bot()
+            for _ in range(60):
+                before = occupancy(engine.grid)
+                kind = engine.current_piece.kind
+                placement = bot.play(engine)
+                if engine.game_over:
+                    break
+                expected, lines = place(before, engine.grid.width, engine.grid.height, kind, *placement)
+                self.assertEqual(occupancy(engine.grid), expected)
+
+    def test_line_clear(self):
+        width, height = 4, 4
+        cells = bytes(12) + b"\x01\x01\x01\x00"
+        # A vertical I in the last column clears the bottom row
+        after, lines = place(cells, width, height, 1, 1, 3)
+        self.assertEqual(lines, 1)
+        self.assertEqual(after, bytes(4) + b"\x00\x00\x00\x01" * 3)
+
+    def test_evaluate(self):
+        width, height = 3, 3
+        cells = b"\x00\x00\x00" b"\x01\x00\x00" b"\x00\x00\x01"
+        # Heights 2, 0, 1; one hole; bumpiness 3
+        self.assertAlmostEqual(evaluate(cells, width, height, 0, (1, 0, 0, 0)), 3)
+        self.assertAlmostEqual(evaluate(cells, width, height, 0, (0, 0, 1, 0)), 1)
+        self.assertAlmostEqual(evaluate(cells, width, height, 0, (0, 0, 0, 1)), 3)
+        self.assertEqual(column_tops(cells, width, height), [1, 3, 2])
+
+    def test_prefers_filling_rows(self):
+        width, height = 4, 4
+        cells = bytes(12) + b"\x01\x01\x00\x00"
+        self.assertEqual(best_placement(cells, width, height, 2), (0, 2))
+
+    def test_no_placement_when_full(self):
+        width, height = 4, 2
+        cells = b"\x01\x00\x01\x00" * 2
+        self.assertEqual(list(placements(cells, width, height, 2)), [])
+        self.assertIsNone(best_placement(cells, width, height, 2))
+
+    def test_bot_survives(self):
+        engine = make_engine(5)
+        bot = Bot()
+        for _ in range(200):
+            bot.play(engine)
+        self.assertFalse(engine.game_over)
+        self.assertGreater(engine.total_lines, 50)
+        self.assertEqual(bot.searches, 200)
+
+    def test_preview_sequence_unchanged(self):
+        """Test that the preview does not change a seed's piece sequence."""
+        import random
+        from tetris.constants import SHAPES
+        rng = random.Random(9)
+        expected = [rng.choice(SHAPES)['id'] for _ in range(9)]
+        engine = make_engine(9)
+        seen = []
+        for _ in range(8):
+            seen.append(engine.current_piece.kind)
+            self.assertEqual(engine.next_shape['id'], expected[len(seen)])
+            engine.hard_drop()
+        self.assertEqual(seen, expected[:8])
+
+if __name__ == '__main__':
+    unittest.main()
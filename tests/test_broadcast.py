@@ -0,0 +1,187 @@
+"""Tests for broadcasting games to viewers over loopback."""
+
+import random
+import socket
+import time
+import unittest
+from tetris.broadcast import (
+    BroadcastRelay, BroadcastPublisher, BroadcastViewer,
+    encode_shape, decode_shape, encode_keyframe, frame, iter_frames, MOVE
+)
+from tetris.constants import GARBAGE_ID, Action, GameEvent, SHAPES
+from tetris.engine import GameEngine
+
+class MockSettings:
+    """Mock settings class for testing purposes."""
+    difficulty = "Normal"
+
+def make_game(seed=0):
+    game = GameEngine(MockSettings())
+    game.seed(seed)
+    game.reset_game()
+    return game
+
+def in_sync(game, viewer):
+    """Return True if the viewer mirrors the game."""
+    if viewer.grid.linear() != game.grid.linear() or viewer.score != game.score:
+        return False
+    piece, mirrored = game.current_piece, viewer.current_piece
+    if game.game_over:
+        return viewer.game_over
+    return (mirrored is not None and (mirrored.x, mirrored.y, mirrored.kind) == (piece.x, piece.y, piece.kind)
+            and mirrored.shape == piece.shape)
+
+def sync(relay, viewers, game, timeout=5.0):
+    """Pump and poll until every viewer mirrors the game."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        relay.pump()
+        for viewer in viewers:
+            viewer.poll()
+        if all(in_sync(game, viewer) for viewer in viewers):
+            return True
+        time.sleep(0.002)
+    return False
+
+class TestCodec(unittest.TestCase):
+    """Test cases for frame encoding."""
+
+    def test_shape_round_trip(self):
+        for info in SHAPES:
+            self.assertEqual(decode_shape(*encode_shape(info['shape'])), info['shape'])
+
+    def test_iter_frames_keeps_partial_frame(self):
+        data = frame(MOVE, b"abc") + frame(MOVE, b"defg")
+        buffer = bytearray(data[:-2])
+        self.assertEqual(list(iter_frames(buffer)), [(MOVE, b"abc")])
+        buffer += data[-2:]
+        self.assertEqual(list(iter_frames(buffer)), [(MOVE, b"defg")])
+        self.assertEqual(buffer, b"")
+
+class TestBroadcast(unittest.TestCase):
+    """Test cases for the relay, publisher and viewer."""
+
+    def setUp(self):
+        self.relay = BroadcastRelay()
+        self.viewers = []
+
+    def tearDown(self):
+        for viewer in self.viewers:
+            viewer.close()
+        self.relay.close()
+
+    def connect(self):
+        viewer = BroadcastViewer(self.relay.address)
+        self.viewers.append(viewer)
+        return viewer
+
+    def play(self, game, steps, rng):
+        actions = list(Action)
+        for _ in range(steps):
+            if game.game_over:
+                game.reset_game()
+            game.apply_action(rng.choice(actions))
+            game.advance(50)
+
+    def test_viewers_mirror_game(self):
+        game = make_game()
+        BroadcastPublisher(game, self.relay)
+        viewers = [self.connect() for _ in range(3)]
+        self.assertTrue(sync(self.relay, viewers, game))
+        rng = random.Random(0)
+        for _ in range(20):
+            self.play(game, 25, rng)
+            self.assertTrue(sync(self.relay, viewers, game))
+
+    def test_late_joiner_gets_keyframe(self):
+        game = make_game(1)
+        BroadcastPublisher(game, self.relay)
+        rng = random.Random(1)
+        self.play(game, 300, rng)
+        # Join mid-game, with blocks on the board
+        while not any(game.grid.cells):
+            self.play(game, 1, rng)
+        viewer = self.connect()
+        self.assertTrue(sync(self.relay, [viewer], game))
+        self.play(game, 50, random.Random(2))
+        self.assertTrue(sync(self.relay, [viewer], game))
+
+    def test_one_copy_per_event(self):
+        """Test that published data is stored once whatever the viewer count."""
+        game = make_game()
+        BroadcastPublisher(game, self.relay)
+        for _ in range(5):
+            self.connect()
+        self.relay.pump()
+        self.assertEqual(len(self.relay.subscribers), 5)
+        before = len(self.relay.log)
+        self.relay.publish(b"x" * 10)
+        self.assertEqual(len(self.relay.log) - before, 10)
+
+    def test_slow_viewer_dropped(self):
+        relay = self.relay
+        relay.max_lag = 8192
+        game = make_game()
+        BroadcastPublisher(game, relay)
+        fast = self.connect()
+        slow = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        slow.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4096)
+        slow.connect(relay.address)
+        relay.pump()
+        self.assertEqual(len(relay.subscribers), 2)
+
+        # Flood with valid frames; the slow socket never reads
+        burst = encode_keyframe(game) * 20
+        start = time.monotonic()
+        for _ in range(4000):
+            relay.publish(burst)
+            relay.pump()
+            fast.poll()
+            if relay.dropped:
+                break
+        slow.close()
+        # Publishing never waited on the slow socket
+        self.assertLess(time.monotonic() - start, 10)
+        self.assertEqual(relay.dropped, 1)
+        self.assertEqual(len(relay.subscribers), 1)
+        self.assertTrue(sync(relay, [fast], game))
+
+    def test_garbage_mirrored(self):
+        game = make_game(2)
+        BroadcastPublisher(game, self.relay)
+        viewer = self.connect()
+        self.play(game, 40, random.Random(2))
+        game.add_garbage(3, 4)
+        self.assertTrue(sync(self.relay, [viewer], game))
+        for y in range(17, 20):
+            self.assertEqual((viewer.grid.get(4, y), viewer.grid.get(0, y)), (0, GARBAGE_ID))
+
+    def test_detach(self):
+        game = make_game()
+        publisher = BroadcastPublisher(game, self.relay)
+        publisher.detach()
+        self.assertEqual(game.listeners, [])
+        self.assertIsNone(self.relay.keyframe)
+
+class TestEngineEvents(unittest.TestCase):
+    """Test cases for GameEngine listeners."""
+
+    def test_events_reported(self):
+        game = make_game()
+        events = []
+        game.add_listener(lambda event, *args: events.append(event))
+        game.move_right()
+        game.hard_drop()
+        game.reset_game()
+        self.assertEqual(events[:4], [GameEvent.MOVE, GameEvent.LOCK, GameEvent.SPAWN, GameEvent.RESET])
+
+    def test_game_over_reported_once(self):
+        game = make_game()
+        events = []
+        game.add_listener(lambda event, *args: events.append(event))
+        while not game.game_over:
+            game.hard_drop()
+        self.assertEqual(events.count(GameEvent.GAME_OVER), 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+"""Tests for the key-to-action input layer."""
+
+import unittest
+from tetris.constants import Action, SHAPES
+from tetris.controls import InputHandler
+from tetris.engine import GameEngine
+from tetris.tetrimino import Tetrimino
+
+CONTROLS = {"MOVE_LEFT": 1, "MOVE_RIGHT": 2, "ROTATE": 3, "SOFT_DROP": 4, "HARD_DROP": 5}
+
+class MockSettings:
+    """Mock settings class for testing purposes."""
+    def __init__(self, difficulty="Easy"):
+        self.difficulty = difficulty
+
+class TestInputHandler(unittest.TestCase):
+    """Test cases for the InputHandler class."""
+
+    def setUp(self):
+        """Set up test cases."""
+        self.handler = InputHandler(CONTROLS, das=100, arr=20)
+
+    def test_dispatch_uses_controls(self):
+        """Test that keys map to actions through the controls table."""
+        self.assertTrue(self.handler.key_down(3, 0))
+        self.assertFalse(self.handler.key_down(99, 0))
+        self.assertEqual(self.handler.drain(), [(0, Action.ROTATE)])
+
+    def test_auto_repeat_on_simulation_clock(self):
+        """Test DAS then ARR repeats at exact timestamps."""
+        self.handler.key_down(1, 0)
+        self.handler.update(150)
+        self.assertEqual([t for t, _ in self.handler.drain()], [0, 100, 120, 140])
+
+    def test_long_frame_keeps_repeat_rate(self):
+        """Test that one long update yields every repeat that was due."""
+        self.handler.key_down(2, 0)
+        self.handler.update(1000)
+        self.assertEqual(len(self.handler.drain()), 1 + (1000 - 100) // 20 + 1)
+
+    def test_release_stops_repeat(self):
+        """Test that repeats stop at key release."""
+        self.handler.key_down(4, 0)
+        self.handler.key_up(4, 130)
+        self.handler.update(1000)
+        self.assertEqual([t for t, _ in self.handler.drain()], [0, 100, 120])
+
+    def test_opposite_direction_cancels(self):
+        """Test that pressing the other direction stops the first repeat."""
+        self.handler.key_down(1, 0)
+        self.handler.key_down(2, 50)
+        self.handler.update(200)
+        actions = self.handler.drain()
+        self.assertEqual([a for _, a in actions].count(Action.MOVE_LEFT), 1)
+
+    def test_release_resumes_held_direction(self):
+        """Test that releasing the second direction resumes the first while it is held."""
+        self.handler.key_down(1, 0)
+        self.handler.key_down(2, 50)
+        self.handler.key_up(2, 60)
+        self.handler.update(200)
+        self.assertEqual(self.handler.drain(), [(0, Action.MOVE_LEFT), (50, Action.MOVE_RIGHT),
+                                                (160, Action.MOVE_LEFT), (180, Action.MOVE_LEFT),
+                                                (200, Action.MOVE_LEFT)])
+        # Once both are released nothing repeats
+        self.handler.key_up(1, 210)
+        self.handler.update(1000)
+        self.assertEqual(self.handler.drain(), [])
+
+    def test_release_of_replaced_direction(self):
+        """Test that releasing the first direction leaves the second repeating."""
+        self.handler.key_down(1, 0)
+        self.handler.key_down(2, 50)
+        self.handler.key_up(1, 60)
+        self.handler.update(170)
+        self.assertEqual([a for _, a in self.handler.drain()],
+                         [Action.MOVE_LEFT, Action.MOVE_RIGHT, Action.MOVE_RIGHT, Action.MOVE_RIGHT])
+
+    def test_rotate_does_not_repeat(self):
+        """Test that rotation fires once per press."""
+        self.handler.key_down(3, 0)
+        self.handler.update(1000)
+        self.assertEqual(len(self.handler.drain()), 1)
+
+class TestEngineActions(unittest.TestCase):
+    """Test cases for applying actions to the engine."""
+
+    def setUp(self):
+        """Set up test cases."""
+        self.game = GameEngine(MockSettings())
+        self.game.current_piece = Tetrimino(4, 0, SHAPES[1])
+
+    def test_apply_actions(self):
+        """Test that actions move the piece."""
+        self.game.apply_action(Action.MOVE_LEFT)
+        self.game.apply_action(Action.SOFT_DROP)
+        self.assertEqual((self.game.current_piece.x, self.game.current_piece.y), (3, 1))
+
+    def test_run_until_interleaves_gravity(self):
+        """Test that gravity runs up to each action's timestamp."""
+        fall_speed = self.game.fall_speed
+        self.game.run_until(fall_speed * 2, [(fall_speed, Action.MOVE_RIGHT)])
+        self.assertEqual(self.game.sim_time, fall_speed * 2)
+        self.assertEqual((self.game.current_piece.x, self.game.current_piece.y), (5, 2))
+
+    def test_hard_drop_locks(self):
+        """Test that hard drop locks the piece at the bottom."""
+        self.game.apply_action(Action.HARD_DROP)
+        self.assertEqual(self.game.grid.get(4, 19), SHAPES[1]['id'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+"""Tests for resolution-independent presentation."""
+
+import unittest
+import pygame
+from tetris.display import Display
+from tetris.constants import COLORS, SCREEN_DIMENSIONS
+
+LOGICAL_SIZE = (SCREEN_DIMENSIONS['WIDTH'], SCREEN_DIMENSIONS['HEIGHT'])
+
+class TestDisplay(unittest.TestCase):
+    """Test cases for the Display class."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up test environment."""
+        pygame.init()
+
+    def test_logical_surface_size(self):
+        """Test that drawing happens at the logical resolution."""
+        display = Display((1600, 1200))
+        self.assertEqual(display.surface.get_size(), LOGICAL_SIZE)
+        self.assertEqual(display.window.get_size(), (1600, 1200))
+
+    def test_integer_scale_present(self):
+        """Test that a logical pixel fills a scaled block of the window."""
+        display = Display((1600, 1200))
+        self.assertEqual(display.scale, 2)
+        display.surface.fill(COLORS["BLACK"])
+        display.surface.set_at((10, 10), COLORS["RED"])
+        display.present()
+        self.assertEqual(display.window.get_at((21, 21))[:3], COLORS["RED"])
+        self.assertEqual(display.window.get_at((19, 19))[:3], COLORS["BLACK"])
+
+    def test_letterbox_and_mouse_mapping(self):
+        """Test centered letterboxing and window-to-logical mapping."""
+        display = Display((1000, 600))
+        self.assertEqual(display.dest_rect.topleft, (100, 0))
+        self.assertEqual(display.to_logical((150, 20)), (50, 20))
+        event = pygame.event.Event(pygame.MOUSEMOTION, {'pos': (150, 20)})
+        self.assertEqual(display.map_mouse_events([event])[0].pos, (50, 20))
+
+    def test_resize_keeps_surface(self):
+        """Test that resizing keeps the surface menus and games draw on."""
+        display = Display()
+        surface = display.surface
+        display.resize((2400, 1800))
+        self.assertIs(display.surface, surface)
+        self.assertEqual(display.scale, 3)
+
+    @classmethod
+    def tearDownClass(cls):
+        """Clean up test environment."""
+        pygame.quit()
+
+if __name__ == '__main__':
+    unittest.main()
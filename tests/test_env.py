@@ -0,0 +1,146 @@
+"""Tests for the reinforcement learning environments."""
+
+import os
+import subprocess
+import sys
+import unittest
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is an optional dependency
+    np = None
+
+from tetris.constants import SHAPES
+from tetris.tetrimino import Tetrimino
+
+if np is not None:
+    from tetris.env import TetrisEnv, VectorTetrisEnv
+
+O_PIECE = SHAPES[1]
+
+class FixedPieces:
+    """Stand-in generator that always draws the given piece ids."""
+
+    def __init__(self, kinds):
+        self.kinds = kinds
+
+    def integers(self, low, high, size, dtype):
+        return np.asarray(self.kinds, dtype=dtype)
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestTetrisEnv(unittest.TestCase):
+    """Test cases for TetrisEnv."""
+
+    def test_reset_observation(self):
+        env = TetrisEnv()
+        obs, info = env.reset(seed=3)
+        self.assertEqual(obs["board"].shape, (20, 10))
+        self.assertEqual(obs["board"].dtype, np.uint8)
+        self.assertIn(obs["piece"], range(1, 8))
+        self.assertEqual(info["score"], 0)
+
+    def test_seed_reproducible(self):
+        def pieces(seed):
+            env = TetrisEnv()
+            obs, _ = env.reset(seed=seed)
+            kinds = [obs["piece"]]
+            for _ in range(10):
+                obs, _, terminated, _, _ = env.step(env.num_actions // 2)
+                kinds.append(obs["piece"])
+            return kinds
+        self.assertEqual(pieces(7), pieces(7))
+
+    def test_line_clear_reward(self):
+        env = TetrisEnv()
+        env.reset(seed=0)
+        board = env.engine.grid
+        for y in (18, 19):
+            for x in range(2, 10):
+                board.set(x, y, 1)
+        env.engine.current_piece = Tetrimino(4, 0, O_PIECE)
+        obs, reward, terminated, truncated, info = env.step(0)
+        self.assertEqual(reward, 3.0)
+        self.assertFalse(terminated)
+        self.assertEqual(info["lines"], 2)
+        self.assertFalse(obs["board"][18:].any())
+
+    def test_top_out_terminates(self):
+        env = TetrisEnv(max_steps=1000)
+        env.reset(seed=0)
+        terminated = False
+        for _ in range(200):
+            _, _, terminated, truncated, _ = env.step(0)
+            if terminated:
+                break
+        self.assertTrue(terminated)
+        self.assertFalse(truncated)
+
+    def test_truncation(self):
+        env = TetrisEnv(width=20, max_steps=2)
+        env.reset(seed=0)
+        self.assertFalse(env.step(0)[3])
+        self.assertTrue(env.step(10)[3])
+
+    def test_no_pygame(self):
+        src_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src'))
+        code = "import sys, tetris.env; print('pygame' in sys.modules)"
+        env = dict(os.environ, PYTHONPATH=src_path)
+        output = subprocess.check_output([sys.executable, "-c", code], env=env, text=True)
+        self.assertEqual(output.strip(), "False")
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestVectorTetrisEnv(unittest.TestCase):
+    """Test cases for VectorTetrisEnv."""
+
+    def test_reset_shapes(self):
+        env = VectorTetrisEnv(8)
+        obs, _ = env.reset(seed=1)
+        self.assertEqual(obs["board"].shape, (8, 20, 10))
+        self.assertEqual(obs["piece"].shape, (8,))
+        self.assertTrue(((obs["piece"] >= 1) & (obs["piece"] <= 7)).all())
+
+    def test_line_clear_reward(self):
+        env = VectorTetrisEnv(2)
+        env.reset(seed=0)
+        env.boards[0, 18:, 2:] = 1
+        env.tops[0, 2:] = 18
+        env.pieces[:] = O_PIECE['id']
+        _, rewards, terminated, _, info = env.step([0, 0])
+        self.assertEqual(rewards.tolist(), [3.0, 0.0])
+        self.assertEqual(info["lines"].tolist(), [2, 0])
+        self.assertFalse(terminated.any())
+        self.assertFalse(env.boards[0].any())
+        self.assertEqual(env.tops[0].tolist(), [20] * 10)
+
+    def test_finished_games_reset(self):
+        env = VectorTetrisEnv(4, max_steps=5)
+        env.reset(seed=0)
+        for _ in range(4):
+            env.step(np.zeros(4, dtype=np.int64))
+        _, _, terminated, truncated, info = env.step(np.zeros(4, dtype=np.int64))
+        self.assertTrue((terminated | truncated).all())
+        self.assertFalse(env.boards.any())
+        self.assertEqual(env.steps.tolist(), [0] * 4)
+
+    def test_matches_engine_rules(self):
+        """Both environments produce the same boards for the same pieces."""
+        rng = np.random.default_rng(1)
+        single = TetrisEnv()
+        vector = VectorTetrisEnv(1)
+        for episode in range(10):
+            obs, _ = single.reset(seed=episode)
+            vector.reset()
+            vector.pieces[0] = obs["piece"]
+            for _ in range(200):
+                action = int(rng.integers(single.num_actions))
+                obs, reward, terminated, _, _ = single.step(action)
+                vector.rng = FixedPieces([obs["piece"]])
+                _, rewards, vector_terminated, _, _ = vector.step([action])
+                self.assertEqual(reward, rewards[0])
+                self.assertEqual(terminated, vector_terminated[0])
+                if terminated:
+                    break
+                np.testing.assert_array_equal(obs["board"], vector.boards[0])
+
+if __name__ == '__main__':
+    unittest.main()
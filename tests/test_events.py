@@ -0,0 +1,51 @@
+"""Tests for event pre-processing."""
+
+import unittest
+import pygame
+from tetris.events import EventFilter, coalesce_motion, route
+from tetris.ui import Menu
+
+def motion(x, y):
+    """Create a MOUSEMOTION event."""
+    return pygame.event.Event(pygame.MOUSEMOTION, {'pos': (x, y)})
+
+class TestEventProcessing(unittest.TestCase):
+    """Test cases for event filtering and coalescing."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up test environment."""
+        pygame.init()
+        pygame.display.set_mode((100, 100))
+
+    def test_coalesce_motion_runs(self):
+        """Test that motion runs collapse to their latest position."""
+        click = pygame.event.Event(pygame.MOUSEBUTTONDOWN, {'pos': (3, 3), 'button': 1})
+        events = coalesce_motion([motion(1, 1), motion(2, 2), click, motion(4, 4), motion(5, 5)])
+        self.assertEqual([event.type for event in events],
+                         [pygame.MOUSEMOTION, pygame.MOUSEBUTTONDOWN, pygame.MOUSEMOTION])
+        self.assertEqual(events[0].pos, (2, 2))
+        self.assertEqual(events[2].pos, (5, 5))
+
+    def test_route_filters_types(self):
+        """Test that handlers only receive event types they use."""
+        key_up = pygame.event.Event(pygame.KEYUP, {'key': pygame.K_a})
+        events = route([motion(1, 1), key_up], Menu.EVENT_TYPES)
+        self.assertEqual([event.type for event in events], [pygame.MOUSEMOTION])
+
+    def test_restrict_queue(self):
+        """Test that blocked event types never reach the queue."""
+        event_filter = EventFilter()
+        event_filter.restrict(frozenset((pygame.KEYDOWN,)))
+        self.assertTrue(pygame.event.get_blocked(pygame.MOUSEMOTION))
+        self.assertFalse(pygame.event.get_blocked(pygame.KEYDOWN))
+        self.assertFalse(pygame.event.get_blocked(pygame.QUIT))
+
+    @classmethod
+    def tearDownClass(cls):
+        """Clean up test environment."""
+        pygame.event.set_allowed(None)
+        pygame.quit()
+
+if __name__ == '__main__':
+    unittest.main()
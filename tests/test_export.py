@@ -0,0 +1,84 @@
+"""Tests for headless replay export."""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+import pygame
+from tetris.constants import Action
+from tetris.export import ReplayRenderer, export, read_raw_frame, pixel_format, RAW_DATA_OFFSET
+from tetris.replay import Replay
+
+def make_replay(frames=120, step=16):
+    """Return a replay of a game that only hard drops."""
+    replay = Replay(3)
+    for index in range(1, frames + 1):
+        actions = [(index * step - 1, Action.HARD_DROP)] if index % 10 == 0 else []
+        replay.add_frame(index * step, actions)
+    return replay
+
+class TestExport(unittest.TestCase):
+    """Test cases for replay export."""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp(prefix="tetris-export-")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_frame_count(self):
+        replay = make_replay()
+        renderer = ReplayRenderer(replay)
+        self.assertEqual(sum(1 for _ in renderer.frames(60)), renderer.frame_count(60))
+        self.assertEqual(renderer.frame_count(30, tail=1.0), replay.end_time * 30 // 1000 + 1 + 30)
+
+    def test_pixel_format(self):
+        surface = pygame.Surface((4, 4), 0, 32)
+        surface.fill((1, 2, 3))
+        fmt = pixel_format(surface)
+        pixel = bytes(surface.get_buffer())[:4]
+        self.assertEqual(pixel[fmt.index("R")], 1)
+        self.assertEqual(pixel[fmt.index("G")], 2)
+        self.assertEqual(pixel[fmt.index("B")], 3)
+
+    def test_raw_export(self):
+        replay = make_replay()
+        path = os.path.join(self.directory, "game.raw")
+        count = export(replay, path, fps=30, tail=0.5)
+        header, pixels = read_raw_frame(path, count - 1)
+        self.assertEqual(header["frames"], count)
+        self.assertEqual(os.path.getsize(path), RAW_DATA_OFFSET + count * header["pitch"] * header["height"])
+
+        # The last frame shows the stacked pieces at the bottom of the board
+        renderer = ReplayRenderer(replay)
+        for _ in renderer.frames(30):
+            pass
+        game = renderer.game
+        x = game.grid_offset_x + game.block_size // 2
+        y = game.grid_offset_y + (game.grid_height - 1) * game.block_size + game.block_size // 2
+        column = next(c for c in range(game.grid_width) if game.grid[game.grid_height - 1][c])
+        x += column * game.block_size
+        offset = y * header["pitch"] + x * 4
+        fmt = header["format"]
+        colour = tuple(pixels[offset + fmt.index(channel)] for channel in "RGB")
+        self.assertEqual(colour, game.grid[game.grid_height - 1][column])
+        pixels.release()
+
+    def test_encoder_pipe(self):
+        """Test streaming frames to an encoder command."""
+        replay = make_replay(frames=30)
+        path = os.path.join(self.directory, "frames.bin")
+        command = [sys.executable, "-c",
+                   f"import sys, shutil; shutil.copyfileobj(sys.stdin.buffer, open({path!r}, 'wb'))"]
+        count = export(replay, "unused.mp4", fps=60, command=command)
+        self.assertEqual(os.path.getsize(path), count * 800 * 600 * 4)
+
+    @unittest.skipIf(shutil.which("ffmpeg") is None, "ffmpeg not installed")
+    def test_ffmpeg_export(self):
+        path = os.path.join(self.directory, "game.mp4")
+        export(make_replay(frames=30), path, fps=30)
+        self.assertGreater(os.path.getsize(path), 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,117 @@
+"""Tests for the incremental board feature tracker."""
+
+import random
+import unittest
+from tetris.board import Board
+from tetris.constants import SHAPES
+from tetris.engine import GameEngine
+from tetris.features import FeatureTracker, FEATURES
+from tetris.tetrimino import Tetrimino
+
+class MockSettings:
+    """Mock settings class for testing purposes."""
+    difficulty = "Normal"
+
+def fill(board, rows):
+    """Fill cells from strings, '#' filled and '.' empty, bottom-aligned."""
+    top = board.height - len(rows)
+    for y, row in enumerate(rows):
+        for x, char in enumerate(row):
+            board.set(x, top + y, 1 if char == '#' else 0)
+
+class TestFeatureTracker(unittest.TestCase):
+    """Test cases for FeatureTracker."""
+
+    def assertMatchesRebuild(self, tracker):
+        """Assert the tracker equals one built from scratch."""
+        fresh = FeatureTracker(tracker.board)
+        self.assertEqual(tracker.as_dict(), fresh.as_dict())
+        self.assertEqual(list(tracker.heights), list(fresh.heights))
+        self.assertEqual(tracker.row_transitions, fresh.row_transitions)
+
+    def test_known_board(self):
+        board = Board(4, 5)
+        fill(board, [
+            "#...",
+            "#.#.",
+            "##.#",
+        ])
+        features = FeatureTracker(board).as_dict()
+        self.assertEqual(features, {
+            "aggregate_height": 3 + 1 + 2 + 1,
+            "max_height": 3,
+            "holes": 1,
+            "bumpiness": 2 + 1 + 1,
+            "wells": 1 + 1,
+            # Empty rows count the two walls
+            "row_transitions": 2 + 2 + 2 + 4 + 2,
+            "column_transitions": 1 + 1 + 3 + 1,
+        })
+        self.assertEqual(tuple(features), FEATURES)
+
+    def test_update_cells_matches_rebuild(self):
+        rng = random.Random(1)
+        board = Board(6, 10)
+        tracker = FeatureTracker(board)
+        for _ in range(200):
+            columns, rows = set(), set()
+            for _ in range(4):
+                x, y = rng.randrange(6), rng.randrange(10)
+                board.set(x, y, rng.randint(1, 7))
+                columns.add(x)
+                rows.add(y)
+            tracker.update_cells(columns, rows)
+            self.assertMatchesRebuild(tracker)
+
+    def test_remove_rows_matches_rebuild(self):
+        rng = random.Random(2)
+        for _ in range(300):
+            width, height = rng.randint(1, 8), rng.randint(2, 12)
+            board = Board(width, height)
+            density = rng.random()
+            for index in range(width * height):
+                if rng.random() < density:
+                    board.cells[index] = rng.randint(1, 7)
+            for y in rng.sample(range(height), rng.randint(1, min(4, height))):
+                for x in range(width):
+                    board.set(x, y, 1)
+            full = [y for y in range(height) if board.row_is_full(y)]
+            tracker = FeatureTracker(board)
+            tracker.remove_rows(full)
+            board.clear_rows(full)
+            self.assertMatchesRebuild(tracker)
+
+    def test_push_rows_matches_rebuild(self):
+        rng = random.Random(3)
+        for _ in range(200):
+            width, height = rng.randint(2, 8), rng.randint(4, 12)
+            board = Board(width, height)
+            for _ in range(rng.randint(0, width * height // 2)):
+                board.set(rng.randrange(width), rng.randrange(height // 2, height), rng.randint(1, 7))
+            tracker = FeatureTracker(board)
+            count = rng.randint(1, 3)
+            board.push_rows([bytes(rng.randint(0, 1) for _ in range(width)) for _ in range(count)])
+            tracker.push_rows(count)
+            self.assertMatchesRebuild(tracker)
+
+    def test_engine_keeps_features_current(self):
+        game = GameEngine(MockSettings())
+        game.seed(5)
+        game.reset_game()
+        grid = game.grid
+        for x in range(2, 10):
+            grid.set(x, 19, 1)
+        game.features.rebuild()
+        game.current_piece = Tetrimino(0, 18, SHAPES[1])
+        game.lock_piece()
+        self.assertEqual(game.total_lines, 1)
+        self.assertEqual(list(game.features.heights), [1, 1] + [0] * 8)
+        self.assertMatchesRebuild(game.features)
+        for _ in range(100):
+            if game.game_over:
+                break
+            game.hard_drop()
+            self.assertMatchesRebuild(game.features)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,14 +3,19 @@
 import unittest
 import pygame
 import logging
+import os
+import subprocess
 import sys
+from tetris.engine import GameEngine
 from tetris.game import BaseGame, SpeedGame, BattleGame
+from tetris.levels import LevelTable
+from tetris.tetrimino import Tetrimino
 from tetris.settings import Settings, HighScores
 from tetris.constants import (
     SCREEN_DIMENSIONS,
-    COLORS,
-    SHAPES,
-    GameState
+    COLORS, PALETTE,
+    SHAPES, GARBAGE_ID,
+    Action, GameEvent, GameState
 )
 
 # Configure logging
@@ -63,6 +68,30 @@ class TestBaseGame(unittest.TestCase):
         self.assertIsNotNone(self.game.current_piece)
         self.assertEqual(self.game.fall_speed, BaseGame.FALL_SPEEDS[self.settings.difficulty])
 
+    def test_restart_after_wait(self):
+        """Test that time on the game over screen isn't applied to the next game."""
+        self.game.end_game()
+        pygame.time.wait(600)
+        self.game.reset_game()
+        first = self.game.current_piece
+        self.game.update()
+        self.assertIs(self.game.current_piece, first)
+        self.assertLessEqual(first.y, 1)
+        self.assertFalse(any(self.game.grid.cells))
+
+    def test_input_stamped_within_frame(self):
+        """Test that key events keep their real time within a frame on the sim clock."""
+        key = self.settings.controls["MOVE_LEFT"]
+        start = self.game._frame_ticks
+        self.game.handle_input([pygame.event.Event(pygame.KEYDOWN, key=key, timestamp=start + 7)])
+        self.game.handle_input([pygame.event.Event(pygame.KEYUP, key=key, timestamp=start + 9)])
+        self.assertEqual(self.game.input.drain(), [(7, Action.MOVE_LEFT)])
+        # Without a timestamp the time of handling is used
+        pygame.time.wait(20)
+        self.game.handle_input([pygame.event.Event(pygame.KEYDOWN, key=key)])
+        (timestamp, _), = self.game.input.drain()
+        self.assertGreaterEqual(timestamp, 20)
+
     def test_piece_movement(self):
         """Test piece movement mechanics."""
         original_x = self.game.current_piece.x
@@ -125,6 +154,16 @@ class TestBaseGame(unittest.TestCase):
         # Verify game over
         self.assertTrue(self.game.game_over)
 
+    def test_final_score_recorded_once(self):
+        """Test that game over submits the score a single time."""
+        submitted = []
+        self.high_scores.submit_score = lambda score, mode: submitted.append((score, mode))
+        self.game.score = 300
+        self.game.current_state = GameState.GAME_OVER
+        self.game.update()
+        self.game.update()
+        self.assertEqual(submitted, [(300, "Classic")])
+
     def test_draw_methods(self):
         """Test the drawing methods of BaseGame."""
         self.game.clear_screen()  # Test clear screen
@@ -201,6 +240,36 @@ class TestSpeedGame(unittest.TestCase):
         # Speed should not decrease further (should stay at minimum)
         self.assertEqual(self.game.fall_speed, speed_after_many_lines)
 
+    def test_restart_resets_speed(self):
+        """Test that a restarted game starts at the base speed again."""
+        initial_speed = self.game.fall_speed
+        row_index = SCREEN_DIMENSIONS['GRID_HEIGHT'] - 1
+        for col in range(SCREEN_DIMENSIONS['GRID_WIDTH']):
+            self.game.grid[row_index][col] = COLORS["BLUE"]
+        self.game.clear_lines()
+        self.game.reset_game()
+        self.assertEqual(self.game.speed_factor, 1.0)
+
+        for col in range(SCREEN_DIMENSIONS['GRID_WIDTH']):
+            self.game.grid[row_index][col] = COLORS["BLUE"]
+        self.game.clear_lines()
+        self.assertEqual(self.game.fall_speed, int(initial_speed * 0.9))
+
+    def test_level_table(self):
+        """Test that the speed follows a loaded level table."""
+        table = LevelTable({"Normal": [700, 400, 100]}, lines_per_level=2)
+        self.settings.difficulty = "Normal"
+        game = SpeedGame(self.screen, self.settings, self.high_scores)
+        game.LEVELS = table
+        game.reset_game()
+        self.assertEqual(game.fall_speed, 700)
+        row_index = SCREEN_DIMENSIONS['GRID_HEIGHT'] - 1
+        for expected in (700, 400, 400, 100, 100):
+            for col in range(SCREEN_DIMENSIONS['GRID_WIDTH']):
+                game.grid[row_index][col] = COLORS["BLUE"]
+            game.clear_lines()
+            self.assertEqual(game.fall_speed, expected)
+
 class TestBattleGame(unittest.TestCase):
     """Test cases for the BattleGame class."""
 
@@ -233,10 +302,229 @@ class TestBattleGame(unittest.TestCase):
         self.game.clear_lines()
         self.assertGreater(self.game.opponent_score, initial_score)
 
+    def fill_rows(self, game, count):
+        """Fill the bottom ``count`` rows of a game's board."""
+        for y in range(game.grid.height - count, game.grid.height):
+            for x in range(game.grid.width):
+                game.grid.set(x, y, 1)
+        game.features.rebuild()
+
+    def test_garbage_exchange(self):
+        """Test that clears send garbage that arrives on the next lock."""
+        opponent = BattleGame(self.screen, self.settings, self.high_scores)
+        self.game.connect(opponent)
+        self.fill_rows(self.game, 2)
+        self.game.clear_lines()
+        self.assertEqual(self.game.garbage_sent, 1)
+        self.assertEqual(opponent.pending_garbage, 1)
+
+        # A lock without a clear adds the garbage at the bottom
+        piece = opponent.current_piece
+        opponent.hard_drop()
+        self.assertEqual(opponent.pending_garbage, 0)
+        bottom = opponent.grid.height - 1
+        row = [opponent.grid.get(x, bottom) for x in range(opponent.grid.width)]
+        self.assertEqual(row.count(0), 1)
+        self.assertEqual(set(row) - {0}, {GARBAGE_ID})
+        self.assertEqual(opponent.features.values[0], sum(opponent.features.heights))
+        self.assertGreater(max(opponent.features.heights), 1)
+        self.assertIsNot(opponent.current_piece, piece)
+
+    def test_garbage_lifts_only_the_new_piece(self):
+        """Test that garbage goes in after the locked piece has become part of the stack."""
+        locked = []
+
+        def on_event(event, *args):
+            if event == GameEvent.LOCK:
+                locked.append((args[0], args[0].y))
+        self.game.add_listener(on_event)
+        self.game.receive_garbage(2)
+        self.game.hard_drop()
+        (piece, y), = locked
+        self.assertEqual(piece.y, y)
+        self.assertIsNot(self.game.current_piece, piece)
+        self.assertEqual(self.game.pending_garbage, 0)
+        # The locked blocks moved up with the stack; the piece object didn't
+        self.assertEqual(sum(self.game.grid.get(x, self.game.grid.height - 1) == 0
+                             for x in range(self.game.grid.width)), 1)
+
+    def test_garbage_seeded_by_replay_seed(self):
+        """Test that a game started without a seed still replays its garbage holes."""
+        self.game.reset_game()
+        holes = [self.game.garbage_rng.random() for _ in range(3)]
+        self.game.reset_game(self.game.replay.seed)
+        self.assertEqual([self.game.garbage_rng.random() for _ in range(3)], holes)
+
+    def test_attack_cancels_pending_garbage(self):
+        self.game.receive_garbage(3)
+        self.fill_rows(self.game, 4)
+        self.game.clear_lines()
+        self.assertEqual(self.game.pending_garbage, 0)
+        self.assertEqual(self.game.garbage_sent, 1)
+        self.assertFalse(any(self.game.grid.linear()))
+
+    def test_garbage_tops_out(self):
+        self.game.add_garbage(self.game.grid.height, 0)
+        self.assertFalse(self.game.game_over)
+        self.game.add_garbage(1, 0)
+        self.assertTrue(self.game.game_over)
+
     @classmethod
     def tearDownClass(cls):
         """Clean up test environment."""
         pygame.quit()
 
+class TestBoardSizes(unittest.TestCase):
+    """Test cases for games on non-standard boards."""
+
+    @classmethod
+    def setUpClass(cls):
+        pygame.init()
+        cls.screen = pygame.display.set_mode((SCREEN_DIMENSIONS['WIDTH'], SCREEN_DIMENSIONS['HEIGHT']))
+
+    def test_large_board_fits_screen(self):
+        game = SpeedGame(self.screen, Settings(), None, grid_width=100, grid_height=400)
+        self.assertEqual(game.block_size, 1)
+        self.assertEqual(game.grid_offset_x, (SCREEN_DIMENSIONS['WIDTH'] - 100) // 2)
+        game.draw()
+
+    def test_only_changed_rows_redrawn(self):
+        game = BaseGame(self.screen, Settings(), None, grid_width=10, grid_height=20)
+        game.draw_filled_blocks()
+        self.assertIsNone(game.changed_rows)
+        game.grid.set(0, 19, 1)
+        game.draw_filled_blocks()
+        # Not reported as changed, so not redrawn yet
+        pixel = (game.grid_offset_x + 1, game.grid_offset_y + 19 * game.block_size + 1)
+        self.assertEqual(self.screen.get_at(pixel)[:3], COLORS["BLACK"])
+        game.mark_changed(19, 19)
+        game.draw_filled_blocks()
+        self.assertEqual(self.screen.get_at(pixel)[:3], PALETTE[1])
+
+    @classmethod
+    def tearDownClass(cls):
+        pygame.quit()
+
+class MockSettings:
+    """Mock settings class for testing purposes."""
+    def __init__(self, difficulty="Easy"):
+        self.difficulty = difficulty
+
+class TestGameEngine(unittest.TestCase):
+    """Test cases for the pygame-free GameEngine."""
+
+    def test_spawn_new_piece(self):
+        game = GameEngine(MockSettings())
+        game.reset_game()
+        self.assertIsNotNone(game.current_piece)
+
+    def test_check_collision(self):
+        game = GameEngine(MockSettings())
+        game.reset_game()
+        game.current_piece = Tetrimino(-1, 0, {'shape': [[1, 1], [1, 1]], 'color': COLORS["YELLOW"]})
+        self.assertTrue(game.check_collision())
+
+    def test_lock_piece(self):
+        game = GameEngine(MockSettings())
+        game.reset_game()
+        game.current_piece = Tetrimino(0, 0, {'shape': [[1, 1], [1, 1]], 'color': COLORS["YELLOW"]})
+        game.lock_piece()
+        self.assertIsNotNone(game.grid[0][0])
+
+    def test_clear_lines(self):
+        game = GameEngine(MockSettings())
+        game.reset_game()
+        game.grid.cells[:] = bytes([1]) * len(game.grid.cells)
+        lines_cleared = game.clear_lines()
+        self.assertEqual(lines_cleared, 20)
+
+    def test_custom_board_size(self):
+        game = GameEngine(MockSettings(), grid_width=200, grid_height=1000)
+        self.assertEqual((game.grid.width, game.grid.height), (200, 1000))
+        self.assertLess(game.current_piece.x, 200)
+        self.assertGreater(game.current_piece.x, 90)
+
+    def test_lock_clears_only_rows_under_piece(self):
+        game = GameEngine(MockSettings(), grid_width=40, grid_height=100)
+        grid = game.grid
+        # A full row the piece does not touch stays put
+        for x in range(40):
+            grid.set(x, 50, 1)
+        for x in range(2, 40):
+            grid.set(x, 98, 1)
+            grid.set(x, 99, 1)
+        game.current_piece = Tetrimino(0, 98, {'shape': [[1, 1], [1, 1]], 'color': COLORS["YELLOW"]})
+        game.changed_rows = None
+        game.lock_piece()
+        self.assertEqual(game.score, 200)
+        self.assertTrue(grid.row_is_full(52))
+        self.assertEqual(game.changed_rows, (0, 99))
+
+    def test_drop_distance(self):
+        """Test that the drop distance matches stepping the piece down."""
+        game = GameEngine(MockSettings(), grid_width=10, grid_height=20)
+        game.seed(3)
+        game.reset_game(3)
+        game.add_garbage(3, 4)  # Rows stored with a nonzero offset
+        rng = game.rng
+        for _ in range(200):
+            for _ in range(3):
+                game.grid.set(rng.randrange(10), rng.randrange(6, 17), 1)
+            piece = game.current_piece
+            piece.x = rng.randrange(-1, 8)
+            piece.y = rng.randrange(0, 4)
+            if game.check_collision():
+                continue
+            steps = 0
+            while not game.check_collision(y_offset=steps + 1):
+                steps += 1
+            self.assertEqual(game.drop_distance(), steps)
+            self.assertEqual(game.drop_distance(limit=2), min(steps, 2))
+            game.grid.clear()
+
+    def test_fractional_gravity_keeps_overshoot(self):
+        game = GameEngine(MockSettings())
+        game.reset_game(0)
+        game.gravity = 0.4
+        start = game.current_piece.y
+        for _ in range(10):
+            game.advance(game.TICK_MS)
+        self.assertEqual(game.current_piece.y, start + 4)
+        # A one-row-per-frame limit would stall here; 3G moves 3 rows per tick
+        game.gravity = 3
+        game.advance(game.TICK_MS)
+        self.assertEqual(game.current_piece.y, start + 7)
+
+    def test_instant_gravity(self):
+        """Test that instant gravity drops a piece to the floor and locks it in one tick."""
+        for height in (20, 1000):
+            game = GameEngine(MockSettings(), grid_height=height)
+            game.reset_game(0)
+            game.gravity = game.INSTANT_GRAVITY
+            self.assertEqual(game.gravity, game.INSTANT_GRAVITY)
+            first = game.current_piece
+            landed = []
+            game.add_listener(lambda event, *args: landed.append(args[0].y) if event == GameEvent.LOCK else None)
+            game.advance(game.TICK_MS)
+            self.assertIsNot(game.current_piece, first)
+            self.assertEqual(landed, [height - len(first.shape)])
+
+    def test_gravity_must_be_positive(self):
+        game = GameEngine(MockSettings())
+        for gravity in (0, -1, float("nan")):
+            with self.assertRaises(ValueError):
+                game.gravity = gravity
+        game.gravity = 20
+        self.assertAlmostEqual(game.gravity, 20)
+
+    def test_import_without_pygame(self):
+        """Logic, settings and constants must not import pygame."""
+        src_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src'))
+        code = ("import sys, tetris.engine, tetris.settings, tetris.constants; "
+                "print('pygame' in sys.modules)")
+        env = dict(os.environ, PYTHONPATH=src_path)
+        output = subprocess.check_output([sys.executable, "-c", code], env=env, text=True)
+        self.assertEqual(output.strip(), "False")
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,58 @@
+"""Tests for the level table."""
+
+import json
+import os
+import tempfile
+import unittest
+from tetris.engine import GameEngine
+from tetris.levels import (
+    LevelTable, curve_speeds, default_table, load_level_table, save_level_table, MIN_FALL_SPEED
+)
+
+class TestLevelTable(unittest.TestCase):
+    """Test cases for LevelTable and its file."""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "levels.json")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_curve_speeds(self):
+        self.assertEqual(curve_speeds(100, 0.5, 20), [100, 50, 25, 20])
+        self.assertEqual(curve_speeds(100, 1.0, 20), [100])
+
+    def test_default_matches_hand_tuned_curve(self):
+        """Test that the default table is 10% faster per line down to the minimum."""
+        table = default_table()
+        base = GameEngine.FALL_SPEEDS["Normal"]
+        for lines in range(40):
+            self.assertEqual(table.fall_speed("Normal", lines), max(MIN_FALL_SPEED, int(base * 0.9 ** lines)))
+
+    def test_levels(self):
+        table = LevelTable({"Normal": [300, 200, 100]}, lines_per_level=10)
+        self.assertEqual(table.fall_speed("Normal", 9), 300)
+        self.assertEqual(table.fall_speed("Normal", 10), 200)
+        self.assertEqual(table.fall_speed("Normal", 500), 100)
+        # Unknown difficulties fall back to Normal
+        self.assertEqual(table.fall_speed("Expert", 0), 300)
+
+    def test_round_trip(self):
+        table = LevelTable({"Normal": [300, 100], "Hard": [200, 50]}, 5, {"games": 3})
+        save_level_table(table, self.path)
+        loaded = load_level_table(self.path)
+        self.assertEqual(loaded.fall_speeds, table.fall_speeds)
+        self.assertEqual(loaded.lines_per_level, 5)
+        self.assertEqual(loaded.metadata, {"games": 3})
+
+    def test_missing_or_invalid_file_gives_default(self):
+        self.assertEqual(load_level_table(self.path).fall_speeds, default_table().fall_speeds)
+        for data in ({"version": 99}, {"version": 1, "fall_speeds": {"Normal": [0]}}, [1, 2]):
+            with open(self.path, "w") as f:
+                json.dump(data, f)
+            with self.assertLogs("tetris.levels", "WARNING"):
+                self.assertEqual(load_level_table(self.path).fall_speeds, default_table().fall_speeds)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+"""Tests for main loop frame pacing."""
+
+import time
+import unittest
+import pygame
+from tetris.pacing import FramePacer
+
+class TestFramePacer(unittest.TestCase):
+    """Test cases for the FramePacer class."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up test environment."""
+        pygame.init()
+        pygame.display.set_mode((100, 100))
+
+    def setUp(self):
+        """Set up test cases."""
+        pygame.event.clear()
+        self.pacer = FramePacer(fps=60, idle_timeout=20)
+
+    def test_idle_wait_times_out(self):
+        """Test that an idle frame waits and reports no events."""
+        self.pacer.should_render("menu", animating=False)
+        start = time.perf_counter()
+        events = self.pacer.get_events(idle=True)
+        self.assertEqual(events, [])
+        self.assertGreaterEqual(time.perf_counter() - start, 0.01)
+
+    def test_idle_wakes_on_input(self):
+        """Test that input ends the wait and forces a render."""
+        self.pacer.should_render("menu", animating=False)
+        pygame.event.post(pygame.event.Event(pygame.KEYDOWN, {'key': pygame.K_a}))
+        events = self.pacer.get_events(idle=True)
+        self.assertEqual([event.type for event in events], [pygame.KEYDOWN])
+        self.assertTrue(self.pacer.should_render("menu", animating=False))
+
+    def test_render_only_on_change(self):
+        """Test that static screens render once until the view changes."""
+        self.assertTrue(self.pacer.should_render("menu", animating=False))
+        self.assertFalse(self.pacer.should_render("menu", animating=False))
+        self.assertTrue(self.pacer.should_render("settings", animating=False))
+        self.assertTrue(self.pacer.should_render("settings", animating=True))
+
+    def test_fixed_mode_always_renders(self):
+        """Test that non-adaptive pacing renders every frame."""
+        pacer = FramePacer(adaptive=False)
+        pacer.should_render("menu", animating=False)
+        self.assertTrue(pacer.should_render("menu", animating=False))
+
+    @classmethod
+    def tearDownClass(cls):
+        """Clean up test environment."""
+        pygame.quit()
+
+if __name__ == '__main__':
+    unittest.main()
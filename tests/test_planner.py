@@ -0,0 +1,129 @@
+"""Tests for the reachability planner."""
+
+import types
+import unittest
+from tetris.bot import Bot, occupancy, place, placements
+from tetris.constants import SHAPES, Action, GameEvent
+from tetris.engine import GameEngine
+from tetris.planner import CYCLES, Planner, play_path, spawn_state
+from tetris.tetrimino import rotate_shape
+
+def make_engine(width=10, height=20, filled=()):
+    """Return an engine with the given cells filled and no piece in play."""
+    engine = GameEngine(types.SimpleNamespace(difficulty="Normal"), width, height)
+    engine.seed(0)
+    engine.reset_game()
+    engine.grid.cells[:] = bytes(width * height)
+    for x, y in filled:
+        engine.grid.cells[y * width + x] = 8
+    return engine
+
+def spawn(engine, kind):
+    """Spawn a piece of the given type in the engine."""
+    engine.next_shape = SHAPES[kind - 1]
+    engine.spawn_new_piece()
+
+def cave():
+    """Cells of a board with an overhang over columns 4-7 on row 17."""
+    filled = [(x, 17) for x in range(4, 10)]
+    filled += [(x, y) for x in (8, 9) for y in (18, 19)]
+    return filled
+
+class TestPlanner(unittest.TestCase):
+    """Test cases for the Planner."""
+
+    def test_rotation_periods(self):
+        self.assertEqual([len(cycle) for cycle in CYCLES[1:]], [2, 1, 2, 2, 4, 4, 4])
+
+    def test_paths_reach_lock_positions(self):
+        """Test that every planned key sequence locks the piece where planned."""
+        planner = Planner()
+        for kind in range(1, 8):
+            engine = make_engine(filled=cave())
+            cells = occupancy(engine.grid)
+            positions = planner.lock_positions(cells, 10, 20, kind)
+            self.assertTrue(positions)
+            for (x, y, r), actions in positions.items():
+                engine = make_engine(filled=cave())
+                spawn(engine, kind)
+                locked = []
+                engine.add_listener(lambda event, *args: locked.append(args[0])
+                                    if event == GameEvent.LOCK else None)
+                play_path(engine, actions)
+                self.assertEqual(len(locked), 1, (kind, x, y, r))
+                piece = locked[0]
+                self.assertEqual((piece.x, piece.y), (x, y))
+                self.assertEqual(piece.shape, [list(row) for row in _shape(kind, r)])
+
+    def test_tuck_under_overhang(self):
+        planner = Planner()
+        engine = make_engine(filled=cave())
+        positions = planner.lock_positions(occupancy(engine.grid), 10, 20, 1)
+        # A flat I slides under the overhang after a soft drop
+        actions = positions[(4, 19, 0)]
+        self.assertIn(Action.SOFT_DROP, actions)
+        self.assertGreater(actions.index(Action.MOVE_RIGHT), actions.index(Action.SOFT_DROP))
+        # A straight drop at the same column lands on the overhang instead
+        self.assertEqual(planner.placement_path(occupancy(engine.grid), 10, 20, 1, 0, 4),
+                         positions[(4, 16, 0)])
+
+    def test_minimal_keystrokes_on_empty_board(self):
+        planner = Planner()
+        cells = bytes(10 * 20)
+        positions = planner.lock_positions(cells, 10, 20, 7)
+        start_x = spawn_state(7, 10)[0]
+        for (x, y, r), actions in positions.items():
+            self.assertEqual(len(actions), r + abs(x - start_x) + 1)
+
+    def test_placement_path(self):
+        planner = Planner()
+        cells = bytes(10 * 20)
+        for rotation, x, after, _ in placements(cells, 10, 20, 6):
+            engine = make_engine()
+            spawn(engine, 6)
+            play_path(engine, planner.placement_path(cells, 10, 20, 6, rotation, x))
+            self.assertEqual(occupancy(engine.grid), after)
+        # Off the board
+        self.assertIsNone(planner.placement_path(cells, 10, 20, 6, 0, 9))
+
+    def test_bot_placements_played_by_keys(self):
+        """Test that keying in the bot's placements builds the boards it searched."""
+        planner = Planner()
+        bot = Bot()
+        engine = make_engine()
+        engine.reset_game(1)
+        grid = engine.grid
+        for _ in range(150):
+            if engine.game_over:
+                break
+            before = occupancy(grid)
+            kind = engine.current_piece.kind
+            placement = bot.choose(engine)
+            path = planner.placement_path(before, grid.width, grid.height, kind, *placement)
+            self.assertIsNotNone(path, placement)
+            play_path(engine, path)
+            self.assertEqual(occupancy(grid), place(before, grid.width, grid.height, kind, *placement)[0])
+
+    def test_region_memoized(self):
+        """Test that boards with the same clearance share the open region's search."""
+        planner = Planner()
+        first = make_engine(filled=[(0, 19)])
+        second = make_engine(filled=[(9, 19), (3, 19)])
+        planner.lock_positions(occupancy(first.grid), 10, 20, 3)
+        planner.lock_positions(occupancy(second.grid), 10, 20, 3)
+        self.assertEqual(list(planner.regions), [(3, 10, 19)])
+
+    def test_blocked_spawn(self):
+        planner = Planner()
+        engine = make_engine(filled=[(x, 0) for x in range(10)])
+        self.assertEqual(planner.lock_positions(occupancy(engine.grid), 10, 20, 2), {})
+
+def _shape(kind, r):
+    """Return the rows of a piece after ``r`` rotations."""
+    shape = SHAPES[kind - 1]['shape']
+    for _ in range(r):
+        shape = rotate_shape(shape)
+    return shape
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,163 @@
+"""Tests for recording and replaying games."""
+
+import os
+import random
+import tempfile
+import unittest
+import pygame
+from tetris.constants import GARBAGE_ID, SCREEN_DIMENSIONS, Action, GameState
+from tetris.game import BaseGame, BattleGame, SpeedGame
+from tetris.levels import LevelTable
+from tetris.replay import ACTION_CODES, HEADER, MAGIC, Garbage, Replay, save_replay
+from tetris.settings import Settings
+
+class FakeClock:
+    """Clock stub advancing a fixed step per tick."""
+    def __init__(self, step=16):
+        self.step = step
+
+    def tick(self, *args):
+        return self.step
+
+def record(cls, screen, seed, updates=600, between=None):
+    """Play a game with random key presses and return it.
+
+    ``between(game, index)`` is called after each update, as another game's
+    update would be.
+    """
+    game = cls(screen, Settings(), None)
+    game.clock = FakeClock()
+    game.reset_game(seed)
+    keys = list(game.settings.controls.values())
+    rng = random.Random(seed)
+    for index in range(updates):
+        if game.current_state == GameState.GAME_OVER:
+            break
+        if rng.random() < 0.3:
+            key = rng.choice(keys)
+            game.handle_input([pygame.event.Event(pygame.KEYDOWN, key=key),
+                               pygame.event.Event(pygame.KEYUP, key=key)])
+        game.update()
+        if between is not None:
+            between(game, index)
+    game.record_score()
+    return game
+
+class TestReplay(unittest.TestCase):
+    """Test cases for Replay."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up test environment."""
+        pygame.init()
+        cls.screen = pygame.display.set_mode((SCREEN_DIMENSIONS['WIDTH'], SCREEN_DIMENSIONS['HEIGHT']))
+
+    def assert_reproduced(self, game, replay):
+        copy = type(game)(self.screen, Settings(), None)
+        for _ in replay.play(copy):
+            pass
+        self.assertEqual(copy.grid.cells, game.grid.cells)
+        self.assertEqual(copy.score, game.score)
+        self.assertEqual(copy.game_over, game.game_over)
+        self.assertEqual(copy.sim_time, game.sim_time)
+
+    def test_playback_reproduces_game(self):
+        for seed in range(3):
+            game = record(BaseGame, self.screen, seed)
+            self.assertGreater(game.replay.frame_count, 0)
+            self.assert_reproduced(game, game.replay)
+
+    def test_playback_reproduces_speed_game(self):
+        game = record(SpeedGame, self.screen, 7, updates=2000)
+        self.assert_reproduced(game, game.replay)
+
+    def test_speed_replay_keeps_its_level_table(self):
+        """Test that a Speed replay plays back with its table after the table changes."""
+        table = LevelTable({"Normal": [120, 60, 30]}, 1, {"games": 8})
+        SpeedGame.LEVELS = table
+        try:
+            game = record(SpeedGame, self.screen, 8, updates=1500)
+        finally:
+            del SpeedGame.LEVELS
+        self.assertIsNot(SpeedGame.LEVELS, table)
+        replay = Replay.from_bytes(game.replay.to_bytes())
+        self.assertEqual(replay.levels.fall_speeds, table.fall_speeds)
+        self.assertEqual(replay.levels.metadata, {})
+        self.assert_reproduced(game, replay)
+
+    def test_playback_reproduces_received_garbage(self):
+        """Test that garbage from the opponent is recorded and applied again."""
+        def attack(game, index):
+            if index % 150 == 75:
+                game.receive_garbage(2)
+        game = record(BattleGame, self.screen, 9, updates=900, between=attack)
+        self.assertIn(GARBAGE_ID, game.grid.linear())
+        replay = Replay.from_bytes(game.replay.to_bytes())
+        received = [action for _, actions in replay.frames() for _, action in actions
+                    if isinstance(action, Garbage)]
+        self.assertTrue(received)
+        self.assertEqual(set(received), {Garbage(2)})
+        self.assert_reproduced(game, replay)
+
+    def test_byte_round_trip(self):
+        game = record(BaseGame, self.screen, 4)
+        replay = Replay.from_bytes(game.replay.to_bytes())
+        self.assertEqual((replay.seed, replay.mode, replay.width, replay.height, replay.difficulty),
+                         (4, "Classic", game.grid_width, game.grid_height, game.settings.difficulty))
+        self.assertEqual(replay.score, game.score)
+        self.assertEqual(list(replay.frames()), list(game.replay.frames()))
+        self.assert_reproduced(game, replay)
+
+    def test_play_until(self):
+        game = record(BaseGame, self.screen, 5)
+        times = list(game.replay.play(BaseGame(self.screen, Settings(), None), until=500))
+        self.assertGreaterEqual(times[-1], 500)
+        self.assertLess(times[-2], 500)
+
+    def test_compact_encoding(self):
+        """Test that a frame without input costs two bytes."""
+        replay = Replay(1)
+        for index in range(1, 101):
+            replay.add_frame(index * 16)
+        self.assertEqual(len(replay.data), 200)
+
+    def test_many_actions_in_one_frame(self):
+        """Test frames with more actions than fit in a byte, e.g. after a stall."""
+        replay = Replay(1, "Classic" * 40)
+        actions = [(index, Action.MOVE_LEFT) for index in range(300)]
+        replay.add_frame(300, actions)
+        replay.add_frame(316)
+        loaded = Replay.from_bytes(replay.to_bytes())
+        self.assertEqual(loaded.mode, "Classic" * 40)
+        self.assertEqual(list(loaded.frames()), [(300, actions), (316, [])])
+
+    def test_reads_version_1(self):
+        """Test that replays with one-byte counts still load."""
+        data = bytearray(HEADER.pack(MAGIC, 1, 9, 10, 20, 0, 48, 2))
+        data += b"\x07Classic\x06Normal"
+        data += bytes([32, 1, 5, ACTION_CODES[Action.ROTATE], 16, 0])
+        replay = Replay.from_bytes(data)
+        self.assertEqual((replay.seed, replay.mode, replay.difficulty), (9, "Classic", "Normal"))
+        self.assertEqual(list(replay.frames()), [(32, [(5, Action.ROTATE)]), (48, [])])
+        self.assertEqual(replay.to_bytes(), bytes(data))
+
+    def test_rejects_other_data(self):
+        with self.assertRaises(ValueError):
+            Replay.from_bytes(b"not a replay at all, really")
+
+    def test_save_and_load(self):
+        game = record(BaseGame, self.screen, 6)
+        path = save_replay(game.replay)
+        try:
+            loaded = Replay.load(path)
+            self.assertEqual(loaded.to_bytes(), game.replay.to_bytes())
+        finally:
+            os.remove(path)
+
+    @classmethod
+    def tearDownClass(cls):
+        """Clean up test environment."""
+        pygame.quit()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,151 @@
+"""Tests for high score backends."""
+
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from tetris.scores import JsonScoreBackend, SqliteScoreBackend, ScoreWriter
+from tetris.settings import HighScores
+
+class ScoreBackendTests:
+    """Behaviour shared by every score backend."""
+
+    def make_backend(self):
+        """Return a fresh backend instance."""
+        raise NotImplementedError
+
+    def setUp(self):
+        """Set up test cases."""
+        self.tmp_dir = tempfile.mkdtemp()
+        self.backend = self.make_backend()
+
+    def test_top_sorted(self):
+        """Test that entries come back in descending score order."""
+        for score in (500, 1000, 750):
+            self.backend.add({"score": score, "mode": "Classic", "date": "2024-01-01"})
+        self.assertEqual([e["score"] for e in self.backend.top()], [1000, 750, 500])
+
+    def test_top_by_mode_and_date(self):
+        """Test filtering by mode and inclusive date range."""
+        self.backend.add_many([
+            {"score": 100, "mode": "Classic", "date": "2024-01-01"},
+            {"score": 300, "mode": "Classic", "date": "2024-01-02"},
+            {"score": 200, "mode": "Speed", "date": "2024-01-02"},
+            {"score": 400, "mode": "Classic", "date": "2024-01-03"},
+        ])
+        classic = self.backend.top("Classic", date_from="2024-01-01", date_to="2024-01-02")
+        self.assertEqual([e["score"] for e in classic], [300, 100])
+        self.assertEqual(self.backend.top("Speed", limit=1)[0]["score"], 200)
+
+    def test_persistence(self):
+        """Test that entries survive reopening the backend."""
+        self.backend.add({"score": 900, "mode": "Battle", "date": "2024-01-01"})
+        self.backend.save()
+        self.backend.close()
+        self.backend = self.make_backend()
+        self.assertEqual(self.backend.top()[0]["score"], 900)
+
+    def tearDown(self):
+        """Clean up test environment."""
+        self.backend.close()
+        shutil.rmtree(self.tmp_dir)
+
+class TestJsonScoreBackend(ScoreBackendTests, unittest.TestCase):
+    """Test cases for JsonScoreBackend."""
+
+    def make_backend(self):
+        return JsonScoreBackend(os.path.join(self.tmp_dir, "highscores.json"), max_scores=10)
+
+    def test_truncates_to_max_scores(self):
+        """Test that only the best max_scores entries are kept."""
+        for score in range(15):
+            self.backend.add({"score": score, "mode": "Classic", "date": "2024-01-01"})
+        self.assertEqual(len(self.backend.top()), 10)
+        self.assertEqual(self.backend.top()[0]["score"], 14)
+
+class TestSqliteScoreBackend(ScoreBackendTests, unittest.TestCase):
+    """Test cases for SqliteScoreBackend."""
+
+    def make_backend(self):
+        return SqliteScoreBackend(os.path.join(self.tmp_dir, "highscores.db"))
+
+    def test_keeps_every_entry(self):
+        """Test that large leaderboards are kept in full."""
+        self.backend.add_many([{"score": i, "mode": "Classic", "date": "2024-01-01"}
+                               for i in range(1000)])
+        self.assertEqual(len(self.backend.top("Classic")), 1000)
+        self.assertEqual(self.backend.top("Classic", limit=3)[2]["score"], 997)
+
+    def test_one_day_reads_index_in_order(self):
+        """Test that a mode's top scores of one day need no sort."""
+        self.backend.add_many([{"score": i, "mode": "Classic", "date": f"2024-01-0{i % 3 + 1}"}
+                               for i in range(30)])
+        top = self.backend.top("Classic", limit=3, date_from="2024-01-02", date_to="2024-01-02")
+        self.assertEqual([e["score"] for e in top], [28, 25, 22])
+        query, params = self.backend._top_query("Classic", 3, "2024-01-02", "2024-01-02")
+        plan = " ".join(row[-1] for row in self.backend.connection.execute("EXPLAIN QUERY PLAN " + query, params))
+        self.assertIn("scores_by_mode_date", plan)
+        self.assertNotIn("TEMP B-TREE", plan)
+
+class TestHighScoresFacade(unittest.TestCase):
+    """Test cases for HighScores on top of a backend."""
+
+    def test_scores_track_backend(self):
+        """Test that add_score refreshes the cached top list."""
+        high_scores = HighScores(backend=SqliteScoreBackend(":memory:"), max_scores=2)
+        for score in (100, 300, 200):
+            high_scores.add_score(score, "Classic")
+        high_scores.add_score(50, "Speed")
+        self.assertEqual([e["score"] for e in high_scores.scores], [300, 200])
+        self.assertEqual([e["score"] for e in high_scores.get_high_scores("Speed")], [50])
+        high_scores.close()
+
+    def test_submit_score_is_non_blocking(self):
+        """Test that submitted scores are visible at once and written on flush."""
+        backend = SqliteScoreBackend(":memory:")
+        high_scores = HighScores(backend=backend)
+        high_scores.submit_score(700, "Speed")
+        self.assertEqual(high_scores.scores[0]["score"], 700)
+        self.assertTrue(high_scores.flush(timeout=5))
+        self.assertEqual(backend.top("Speed")[0]["score"], 700)
+        high_scores.close()
+
+class SlowBackend:
+    """Backend that blocks writes until released."""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.batches = []
+
+    def add_many(self, entries):
+        self.release.wait(5)
+        self.batches.append(list(entries))
+
+class TestScoreWriter(unittest.TestCase):
+    """Test cases for the ScoreWriter class."""
+
+    def test_batches_queued_entries(self):
+        """Test that entries queued during a slow write are written together."""
+        backend = SlowBackend()
+        writer = ScoreWriter(backend)
+        for score in range(5):
+            writer.submit({"score": score, "mode": "Classic", "date": "2024-01-01"})
+        self.assertFalse(writer.flush(timeout=0.05))
+        backend.release.set()
+        self.assertTrue(writer.flush(timeout=5))
+        self.assertEqual(sum(len(batch) for batch in backend.batches), 5)
+        self.assertLessEqual(len(backend.batches), 2)
+        writer.close(timeout=5)
+
+    def test_close_writes_remaining(self):
+        """Test that closing drains the queue."""
+        backend = SlowBackend()
+        backend.release.set()
+        writer = ScoreWriter(backend)
+        writer.submit({"score": 1, "mode": "Classic", "date": "2024-01-01"})
+        writer.close(timeout=5)
+        self.assertEqual(backend.batches, [[{"score": 1, "mode": "Classic", "date": "2024-01-01"}]])
+
+if __name__ == '__main__':
+    unittest.main()
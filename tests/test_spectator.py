@@ -0,0 +1,93 @@
+"""Tests for the multi-board spectator wall."""
+
+import unittest
+import pygame
+from tetris.constants import PALETTE, SHAPES
+from tetris.engine import GameEngine
+from tetris.spectator import SpectatorWall, block_sprite, grid_shape, BOARD_BACKGROUND
+from tetris.tetrimino import Tetrimino
+
+class MockSettings:
+    """Mock settings class for testing purposes."""
+    difficulty = "Normal"
+
+class TestSpectatorWall(unittest.TestCase):
+    """Test cases for SpectatorWall."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up test environment."""
+        pygame.init()
+        cls.screen = pygame.display.set_mode((1280, 720))
+
+    def make_games(self, count):
+        games = []
+        for index in range(count):
+            game = GameEngine(MockSettings())
+            game.seed(index)
+            game.reset_game()
+            games.append(game)
+        return games
+
+    def test_grid_shape(self):
+        """Test that tall boards are laid out wide on a wide screen."""
+        columns, rows = grid_shape(64, 0.5, 1280, 720)
+        self.assertGreaterEqual(columns * rows, 64)
+        self.assertGreater(columns, rows)
+        self.assertEqual(grid_shape(1, 0.5, 800, 600), (1, 1))
+
+    def test_layout_fits_screen(self):
+        """Test that every tile lies inside the wall."""
+        wall = SpectatorWall(self.screen.get_rect(), self.make_games(64))
+        wall.draw(self.screen)
+        self.assertEqual(len(wall.tiles), 64)
+        self.assertGreaterEqual(wall.block_size, 4)
+        for tile in wall.tiles:
+            self.assertTrue(self.screen.get_rect().contains(tile.rect))
+            left, top = tile.board_pos
+            self.assertLessEqual(left + 10 * wall.block_size, tile.rect.right)
+            self.assertLessEqual(top + 20 * wall.block_size, tile.rect.bottom)
+
+    def test_sprites_shared(self):
+        """Test that block sprites are cached per size and piece type."""
+        self.assertIs(block_sprite(6, 3), block_sprite(6, 3))
+        self.assertIsNot(block_sprite(6, 3), block_sprite(7, 3))
+        self.assertEqual(block_sprite(6, 3).get_at((0, 0))[:3], PALETTE[3])
+        self.assertEqual(block_sprite(6, 0).get_at((0, 0))[:3], BOARD_BACKGROUND)
+
+    def test_only_changed_tiles_redrawn(self):
+        """Test that unchanged tiles are skipped."""
+        games = self.make_games(4)
+        wall = SpectatorWall(self.screen.get_rect(), games)
+        self.assertEqual(len(wall.draw(self.screen)), 4)
+        self.assertEqual(wall.draw(self.screen), [])
+
+        games[2].current_piece.move(0, 1)
+        dirty = wall.draw(self.screen)
+        self.assertEqual(dirty, [wall.tiles[2].rect.move(wall.rect.topleft)])
+
+    def test_locked_cells_drawn(self):
+        """Test that a locked block appears at its cell."""
+        game = self.make_games(1)[0]
+        wall = SpectatorWall(self.screen.get_rect(), [game])
+        wall.draw(self.screen)
+        game.current_piece = Tetrimino(0, 18, SHAPES[1])
+        game.lock_piece()
+        wall.draw(self.screen)
+        tile = wall.tiles[0]
+        size = wall.block_size
+        left, top = tile.board_pos
+        self.assertEqual(wall.surface.get_at((left, top + 19 * size))[:3], PALETTE[SHAPES[1]['id']])
+
+        # A reset game gets a fresh board
+        game.reset_game()
+        wall.draw(self.screen)
+        self.assertEqual(wall.surface.get_at((left, top + 19 * size))[:3], BOARD_BACKGROUND)
+
+    @classmethod
+    def tearDownClass(cls):
+        """Clean up test environment."""
+        pygame.quit()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,159 @@
+"""Tests for data file storage."""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+from tetris.settings import Settings
+from tetris.storage import SettingsStore, atomic_write_json, data_dir, data_path, DATA_DIR_ENV
+
+class TestAtomicWrite(unittest.TestCase):
+    """Test cases for atomic_write_json."""
+
+    def setUp(self):
+        """Set up a scratch directory."""
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def test_write_replaces_file(self):
+        """Test that the target is replaced and no temp files are left."""
+        path = os.path.join(self.tmp_dir, "data.json")
+        atomic_write_json(path, {"a": 1})
+        atomic_write_json(path, {"a": 2})
+        with open(path) as f:
+            self.assertEqual(json.load(f), {"a": 2})
+        self.assertEqual(os.listdir(self.tmp_dir), ["data.json"])
+
+    def test_failed_write_keeps_old_content(self):
+        """Test that a failing serialization leaves the old file intact."""
+        path = os.path.join(self.tmp_dir, "data.json")
+        atomic_write_json(path, {"a": 1})
+        with self.assertRaises(TypeError):
+            atomic_write_json(path, {"a": object()})
+        with open(path) as f:
+            self.assertEqual(json.load(f), {"a": 1})
+        self.assertEqual(os.listdir(self.tmp_dir), ["data.json"])
+
+    def test_data_path_uses_environment(self):
+        """Test that data files resolve inside $TETRIS_DATA_DIR."""
+        self.assertEqual(os.path.dirname(data_path("settings.json")), os.environ[DATA_DIR_ENV])
+
+    @unittest.skipIf(sys.platform in ("win32", "darwin"), "XDG layout")
+    def test_default_data_dir_is_per_user(self):
+        """Test that without $TETRIS_DATA_DIR data goes to the user's data directory."""
+        environ = {key: value for key, value in os.environ.items() if key != DATA_DIR_ENV}
+        with mock.patch.dict(os.environ, environ, clear=True):
+            os.environ["XDG_DATA_HOME"] = self.tmp_dir
+            self.assertEqual(data_dir(), os.path.join(self.tmp_dir, "tetris"))
+            del os.environ["XDG_DATA_HOME"]
+            self.assertEqual(data_dir(), os.path.expanduser(os.path.join("~", ".local", "share", "tetris")))
+
+    def tearDown(self):
+        """Remove the scratch directory."""
+        shutil.rmtree(self.tmp_dir)
+
+class TestSettingsStore(unittest.TestCase):
+    """Test cases for the SettingsStore class."""
+
+    def setUp(self):
+        """Set up a store in a scratch directory."""
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp_dir, "settings.json")
+        self.store = SettingsStore(self.path, delay=60)
+
+    def test_missing_file_is_not_created(self):
+        """Test that loading a missing file does not write defaults."""
+        self.assertIsNone(self.store.load())
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_changes_are_coalesced(self):
+        """Test that a burst of saves results in one write of the last value."""
+        for volume in range(10):
+            self.store.save({"music_volume": volume / 10})
+        self.assertFalse(os.path.exists(self.path))
+        self.assertEqual(self.store.load(), {"music_volume": 0.9})
+        self.store.flush()
+        with open(self.path) as f:
+            self.assertEqual(json.load(f), {"music_volume": 0.9})
+
+    def test_write_waits_for_quiet(self):
+        """Test that each change restarts the delay, so a long burst is written once at the end."""
+        store = SettingsStore(self.path, delay=0.2)
+        for volume in range(6):
+            store.save({"music_volume": volume / 10})
+            time.sleep(0.08)
+        # Longer than the delay since the first change, but never quiet for it
+        self.assertFalse(os.path.exists(self.path))
+        time.sleep(0.5)
+        with open(self.path) as f:
+            self.assertEqual(json.load(f), {"music_volume": 0.5})
+
+    def test_save_does_not_wait_for_write(self):
+        """Test that a change goes through while a slow write is in progress."""
+        started = threading.Event()
+        release = threading.Event()
+
+        def slow_write(path, data):
+            started.set()
+            release.wait(5)
+            atomic_write_json(path, data)
+        self.store.save({"music_volume": 0.1})
+        with mock.patch("tetris.storage.atomic_write_json", slow_write):
+            writer = threading.Thread(target=self.store.flush)
+            writer.start()
+            self.assertTrue(started.wait(5))
+            start = time.perf_counter()
+            self.assertTrue(self.store.save({"music_volume": 0.2}))
+            self.assertLess(time.perf_counter() - start, 1)
+            release.set()
+            writer.join()
+        with open(self.path) as f:
+            self.assertEqual(json.load(f), {"music_volume": 0.1})
+        self.store.flush()
+        with open(self.path) as f:
+            self.assertEqual(json.load(f), {"music_volume": 0.2})
+
+    def test_failed_timer_write_stays_pending(self):
+        """Test that a failed background write is logged and retried by the next flush."""
+        self.store.save({"music_volume": 0.3})
+        with mock.patch("tetris.storage.atomic_write_json", side_effect=OSError("disk full")):
+            with self.assertLogs("tetris.storage", "WARNING"):
+                self.store._expire(self.store._generation)
+        self.assertFalse(os.path.exists(self.path))
+        self.store.flush()
+        with open(self.path) as f:
+            self.assertEqual(json.load(f), {"music_volume": 0.3})
+
+    def test_unchanged_content_is_not_written(self):
+        """Test that saving identical content is a no-op."""
+        self.assertTrue(self.store.save({"difficulty": "Hard"}))
+        self.store.flush()
+        self.assertFalse(self.store.save({"difficulty": "Hard"}))
+
+    def test_corrupt_file_falls_back(self):
+        """Test that a corrupt file is ignored."""
+        with open(self.path, "w") as f:
+            f.write("")
+        self.assertIsNone(self.store.load())
+
+    def test_settings_round_trip(self):
+        """Test that Settings instances share the cached store."""
+        settings = Settings(self.path)
+        settings.difficulty = "Hard"
+        settings.save_settings()
+        self.assertEqual(Settings(self.path).difficulty, "Hard")
+        settings.flush()
+        with open(self.path) as f:
+            self.assertEqual(json.load(f)["difficulty"], "Hard")
+
+    def tearDown(self):
+        """Remove the scratch directory."""
+        self.store.flush()
+        shutil.rmtree(self.tmp_dir)
+
+if __name__ == '__main__':
+    unittest.main()
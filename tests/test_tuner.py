@@ -0,0 +1,70 @@
+"""Tests for the difficulty-curve tuner."""
+
+import types
+import unittest
+from tetris.levels import LevelTable
+from tetris.tuner import (
+    CurveEngine, GameResult, candidate_table, error, fit, parse_target, percentile, play_game, tune
+)
+
+class TestTuner(unittest.TestCase):
+    """Test cases for the simulation and the fit."""
+
+    def test_percentile(self):
+        values = [5, 1, 4, 2, 3]
+        self.assertEqual(percentile(values, 50), 3)
+        self.assertEqual(percentile(values, 100), 5)
+        self.assertEqual(percentile(values, 0), 1)
+        self.assertEqual(percentile(values, 90), 5)
+
+    def test_curve_engine_follows_table(self):
+        table = LevelTable({"Normal": [400, 300, 200]}, lines_per_level=2)
+        engine = CurveEngine(types.SimpleNamespace(difficulty="Normal"), table, 4, 6)
+        self.assertEqual(engine.fall_speed, 400)
+        for expected in (400, 300, 300, 200):
+            for x in range(4):
+                engine.grid.set(x, 5, 1)
+            engine.clear_lines()
+            self.assertEqual(engine.fall_speed, expected)
+        engine.reset_game()
+        self.assertEqual(engine.fall_speed, 400)
+
+    def test_faster_curve_ends_sooner(self):
+        """Test that the simulated player survives longer on a gentler curve."""
+        gentle = play_game(candidate_table("Normal", 0.96, 120), "Normal", 0, max_time=120)
+        harsh = play_game(candidate_table("Normal", 0.8, 30), "Normal", 0, max_time=120)
+        self.assertTrue(harsh.topped_out)
+        self.assertGreater(gentle.survival, harsh.survival)
+        self.assertGreater(harsh.lpm, 0)
+
+    def test_game_stops_at_max_time(self):
+        result = play_game(candidate_table("Normal", 1.0, 150), "Normal", 0, max_time=3)
+        self.assertEqual(result.survival, 3)
+        self.assertFalse(result.topped_out)
+
+    def test_fit_picks_closest_candidate(self):
+        results = {
+            ("Normal", 0.9, 50): [GameResult(100.0, 30.0, True)] * 3,
+            ("Normal", 0.8, 30): [GameResult(20.0, 30.0, True)] * 3,
+        }
+        targets = {"Normal": [("survival", 50, 90.0)]}
+        self.assertEqual(fit(results, targets)["Normal"][:2], (0.9, 50))
+        self.assertAlmostEqual(error(results[("Normal", 0.9, 50)], targets["Normal"]), 0.0111, places=3)
+
+    def test_tune(self):
+        table = tune({"Hard": [("survival", 50, 10.0)]}, games=2, decays=(0.8, 0.96), floors=(30,),
+                     max_time=30)
+        curve = table.metadata["curves"]["Hard"]
+        self.assertIn(curve["decay"], (0.8, 0.96))
+        self.assertEqual(table.fall_speeds["Hard"][-1], 30)
+        self.assertEqual(table.fall_speed("Hard", 0), table.fall_speeds["Hard"][0])
+
+    def test_parse_target(self):
+        self.assertEqual(parse_target("Easy:lpm:90:40"), ("Easy", ("lpm", 90.0, 40.0)))
+        with self.assertRaises(ValueError):
+            parse_target("Easy:speed:90:40")
+        with self.assertRaises(ValueError):
+            parse_target("Easy:lpm:90")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,7 +2,7 @@
 
 import unittest
 import pygame
-from tetris.ui import Button, Menu
+from tetris.ui import Button, Label, Menu, WidgetLayer
 from tetris.settings import Settings, HighScores
 from tetris.constants import COLORS, GameState, SCREEN_DIMENSIONS
 
@@ -196,5 +196,82 @@ class TestMenu(unittest.TestCase):
         """Clean up test environment."""
         pygame.quit()
 
+class CountingWidget:
+    """Widget counting how often it is drawn."""
+
+    def __init__(self):
+        self.changed = True
+        self.draws = 0
+
+    def draw(self, screen):
+        self.draws += 1
+
+class TestWidgetCaching(unittest.TestCase):
+    """Test cases for cached widget rendering."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up test environment."""
+        pygame.init()
+        cls.screen = pygame.display.set_mode((SCREEN_DIMENSIONS['WIDTH'], SCREEN_DIMENSIONS['HEIGHT']))
+
+    def test_label_renders_on_change_only(self):
+        """Test that setting the same text keeps the cached surface."""
+        label = Label("Score", (50, 50))
+        surface = label._surface
+        self.assertFalse(label.set_text("Score"))
+        self.assertIs(label._surface, surface)
+        self.assertTrue(label.set_text("Score 1"))
+        self.assertIsNot(label._surface, surface)
+
+    def test_layer_recomposites_on_change_only(self):
+        """Test that an unchanged layer is blitted without re-rendering."""
+        widget = CountingWidget()
+        layer = WidgetLayer((10, 10), [widget])
+        layer.draw(self.screen)
+        layer.draw(self.screen)
+        self.assertEqual(widget.draws, 1)
+        widget.changed = True
+        layer.draw(self.screen)
+        self.assertEqual(widget.draws, 2)
+
+    def test_hover_marks_button_changed(self):
+        """Test that hover changes invalidate the button."""
+        button = Button(0, 0, 100, 50, "Play")
+        button.changed = False
+        button.handle_event(pygame.event.Event(pygame.MOUSEMOTION, {'pos': (500, 500)}))
+        self.assertFalse(button.changed)
+        button.handle_event(pygame.event.Event(pygame.MOUSEMOTION, {'pos': (10, 10)}))
+        self.assertTrue(button.changed)
+
+    def test_settings_labels_follow_settings(self):
+        """Test that settings buttons show current values."""
+        settings = Settings()
+        menu = Menu(self.screen, settings, HighScores())
+        menu.state = GameState.SETTINGS
+        settings.difficulty = "Hard"
+        menu.draw()
+        self.assertEqual(menu.settings_buttons[2].text, "Difficulty: Hard")
+
+    def test_idle_menu_reuses_layer(self):
+        """Test that redrawing an unchanged menu re-uses the cached surface."""
+        menu = Menu(self.screen, Settings(), HighScores())
+        menu.draw()
+        layer = menu.layers[GameState.MAIN_MENU]
+        surface = layer.surface
+        self.assertTrue(layer.valid)
+        menu.draw()
+        self.assertIs(layer.surface, surface)
+        self.assertTrue(layer.valid)
+
+    def test_game_over_reuses_buttons(self):
+        """Test that the game over screen doesn't recreate its buttons."""
+        menu = Menu(self.screen, Settings(), HighScores())
+        restart_button = menu.restart_button
+        snapshot = self.screen.copy()
+        menu.draw_game_over(None, snapshot)
+        menu.draw_game_over(None, snapshot)
+        self.assertIs(menu.restart_button, restart_button)
+
 if __name__ == '__main__':
     unittest.main()